@@ -0,0 +1 @@
+"""Micro-benchmarks for the context-building hot paths."""
@@ -0,0 +1,50 @@
+"""Benchmark: chained accessibility filters vs. the fused pipeline.
+
+Usage:
+    python -m benchmarks.bench_ax_filter [--repeat N]
+"""
+
+import argparse
+import tracemalloc
+
+from webtask._internal.accessibility import AXNode
+from webtask._internal.accessibility.filters import (
+    filter_accessibility_tree,
+    filter_duplicate_text,
+    filter_ignored_nodes,
+    filter_non_semantic_role,
+)
+
+from .snapshots import load_snapshots
+from .timing import measure, report
+
+
+def _chained(root: AXNode) -> AXNode:
+    root = filter_ignored_nodes(root)
+    root = filter_duplicate_text(root)
+    return filter_non_semantic_role(root)
+
+
+def _peak_bytes(fn) -> int:
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    for page in load_snapshots():
+        root = AXNode.from_cdp(page.ax)
+        print(f"{page.name} ({sum(1 for _ in root.traverse())} AX nodes)")
+        for label, fn in (("chained", _chained), ("fused", filter_accessibility_tree)):
+            report(label, measure(lambda: fn(root), args.repeat))
+            print(f"  {'':<32} peak {_peak_bytes(lambda: fn(root)) / 1024:8.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
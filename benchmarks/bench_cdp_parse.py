@@ -0,0 +1,33 @@
+"""Benchmark: parse_cdp() vs. the columnar CdpNodeTable.
+
+Usage:
+    python -m benchmarks.bench_cdp_parse [--repeat N]
+"""
+
+import argparse
+
+from webtask._internal.dom.parsers import parse_cdp, parse_cdp_columnar
+
+from .snapshots import load_snapshots, node_count
+from .timing import measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    for page in load_snapshots():
+        snapshot = page.dom
+        print(f"{page.name} ({node_count(snapshot)} nodes)")
+        baseline = measure(lambda: parse_cdp(snapshot), args.repeat)
+        table = measure(lambda: parse_cdp_columnar(snapshot), args.repeat)
+        tree = measure(lambda: parse_cdp_columnar(snapshot).build_tree(), args.repeat)
+        report("parse_cdp", baseline)
+        report("columnar table only", table)
+        report("columnar + build_tree", tree)
+        print(f"  speedup (tree): {baseline['min'] / tree['min']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark: prompt size of full-page vs. viewport-windowed context.
+
+Usage:
+    python -m benchmarks.bench_context_tokens [--viewport-height PX] [--repeat N]
+
+Builds each mode's context for the whole page and for a window around the
+viewport, scrolled to the top, middle and bottom of the page, and reports
+tokens (cl100k_base via tiktoken) and build time. Without the tiktoken
+encoding (it is downloaded on first use), tokens are estimated as chars / 4.
+"""
+
+import argparse
+from typing import Any, Callable, Dict
+
+from webtask._internal.context import LLMDomContext, PageCapture
+
+from .snapshots import load_snapshots
+from .timing import measure
+
+
+def _token_counter() -> Callable[[str], int]:
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text))
+    except Exception as e:
+        print(f"tiktoken encoding unavailable ({type(e).__name__}), using chars / 4")
+        return lambda text: len(text) // 4
+
+
+def _scrolled(dom: Dict[str, Any], scroll_y: float) -> Dict[str, Any]:
+    """Copy of a snapshot with a different vertical scroll offset."""
+    first, *rest = dom["documents"]
+    return dict(dom, documents=[dict(first, scrollOffsetY=scroll_y), *rest])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--viewport-height", type=int, default=720)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    count_tokens = _token_counter()
+
+    for page in load_snapshots():
+        document = page.dom["documents"][0]
+        bottom = max(0, (document.get("contentHeight") or 0) - args.viewport_height)
+        print(page.name)
+        for mode in ("dom", "accessibility"):
+            capture = PageCapture(dom_snapshot=page.dom, ax_tree=page.ax)
+            full = count_tokens(LLMDomContext.from_capture(capture).get_context(mode))
+            stats = measure(
+                lambda: LLMDomContext.from_capture(capture).get_context(mode),
+                args.repeat,
+            )
+            print(
+                f"  {mode + ' full page':<28} {full:>8} tokens"
+                f"   median {stats['median'] * 1000:8.2f} ms"
+            )
+            for label, scroll_y in (
+                ("top", 0),
+                ("middle", bottom / 2),
+                ("bottom", bottom),
+            ):
+                capture = PageCapture(
+                    dom_snapshot=_scrolled(page.dom, scroll_y), ax_tree=page.ax
+                )
+
+                def build():
+                    return LLMDomContext.from_capture(
+                        capture, viewport_height=args.viewport_height
+                    ).get_context(mode)
+
+                tokens = count_tokens(build())
+                stats = measure(build, args.repeat)
+                print(
+                    f"  {mode + ' window @ ' + label:<28} {tokens:>8} tokens"
+                    f"   median {stats['median'] * 1000:8.2f} ms"
+                    f"   ({tokens / max(full, 1):.1%} of full)"
+                )
+
+
+if __name__ == "__main__":
+    main()
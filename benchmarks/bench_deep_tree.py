@@ -0,0 +1,58 @@
+"""Benchmark: context building on very deep trees, plus traversal overhead.
+
+Usage:
+    python -m benchmarks.bench_deep_tree [--depth N] [--repeat N]
+
+Builds the DOM and accessibility contexts for a page nested --depth levels
+deep (far beyond the default recursion limit of 1000), then times tree
+traversal on the regular benchmark pages.
+"""
+
+import argparse
+import sys
+
+from webtask._internal.accessibility import AXNode
+from webtask._internal.context import LLMDomContext, PageCapture
+from webtask._internal.dom import DomNode
+
+from .snapshots import load_snapshots, synthesize_ax_tree, synthesize_deep_snapshot
+from .timing import measure, report
+
+
+def _build_context(dom, ax, mode: str) -> str:
+    context = LLMDomContext.from_capture(PageCapture(dom_snapshot=dom, ax_tree=ax))
+    return context.get_context(mode)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    dom = synthesize_deep_snapshot(args.depth)
+    ax = synthesize_ax_tree(dom)
+    print(f"deep-{args.depth} (recursion limit {sys.getrecursionlimit()})")
+    for mode in ("dom", "accessibility"):
+        try:
+            stats = measure(lambda: _build_context(dom, ax, mode), args.repeat)
+        except RecursionError:
+            print(f"  {mode + ' context':<32} RecursionError")
+            continue
+        report(f"{mode} context", stats)
+
+    for page in load_snapshots():
+        dom_root = DomNode.from_cdp(page.dom, columnar=True)
+        ax_root = AXNode.from_cdp(page.ax)
+        print(page.name)
+        report("DomNode.traverse", measure(lambda: sum(1 for _ in dom_root.traverse())))
+        report("AXNode.traverse", measure(lambda: sum(1 for _ in ax_root.traverse())))
+        for mode in ("dom", "accessibility"):
+            stats = measure(
+                lambda: _build_context(page.dom, page.ax, mode), args.repeat
+            )
+            report(f"{mode} context", stats)
+
+
+if __name__ == "__main__":
+    main()
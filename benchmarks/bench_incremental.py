@@ -0,0 +1,77 @@
+"""Benchmark: incremental vs. fresh context builds across successive steps.
+
+Usage:
+    python -m benchmarks.bench_incremental [--repeat N]
+
+Simulates an agent step that changes one element (an attribute in the DOM,
+a name in the accessibility tree) and rebuilds the context from the parsed
+trees. Builds alternate between the original and the changed page, so every
+incremental build sees exactly one change since the previous one.
+"""
+
+import argparse
+import copy
+import itertools
+from typing import Any, Dict
+
+from webtask._internal.accessibility import AXNode
+from webtask._internal.context import IncrementalContext, LLMDomContext
+from webtask._internal.dom import DomNode
+
+from .snapshots import load_snapshots
+from .timing import measure, report
+
+
+def _change_one_element(dom: Dict[str, Any], ax: Dict[str, Any]):
+    """Copy of the page with one element in the middle changed."""
+    dom = copy.deepcopy(dom)
+    nodes = dom["documents"][0]["nodes"]
+    dom["strings"].append("toggled")
+    with_attributes = [i for i, flat in enumerate(nodes["attributes"]) if flat]
+    target = with_attributes[len(with_attributes) // 2]
+    nodes["attributes"][target][-1] = len(dom["strings"]) - 1
+
+    ax = copy.deepcopy(ax)
+    named = [node for node in ax["nodes"] if node.get("name", {}).get("value")]
+    named[len(named) // 2]["name"]["value"] += " (toggled)"
+    return dom, ax
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    for page in load_snapshots():
+        changed_dom, changed_ax = _change_one_element(page.dom, page.ax)
+        # Parsing is the same either way; time what happens after it
+        trees = [
+            (DomNode.from_cdp(dom, columnar=True), AXNode.from_cdp(ax))
+            for dom, ax in ((page.dom, page.ax), (changed_dom, changed_ax))
+        ]
+        print(page.name)
+        for mode in ("dom", "accessibility"):
+            fresh = itertools.cycle(trees)
+            stats = measure(
+                lambda: LLMDomContext(*next(fresh)).get_context(mode), args.repeat
+            )
+            report(f"{mode} fresh", stats)
+
+            state = IncrementalContext()
+            steps = itertools.cycle(trees)
+            last = {}
+
+            def incremental_step():
+                context = LLMDomContext(*next(steps), incremental=state)
+                context.get_context(mode)
+                last["stats"] = context.get_reuse_stats()
+
+            report(f"{mode} incremental", measure(incremental_step, args.repeat))
+            print(
+                f"  {'':<32} reused {last['stats']['reused']} nodes, "
+                f"rebuilt {last['stats']['rebuilt']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark: event loop lag while concurrent agents build page context.
+
+Usage:
+    python -m benchmarks.bench_loop_lag [--agents N] [--steps N]
+
+Each simulated agent builds its DOM context from the snapshot on every
+step, with a short await in between standing in for browser and LLM I/O.
+A probe coroutine meanwhile sleeps 5 ms at a time and records how late it
+wakes up: that lateness is what every other agent's I/O waits for. Builds
+run inline (on the loop), in the thread pool and in the process pool.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+from webtask._internal.context import PageCapture, build_dom_context_in
+from webtask._internal.context.offload import shutdown_parse_executors
+
+from .snapshots import load_snapshots
+
+_PROBE_INTERVAL = 0.005
+
+
+async def _run(
+    parse_in: str, capture: PageCapture, agents: int, steps: int
+) -> Dict[str, float]:
+    lags: List[float] = []
+    done = asyncio.Event()
+
+    async def probe() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(_PROBE_INTERVAL)
+            lags.append(time.perf_counter() - start - _PROBE_INTERVAL)
+
+    async def agent() -> None:
+        for _ in range(steps):
+            await build_dom_context_in(parse_in, capture, "dom")
+            await asyncio.sleep(0.001)
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(agent() for _ in range(agents)))
+    wall = time.perf_counter() - start
+    done.set()
+    await probe_task
+
+    lags.sort()
+    return {
+        "wall": wall,
+        "builds_per_second": agents * steps / wall,
+        "lag_p50": statistics.median(lags),
+        "lag_p95": lags[int(len(lags) * 0.95)],
+        "lag_max": lags[-1],
+    }
+
+
+async def _main(agents: int, steps: int) -> None:
+    for page in load_snapshots():
+        capture = PageCapture(dom_snapshot=page.dom)
+        print(f"{page.name} - {agents} agents x {steps} steps")
+        for parse_in in ("inline", "thread", "process"):
+            # Warm-up (starts the pool workers)
+            await build_dom_context_in(parse_in, capture, "dom")
+            stats = await _run(parse_in, capture, agents, steps)
+            print(
+                f"  {parse_in:<10} {stats['builds_per_second']:7.1f} builds/s"
+                f"   loop lag p50 {stats['lag_p50'] * 1000:7.2f} ms"
+                f"   p95 {stats['lag_p95'] * 1000:7.2f} ms"
+                f"   max {stats['lag_max'] * 1000:7.2f} ms"
+            )
+    shutdown_parse_executors()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_main(args.agents, args.steps))
+
+
+if __name__ == "__main__":
+    main()
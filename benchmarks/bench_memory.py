@@ -0,0 +1,78 @@
+"""Benchmark: retained memory per DOM/AX node.
+
+Usage:
+    python -m benchmarks.bench_memory
+
+Measures, with tracemalloc, the memory retained by each tree a context build
+keeps alive, divided by the number of nodes in that tree. The CDP payloads
+are allocated before measuring, so shared strings are not counted.
+"""
+
+import gc
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+from webtask._internal.accessibility import AXNode
+from webtask._internal.accessibility.filters import (
+    filter_duplicate_text,
+    filter_ignored_nodes,
+    filter_non_semantic_role,
+)
+from webtask._internal.dom import DomNode
+from webtask._internal.dom.filters import filter_non_rendered, filter_non_semantic
+
+from .snapshots import load_snapshots
+
+
+def _retained(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """Build a structure and return it with the bytes it retains."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def _count(root: Any) -> int:
+    return sum(1 for _ in root.traverse())
+
+
+def _report(label: str, root: Any, size: int) -> None:
+    nodes = _count(root)
+    print(
+        f"  {label:<22} {nodes:>7} nodes  {size / 1024 / 1024:7.2f} MiB"
+        f"  {size / nodes:7.1f} B/node"
+    )
+
+
+def main() -> None:
+    for page in load_snapshots():
+        print(page.name)
+
+        dom_root, size = _retained(lambda: DomNode.from_cdp(page.dom, columnar=True))
+        _report("DOM tree", dom_root, size)
+
+        def filter_dom():
+            root = filter_non_rendered(dom_root)
+            return filter_non_semantic(root)
+
+        filtered_dom, size = _retained(filter_dom)
+        _report("filtered DOM tree", filtered_dom, size)
+
+        ax_root, size = _retained(lambda: AXNode.from_cdp(page.ax))
+        _report("AX tree", ax_root, size)
+
+        def filter_ax():
+            root = filter_ignored_nodes(ax_root)
+            root = filter_duplicate_text(root)
+            return filter_non_semantic_role(root)
+
+        filtered_ax, size = _retained(filter_ax)
+        _report("filtered AX tree", filtered_ax, size)
+
+
+if __name__ == "__main__":
+    main()
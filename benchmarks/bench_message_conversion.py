@@ -0,0 +1,95 @@
+"""Benchmark: provider message conversion over a run, with and without the cache.
+
+Usage:
+    python -m benchmarks.bench_message_conversion [--steps N] [--repeat N]
+
+Replays the message histories a TaskRunner sends over a run of N steps
+(page context and a screenshot per step, purged by lifespan) and converts
+each one to Gemini and Bedrock format, as every LLM call does. Without the
+cache the whole history is converted on every step.
+"""
+
+import argparse
+import os
+from typing import Callable, List
+from unittest import mock
+
+from webtask._internal.agent.message import AgentImage, AgentText
+from webtask._internal.agent.task_runner import TaskRunner
+from webtask._internal.llm.conversion_cache import ConversionCache
+from webtask.integrations.llm.bedrock.bedrock_mapper import messages_to_bedrock_format
+from webtask.integrations.llm.google.gemini_mapper import messages_to_gemini_content
+from webtask.llm import Message, Role, Text, ToolCall, ToolResult, ToolResultStatus
+
+from .timing import measure, report
+
+PAGE = "\n".join(f'- [button-{i}]\n  - "Item {i}"' for i in range(400))
+SCREENSHOT = os.urandom(150_000)
+
+
+def _histories(steps: int) -> List[List[Message]]:
+    """The prepared prompt of every step of a run."""
+    runner = TaskRunner(
+        llm=mock.Mock(),
+        tools=[],
+        get_context=mock.AsyncMock(return_value=[]),
+        system_prompt="system",
+    )
+    session = [
+        Message(role=Role.SYSTEM, content=[Text(text="You are a web agent")]),
+        Message(role=Role.USER, content=[AgentText(text="Task: buy shoes")]),
+    ]
+    pairs = []
+    histories = []
+    for step in range(steps):
+        call = ToolCall(id=f"call-{step}", name="click", arguments={"id": "button-1"})
+        pairs.append(
+            (
+                Message(role=Role.MODEL, content=[Text(text="Clicking"), call]),
+                Message(
+                    role=Role.TOOL,
+                    content=[
+                        ToolResult(
+                            tool_call_id=call.id,
+                            name="click",
+                            status=ToolResultStatus.SUCCESS,
+                        ),
+                        AgentText(text=PAGE, lifespan=1),
+                        AgentImage(data=SCREENSHOT, lifespan=2),
+                    ],
+                ),
+            )
+        )
+        histories.append(runner._prepare_messages(session, pairs))
+    return histories
+
+
+def _run(histories: List[List[Message]], to_provider: Callable, cached: bool):
+    cache = ConversionCache() if cached else None
+    for messages in histories:
+        to_provider(messages, cache)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    histories = _histories(args.steps)
+    total = sum(len(messages) for messages in histories)
+    print(f"{args.steps} steps, {total} messages sent in total")
+    for name, to_provider in (
+        ("gemini", messages_to_gemini_content),
+        ("bedrock", messages_to_bedrock_format),
+    ):
+        for cached in (False, True):
+            label = f"{name} {'cached' if cached else 'uncached'}"
+            report(
+                label,
+                measure(lambda: _run(histories, to_provider, cached), args.repeat),
+            )
+
+
+if __name__ == "__main__":
+    main()
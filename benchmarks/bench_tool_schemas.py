@@ -0,0 +1,96 @@
+"""Benchmark: per-call tool config with and without compiled declarations.
+
+Usage:
+    python -m benchmarks.bench_tool_schemas [--repeat N]
+
+Builds the Gemini and Bedrock tool config for the DOM-mode agent tool set
+(with a structured output schema on complete_work), as every LLM call does.
+"Cold" clears the declaration cache first, which is what each call cost
+before declarations were compiled once.
+"""
+
+import argparse
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from webtask._internal.agent.run import TaskResult
+from webtask._internal.agent.tools import (
+    AbortWorkTool,
+    ClickTool,
+    CompleteWorkTool,
+    GoBackTool,
+    GoForwardTool,
+    GotoTool,
+    KeyCombinationTool,
+    OpenTabTool,
+    ScrollDocumentTool,
+    SelectTool,
+    SwitchTabTool,
+    TypeTool,
+)
+from webtask.integrations.llm.bedrock import bedrock_mapper
+from webtask.integrations.llm.google import gemini_mapper
+
+from .timing import measure, report
+
+
+class Product(BaseModel):
+    name: str
+    price: float
+    rating: Optional[float] = None
+
+
+class Listing(BaseModel):
+    products: List[Product]
+
+
+def _tools():
+    result = TaskResult()
+    return [
+        GotoTool(None, 0),
+        GoBackTool(None, 0),
+        GoForwardTool(None, 0),
+        OpenTabTool(None),
+        SwitchTabTool(None),
+        KeyCombinationTool(None, 0),
+        ClickTool(None, 0),
+        TypeTool(None, 0, 0),
+        SelectTool(None, 0),
+        ScrollDocumentTool(None, 0),
+        CompleteWorkTool(result, Listing),
+        AbortWorkTool(result),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    tools = _tools()
+    print(f"{len(tools)} tools")
+    for name, build, compiled in (
+        (
+            "gemini",
+            gemini_mapper.build_tool_config,
+            gemini_mapper._compile_function_declaration,
+        ),
+        (
+            "bedrock",
+            bedrock_mapper.build_tool_config,
+            bedrock_mapper._compile_tool_spec,
+        ),
+    ):
+
+        def cold():
+            compiled.cache_clear()
+            build(tools)
+
+        report(f"{name} cold", measure(cold, args.repeat))
+        report(f"{name} compiled", measure(lambda: build(tools), args.repeat))
+    report("tool set per run", measure(_tools, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark: XPath generation for every addressable element of a page.
+
+Usage:
+    python -m benchmarks.bench_xpath [--items N] [--repeat N]
+
+Tools resolve each selected element to an XPath. This computes the XPath of
+every element in the DOM-mode element map (what tag IDs resolve to) on a
+freshly parsed tree, plus every link of an N-item <ul> product list.
+"""
+
+import argparse
+from typing import List
+
+from webtask._internal.context import LLMDomContext, PageCapture
+from webtask._internal.dom import DomNode
+
+from .snapshots import load_snapshots
+from .timing import measure, report
+
+
+def _element_map_nodes(page) -> List[DomNode]:
+    context = LLMDomContext.from_capture(
+        PageCapture(dom_snapshot=page.dom, ax_tree=page.ax)
+    )
+    return list(context._get_element_map("dom").values())
+
+
+def _long_list(num_items: int) -> List[DomNode]:
+    """<html><body><ul><li><a/></li>...</ul></body></html>; returns the links."""
+    ul = DomNode(tag="ul")
+    body = DomNode(tag="body")
+    html = DomNode(tag="html")
+    html.add_child(body)
+    body.add_child(ul)
+    links = []
+    for _ in range(num_items):
+        li = DomNode(tag="li")
+        link = DomNode(tag="a")
+        li.add_child(link)
+        ul.add_child(li)
+        links.append(link)
+    return links
+
+
+def _bench_fresh(make_nodes, repeat: int) -> dict:
+    """Time XPaths for all nodes, on a new tree every run (nothing memoized)."""
+    trees = iter([make_nodes() for _ in range(repeat + 1)])
+    return measure(lambda: [node.get_x_path() for node in next(trees)], repeat)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for page in load_snapshots():
+        nodes = _element_map_nodes(page)
+        print(f"{page.name} ({len(nodes)} elements)")
+        stats = _bench_fresh(lambda: _element_map_nodes(page), args.repeat)
+        report("all element XPaths", stats)
+
+    print(f"ul with {args.items} li")
+    stats = _bench_fresh(lambda: _long_list(args.items), args.repeat)
+    report("all link XPaths", stats)
+
+
+if __name__ == "__main__":
+    main()
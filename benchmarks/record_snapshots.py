@@ -0,0 +1,54 @@
+"""Record CDP snapshots of live pages for the benchmarks.
+
+Usage:
+    python -m benchmarks.record_snapshots https://example.com/search?q=shoes ...
+
+Writes <name>.dom.json (DOMSnapshot.captureSnapshot) and <name>.ax.json
+(Accessibility.getFullAXTree) to benchmarks/snapshots/.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+
+from webtask._internal.context import capture_page
+from webtask.integrations.browser.playwright import PlaywrightBrowser
+
+from .snapshots import SNAPSHOT_DIR
+
+
+def _name_for(url: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9]+", "-", url.split("://", 1)[-1]).strip("-")[:80]
+
+
+async def record(urls, headless: bool = True) -> None:
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    browser = await PlaywrightBrowser.create(headless=headless)
+    try:
+        context = await browser.create_context()
+        page = await context.create_page()
+        for url in urls:
+            await page.goto(url)
+            await page.wait_for_load()
+            capture = await capture_page(page)
+            name = _name_for(url)
+            (SNAPSHOT_DIR / f"{name}.dom.json").write_text(
+                json.dumps(capture.dom_snapshot)
+            )
+            (SNAPSHOT_DIR / f"{name}.ax.json").write_text(json.dumps(capture.ax_tree))
+            print(f"recorded {name} ({capture.format_timings()})")
+    finally:
+        await browser.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(record(args.urls, headless=not args.headed))
+
+
+if __name__ == "__main__":
+    main()
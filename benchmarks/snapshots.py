@@ -0,0 +1,351 @@
+"""Benchmark inputs - recorded CDP snapshots or synthesized stand-ins.
+
+Recorded snapshots live in benchmarks/snapshots/<name>.dom.json and
+<name>.ax.json (see record_snapshots.py). When none are present, a
+deterministic synthetic e-commerce page is generated so the benchmarks still
+run offline.
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SNAPSHOT_DIR = Path(__file__).parent / "snapshots"
+
+
+class _SnapshotBuilder:
+    """Builds DOMSnapshot.captureSnapshot-shaped data node by node."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+        self.node_type: List[int] = []
+        self.node_name: List[int] = []
+        self.node_value: List[int] = []
+        self.parent_index: List[int] = []
+        self.attributes: List[List[int]] = []
+        self.backend_node_id: List[int] = []
+        self.layout_index: List[int] = []
+        self.layout_bounds: List[List[float]] = []
+        self.layout_styles: List[List[int]] = []
+
+    def intern(self, value: str) -> int:
+        if value not in self._string_ids:
+            self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return self._string_ids[value]
+
+    def _add(self, node_type, name, value, parent, attrs) -> int:
+        index = len(self.node_type)
+        self.node_type.append(node_type)
+        self.node_name.append(self.intern(name) if name else -1)
+        self.node_value.append(self.intern(value) if value else -1)
+        self.parent_index.append(parent)
+        flat: List[int] = []
+        for key, val in attrs.items():
+            flat.extend((self.intern(key), self.intern(val)))
+        self.attributes.append(flat)
+        self.backend_node_id.append(index + 1)
+        return index
+
+    def _layout(self, index, bounds, display="block", hidden=False):
+        self.layout_index.append(index)
+        self.layout_bounds.append(list(bounds))
+        self.layout_styles.append(
+            [
+                self.intern(display),
+                self.intern("hidden" if hidden else "visible"),
+                self.intern("1"),
+            ]
+        )
+
+    def document(self) -> int:
+        return self._add(9, "#document", None, -1, {})
+
+    def element(self, parent, tag, attrs=None, bounds=None, display="block"):
+        index = self._add(1, tag.upper(), None, parent, attrs or {})
+        if bounds is not None:
+            self._layout(index, bounds, display)
+        return index
+
+    def text(self, parent, content, bounds=None):
+        index = self._add(3, "#text", content, parent, {})
+        if bounds is not None:
+            self._layout(index, bounds, "inline")
+        return index
+
+    def build(self, scroll_y: float, content_height: float) -> Dict[str, Any]:
+        return {
+            "documents": [
+                {
+                    "nodes": {
+                        "nodeType": self.node_type,
+                        "nodeName": self.node_name,
+                        "nodeValue": self.node_value,
+                        "parentIndex": self.parent_index,
+                        "attributes": self.attributes,
+                        "backendNodeId": self.backend_node_id,
+                    },
+                    "layout": {
+                        "nodeIndex": self.layout_index,
+                        "bounds": self.layout_bounds,
+                        "styles": self.layout_styles,
+                    },
+                    "scrollOffsetX": 0,
+                    "scrollOffsetY": scroll_y,
+                    "contentWidth": 1280,
+                    "contentHeight": content_height,
+                }
+            ],
+            "strings": self.strings,
+        }
+
+
+def synthesize_snapshot(num_products: int = 512, seed: int = 0) -> Dict[str, Any]:
+    """Synthesize an e-commerce listing page snapshot.
+
+    Each product card contributes ~39 CDP nodes (elements, text and whitespace
+    text), so the default of 512 products gives a ~20k node snapshot.
+    """
+    rng = random.Random(seed)
+    b = _SnapshotBuilder()
+    ws = "\n    "
+
+    doc = b.document()
+    html = b.element(doc, "html", {"lang": "en"}, (0, 0, 1280, 800))
+    head = b.element(html, "head")
+    for i in range(20):
+        b.element(head, "meta", {"name": f"meta-{i}", "content": "x" * 40})
+    b.element(head, "script", {"src": "/static/app.js"})
+
+    body = b.element(html, "body", {"class": "page"}, (0, 0, 1280, 800))
+    nav = b.element(body, "nav", {"class": "top-nav"}, (0, 0, 1280, 60))
+    for i in range(30):
+        b.text(nav, ws)
+        link = b.element(
+            nav,
+            "a",
+            {"href": f"/category/{i}", "class": "nav-link"},
+            (i * 40, 0, 40, 60),
+            "inline",
+        )
+        b.text(link, f"Category {i}", (i * 40, 0, 40, 20))
+
+    main = b.element(body, "main", {"id": "results"}, (0, 60, 1280, 0))
+    grid = b.element(main, "div", {"class": "grid"}, (0, 60, 1280, 0))
+    y = 60.0
+    for p in range(num_products):
+        x = (p % 4) * 320.0
+        if p % 4 == 0 and p:
+            y += 420.0
+        card = b.element(
+            grid,
+            "div",
+            {"class": "card product-card", "data-sku": f"SKU{p:06d}"},
+            (x, y, 300, 400),
+        )
+        b.text(card, ws)
+        link = b.element(
+            card,
+            "a",
+            {"href": f"/product/{p}", "class": "card-link"},
+            (x, y, 300, 300),
+        )
+        b.text(link, ws)
+        b.element(
+            link,
+            "img",
+            {
+                "src": f"https://cdn.example.com/img/{p}.jpg",
+                "alt": f"Product {p}",
+                "loading": "lazy",
+            },
+            (x, y, 300, 240),
+        )
+        b.text(link, ws)
+        title = b.element(link, "h3", {"class": "title"}, (x, y + 250, 300, 40))
+        b.text(title, f"Product {p} - {rng.choice(['Red', 'Blue', 'Black'])}")
+        b.text(link, ws)
+        details = b.element(card, "div", {"class": "details"}, (x, y + 300, 300, 60))
+        for label in ("price", "rating", "shipping"):
+            b.text(details, ws)
+            span = b.element(
+                details, "span", {"class": label}, (x, y + 300, 100, 20), "inline"
+            )
+            b.text(span, f"{label} {rng.randint(1, 500)}", (x, y + 300, 100, 20))
+        b.text(card, ws)
+        form = b.element(card, "form", {"action": "/cart"}, (x, y + 360, 300, 40))
+        b.element(
+            form,
+            "input",
+            {"type": "hidden", "name": "sku", "value": f"SKU{p:06d}"},
+        )
+        qty = b.element(
+            form,
+            "input",
+            {"type": "number", "name": "qty", "aria-label": "Quantity"},
+            (x, y + 360, 60, 40),
+            "inline-block",
+        )
+        b.text(qty, ws)
+        button = b.element(
+            form,
+            "button",
+            {"type": "submit", "class": "btn btn-primary"},
+            (x + 80, y + 360, 200, 40),
+            "inline-block",
+        )
+        b.text(button, "Add to cart", (x + 80, y + 360, 200, 20))
+        # Hover overlay: not rendered until hovered (no layout entry)
+        overlay = b.element(card, "div", {"class": "overlay", "style": "display:none"})
+        for i in range(3):
+            item = b.element(overlay, "div", {"class": "swatch"})
+            b.text(item, f"Option {i}")
+        tracking = b.element(card, "div", {"class": "tracking"}, (x, y, 0, 0))
+        for i in range(4):
+            b.element(tracking, "span", {"data-track": f"{p}-{i}"}, (x, y, 0, 0))
+        b.text(card, ws)
+
+    footer = b.element(body, "footer", {"class": "footer"}, (0, y + 420, 1280, 200))
+    for i in range(40):
+        b.text(footer, f"Footer link {i}", (0, y + 420, 100, 20))
+
+    return b.build(scroll_y=0.0, content_height=y + 620)
+
+
+def synthesize_deep_snapshot(depth: int = 5000) -> Dict[str, Any]:
+    """Synthesize a pathologically deep page: depth nested divs ending in a button.
+
+    Mimics component-library markup where every wrapper adds a level.
+    """
+    b = _SnapshotBuilder()
+    doc = b.document()
+    html = b.element(doc, "html", {}, (0, 0, 1280, 800))
+    parent = b.element(html, "body", {}, (0, 0, 1280, 800))
+    for level in range(depth):
+        parent = b.element(
+            parent, "div", {"class": f"wrapper-{level % 7}"}, (0, 0, 1280, 40)
+        )
+        if level % 100 == 0:
+            b.text(parent, f"Section {level}", (0, 0, 200, 20))
+    button = b.element(parent, "button", {"type": "button"}, (0, 0, 100, 40))
+    b.text(button, "Deep button", (0, 0, 100, 20))
+    return b.build(scroll_y=0.0, content_height=800)
+
+
+# Roles Chrome reports for the tags the synthetic page uses
+_TAG_ROLES = {
+    "html": "RootWebArea",
+    "a": "link",
+    "img": "image",
+    "h3": "heading",
+    "button": "button",
+    "input": "spinbutton",
+    "form": "form",
+    "nav": "navigation",
+    "main": "main",
+    "footer": "contentinfo",
+}
+
+
+def _ax_value(value_type: str, value: Any) -> Dict[str, Any]:
+    return {"type": value_type, "value": value}
+
+
+def synthesize_ax_tree(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive an Accessibility.getFullAXTree-shaped result from a DOM snapshot.
+
+    Elements map to roles by tag (generic otherwise), text maps to
+    StaticText, and nodes without layout are reported as ignored.
+    """
+    strings = snapshot["strings"]
+    document = snapshot["documents"][0]
+    nodes = document["nodes"]
+    rendered = set(document["layout"]["nodeIndex"])
+    node_types = nodes["nodeType"]
+
+    ax_nodes: List[Dict[str, Any]] = []
+    for i, node_type in enumerate(node_types):
+        if node_type not in (1, 3):
+            continue
+        parent = nodes["parentIndex"][i]
+        if node_type == 3:
+            text = strings[nodes["nodeValue"][i]]
+            if not text.strip():
+                continue
+            role, name = "StaticText", text
+        else:
+            tag = strings[nodes["nodeName"][i]].lower()
+            role, name = _TAG_ROLES.get(tag, "generic"), ""
+        ax = {
+            "nodeId": str(i),
+            "ignored": i not in rendered,
+            "role": _ax_value("role", role if i in rendered else "none"),
+            "chromeRole": _ax_value("internalRole", 0),
+            "childIds": [],
+            "backendDOMNodeId": nodes["backendNodeId"][i],
+            "frameId": "MAIN",
+        }
+        if ax["ignored"]:
+            ax["ignoredReasons"] = [
+                {"name": "notRendered", "value": _ax_value("boolean", True)}
+            ]
+        else:
+            ax["name"] = {
+                "type": "computedString",
+                "value": name,
+                "sources": [
+                    {"type": "attribute", "attribute": "aria-labelledby"},
+                    {"type": "attribute", "attribute": "aria-label"},
+                    {"type": "contents", "value": _ax_value("computedString", name)},
+                ],
+            }
+            ax["properties"] = [
+                {"name": "focusable", "value": _ax_value("booleanOrUndefined", True)}
+            ]
+        if parent > 0:
+            ax["parentId"] = str(parent)
+        ax_nodes.append(ax)
+
+    by_id = {ax["nodeId"]: ax for ax in ax_nodes}
+    for ax in ax_nodes:
+        parent = by_id.get(ax.get("parentId"))
+        if parent is not None:
+            parent["childIds"].append(ax["nodeId"])
+    return {"nodes": ax_nodes}
+
+
+@dataclass
+class BenchmarkPage:
+    """A benchmark input: DOM snapshot plus accessibility tree."""
+
+    name: str
+    dom: Dict[str, Any]
+    ax: Dict[str, Any]
+
+
+def load_snapshots() -> List[BenchmarkPage]:
+    """Return recorded pages if present, else the synthetic page."""
+    recorded = sorted(SNAPSHOT_DIR.glob("*.dom.json"))
+    if not recorded:
+        dom = synthesize_snapshot()
+        return [BenchmarkPage("synthetic-20k", dom, synthesize_ax_tree(dom))]
+
+    pages = []
+    for path in recorded:
+        name = path.name[: -len(".dom.json")]
+        dom = json.loads(path.read_text())
+        ax_path = path.with_name(f"{name}.ax.json")
+        ax: Optional[Dict[str, Any]] = (
+            json.loads(ax_path.read_text()) if ax_path.exists() else None
+        )
+        pages.append(BenchmarkPage(name, dom, ax or synthesize_ax_tree(dom)))
+    return pages
+
+
+def node_count(snapshot: Dict[str, Any]) -> int:
+    """Number of CDP nodes in the first document."""
+    documents = snapshot.get("documents") or [{}]
+    return len(documents[0].get("nodes", {}).get("nodeType", []))
@@ -0,0 +1,25 @@
+"""Small timing helpers shared by the benchmarks."""
+
+import gc
+import statistics
+import time
+from typing import Callable, Dict
+
+
+def measure(fn: Callable[[], object], repeat: int = 7) -> Dict[str, float]:
+    """Run fn repeat times (after one warm-up) and return min/median seconds."""
+    fn()
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {"min": min(samples), "median": statistics.median(samples)}
+
+
+def report(label: str, stats: Dict[str, float]) -> None:
+    print(
+        f"  {label:<32} min {stats['min'] * 1000:8.2f} ms"
+        f"   median {stats['median'] * 1000:8.2f} ms"
+    )
@@ -1,7 +1,17 @@
 """webtask - Web automation framework with LLM-powered agents."""
 
 from .webtask import Webtask
-from .agent import Agent, Result, Verdict, Tool
+from .sharding import ShardedRunner, ShardTask, ShardResult, ShardMetrics
+from .agent import (
+    Agent,
+    Result,
+    Verdict,
+    Tool,
+    ScreenshotOptions,
+    AgentPool,
+    PoolTask,
+    PoolResult,
+)
 from .exceptions import (
     WebtaskError,
     TaskAbortedError,
@@ -21,6 +31,7 @@ from .llm import (
     Content,
     Text,
     Image,
+    CachePoint,
     ToolCall,
     ToolResult,
     ToolResultStatus,
@@ -31,11 +42,19 @@ __version__ = "0.26.0"
 __all__ = [
     # Manager
     "Webtask",
+    "ShardedRunner",
+    "ShardTask",
+    "ShardResult",
+    "ShardMetrics",
     # Agent
     "Agent",
     "Result",
     "Verdict",
     "Tool",
+    "ScreenshotOptions",
+    "AgentPool",
+    "PoolTask",
+    "PoolResult",
     # Exceptions
     "WebtaskError",
     "TaskAbortedError",
@@ -51,6 +70,7 @@ __all__ = [
     "Content",
     "Text",
     "Image",
+    "CachePoint",
     "ToolCall",
     "ToolResult",
     "ToolResultStatus",
@@ -30,7 +30,7 @@ class AXValueType(str, Enum):
     TOKEN_LIST = "tokenList"
 
 
-@dataclass
+@dataclass(slots=True)
 class AXValue:
     """Value in accessibility tree (role, name, property, etc.)."""
 
@@ -48,7 +48,7 @@ class AXValue:
         return self.value is not None and self.value != ""
 
 
-@dataclass
+@dataclass(slots=True)
 class AXProperty:
     """Property of an accessibility node."""
 
@@ -59,7 +59,7 @@ class AXProperty:
         return f"{self.name}={self.value}"
 
 
-@dataclass
+@dataclass(slots=True)
 class AXNode:
     """
     Accessibility tree node with semantic information.
@@ -110,12 +110,21 @@ class AXNode:
         """
         Generator that yields this node and all descendants in depth-first order.
 
+        Uses an explicit stack, so arbitrarily deep trees are fine.
+
         Yields:
             AXNode objects in depth-first traversal order
         """
         yield self
-        for child in self.children:
-            yield from child.traverse()
+        stack = [iter(self.children)]
+        while stack:
+            for node in stack[-1]:
+                yield node
+                if node.children:
+                    stack.append(iter(node.children))
+                    break
+            else:
+                stack.pop()
 
     @classmethod
     def from_cdp(cls, cdp_data: Dict[str, Any]) -> "AXNode":
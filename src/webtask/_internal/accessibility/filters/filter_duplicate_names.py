@@ -1,8 +1,24 @@
 """Filter to remove text nodes with duplicate names from accessibility tree."""
 
-from typing import Optional
+from typing import Any, Optional
 from ..axnode import AXNode
 from ...utils.filter_tree_by_predicate import filter_tree_by_predicate
+from ...utils.filter_tree_by_stages import FilterStage
+
+_TEXT_ROLES = ("StaticText", "InlineTextBox")
+
+
+def _name_of(node: AXNode) -> Optional[Any]:
+    """Node's name value, or None if it has no (non-empty) name."""
+    return node.name.value if node.name and node.name.value else None
+
+
+def _text_name(node: AXNode) -> Optional[Any]:
+    """Name of a text-only node (StaticText, InlineTextBox); None otherwise."""
+    role = str(node.role.value) if node.role and node.role.value else ""
+    if role not in _TEXT_ROLES:
+        return None
+    return _name_of(node)
 
 
 def filter_duplicate_text(root: AXNode) -> Optional[AXNode]:
@@ -14,20 +30,14 @@ def filter_duplicate_text(root: AXNode) -> Optional[AXNode]:
     def is_duplicate_text(node: AXNode) -> bool:
         """Check if node is text-only with duplicate name in ancestor."""
         # Only filter text nodes (StaticText, InlineTextBox)
-        role = str(node.role.value) if node.role and node.role.value else ""
-        if role not in ("StaticText", "InlineTextBox"):
-            return False  # Don't filter non-text nodes
-
-        node_name = node.name.value if node.name and node.name.value else None
+        node_name = _text_name(node)
         if not node_name:
             return False
 
         # Walk up parent chain to find nearest ancestor with a name
         current = node.parent
         while current is not None:
-            ancestor_name = (
-                current.name.value if current.name and current.name.value else None
-            )
+            ancestor_name = _name_of(current)
             if ancestor_name:
                 # Found nearest ancestor with name - check if child text is in parent text
                 return node_name in ancestor_name
@@ -36,3 +46,21 @@ def filter_duplicate_text(root: AXNode) -> Optional[AXNode]:
         return False
 
     return filter_tree_by_predicate(root, is_duplicate_text, on_remove="keep_wrapper")
+
+
+def _is_duplicate_of(node: AXNode, ancestor_name: Optional[Any]) -> bool:
+    node_name = _text_name(node)
+    if not node_name or not ancestor_name:
+        return False
+    return node_name in ancestor_name
+
+
+def _nearest_name(node: AXNode, ancestor_name: Optional[Any]) -> Optional[Any]:
+    return _name_of(node) or ancestor_name
+
+
+# filter_duplicate_text as a stage for filter_tree_by_stages: the nearest
+# named ancestor is carried down instead of walking the parent chain
+DUPLICATE_TEXT_STAGE = FilterStage(
+    should_remove=_is_duplicate_of, on_remove="keep_wrapper", carry=_nearest_name
+)
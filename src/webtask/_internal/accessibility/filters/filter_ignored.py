@@ -3,6 +3,7 @@
 from typing import Optional
 from ..axnode import AXNode
 from ...utils.filter_tree_by_predicate import filter_tree_by_predicate
+from ...utils.filter_tree_by_stages import FilterStage
 
 
 def filter_ignored_nodes(root: AXNode) -> Optional[AXNode]:
@@ -14,3 +15,9 @@ def filter_ignored_nodes(root: AXNode) -> Optional[AXNode]:
     return filter_tree_by_predicate(
         root, lambda node: node.ignored, on_remove="promote"
     )
+
+
+# filter_ignored_nodes as a stage for filter_tree_by_stages
+IGNORED_NODES_STAGE = FilterStage(
+    should_remove=lambda node, _: node.ignored, on_remove="promote"
+)
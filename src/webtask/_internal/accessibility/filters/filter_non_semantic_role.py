@@ -2,6 +2,13 @@
 
 from ..axnode import AXNode
 from ...utils.filter_tree_by_predicate import filter_tree_by_predicate
+from ...utils.filter_tree_by_stages import FilterStage
+
+
+def _has_non_semantic_role(node: AXNode) -> bool:
+    """Check if node has a non-semantic role (generic or none)."""
+    role = str(node.role.value) if node.role and node.role.value else "unknown"
+    return role in ("generic", "none")
 
 
 def filter_non_semantic_role(root: AXNode) -> AXNode:
@@ -14,12 +21,12 @@ def filter_non_semantic_role(root: AXNode) -> AXNode:
 
     These wrapper nodes are flattened - children are promoted.
     """
-
-    def has_non_semantic_role(node: AXNode) -> bool:
-        """Check if node has a non-semantic role (generic or none)."""
-        role = str(node.role.value) if node.role and node.role.value else "unknown"
-        return role in ("generic", "none")
-
-    result = filter_tree_by_predicate(root, has_non_semantic_role, on_remove="promote")
+    result = filter_tree_by_predicate(root, _has_non_semantic_role, on_remove="promote")
     # filter_tree_by_predicate returns Optional[AXNode], but we should always have a root
     return result if result is not None else root.copy(children=[], parent=None)
+
+
+# filter_non_semantic_role as a stage for filter_tree_by_stages
+NON_SEMANTIC_ROLE_STAGE = FilterStage(
+    should_remove=lambda node, _: _has_non_semantic_role(node), on_remove="promote"
+)
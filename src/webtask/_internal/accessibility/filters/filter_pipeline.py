@@ -0,0 +1,31 @@
+"""Fused accessibility filter pipeline."""
+
+from typing import Optional, TYPE_CHECKING
+from ..axnode import AXNode
+from ...utils.filter_tree_by_stages import filter_tree_by_stages
+from .filter_ignored import IGNORED_NODES_STAGE
+from .filter_duplicate_names import DUPLICATE_TEXT_STAGE
+from .filter_non_semantic_role import NON_SEMANTIC_ROLE_STAGE
+
+if TYPE_CHECKING:
+    from ...utils.subtree_memo import SubtreeMemo
+
+ACCESSIBILITY_FILTER_STAGES = (
+    IGNORED_NODES_STAGE,
+    DUPLICATE_TEXT_STAGE,
+    NON_SEMANTIC_ROLE_STAGE,
+)
+
+
+def filter_accessibility_tree(
+    root: AXNode, memo: Optional["SubtreeMemo"] = None
+) -> AXNode:
+    """
+    Filter accessibility tree for LLM context in a single pass.
+
+    Same result as filter_ignored_nodes, then filter_duplicate_text, then
+    filter_non_semantic_role, without allocating the intermediate trees.
+    Pass a SubtreeMemo to reuse results for subtrees unchanged since the
+    previous snapshot.
+    """
+    return filter_tree_by_stages(root, ACCESSIBILITY_FILTER_STAGES, memo=memo)
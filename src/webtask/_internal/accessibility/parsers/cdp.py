@@ -3,7 +3,7 @@
 Parses raw Chrome DevTools Protocol accessibility tree data into AXNode IR.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from ..axnode import AXNode, AXValue, AXProperty
 
 
@@ -19,6 +19,26 @@ def _parse_ax_value(value_data: Optional[Dict[str, Any]]) -> Optional[AXValue]:
     )
 
 
+def _parse_shared_ax_value(
+    value_data: Optional[Dict[str, Any]], cache: Dict[Tuple[str, Any], AXValue]
+) -> Optional[AXValue]:
+    """Parse an AXValue, reusing one instance per (type, value) when it has no sources.
+
+    Roles repeat on almost every node, so sharing them keeps the tree compact.
+    """
+    if not value_data or value_data.get("sources"):
+        return _parse_ax_value(value_data)
+
+    key = (value_data.get("type", "string"), value_data.get("value"))
+    try:
+        value = cache.get(key)
+    except TypeError:  # unhashable value
+        return _parse_ax_value(value_data)
+    if value is None:
+        value = cache[key] = _parse_ax_value(value_data)
+    return value
+
+
 def _parse_ax_property(prop_data: Dict[str, Any]) -> AXProperty:
     """Parse an AXProperty from CDP data."""
     return AXProperty(
@@ -40,12 +60,15 @@ def parse_cdp_accessibility(cdp_data: Dict[str, Any]) -> AXNode:
     # First pass: Create all AXNode objects (temporarily store CDP IDs)
     nodes_map: Dict[str, AXNode] = {}
     node_data_map: Dict[str, Dict[str, Any]] = {}
+    role_cache: Dict[Tuple[str, Any], AXValue] = {}
 
     for node_data in nodes_data:
         # Parse role, defaulting to "unknown" if missing
-        role = _parse_ax_value(node_data.get("role"))
+        role = _parse_shared_ax_value(node_data.get("role"), role_cache)
         if role is None or not role.value:
-            role = AXValue(type="role", value="unknown")
+            role = _parse_shared_ax_value(
+                {"type": "role", "value": "unknown"}, role_cache
+            )
 
         node = AXNode(
             node_id=node_data.get("nodeId", ""),
@@ -53,7 +76,7 @@ def parse_cdp_accessibility(cdp_data: Dict[str, Any]) -> AXNode:
             ignored=node_data.get("ignored", False),
             ignored_reasons=node_data.get("ignoredReasons", []),
             role=role,
-            chrome_role=_parse_ax_value(node_data.get("chromeRole")),
+            chrome_role=_parse_shared_ax_value(node_data.get("chromeRole"), role_cache),
             name=_parse_ax_value(node_data.get("name")),
             description=_parse_ax_value(node_data.get("description")),
             value=_parse_ax_value(node_data.get("value")),
@@ -1,11 +1,26 @@
 """AgentBrowser - browser interface for agent with page management and LLMDomContext."""
 
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 from webtask.browser import Page, Context, Element
 from webtask.llm.message import Content, ImageMimeType
 from .message import AgentText, AgentImage
-from ..context import LLMDomContext
-import base64
+from ..context import (
+    PARSE_MODES,
+    IncrementalContext,
+    LLMDomContext,
+    PageCapture,
+    RemoteDomContext,
+    build_dom_context_in,
+    capture_page,
+)
+from ..context.offload import build_dom_context
+from ..context.screenshot import ScreenshotOptions, ScreenshotPipeline
+from ..utils.logger import get_logger
+
+# Input types typed into as plain text (search fields often suggest)
+_TEXT_INPUT_TYPES = ("text", "email", "password", "tel", "url", "number")
+# Attributes of fields that open a popup (suggestions, pickers) when used
+_POPUP_ATTRIBUTES = ("aria-haspopup", "aria-expanded", "aria-autocomplete", "list")
 
 
 class AgentBrowser:
@@ -16,13 +31,30 @@ class AgentBrowser:
         context: Optional[Context] = None,
         mode: str = "accessibility",
         coordinate_scale: Optional[int] = None,
+        incremental: bool = False,
+        viewport_window: bool = False,
+        screenshot_options: Optional[ScreenshotOptions] = None,
+        parse_in: str = "inline",
     ):
         self._context = context
         self._mode = mode
         self._coordinate_scale = coordinate_scale
+        self._incremental = incremental
+        self._incremental_contexts: Dict[Page, IncrementalContext] = {}
+        self._reuse_stats: Optional[Dict[str, int]] = None
+        self._viewport_window = viewport_window
+        self._screenshot_pipeline: Optional[ScreenshotPipeline] = None
+        self._screenshot_page: Optional[Page] = None
+        # Size of the last sent screenshot if it was downscaled (for coordinates)
+        self._screenshot_size: Optional[Tuple[int, int]] = None
+        self._screenshot_stats: Optional[Dict[str, int]] = None
+        self.set_screenshot_options(screenshot_options)
         self._pages: List[Page] = []
         self._current_page_index: Optional[int] = None
-        self._dom_context: Optional[LLMDomContext] = None
+        self._dom_context: Optional[Union[LLMDomContext, RemoteDomContext]] = None
+        self.set_parse_in(parse_in)
+        self._capture_timings: Dict[str, float] = {}
+        self._logger = get_logger(__name__)
 
     # Setters
 
@@ -38,6 +70,47 @@ class AgentBrowser:
         """Set coordinate scale for pixel-based tools."""
         self._coordinate_scale = scale
 
+    def set_incremental(self, incremental: bool) -> None:
+        """Enable or disable incremental context building.
+
+        When enabled, each page's context reuses the filtered subtrees and
+        serialized lines of its previous snapshot wherever nothing changed.
+        """
+        self._incremental = incremental
+        if not incremental:
+            self._incremental_contexts = {}
+
+    def set_viewport_window(self, viewport_window: bool) -> None:
+        """Enable or disable viewport-windowed context.
+
+        When enabled, the DOM context only includes elements inside or near
+        the viewport, plus a one-line summary of what lies above and below.
+        """
+        self._viewport_window = viewport_window
+
+    def set_parse_in(self, parse_in: str) -> None:
+        """Set where page context is parsed, filtered and serialized.
+
+        "inline" builds it on the event loop. "thread" and "process" build it
+        in a pool shared by all agents, so a slow parse doesn't hold up other
+        agents' browser I/O and LLM calls. Incremental reuse doesn't apply
+        to builds in a process.
+        """
+        if parse_in not in PARSE_MODES:
+            raise ValueError(
+                f"Invalid parse_in '{parse_in}'. Must be one of: {PARSE_MODES}"
+            )
+        self._parse_in = parse_in
+
+    def set_screenshot_options(self, options: Optional[ScreenshotOptions]) -> None:
+        """Set how screenshots are downscaled, encoded and deduplicated.
+
+        None sends the captured PNG as is.
+        """
+        self._screenshot_pipeline = ScreenshotPipeline(options) if options else None
+        self._screenshot_page = None
+        self._screenshot_size = None
+
     # Getters
 
     def has_current_page(self) -> bool:
@@ -62,6 +135,18 @@ class AgentBrowser:
             return "about:blank"
         return self.get_current_page().url
 
+    def get_capture_timings(self) -> Dict[str, float]:
+        """Get per-capture timings (seconds) from the last page context build."""
+        return dict(self._capture_timings)
+
+    def get_reuse_stats(self) -> Optional[Dict[str, int]]:
+        """Get nodes reused vs. rebuilt by the last context build (incremental mode)."""
+        return dict(self._reuse_stats) if self._reuse_stats is not None else None
+
+    def get_screenshot_stats(self) -> Optional[Dict[str, int]]:
+        """Bytes captured vs. sent for the last screenshot (sent is 0 if skipped)."""
+        return dict(self._screenshot_stats) if self._screenshot_stats else None
+
     def get_viewport_size(self) -> Tuple[int, int]:
         """Get current page viewport size as (width, height)."""
         page = self.get_current_page()
@@ -119,20 +204,15 @@ class AgentBrowser:
         content: List[Content] = []
         tabs_context = self._get_tabs_context()
         content.append(AgentText(text=tabs_context, lifespan=1))
+        capture = await self._capture(include_dom, include_screenshot)
         if include_dom:
-            dom_snapshot = await self._get_dom_snapshot()
+            dom_snapshot = await self._build_dom_snapshot(capture)
             if dom_snapshot:
                 content.append(AgentText(text=dom_snapshot, lifespan=1))
         if include_screenshot:
-            screenshot_b64 = await self._get_screenshot()
-            if screenshot_b64:
-                content.append(
-                    AgentImage(
-                        data=screenshot_b64,
-                        mime_type=ImageMimeType.PNG,
-                        lifespan=2,
-                    )
-                )
+            screenshot = self._get_screenshot(capture)
+            if screenshot is not None:
+                content.append(screenshot)
         return content
 
     async def screenshot(
@@ -146,8 +226,12 @@ class AgentBrowser:
 
     # Element resolution
 
-    async def select(self, id: str) -> Element:
-        """Select element by ID, returns Element for direct interaction."""
+    async def select(self, id: str, keep: bool = False) -> Element:
+        """Select element by ID, returns Element for direct interaction.
+
+        Elements are only good until the next snapshot unless kept (e.g. to
+        hand them to the user).
+        """
         page = self.get_current_page()
         if page is None:
             raise RuntimeError("No page is currently open")
@@ -156,15 +240,53 @@ class AgentBrowser:
         dom_node = self._dom_context.get_dom_node(id)
         if dom_node is None:
             raise KeyError(f"Element ID '{id}' not found")
+        # Resolve the snapshot node directly; re-query by XPath only if it is gone
+        if dom_node.backend_dom_node_id is not None:
+            element = await page.select_by_backend_node_id(
+                dom_node.backend_dom_node_id, keep=keep
+            )
+            if element is not None:
+                return element
+            self._logger.debug(
+                f"Backend node {dom_node.backend_dom_node_id} for '{id}' is gone, "
+                "falling back to XPath"
+            )
         xpath = dom_node.get_x_path()
         return await page.select_one(xpath)
 
+    def is_plain_text_field(self, id: str) -> bool:
+        """Whether id is a text input or textarea of the current snapshot that
+        doesn't pop anything up (e.g. suggestions) as it is typed into."""
+        if self._dom_context is None:
+            return False
+        dom_node = self._dom_context.get_dom_node(id)
+        # Contexts built in a process don't carry attributes
+        attrib = getattr(dom_node, "attrib", None)
+        if attrib is None:
+            return False
+        if any(key in attrib for key in _POPUP_ATTRIBUTES):
+            return False
+        if attrib.get("role") in ("combobox", "searchbox"):
+            return False
+        if dom_node.tag == "textarea":
+            return True
+        return (
+            dom_node.tag == "input" and attrib.get("type", "text") in _TEXT_INPUT_TYPES
+        )
+
     # Coordinate scaling
 
     def scale_coordinates(self, x: int, y: int) -> Tuple[int, int]:
-        """Scale normalized coordinates to actual pixels."""
+        """Scale normalized or screenshot coordinates to actual pixels."""
         if not self._coordinate_scale:
-            return x, y
+            if self._screenshot_size is None:
+                return x, y
+            # Coordinates refer to the downscaled screenshot
+            viewport = self.get_viewport_size()
+            return (
+                int(x * viewport[0] / self._screenshot_size[0]),
+                int(y * viewport[1] / self._screenshot_size[1]),
+            )
         viewport = self.get_viewport_size()
         return (
             int(x / self._coordinate_scale * viewport[0]),
@@ -208,23 +330,136 @@ class AgentBrowser:
             lines.append(f"- [{idx}] {url}{current_marker}")
         return "\n".join(lines)
 
-    async def _get_screenshot(self, full_page: bool = False) -> Optional[str]:
-        """Get screenshot as base64 string, or None if no page is open."""
+    async def _capture(
+        self, include_dom: bool, include_screenshot: bool
+    ) -> Optional[PageCapture]:
+        """Capture what the current mode needs (and a screenshot) concurrently.
+
+        Returns None if no page is open.
+        """
         if not self.has_current_page():
             return None
-        screenshot_bytes = await self.screenshot(full_page=full_page)
-        return base64.b64encode(screenshot_bytes).decode("utf-8")
+        if not include_dom and not include_screenshot:
+            return None
+        capture = await capture_page(
+            self.get_current_page(),
+            dom_snapshot=include_dom,
+            # DOM mode never reads the accessibility tree
+            accessibility_tree=include_dom and self._mode != "dom",
+            screenshot=include_screenshot,
+        )
+        self._capture_timings = capture.timings
+        self._logger.debug(f"Page capture - {capture.format_timings()}")
+        return capture
 
-    async def _get_dom_snapshot(self) -> Optional[str]:
-        """Get DOM snapshot with interactive elements, or None if no page is open."""
-        if not self.has_current_page():
+    def _get_screenshot(self, capture: Optional[PageCapture]) -> Optional[Content]:
+        """Get screenshot content, or None if no page is open.
+
+        With screenshot options, the capture is downscaled and re-encoded, and
+        a duplicate of the previous screenshot is replaced by a short note.
+        """
+        if capture is None or capture.screenshot is None:
             return None
+        png = capture.screenshot
+        if self._screenshot_pipeline is None:
+            self._screenshot_stats = {"source_bytes": len(png), "sent_bytes": len(png)}
+            return AgentImage(
+                data=png,
+                mime_type=ImageMimeType.PNG,
+                lifespan=2,
+            )
+
+        # Dedup compares against the previous screenshot of the same page
         page = self.get_current_page()
-        self._dom_context = await LLMDomContext.from_page(page)
+        if page is not self._screenshot_page:
+            self._screenshot_pipeline.reset()
+            self._screenshot_page = page
+        shot = self._screenshot_pipeline.process(png)
+        self._screenshot_size = shot.size if shot.size != shot.source_size else None
+        self._screenshot_stats = {
+            "source_bytes": shot.source_bytes,
+            "sent_bytes": len(shot.data),
+        }
+        if shot.duplicate:
+            self._logger.debug("Screenshot - unchanged since the previous one, skipped")
+            return AgentText(
+                text="Screenshot: unchanged since the previous step (not resent)",
+                lifespan=1,
+            )
+        self._logger.debug(
+            f"Screenshot - sent {len(shot.data)} of {shot.source_bytes} bytes "
+            f"({shot.size[0]}x{shot.size[1]} {shot.mime_type.value})"
+        )
+        return AgentImage(
+            data=shot.data,
+            mime_type=shot.mime_type,
+            lifespan=2,
+        )
+
+    async def _build_dom_snapshot(
+        self, capture: Optional[PageCapture]
+    ) -> Optional[str]:
+        """Like _get_dom_snapshot, but builds the context where parse_in says."""
+        if self._parse_in == "inline":
+            return self._get_dom_snapshot(capture)
+        if capture is None or capture.dom_snapshot is None:
+            return None
+        self._dom_context = await build_dom_context_in(
+            self._parse_in,
+            capture,
+            self._mode,
+            incremental=(
+                self._get_incremental_context() if self._parse_in == "thread" else None
+            ),
+            viewport_height=self._get_viewport_height(),
+        )
+        return self._format_dom_snapshot()
+
+    def _get_dom_snapshot(self, capture: Optional[PageCapture]) -> Optional[str]:
+        """Get DOM snapshot with interactive elements, or None if no page is open."""
+        if capture is None or capture.dom_snapshot is None:
+            return None
+        self._dom_context = build_dom_context(
+            capture,
+            self._mode,
+            incremental=self._get_incremental_context(),
+            viewport_height=self._get_viewport_height(),
+        )
+        return self._format_dom_snapshot()
+
+    def _get_viewport_height(self) -> Optional[float]:
+        """Viewport height to window the context to, or None without a window."""
+        if not self._viewport_window:
+            return None
+        return self.get_current_page().viewport_size()[1]
+
+    def _format_dom_snapshot(self) -> str:
+        """Frame the built context for the LLM and record its reuse stats."""
         context_str = self._dom_context.get_context(mode=self._mode)
+        self._reuse_stats = self._dom_context.get_reuse_stats()
+        if self._reuse_stats is not None:
+            self._logger.debug(
+                f"Context reuse - reused={self._reuse_stats['reused']}, "
+                f"rebuilt={self._reuse_stats['rebuilt']}"
+            )
         lines = ["Current Tab:"]
         if not context_str:
             lines.append("(no interactive elements found)")
         else:
             lines.append(context_str)
         return "\n".join(lines)
+
+    def _get_incremental_context(self) -> Optional[IncrementalContext]:
+        """Get the current page's incremental state, or None if disabled."""
+        if not self._incremental:
+            return None
+        # Drop state of pages that are no longer open
+        self._incremental_contexts = {
+            page: state
+            for page, state in self._incremental_contexts.items()
+            if page in self._pages
+        }
+        page = self.get_current_page()
+        if page not in self._incremental_contexts:
+            self._incremental_contexts[page] = IncrementalContext()
+        return self._incremental_contexts[page]
@@ -1,6 +1,6 @@
 """Selector - natural language element selection using LLM."""
 
-from typing import List
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from webtask.llm import LLM
 from webtask.llm.message import Content
@@ -33,16 +33,23 @@ class Selector:
         await element.click()
     """
 
-    def __init__(self, llm: LLM, browser: AgentBrowser):
+    def __init__(
+        self,
+        llm: LLM,
+        browser: AgentBrowser,
+        max_context_tokens: Optional[int] = None,
+    ):
         """
         Initialize selector.
 
         Args:
             llm: LLM instance for element identification
             browser: AgentBrowser for DOM context and element resolution
+            max_context_tokens: Trim every prompt to this many tokens (None: no limit)
         """
         self.llm = llm
         self.browser = browser
+        self.max_context_tokens = max_context_tokens
 
     async def select(self, description: str, max_steps: int = 5) -> Element:
         """
@@ -75,6 +82,7 @@ class Selector:
             tools=[],  # No tools needed - just identify
             get_context=get_context,
             system_prompt=build_worker_prompt(),
+            max_context_tokens=self.max_context_tokens,
         )
 
         task = f"Identify the element that matches: {description}"
@@ -94,4 +102,5 @@ class Selector:
             raise TaskAbortedError(f"Could not identify element: {description}")
 
         element_id = run.result.output.element_id
-        return await self.browser.select(element_id)
+        # Handed to the caller, so it must outlive later snapshots
+        return await self.browser.select(element_id, keep=True)
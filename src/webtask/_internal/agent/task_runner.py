@@ -1,6 +1,7 @@
 """TaskRunner - executes one task with conversation-based LLM."""
 
 from collections import defaultdict
+from contextlib import aclosing
 from typing import Awaitable, Callable, List, Optional, Tuple, TYPE_CHECKING, Type
 from pydantic import BaseModel
 from webtask.llm import (
@@ -8,10 +9,15 @@ from webtask.llm import (
     Role,
     Content,
     Text,
+    CachePoint,
+    ToolCall,
+    ToolResult,
 )
 from webtask.llm.tool import Tool
 from .message import AgentContent, AgentText
-from .tool_registry import ToolRegistry
+from .token_budget import TokenBudget
+from .tool_registry import ToolCallBatch, ToolRegistry
+from ..llm.conversion_cache import conversion_scope
 from ..utils.logger import get_logger
 from .run import Run, TaskResult, TaskStatus
 from .tools import CompleteWorkTool, AbortWorkTool
@@ -36,6 +42,7 @@ class TaskRunner:
         tools: List[Tool],
         get_context: Callable[[], Awaitable[List[AgentContent]]],
         system_prompt: str,
+        max_context_tokens: Optional[int] = None,
     ):
         """Initialize TaskRunner.
 
@@ -44,11 +51,15 @@ class TaskRunner:
             tools: List of browser tools (click, fill, goto, etc.)
             get_context: Async callback that returns page context as AgentContent list
             system_prompt: System prompt to use for the LLM
+            max_context_tokens: Trim every prompt to this many tokens (None: no limit)
         """
         self._llm = llm
         self._tools = tools
         self._get_context = get_context
         self._system_prompt = system_prompt
+        self._token_budget = (
+            TokenBudget(max_context_tokens) if max_context_tokens is not None else None
+        )
         self._logger = get_logger(__name__)
 
     async def run(
@@ -71,46 +82,37 @@ class TaskRunner:
         self._logger.info(f"Task start - Task: {task}")
 
         pairs: List[MessagePair] = []
-        for step in range(max_steps):
-            self._logger.info(f"Step {step + 1} - Start")
-
-            all_messages = self._prepare_messages(session_start_messages, pairs)
-
-            self._logger.debug("Sending LLM request...")
-            model_msg = await self._llm.call_tools(
-                messages=all_messages,
-                tools=tool_registry.get_all(),
-            )
+        # Converted messages are reused across the LLM calls of this run only
+        with conversion_scope():
+            for step in range(max_steps):
+                self._logger.info(f"Step {step + 1} - Start")
 
-            reasoning = model_msg.text
-            tool_calls = model_msg.tool_calls
-            tool_names = [tc.name for tc in tool_calls]
+                all_messages = self._prepare_messages(session_start_messages, pairs)
 
-            self._logger.info(f"Received LLM response - Tools: {tool_names}")
-            if reasoning:
-                self._logger.info(f"Reasoning: {reasoning}")
-
-            tool_results = await tool_registry.execute_tool_calls(tool_calls)
+                self._logger.debug("Sending LLM request...")
+                model_msg, tool_results = await self._call_and_execute(
+                    all_messages, tool_registry
+                )
 
-            # Get page context after tool execution
-            page_context = await self._get_context()
+                # Get page context after tool execution
+                page_context = await self._get_context()
 
-            # Build tool result message content: results + page context
-            tool_msg_content: List[Content] = list(tool_results) + list(page_context)
-            tool_result_msg = Message(role=Role.TOOL, content=tool_msg_content)
-            pairs.append((model_msg, tool_result_msg))
+                # Build tool result message content: results + page context
+                tool_msg_content: List[Content] = [*tool_results, *page_context]
+                tool_result_msg = Message(role=Role.TOOL, content=tool_msg_content)
+                pairs.append((model_msg, tool_result_msg))
 
-            self._logger.info(f"Step {step + 1} - End")
+                self._logger.info(f"Step {step + 1} - End")
 
-            # Check if control tool ended execution
-            if result.status:
-                steps_used = step + 1
-                break
-        else:
-            self._logger.info("Task end - Reason: max_steps_reached")
-            result.status = TaskStatus.ABORTED
-            result.feedback = "Reached maximum steps"
-            steps_used = max_steps
+                # Check if control tool ended execution
+                if result.status:
+                    steps_used = step + 1
+                    break
+            else:
+                self._logger.info("Task end - Reason: max_steps_reached")
+                result.status = TaskStatus.ABORTED
+                result.feedback = "Reached maximum steps"
+                steps_used = max_steps
 
         self._logger.info(f"Task end - Status: {result.status.value}")
 
@@ -152,6 +154,51 @@ class TaskRunner:
 
         return tool_registry
 
+    async def _call_and_execute(
+        self, messages: List[Message], tool_registry: ToolRegistry
+    ) -> Tuple[Message, List[ToolResult]]:
+        """Stream the LLM response and run each tool call as soon as it is complete.
+
+        Tool calls run one at a time in response order, with the waits after
+        consecutive fills merged (see ToolCallBatch). After a failed or
+        terminal one, the rest are skipped, as in execute_tool_calls.
+
+        If the stream fails after tool calls have run, their actions already
+        happened on the page, so the response up to the failure is returned
+        with their results instead of raising (a retried step would repeat
+        them). The stream is closed however the loop is left.
+        """
+        content: List[Content] = []
+        tool_results: List[ToolResult] = []
+        batch = ToolCallBatch(tool_registry)
+        try:
+            async with aclosing(
+                self._llm.stream_tools(messages=messages, tools=tool_registry.get_all())
+            ) as stream:
+                async for item in stream:
+                    content.append(item)
+                    if not isinstance(item, ToolCall):
+                        continue
+                    if not tool_results:
+                        self._logger.info(f"First tool call received - {item.name}")
+                    tool_results.append(await batch.run(item))
+        except Exception as e:
+            if not tool_results:
+                raise
+            self._logger.warning(
+                f"LLM stream failed after {len(tool_results)} tool calls - "
+                f"{type(e).__name__}: {e}; keeping the partial response"
+            )
+        await batch.finish()
+
+        model_msg = Message(role=Role.MODEL, content=content or None)
+        if model_msg.text:
+            self._logger.info(f"Reasoning: {model_msg.text}")
+        self._logger.info(
+            f"Received LLM response - Tools: {[tc.name for tc in model_msg.tool_calls]}"
+        )
+        return model_msg, tool_results
+
     async def _build_session_start_messages(
         self,
         task: str,
@@ -166,6 +213,9 @@ class TaskRunner:
 
         user_content.append(AgentText(text=f"## Current task:\n{task}"))
 
+        # Everything up to here is the same on every step of the run
+        user_content.append(CachePoint())
+
         # Add context (page state + files) via get_context callback
         context = await self._get_context()
         user_content.extend(context)
@@ -200,7 +250,12 @@ class TaskRunner:
         all_messages = session_start_messages + tool_messages
 
         # Purge old content based on lifespan values
-        return self._purge_by_lifespan(all_messages)
+        messages = self._purge_by_lifespan(all_messages)
+
+        # Trim what is left to the token budget, if any
+        if self._token_budget is not None:
+            messages = self._token_budget.fit(messages)
+        return messages
 
     def _purge_by_lifespan(self, messages: List[Message]) -> List[Message]:
         """Purge old content from message history based on lifespan values.
@@ -0,0 +1,217 @@
+"""TokenBudget - keeps the prompt under a token limit by trimming it in priority order."""
+
+import json
+from typing import Dict, List, Optional, Tuple
+from webtask.llm import Message, Content, Text, Image, ToolCall, ToolResult
+from .message import AgentContent, AgentText
+from ..utils.logger import get_logger
+from ..utils.token_count import count_tokens
+
+# Rough cost of one screenshot (providers charge ~250-1600 tokens per image)
+IMAGE_TOKENS = 1000
+
+TEXT_LINE = "text"
+ELEMENT_LINE = "element"
+
+
+def _is_page_context(content: Content) -> bool:
+    """Page context is the content that expires (has a lifespan)."""
+    return isinstance(content, AgentContent) and content.lifespan is not None
+
+
+def _line_kind(line: str) -> Optional[str]:
+    """TEXT_LINE or ELEMENT_LINE for serialized page lines, None for the rest."""
+    stripped = line.lstrip()
+    if stripped.startswith('- "'):
+        return TEXT_LINE
+    if stripped.startswith("- ["):
+        return ELEMENT_LINE
+    return None
+
+
+def trim_page_lines(text: str, excess: int) -> Tuple[str, Dict[str, int]]:
+    """Drop lines of a page context until it is about excess tokens smaller.
+
+    Text lines go first, then element lines, each from the bottom of the page
+    up. Other lines (headers, markers, summaries) are kept, and a marker
+    replaces the dropped lines.
+
+    Returns:
+        Trimmed text, and the number of dropped lines per kind
+    """
+    lines = text.split("\n")
+    kinds = [_line_kind(line) for line in lines]
+    dropped = set()
+    dropped_counts = {TEXT_LINE: 0, ELEMENT_LINE: 0}
+    saved = 0
+    for kind in (TEXT_LINE, ELEMENT_LINE):
+        for index in range(len(lines) - 1, -1, -1):
+            if saved >= excess:
+                break
+            if kinds[index] == kind:
+                dropped.add(index)
+                dropped_counts[kind] += 1
+                # +1 for the newline
+                saved += count_tokens(lines[index]) + 1
+
+    if not dropped:
+        return text, dropped_counts
+    marker = (
+        f"[TRUNCATED: {dropped_counts[ELEMENT_LINE]} elements and "
+        f"{dropped_counts[TEXT_LINE]} text lines omitted to fit the context budget]"
+    )
+    first = min(dropped)
+    kept = []
+    for index, line in enumerate(lines):
+        if index not in dropped:
+            kept.append(line)
+        elif index == first:
+            kept.append(marker)
+    return "\n".join(kept), dropped_counts
+
+
+class TokenBudget:
+    """Trims a prompt to at most max_tokens, lowest-priority content first.
+
+    Trimming order:
+    1. Page context of older messages, oldest first
+    2. Text lines of the latest page context, from the bottom
+    3. Element lines of the latest page context, from the bottom
+
+    Content without a lifespan (system prompt, task, previous runs, tool calls
+    and results) is never trimmed. Messages are copied, never modified.
+    """
+
+    def __init__(self, max_tokens: int):
+        self.max_tokens = max_tokens
+        # id(content) -> (content, tokens); content is kept so ids aren't reused
+        self._counts: Dict[int, Tuple[Content, int]] = {}
+        self._logger = get_logger(__name__)
+
+    def count(self, content: Content) -> int:
+        """Tokens of one content item (memoized, content is immutable in history)."""
+        cached = self._counts.get(id(content))
+        if cached is not None and cached[0] is content:
+            return cached[1]
+        if isinstance(content, Text):
+            tokens = count_tokens(content.text)
+        elif isinstance(content, Image):
+            tokens = IMAGE_TOKENS
+        elif isinstance(content, ToolCall):
+            tokens = count_tokens(
+                f"{content.name} {json.dumps(content.arguments, default=str)}"
+            )
+        elif isinstance(content, ToolResult):
+            tokens = count_tokens(
+                f"{content.name} {content.status.value} {content.description} "
+                f"{content.error or ''}"
+            )
+        else:
+            tokens = 0
+        self._counts[id(content)] = (content, tokens)
+        return tokens
+
+    def count_messages(self, messages: List[Message]) -> int:
+        """Tokens of a whole prompt, keeping memoized counts only for its content.
+
+        Content that has left the prompt (e.g. expired screenshots) is
+        forgotten, so the counts don't pin it for the rest of the run.
+        """
+        previous, self._counts = self._counts, {}
+        total = 0
+        for msg in messages:
+            for content in msg.content or []:
+                cached = previous.get(id(content))
+                if cached is not None and cached[0] is content:
+                    self._counts[id(content)] = cached
+                    total += cached[1]
+                else:
+                    total += self.count(content)
+        return total
+
+    def fit(self, messages: List[Message]) -> List[Message]:
+        """Return the messages trimmed to the budget, logging what was trimmed."""
+        total = self.count_messages(messages)
+        if total <= self.max_tokens:
+            self._logger.debug(
+                f"Token budget - {total}/{self.max_tokens} tokens, nothing trimmed"
+            )
+            return messages
+
+        budget = f"{total} > {self.max_tokens} tokens"
+        contents = [list(msg.content or []) for msg in messages]
+        changed = set()
+        latest = max(
+            (
+                i
+                for i, items in enumerate(contents)
+                if any(map(_is_page_context, items))
+            ),
+            default=len(contents),
+        )
+        decisions = []
+
+        # 1. Older page context, oldest first
+        dropped, dropped_tokens = 0, 0
+        for index, items in enumerate(contents[:latest]):
+            kept = []
+            for item in items:
+                if total > self.max_tokens and _is_page_context(item):
+                    dropped += 1
+                    dropped_tokens += self.count(item)
+                    total -= self.count(item)
+                else:
+                    kept.append(item)
+            if len(kept) < len(items):
+                contents[index] = kept
+                changed.add(index)
+        if dropped:
+            decisions.append(
+                f"dropped {dropped} older page context items (-{dropped_tokens})"
+            )
+
+        # 2./3. Lines of the latest page context, largest content first
+        if total > self.max_tokens and latest < len(contents):
+            items = contents[latest]
+            page_texts = sorted(
+                (
+                    i
+                    for i, c in enumerate(items)
+                    if isinstance(c, AgentText) and _is_page_context(c)
+                ),
+                key=lambda i: -self.count(items[i]),
+            )
+            for index in page_texts:
+                if total <= self.max_tokens:
+                    break
+                item = items[index]
+                text, counts = trim_page_lines(item.text, total - self.max_tokens)
+                if text == item.text:
+                    continue
+                saved = self.count(item) - count_tokens(text)
+                items[index] = AgentText(text=text, lifespan=item.lifespan)
+                changed.add(latest)
+                total -= saved
+                decisions.append(
+                    f"trimmed latest page context (-{saved}: "
+                    f"{counts[TEXT_LINE]} text lines, "
+                    f"{counts[ELEMENT_LINE]} element lines)"
+                )
+
+        summary = "; ".join(decisions) or "nothing trimmable"
+        if total > self.max_tokens:
+            self._logger.warning(
+                f"Token budget - {budget}: {summary}; still {total} tokens "
+                f"(content without a lifespan is never trimmed)"
+            )
+        else:
+            self._logger.info(f"Token budget - {budget}: {summary}; now {total} tokens")
+
+        return [
+            (
+                msg.model_copy(update={"content": contents[i] or None})
+                if i in changed
+                else msg
+            )
+            for i, msg in enumerate(messages)
+        ]
@@ -3,7 +3,8 @@
 import logging
 from typing import Dict, List
 from webtask.llm.tool import Tool
-from webtask.llm.message import ToolResult, ToolResultStatus
+from webtask.llm.message import ToolCall, ToolResult, ToolResultStatus
+from webtask._internal.utils.wait import WaitBatch, defer_waits
 
 
 class ToolRegistry:
@@ -35,78 +36,124 @@ class ToolRegistry:
 
     async def execute_tool_calls(self, tool_calls: List) -> List[ToolResult]:
         """Execute multiple tool calls in batch, stopping early if any tool fails or is terminal."""
-        results = []
-        executed_count = 0
+        # Skipped results for calls after a stop are required for Bedrock compatibility
+        batch = ToolCallBatch(self)
+        results = [await batch.run(tool_call) for tool_call in tool_calls]
+        await batch.finish()
+        return results
 
-        for idx, tool_call in enumerate(tool_calls):
+    async def execute_tool_call(self, tool_call: ToolCall) -> ToolResult:
+        """Execute one tool call. Errors are returned as ERROR results, never raised."""
+        try:
+            # Get tool - catch KeyError separately for clearer error message
             try:
-                # Get tool - catch KeyError separately for clearer error message
-                try:
-                    tool = self.get(tool_call.name)
-                except KeyError:
-                    error_msg = f"Tool '{tool_call.name}' not found in registry"
-                    self._logger.error(error_msg)
-                    result = ToolResult(
-                        tool_call_id=tool_call.id,
-                        name=tool_call.name,
-                        status=ToolResultStatus.ERROR,
-                        error=error_msg,
-                        description=f"{tool_call.name} (ERROR: Tool not found)",
-                    )
-                    results.append(result)
-                    executed_count = idx + 1
-                    break  # Stop on tool not found
-
-                # Validate parameters
-                params = tool.Params(**tool_call.arguments)
-
-                # Log tool execution start
-                self._logger.info(
-                    f"Executing tool: {tool_call.name} with params: {tool_call.arguments}"
-                )
-
-                # Execute tool and get result
-                result = await tool.execute(params)
-                result.tool_call_id = tool_call.id
-                results.append(result)
-                executed_count = idx + 1
-
-                # Log tool execution success
-                self._logger.info(f"Tool executed successfully: {result.description}")
-
-                # If terminal tool succeeded or error occurred, stop execution
-                if result.terminal or result.status == ToolResultStatus.ERROR:
-                    break
-
-            except Exception as e:
-                # Params validation or tool execution error
-                error_msg = str(e)
-                self._logger.error(
-                    f"Tool execution failed: {tool_call.name} - {error_msg}"
-                )
-                result = ToolResult(
+                tool = self.get(tool_call.name)
+            except KeyError:
+                error_msg = f"Tool '{tool_call.name}' not found in registry"
+                self._logger.error(error_msg)
+                return ToolResult(
                     tool_call_id=tool_call.id,
                     name=tool_call.name,
                     status=ToolResultStatus.ERROR,
                     error=error_msg,
-                    description=f"{tool_call.name} (ERROR: {error_msg})",
+                    description=f"{tool_call.name} (ERROR: Tool not found)",
                 )
-                results.append(result)
-                executed_count = idx + 1
-                break  # Stop on any error
 
-        # Create skipped results for remaining tool calls (required for Bedrock compatibility)
-        for tool_call in tool_calls[executed_count:]:
-            result = ToolResult(
+            # Validate parameters
+            params = tool.Params(**tool_call.arguments)
+
+            # Log tool execution start
+            self._logger.info(
+                f"Executing tool: {tool_call.name} with params: {tool_call.arguments}"
+            )
+
+            # Execute tool and get result
+            result = await tool.execute(params)
+            result.tool_call_id = tool_call.id
+
+            # Log tool execution success
+            self._logger.info(f"Tool executed successfully: {result.description}")
+            return result
+
+        except Exception as e:
+            # Params validation or tool execution error
+            error_msg = str(e)
+            self._logger.error(f"Tool execution failed: {tool_call.name} - {error_msg}")
+            return ToolResult(
                 tool_call_id=tool_call.id,
                 name=tool_call.name,
                 status=ToolResultStatus.ERROR,
-                error="Skipped due to previous tool failure or terminal action",
-                description=f"{tool_call.name} (SKIPPED)",
-            )
-            results.append(result)
-            self._logger.info(
-                f"Tool skipped: {tool_call.name} (previous tool failed or terminal)"
+                error=error_msg,
+                description=f"{tool_call.name} (ERROR: {error_msg})",
             )
 
-        return results
+    @staticmethod
+    def stops(result: ToolResult) -> bool:
+        """Whether no further tool calls run after this result (terminal or error)."""
+        return result.terminal or result.status == ToolResultStatus.ERROR
+
+    def skip_tool_call(self, tool_call: ToolCall) -> ToolResult:
+        """Result for a tool call not run because an earlier one stopped execution."""
+        self._logger.info(
+            f"Tool skipped: {tool_call.name} (previous tool failed or terminal)"
+        )
+        return ToolResult(
+            tool_call_id=tool_call.id,
+            name=tool_call.name,
+            status=ToolResultStatus.ERROR,
+            error="Skipped due to previous tool failure or terminal action",
+            description=f"{tool_call.name} (SKIPPED)",
+        )
+
+
+class ToolCallBatch:
+    """Runs the tool calls of one step in order, merging their post-action waits.
+
+    Calls whose tool settles_in_batch run with their waits deferred. The page then
+    settles once, for the longest deferred wait, before the next tool that
+    isn't batched runs or when the batch finishes. So five fills
+    followed by a click wait once instead of five times, and the click still
+    sees a settled page.
+
+    After a failed or terminal call, later calls are skipped.
+    """
+
+    def __init__(self, registry: ToolRegistry):
+        self.registry = registry
+        self.stopped = False
+        self._waits = WaitBatch()
+        self._logger = logging.getLogger(__name__)
+
+    async def run(self, tool_call: ToolCall) -> ToolResult:
+        """Run one tool call, or skip it if an earlier one stopped the batch."""
+        if self.stopped:
+            return self.registry.skip_tool_call(tool_call)
+        if self._settles_in_batch(tool_call):
+            with defer_waits(self._waits):
+                result = await self.registry.execute_tool_call(tool_call)
+        else:
+            await self._settle()
+            result = await self.registry.execute_tool_call(tool_call)
+        self.stopped = self.registry.stops(result)
+        return result
+
+    def _settles_in_batch(self, tool_call: ToolCall) -> bool:
+        """Whether the call's tool allows merging its wait (False for calls
+        that will fail anyway, which execute_tool_call reports)."""
+        try:
+            tool = self.registry.get(tool_call.name)
+            return tool.settles_in_batch(tool.Params(**tool_call.arguments))
+        except Exception:
+            return False
+
+    async def finish(self) -> None:
+        """Wait out waits still deferred by the last tool calls."""
+        await self._settle()
+
+    async def _settle(self) -> None:
+        if self._waits.deferred > 1:
+            self._logger.debug(
+                f"Tool batch - merged {self._waits.deferred} waits into one "
+                f"{self._waits.pending}s settle"
+            )
+        await self._waits.settle()
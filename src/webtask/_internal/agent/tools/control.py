@@ -1,5 +1,6 @@
 """Control tools for task flow management."""
 
+from functools import lru_cache
 from typing import Any, Optional, Type, TYPE_CHECKING
 from pydantic import BaseModel, Field, create_model
 from webtask.llm.tool import Tool, ToolParams
@@ -41,21 +42,10 @@ class CompleteWorkTool(Tool):
         self.task_result = task_result
         self._TaskStatus = TaskStatus
 
-        # Dynamically create Params class if output_schema is provided
+        # Use a Params class with the output schema if one is provided
+        # This shadows the class-level Params attribute for this instance
         if output_schema:
-            # Inherit from base Params and only override the output field with the schema
-            # This shadows the class-level Params attribute for this instance
-            self.Params = create_model(  # type: ignore[misc]
-                "CompleteWorkParams",
-                __base__=CompleteWorkTool.Params,
-                output=(
-                    Optional[output_schema],
-                    Field(
-                        default=None,
-                        description="Structured output data matching the specified schema",
-                    ),
-                ),
-            )
+            self.Params = _complete_work_params(output_schema)  # type: ignore[misc]
         # Otherwise, the default class-level Params will be used
 
     async def execute(self, params: Params) -> ToolResult:
@@ -114,3 +104,24 @@ class AbortWorkTool(Tool):
             description=f"Aborted: {params.reason}",
             terminal=True,
         )
+
+
+@lru_cache(maxsize=64)
+def _complete_work_params(output_schema: Type[BaseModel]) -> Type[BaseModel]:
+    """CompleteWorkTool.Params with output typed as output_schema.
+
+    Created once per schema, so runs with the same schema share one Params
+    class (and its compiled tool declaration).
+    """
+    # Inherit from base Params and only override the output field with the schema
+    return create_model(
+        "CompleteWorkParams",
+        __base__=CompleteWorkTool.Params,
+        output=(
+            Optional[output_schema],
+            Field(
+                default=None,
+                description="Structured output data matching the specified schema",
+            ),
+        ),
+    )
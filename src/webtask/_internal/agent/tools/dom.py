@@ -69,6 +69,11 @@ class TypeTool(Tool):
         self.wait_after_action = wait_after_action
         self.typing_delay = typing_delay
 
+    def settles_in_batch(self, params: Params) -> bool:
+        """Typing into a plain text field of the snapshot changes nothing the
+        next call acts on, unlike e.g. an autocomplete input."""
+        return self.browser.is_plain_text_field(params.element_id)
+
     async def execute(self, params: Params) -> ToolResult:
         """Execute type into element (clicks to focus, then types)."""
         element = await self.browser.select(params.element_id)
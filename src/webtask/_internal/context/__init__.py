@@ -1,5 +1,21 @@
 """Context builders for LLM consumption."""
 
+from .incremental import IncrementalContext
 from .llm_dom_context import LLMDomContext
+from .offload import PARSE_MODES, RemoteDomContext, build_dom_context_in
+from .page_capture import PageCapture, capture_page
+from .screenshot import ScreenshotOptions, ScreenshotPipeline
+from .viewport_window import ViewportWindow
 
-__all__ = ["LLMDomContext"]
+__all__ = [
+    "IncrementalContext",
+    "LLMDomContext",
+    "PARSE_MODES",
+    "PageCapture",
+    "RemoteDomContext",
+    "ScreenshotOptions",
+    "ScreenshotPipeline",
+    "ViewportWindow",
+    "build_dom_context_in",
+    "capture_page",
+]
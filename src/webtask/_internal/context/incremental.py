@@ -0,0 +1,89 @@
+"""IncrementalContext - state carried between successive contexts of a page."""
+
+from typing import Any, Dict, Hashable, Optional, Tuple
+from ..dom import DomNode, Text
+from ..accessibility import AXNode
+from ..utils.subtree_memo import SubtreeMemo
+
+
+def _dom_key(node: Any) -> Optional[int]:
+    return node.backend_dom_node_id if isinstance(node, DomNode) else None
+
+
+def _dom_content(node: Any) -> Hashable:
+    """Everything the DOM filters and serializer read from a node (no children)."""
+    if type(node) is Text:
+        return node.content
+    data = node.data
+    bounds = data.bounds
+    # Flat tuple (cheaper to build and hash than nested ones); attribute and
+    # style items are (name, value) pairs, so bounds can't be confused with them
+    if bounds is None:
+        return (
+            data.tag,
+            data.backend_dom_node_id,
+            *data.attrib.items(),
+            None,
+            *data.styles.items(),
+        )
+    return (
+        data.tag,
+        data.backend_dom_node_id,
+        *data.attrib.items(),
+        None,
+        *data.styles.items(),
+        bounds.x,
+        bounds.y,
+        bounds.width,
+        bounds.height,
+    )
+
+
+def _ax_key(node: AXNode) -> str:
+    return node.node_id
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable form of a CDP value (lists and dicts become tuples)."""
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    return value
+
+
+def _ax_value(value: Any) -> Hashable:
+    return _freeze(value.value) if value is not None else None
+
+
+def _ax_content(node: AXNode) -> Hashable:
+    """Everything the accessibility filters and serializer read from a node."""
+    return (
+        node.node_id,
+        node.backend_dom_node_id,
+        node.ignored,
+        _ax_value(node.role),
+        _ax_value(node.chrome_role),
+        _ax_value(node.name),
+        _ax_value(node.description),
+        _ax_value(node.value),
+        tuple((prop.name, _ax_value(prop.value)) for prop in node.properties),
+    )
+
+
+class IncrementalContext:
+    """Reusable results from the previous snapshot of the same page.
+
+    Successive snapshots are diffed by subtree: nodes are matched by backend
+    node ID (AX node ID for the accessibility tree) and compared by a
+    fingerprint of their subtree. Unchanged subtrees reuse their previous
+    filtered output and serialized lines, so only changed regions are rebuilt.
+
+    Pass one instance to every LLMDomContext built for a page, in order.
+    """
+
+    def __init__(self):
+        self.dom_memo = SubtreeMemo(key=_dom_key, content=_dom_content)
+        self.ax_memo = SubtreeMemo(key=_ax_key, content=_ax_content)
+        # id(filtered node) -> (node, serialized line without its ID)
+        self.line_cache: Dict[int, Tuple[Any, str]] = {}
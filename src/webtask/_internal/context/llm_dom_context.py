@@ -1,12 +1,18 @@
 """LLMDomContext - builds LLM context with role_id/tag_id → DomNode lookup."""
 
-from typing import Dict, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 from ..dom import DomNode
+from ..dom.filters import filter_dom_tree
 from ..accessibility import AXNode
-from ..accessibility.filters import (
-    filter_ignored_nodes,
-    filter_duplicate_text,
-    filter_non_semantic_role,
+from ..accessibility.filters import filter_accessibility_tree
+from .incremental import IncrementalContext
+from .page_capture import PageCapture, capture_page
+from .viewport_window import (
+    ABOVE,
+    BELOW,
+    ViewportWindow,
+    WindowSplit,
+    split_by_window,
 )
 
 if TYPE_CHECKING:
@@ -14,32 +20,125 @@ if TYPE_CHECKING:
 
 
 class LLMDomContext:
-    """Builds LLM context from DOM and accessibility trees."""
+    """Builds LLM context from DOM and accessibility trees.
+
+    Everything is lazy and per mode: trees are parsed from the captured CDP
+    data on first use, each mode's context is built once, and element IDs
+    are resolved to DOM nodes only when one is first looked up.
+
+    With a window, only elements inside or near the viewport are serialized;
+    what lies above and below is summarized in one line each. Element IDs
+    are still assigned over the whole page, so they stay stable on scroll.
+    """
 
     END_OF_PAGE_MARKER = "[END OF PAGE]"
+    MODES = ("accessibility", "dom")
 
     def __init__(
-        self, dom_root: DomNode, ax_root: AXNode, include_element_ids: bool = True
+        self,
+        dom_root: Optional[DomNode] = None,
+        ax_root: Optional[AXNode] = None,
+        include_element_ids: bool = True,
+        incremental: Optional[IncrementalContext] = None,
+        window: Optional[ViewportWindow] = None,
     ):
-        self.dom_root = dom_root
-        self.ax_root = ax_root
+        self._dom_root = dom_root
+        self._ax_root = ax_root
         self.include_element_ids = include_element_ids
-        self._context_str: Optional[str] = None
-        self._element_map: Optional[Dict[str, DomNode]] = None
+        self.incremental = incremental
+        self.window = window
+        # Raw CDP data, parsed into the trees above on first use
+        self._dom_snapshot: Optional[Dict[str, Any]] = None
+        self._ax_tree: Optional[Dict[str, Any]] = None
+        # Per mode: context string, element ID -> filtered node, and
+        # element ID -> DOM node (resolved on first lookup)
+        self._context_strs: Dict[str, str] = {}
+        self._id_maps: Dict[str, Dict[str, Any]] = {}
+        self._element_maps: Dict[str, Dict[str, DomNode]] = {}
+        self._last_mode: Optional[str] = None
+        self._dom_map: Optional[Dict[int, DomNode]] = None
+        self._reuse_stats: Optional[Dict[str, int]] = None
 
     @classmethod
     async def from_page(
-        cls, page: "Page", include_element_ids: bool = True
+        cls,
+        page: "Page",
+        include_element_ids: bool = True,
+        incremental: Optional[IncrementalContext] = None,
+        mode: Optional[str] = None,
+        viewport_window: bool = False,
     ) -> "LLMDomContext":
-        """Create LLMDomContext from page."""
-        dom_root = DomNode.from_cdp(await page.get_cdp_dom_snapshot())
-        ax_root = AXNode.from_cdp(await page.get_cdp_accessibility_tree())
-        return cls(
-            dom_root=dom_root,
-            ax_root=ax_root,
+        """Create LLMDomContext from page.
+
+        Args:
+            page: Page to capture
+            include_element_ids: Include element IDs in the context
+            incremental: State shared with the previous context of the same page
+            mode: Only capture what this mode needs (default: capture everything)
+            viewport_window: Only include elements inside or near the viewport
+        """
+        # DOM mode never reads the accessibility tree
+        capture = await capture_page(page, accessibility_tree=mode != "dom")
+        return cls.from_capture(
+            capture,
             include_element_ids=include_element_ids,
+            incremental=incremental,
+            viewport_height=page.viewport_size()[1] if viewport_window else None,
         )
 
+    @classmethod
+    def from_capture(
+        cls,
+        capture: PageCapture,
+        include_element_ids: bool = True,
+        incremental: Optional[IncrementalContext] = None,
+        viewport_height: Optional[float] = None,
+    ) -> "LLMDomContext":
+        """Create LLMDomContext from an already captured page state.
+
+        Trees are parsed on first use, so a capture without an accessibility
+        tree is fine for DOM mode.
+
+        Args:
+            capture: Captured page state (DOM snapshot and accessibility tree)
+            include_element_ids: Include element IDs in the context
+            incremental: State shared with the previous context of the same
+                page, to reuse everything that did not change since
+            viewport_height: If given, only include elements inside or near
+                the viewport (its scroll offset comes from the DOM snapshot)
+        """
+        window = None
+        if viewport_height is not None and capture.dom_snapshot is not None:
+            window = ViewportWindow.from_snapshot(capture.dom_snapshot, viewport_height)
+        context = cls(
+            include_element_ids=include_element_ids,
+            incremental=incremental,
+            window=window,
+        )
+        context._dom_snapshot = capture.dom_snapshot
+        context._ax_tree = capture.ax_tree
+        return context
+
+    @property
+    def dom_root(self) -> DomNode:
+        """DOM tree, parsed from the captured snapshot on first access."""
+        if self._dom_root is None:
+            if self._dom_snapshot is None:
+                raise ValueError("No DOM snapshot was captured")
+            self._dom_root = DomNode.from_cdp(self._dom_snapshot, columnar=True)
+        return self._dom_root
+
+    @property
+    def ax_root(self) -> AXNode:
+        """Accessibility tree, parsed from the captured data on first access."""
+        if self._ax_root is None:
+            if self._ax_tree is None:
+                raise ValueError(
+                    "No accessibility tree was captured (required for accessibility mode)"
+                )
+            self._ax_root = AXNode.from_cdp(self._ax_tree)
+        return self._ax_root
+
     def get_context(self, mode: str = "accessibility") -> str:
         """Get LLM context string.
 
@@ -48,107 +147,173 @@ class LLMDomContext:
                 - accessibility: Clean, filtered, role-based IDs (button-0)
                 - dom: Complete, tag-based IDs (input-0), includes file inputs
         """
-        if self._context_str is None:
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid mode: {mode}. Must be 'accessibility' or 'dom'")
+
+        if mode not in self._context_strs:
             if mode == "accessibility":
                 self._build_accessibility_context()
-            elif mode == "dom":
-                self._build_dom_context()
             else:
-                raise ValueError(
-                    f"Invalid mode: {mode}. Must be 'accessibility' or 'dom'"
-                )
+                self._build_dom_context()
 
-        return self._context_str
+        self._last_mode = mode
+        return self._context_strs[mode]
+
+    def get_reuse_stats(self) -> Optional[Dict[str, int]]:
+        """Nodes reused from the previous snapshot vs. rebuilt (incremental only)."""
+        return dict(self._reuse_stats) if self._reuse_stats is not None else None
+
+    def _begin_reuse(self, mode: str, root: Any):
+        """Fingerprint the new tree against the previous snapshot's (if incremental)."""
+        if self.incremental is None:
+            return None, None
+        memo = (
+            self.incremental.ax_memo
+            if mode == "accessibility"
+            else self.incremental.dom_memo
+        )
+        memo.begin(root)
+        return memo, self.incremental.line_cache
 
     def _build_accessibility_context(self) -> None:
         """Build context from accessibility tree."""
-        # Filter accessibility tree
-        filtered_root = filter_ignored_nodes(self.ax_root)
-        if filtered_root is None:
-            self._context_str = ""
-            self._element_map = {}
-            return
-
-        filtered_root = filter_duplicate_text(filtered_root)
-        if filtered_root is None:
-            self._context_str = ""
-            self._element_map = {}
-            return
-
-        filtered_root = filter_non_semantic_role(filtered_root)
-
-        # Assign role-based IDs
-        role_id_map = self._assign_role_ids(filtered_root)
-
-        # Serialize
-        self._context_str = self._serialize_accessibility_context(
-            filtered_root, self.include_element_ids
-        )
+        memo, line_cache = self._begin_reuse("accessibility", self.ax_root)
+
+        # Filter accessibility tree (ignored, duplicate text, non-semantic roles)
+        filtered_root = filter_accessibility_tree(self.ax_root, memo=memo)
 
-        # Build DOM lookup map
-        dom_map: Dict[int, DomNode] = {}
-        for node in self.dom_root.traverse():
-            if isinstance(node, DomNode) and node.backend_dom_node_id is not None:
-                dom_map[node.backend_dom_node_id] = node
+        # Assign role-based IDs (resolved to DOM nodes on first lookup)
+        self._id_maps["accessibility"], node_ids = self._assign_role_ids(filtered_root)
 
-        # Translate role IDs to DOM nodes
-        self._element_map = {}
-        for role_id, ax_node in role_id_map.items():
-            if ax_node.backend_dom_node_id is not None:
-                dom_node = dom_map.get(ax_node.backend_dom_node_id)
-                if dom_node:
-                    self._element_map[role_id] = dom_node
+        # Serialize (only the viewport window, if any)
+        self._context_strs["accessibility"] = self._serialize_accessibility_context(
+            filtered_root,
+            node_ids,
+            self.include_element_ids,
+            line_cache,
+            self._split_by_window("accessibility", filtered_root),
+        )
+        if memo is not None:
+            self._reuse_stats = {"reused": memo.reused, "rebuilt": memo.rebuilt}
 
     def _build_dom_context(self) -> None:
         """Build context from DOM tree."""
-        from ..dom.filters import filter_non_rendered, filter_non_semantic
-
-        # Preserve original node references before filtering (for XPath computation)
-        self._add_original_node_references(self.dom_root)
+        memo, line_cache = self._begin_reuse("dom", self.dom_root)
 
-        # Filter DOM tree
-        filtered_root = filter_non_rendered(self.dom_root)
-        if filtered_root is None:
-            self._context_str = ""
-            self._element_map = {}
-            return
+        # Preserve original node references before filtering (for XPath
+        # computation). Reused subtrees would still reference the previous
+        # snapshot's nodes (and keep them alive), so incremental builds
+        # resolve originals by backend node ID instead.
+        originals = None
+        if memo is None:
+            self._add_original_node_references(self.dom_root)
+        else:
+            originals = self._backend_node_map()
 
-        filtered_root = filter_non_semantic(filtered_root)
-        if filtered_root is None:
-            self._context_str = ""
-            self._element_map = {}
-            return
+        # Filter DOM tree (non-rendered, non-semantic elements and attributes)
+        filtered_root = filter_dom_tree(self.dom_root, memo=memo)
 
         # Assign tag-based IDs
-        tag_map = self._assign_tag_ids(filtered_root)
+        self._element_maps["dom"], node_ids = self._assign_tag_ids(
+            filtered_root, originals
+        )
 
-        # Serialize
-        self._context_str = self._serialize_dom_context(filtered_root)
+        # Serialize (only the viewport window, if any)
+        self._context_strs["dom"] = self._serialize_dom_context(
+            filtered_root,
+            node_ids,
+            line_cache,
+            self._split_by_window("dom", filtered_root),
+        )
+        if memo is not None:
+            self._reuse_stats = {"reused": memo.reused, "rebuilt": memo.rebuilt}
+
+    def _split_by_window(self, mode: str, root: Any) -> Optional[WindowSplit]:
+        """Split the filtered tree by the viewport window (None: no window)."""
+        if self.window is None:
+            return None
+        if mode == "dom":
+            return split_by_window(
+                root,
+                self.window,
+                bounds_of=lambda node: getattr(node, "bounds", None),
+                label_of=lambda node: (
+                    node.tag.lower() if isinstance(node, DomNode) else None
+                ),
+            )
+
+        # AX nodes have no layout; use the boxes of their DOM nodes
+        dom_map = self._backend_node_map()
+
+        def bounds_of(node: AXNode):
+            dom_node = dom_map.get(node.backend_dom_node_id)
+            return dom_node.bounds if dom_node is not None else None
+
+        def label_of(node: AXNode) -> Optional[str]:
+            role = str(node.role.value)
+            return None if role in ("StaticText", "InlineTextBox") else role
 
-        # Store tag map as interactive map
-        self._element_map = tag_map
+        return split_by_window(root, self.window, bounds_of, label_of)
 
-    def get_dom_node(self, id: str) -> Optional[DomNode]:
-        """Get DOM node by element ID (role_id in accessibility mode, tag_id in DOM mode)."""
-        if self._element_map is None:
-            self.get_context()  # Trigger build
-        return self._element_map.get(id)
+    def get_dom_node(self, id: str, mode: Optional[str] = None) -> Optional[DomNode]:
+        """Get DOM node by element ID (role_id in accessibility mode, tag_id in DOM mode).
+
+        Args:
+            id: Element ID from the context
+            mode: Mode the ID comes from (default: the mode last requested)
+        """
+        return self._get_element_map(mode or self._last_mode or "accessibility").get(id)
+
+    def get_element_map(self, mode: Optional[str] = None) -> Dict[str, DomNode]:
+        """Element ID -> DOM node for a mode (default: the mode last requested)."""
+        return dict(self._get_element_map(mode or self._last_mode or "accessibility"))
+
+    def _get_element_map(self, mode: str) -> Dict[str, DomNode]:
+        """Element ID -> DOM node for a mode, built on first use."""
+        if mode not in self._element_maps:
+            self.get_context(mode)
+        if mode not in self._element_maps:
+            # Translate role IDs to DOM nodes
+            dom_map = self._backend_node_map()
+            element_map = {}
+            for role_id, ax_node in self._id_maps[mode].items():
+                if ax_node.backend_dom_node_id is not None:
+                    dom_node = dom_map.get(ax_node.backend_dom_node_id)
+                    if dom_node:
+                        element_map[role_id] = dom_node
+            self._element_maps[mode] = element_map
+        return self._element_maps[mode]
+
+    def _backend_node_map(self) -> Dict[int, DomNode]:
+        """Map backend node IDs to nodes of the (unfiltered) DOM tree."""
+        if self._dom_map is None:
+            dom_map: Dict[int, DomNode] = {}
+            for node in self.dom_root.traverse():
+                if isinstance(node, DomNode) and node.backend_dom_node_id is not None:
+                    dom_map[node.backend_dom_node_id] = node
+            self._dom_map = dom_map
+        return self._dom_map
 
     @staticmethod
-    def _assign_role_ids(root: AXNode) -> Dict[str, AXNode]:
-        """Assign role-based IDs (button-0, textbox-1) to accessibility tree nodes."""
+    def _assign_role_ids(root: AXNode) -> Tuple[Dict[str, AXNode], Dict[int, str]]:
+        """Assign role-based IDs (button-0, textbox-1) to accessibility tree nodes.
+
+        Returns role_id -> node and id(node) -> role_id. IDs are kept out of
+        node metadata, which filtered and memoized trees share with others.
+        """
         role_id_map = {}
+        node_ids: Dict[int, str] = {}
         role_counters: Dict[str, int] = {}
 
         for node in root.traverse():
             role = str(node.role.value)
             count = role_counters.get(role, 0)
             role_id = f"{role}-{count}"
-            node.metadata["role_id"] = role_id
+            node_ids[id(node)] = role_id
             role_id_map[role_id] = node
             role_counters[role] = count + 1
 
-        return role_id_map
+        return role_id_map, node_ids
 
     @staticmethod
     def _should_filter_url(url: str) -> bool:
@@ -174,25 +339,46 @@ class LLMDomContext:
 
     @staticmethod
     def _serialize_accessibility_context(
-        root: AXNode, include_element_ids: bool
+        root: AXNode,
+        node_ids: Dict[int, str],
+        include_element_ids: bool,
+        line_cache: Optional[Dict[int, Tuple[Any, str]]] = None,
+        split: Optional[WindowSplit] = None,
     ) -> str:
-        """Serialize accessibility tree to markdown with role-based IDs."""
+        """Serialize accessibility tree to markdown with role-based IDs.
+
+        node_ids maps id(node) -> element ID. line_cache maps id(node) ->
+        (node, line without its ID) for nodes reused from the previous
+        snapshot; it is refreshed in place. With a split, only its kept nodes
+        are serialized.
+        """
+        kept = split.kept if split is not None else None
+        fresh_cache: Dict[int, Tuple[Any, str]] = {}
         lines = []
+        # Explicit stack of (node, depth) so deep trees don't hit the recursion limit
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if kept is not None and id(node) not in kept:
+                continue
+            stack.extend((child, depth + 1) for child in reversed(node.children))
 
-        def traverse(node: AXNode, depth: int = 0):
             indent = "  " * depth
             role = str(node.role.value)
 
             if role in ("StaticText", "InlineTextBox"):
                 if node.name and node.name.value:
                     lines.append(f'{indent}- "{node.name.value}"')
-                for child in node.children:
-                    traverse(child, depth + 1)
-                return
+                continue
 
-            role_id = node.metadata["role_id"]
-            parts = [f"[{role_id}]"] if include_element_ids else [role]
+            head = f"[{node_ids[id(node)]}]" if include_element_ids else role
+            cached = line_cache.get(id(node)) if line_cache is not None else None
+            if cached is not None and cached[0] is node:
+                fresh_cache[id(node)] = cached
+                lines.append(f"{indent}- {head}{cached[1]}")
+                continue
 
+            parts = []
             if node.name and node.name.value:
                 parts.append(f'"{node.name.value}"')
 
@@ -215,14 +401,14 @@ class LLMDomContext:
                         continue
                     parts.append(f"{prop.name}={prop_value}")
 
-            lines.append(f"{indent}- {' '.join(parts)}")
-
-            for child in node.children:
-                traverse(child, depth + 1)
+            suffix = "".join(f" {part}" for part in parts)
+            fresh_cache[id(node)] = (node, suffix)
+            lines.append(f"{indent}- {head}{suffix}")
 
-        traverse(root, 0)
-        lines.append(LLMDomContext.END_OF_PAGE_MARKER)
-        return "\n".join(lines)
+        if line_cache is not None:
+            line_cache.clear()
+            line_cache.update(fresh_cache)
+        return LLMDomContext._join_lines(lines, split)
 
     @staticmethod
     def _add_original_node_references(root: DomNode) -> None:
@@ -232,12 +418,18 @@ class LLMDomContext:
                 node.metadata["original_node"] = node
 
     @staticmethod
-    def _assign_tag_ids(root: DomNode) -> Dict[str, DomNode]:
+    def _assign_tag_ids(
+        root: DomNode, originals: Optional[Dict[int, DomNode]] = None
+    ) -> Tuple[Dict[str, DomNode], Dict[int, str]]:
         """Assign tag-based IDs (input-0, button-1) to DOM tree nodes.
 
-        Returns mapping of tag_id -> original unfiltered node (for correct XPath).
+        Returns tag_id -> original unfiltered node (for correct XPath) and
+        id(node) -> tag_id. If originals (backend node ID -> node) is given,
+        original nodes are looked up there. Nodes aren't modified: their
+        metadata is shared with the input tree and memoized subtrees.
         """
         tag_map = {}
+        node_ids: Dict[int, str] = {}
         tag_counters: Dict[str, int] = {}
 
         for node in root.traverse():
@@ -247,53 +439,88 @@ class LLMDomContext:
             tag = node.tag.lower()
             count = tag_counters.get(tag, 0)
             tag_id = f"{tag}-{count}"
-            node.metadata["tag_id"] = tag_id
+            node_ids[id(node)] = tag_id
 
             # Store original node (not filtered) for correct XPath computation
             original_node = node.metadata.get("original_node", node)
+            if originals is not None:
+                original_node = originals.get(node.backend_dom_node_id, original_node)
             tag_map[tag_id] = original_node
             tag_counters[tag] = count + 1
 
-        return tag_map
+        return tag_map, node_ids
 
     @staticmethod
-    def _serialize_dom_context(root: DomNode) -> str:
-        """Serialize DOM tree to markdown with tag-based IDs."""
+    def _serialize_dom_context(
+        root: DomNode,
+        node_ids: Dict[int, str],
+        line_cache: Optional[Dict[int, Tuple[Any, str]]] = None,
+        split: Optional[WindowSplit] = None,
+    ) -> str:
+        """Serialize DOM tree to markdown with tag-based IDs.
+
+        node_ids maps id(node) -> element ID. line_cache maps id(node) ->
+        (node, line without its ID) for nodes reused from the previous
+        snapshot; it is refreshed in place. With a split, only its kept nodes
+        are serialized.
+        """
         from ..dom.domnode import Text
 
+        kept = split.kept if split is not None else None
+        fresh_cache: Dict[int, Tuple[Any, str]] = {}
         lines = []
+        # Explicit stack of (node, depth) so deep trees don't hit the recursion limit
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if kept is not None and id(node) not in kept:
+                continue
 
-        def traverse(node: DomNode, depth: int = 0):
             # Handle text nodes
             if isinstance(node, Text):
                 text = node.content.strip()
                 if text:
                     indent = "  " * depth
                     lines.append(f'{indent}- "{text}"')
-                return
+                continue
 
             # Skip non-element nodes
             if not isinstance(node, DomNode):
-                return
+                continue
 
             indent = "  " * depth
-            tag_id = node.metadata.get("tag_id", "unknown")
-            parts = [f"[{tag_id}]"]
-
-            # Add attributes
-            for attr_name, attr_value in node.attrib.items():
-                if attr_value:
-                    # Skip data URLs and very long URLs
-                    if LLMDomContext._should_filter_url(attr_value):
-                        continue
-                    parts.append(f"{attr_name}={attr_value}")
-
-            lines.append(f"{indent}- {' '.join(parts)}")
+            tag_id = node_ids.get(id(node), "unknown")
+            cached = line_cache.get(id(node)) if line_cache is not None else None
+            if cached is not None and cached[0] is node:
+                suffix = cached[1]
+            else:
+                # Add attributes
+                parts = []
+                for attr_name, attr_value in node.attrib.items():
+                    if attr_value:
+                        # Skip data URLs and very long URLs
+                        if LLMDomContext._should_filter_url(attr_value):
+                            continue
+                        parts.append(f"{attr_name}={attr_value}")
+                suffix = "".join(f" {part}" for part in parts)
+            fresh_cache[id(node)] = (node, suffix)
+
+            lines.append(f"{indent}- [{tag_id}]{suffix}")
 
             # Traverse children
-            for child in node.children:
-                traverse(child, depth + 1)
+            stack.extend((child, depth + 1) for child in reversed(node.children))
+
+        if line_cache is not None:
+            line_cache.clear()
+            line_cache.update(fresh_cache)
+        return LLMDomContext._join_lines(lines, split)
 
-        traverse(root, 0)
-        lines.append(LLMDomContext.END_OF_PAGE_MARKER)
+    @staticmethod
+    def _join_lines(lines: List[str], split: Optional[WindowSplit]) -> str:
+        """Join serialized lines, framed by summaries of what the window left out."""
+        above = split.summary(ABOVE) if split is not None else None
+        below = split.summary(BELOW) if split is not None else None
+        if above is not None:
+            lines.insert(0, above)
+        lines.append(below or LLMDomContext.END_OF_PAGE_MARKER)
         return "\n".join(lines)
@@ -0,0 +1,211 @@
+"""Context offloading - parse, filter and serialize page context off the event loop."""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..dom.selector import XPath
+from .incremental import IncrementalContext
+from .llm_dom_context import LLMDomContext
+from .page_capture import PageCapture
+
+# Where page context is built: on the event loop, or in a shared pool
+PARSE_MODES = ("inline", "thread", "process")
+
+_executors: Dict[str, Executor] = {}
+# Guards _executors and _owners (pools are created and shut down from
+# different threads)
+_executors_lock = threading.Lock()
+# Open Webtasks; the pools are shut down when the last one closes
+_owners = 0
+
+
+@dataclass(frozen=True)
+class ElementRef:
+    """Page element of a context built in another process.
+
+    Carries what element resolution needs from a DOM node (its backend node
+    ID and XPath), so the tree itself never has to come back.
+    """
+
+    backend_dom_node_id: Optional[int]
+    x_path: XPath
+
+    def get_x_path(self) -> XPath:
+        return self.x_path
+
+
+class RemoteDomContext:
+    """Context built in a worker process: the context string and element lookup.
+
+    Stands in for LLMDomContext after its build, for the one mode it was
+    built in.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        context_str: str,
+        elements: Dict[str, Tuple[Optional[int], XPath]],
+    ):
+        self.mode = mode
+        self._context_str = context_str
+        self._elements = elements
+
+    def get_context(self, mode: Optional[str] = None) -> str:
+        self._check_mode(mode)
+        return self._context_str
+
+    def get_dom_node(self, id: str, mode: Optional[str] = None) -> Optional[ElementRef]:
+        self._check_mode(mode)
+        element = self._elements.get(id)
+        return ElementRef(*element) if element is not None else None
+
+    def get_reuse_stats(self) -> Optional[Dict[str, int]]:
+        # Incremental reuse needs the previous trees, which stay in the parent
+        return None
+
+    def _check_mode(self, mode: Optional[str]) -> None:
+        if mode is not None and mode != self.mode:
+            raise ValueError(f"Context was built in '{self.mode}' mode, not '{mode}'")
+
+
+def build_dom_context(
+    capture: PageCapture,
+    mode: str,
+    incremental: Optional[IncrementalContext] = None,
+    viewport_height: Optional[float] = None,
+) -> LLMDomContext:
+    """Parse, filter and serialize a capture into a context for mode."""
+    context = LLMDomContext.from_capture(
+        capture, incremental=incremental, viewport_height=viewport_height
+    )
+    context.get_context(mode=mode)
+    return context
+
+
+async def build_dom_context_in(
+    parse_in: str,
+    capture: PageCapture,
+    mode: str,
+    incremental: Optional[IncrementalContext] = None,
+    viewport_height: Optional[float] = None,
+) -> Union[LLMDomContext, RemoteDomContext]:
+    """build_dom_context on the event loop, in the thread pool or the process pool.
+
+    In a thread, the built LLMDomContext (and incremental state) is shared
+    as is. The GIL still serializes the parse, but the loop gets to run
+    other agents' I/O in between instead of waiting for the whole build.
+
+    In a process, only the CDP data the mode reads is sent (the columnar
+    DOM snapshot is mostly flat lists of ints, which pickle cheaply), and
+    only the context string and element refs come back. Incremental state
+    can't be shared with the process, so every build there is fresh.
+    """
+    if parse_in not in PARSE_MODES:
+        raise ValueError(
+            f"Invalid parse_in '{parse_in}'. Must be one of: {PARSE_MODES}"
+        )
+    if parse_in == "inline":
+        return build_dom_context(capture, mode, incremental, viewport_height)
+
+    loop = asyncio.get_running_loop()
+    executor = get_parse_executor(parse_in)
+    if parse_in == "thread":
+        return await loop.run_in_executor(
+            executor, build_dom_context, capture, mode, incremental, viewport_height
+        )
+    return await loop.run_in_executor(
+        executor,
+        _build_remote_context,
+        capture.dom_snapshot,
+        # DOM mode never reads the accessibility tree
+        capture.ax_tree if mode != "dom" else None,
+        mode,
+        viewport_height,
+    )
+
+
+def get_parse_executor(parse_in: str) -> Executor:
+    """Pool shared by all agents of this process for parse_in, created on first use."""
+    with _executors_lock:
+        if parse_in not in _executors:
+            if parse_in == "thread":
+                _executors[parse_in] = ThreadPoolExecutor(
+                    thread_name_prefix="webtask-parse"
+                )
+            elif parse_in == "process":
+                # Forking a process with a running event loop and browser
+                # connection isn't safe, so workers start fresh. Spawned
+                # workers import __main__, so scripts must start agents under
+                # `if __name__ == "__main__":`
+                _executors[parse_in] = ProcessPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                raise ValueError(f"No executor for parse_in '{parse_in}'")
+        return _executors[parse_in]
+
+
+def retain_parse_executors() -> None:
+    """Register an owner of the shared parse pools (a Webtask)."""
+    global _owners
+    with _executors_lock:
+        _owners += 1
+
+
+def release_parse_executors() -> None:
+    """Unregister an owner, shutting the pools down if it was the last one.
+
+    Waits for builds in flight. Pools are created again on next use.
+    """
+    global _owners
+    with _executors_lock:
+        _owners = max(_owners - 1, 0)
+        if _owners:
+            return
+        executors = _take_executors()
+    _shutdown(executors)
+
+
+def shutdown_parse_executors() -> None:
+    """Shut down the shared parse pools whatever their owners (they are
+    recreated on next use), e.g. when agents were created without a Webtask.
+    """
+    with _executors_lock:
+        executors = _take_executors()
+    _shutdown(executors)
+
+
+def _take_executors() -> List[Executor]:
+    """Remove the pools from the registry (call with _executors_lock held)."""
+    executors = list(_executors.values())
+    _executors.clear()
+    return executors
+
+
+def _shutdown(executors: List[Executor]) -> None:
+    # Outside the lock, so new pools can be created meanwhile
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+
+def _build_remote_context(
+    dom_snapshot: Optional[Dict[str, Any]],
+    ax_tree: Optional[Dict[str, Any]],
+    mode: str,
+    viewport_height: Optional[float],
+) -> RemoteDomContext:
+    """Build a context in a worker process and reduce it to what the parent needs."""
+    capture = PageCapture(dom_snapshot=dom_snapshot, ax_tree=ax_tree)
+    context = build_dom_context(capture, mode, viewport_height=viewport_height)
+    elements = {
+        id: (node.backend_dom_node_id, node.get_x_path())
+        for id, node in context.get_element_map(mode).items()
+    }
+    return RemoteDomContext(mode, context.get_context(mode), elements)
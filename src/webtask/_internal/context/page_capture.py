@@ -0,0 +1,78 @@
+"""PageCapture - concurrent capture of the raw page state used to build context."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...browser.page import Page
+
+
+@dataclass
+class PageCapture:
+    """Raw page state captured in one stage.
+
+    Each field is None when it was not requested. timings holds the wall time
+    (seconds) of every capture that ran, plus "total" for the whole stage.
+    """
+
+    dom_snapshot: Optional[Dict[str, Any]] = None
+    ax_tree: Optional[Dict[str, Any]] = None
+    screenshot: Optional[bytes] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    def format_timings(self) -> str:
+        """Format timings for logging, e.g. "dom_snapshot=0.21s, total=0.22s"."""
+        return ", ".join(
+            f"{name}={seconds:.3f}s" for name, seconds in self.timings.items()
+        )
+
+
+async def _timed(
+    name: str, awaitable: Awaitable[Any], timings: Dict[str, float]
+) -> Any:
+    """Await and record how long it took."""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+async def capture_page(
+    page: "Page",
+    dom_snapshot: bool = True,
+    accessibility_tree: bool = True,
+    screenshot: bool = False,
+) -> PageCapture:
+    """Capture DOM snapshot, accessibility tree and screenshot concurrently.
+
+    The three captures are independent round-trips to the browser, so they are
+    issued together and the stage takes as long as the slowest one.
+
+    Args:
+        page: Page to capture
+        dom_snapshot: Capture DOMSnapshot.captureSnapshot data
+        accessibility_tree: Capture Accessibility.getFullAXTree data
+        screenshot: Capture a viewport screenshot (PNG bytes)
+    """
+    capture = PageCapture()
+    jobs: Dict[str, Awaitable[Any]] = {}
+    if dom_snapshot:
+        jobs["dom_snapshot"] = page.get_cdp_dom_snapshot()
+    if accessibility_tree:
+        jobs["ax_tree"] = page.get_cdp_accessibility_tree()
+    if screenshot:
+        jobs["screenshot"] = page.screenshot()
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(_timed(name, job, capture.timings) for name, job in jobs.items())
+    )
+    capture.timings["total"] = time.perf_counter() - start
+
+    for name, result in zip(jobs, results):
+        setattr(capture, name, result)
+
+    return capture
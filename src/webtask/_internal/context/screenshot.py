@@ -0,0 +1,162 @@
+"""Screenshot pipeline - downscaling, re-encoding and dedup of page screenshots."""
+
+import io
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from PIL import Image as PILImage
+
+from webtask.llm.message import ImageMimeType
+
+# Pillow format names per MIME type
+_PIL_FORMATS = {
+    ImageMimeType.PNG: "PNG",
+    ImageMimeType.JPEG: "JPEG",
+    ImageMimeType.WEBP: "WEBP",
+}
+
+
+@dataclass(frozen=True)
+class ScreenshotOptions:
+    """How screenshots are prepared before they are sent to the LLM.
+
+    Attributes:
+        max_width: Downscale to at most this width, keeping the aspect ratio
+            (None: keep the captured width)
+        max_height: Downscale to at most this height (None: keep)
+        format: Encoding of the sent image (PNG, JPEG or WEBP)
+        quality: JPEG/WEBP quality, 1-95
+        dedup: Skip a screenshot that looks the same as the previous one
+        dedup_threshold: Maximum number of differing perceptual-hash bits
+            for two screenshots to count as the same (0: identical hashes)
+    """
+
+    max_width: Optional[int] = None
+    max_height: Optional[int] = None
+    format: ImageMimeType = ImageMimeType.PNG
+    quality: int = 80
+    dedup: bool = False
+    dedup_threshold: int = 0
+
+    def __post_init__(self):
+        if self.format not in _PIL_FORMATS:
+            raise ValueError(
+                f"Unsupported screenshot format: {self.format}. "
+                f"Must be one of: {[f.value for f in _PIL_FORMATS]}"
+            )
+
+
+@dataclass
+class ProcessedScreenshot:
+    """A screenshot ready to send, with the numbers needed to report on it.
+
+    Attributes:
+        data: Encoded image (empty if duplicate)
+        mime_type: Encoding of data
+        size: (width, height) of the sent image
+        source_size: (width, height) of the captured image
+        source_bytes: Size of the captured PNG
+        duplicate: Same as the previous screenshot (not sent)
+    """
+
+    data: bytes
+    mime_type: ImageMimeType
+    size: Tuple[int, int]
+    source_size: Tuple[int, int]
+    source_bytes: int
+    duplicate: bool = False
+
+
+def perceptual_hash(image: PILImage.Image, hash_size: int = 16) -> int:
+    """Difference hash: one bit per horizontally adjacent pixel pair.
+
+    The image is reduced to (hash_size + 1) x hash_size grayscale pixels, so
+    re-encoding noise and tiny shifts don't change the hash.
+    """
+    small = image.convert("L").resize(
+        (hash_size + 1, hash_size), PILImage.Resampling.BILINEAR
+    )
+    pixels = small.tobytes()
+    width = hash_size + 1
+    bits = 0
+    for row in range(hash_size):
+        offset = row * width
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+class ScreenshotPipeline:
+    """Prepares captured PNG screenshots according to ScreenshotOptions.
+
+    Keeps the perceptual hash of the last screenshot to detect duplicates.
+    """
+
+    def __init__(self, options: ScreenshotOptions):
+        self.options = options
+        self._last_hash: Optional[int] = None
+
+    def reset(self) -> None:
+        """Forget the previous screenshot (e.g. after switching pages)."""
+        self._last_hash = None
+
+    def process(self, png: bytes) -> ProcessedScreenshot:
+        """Downscale, dedup and re-encode a captured PNG screenshot."""
+        options = self.options
+        image = PILImage.open(io.BytesIO(png))
+        source_size = image.size
+
+        if options.dedup:
+            image_hash = perceptual_hash(image)
+            previous, self._last_hash = self._last_hash, image_hash
+            if previous is not None and (
+                bin(previous ^ image_hash).count("1") <= options.dedup_threshold
+            ):
+                return ProcessedScreenshot(
+                    data=b"",
+                    mime_type=options.format,
+                    size=self._target_size(source_size),
+                    source_size=source_size,
+                    source_bytes=len(png),
+                    duplicate=True,
+                )
+
+        size = self._target_size(source_size)
+        if size == source_size and options.format == ImageMimeType.PNG:
+            # Nothing to do, send the capture as is
+            return ProcessedScreenshot(
+                data=png,
+                mime_type=ImageMimeType.PNG,
+                size=size,
+                source_size=source_size,
+                source_bytes=len(png),
+            )
+
+        if size != source_size:
+            image = image.resize(size, PILImage.Resampling.LANCZOS)
+        if options.format == ImageMimeType.JPEG and image.mode != "RGB":
+            image = image.convert("RGB")
+        out = io.BytesIO()
+        save_args = (
+            {} if options.format == ImageMimeType.PNG else {"quality": options.quality}
+        )
+        image.save(out, format=_PIL_FORMATS[options.format], **save_args)
+        return ProcessedScreenshot(
+            data=out.getvalue(),
+            mime_type=options.format,
+            size=size,
+            source_size=source_size,
+            source_bytes=len(png),
+        )
+
+    def _target_size(self, size: Tuple[int, int]) -> Tuple[int, int]:
+        """Largest size within max_width x max_height with the same aspect ratio."""
+        width, height = size
+        scale = 1.0
+        if self.options.max_width and width > self.options.max_width:
+            scale = self.options.max_width / width
+        if self.options.max_height and height > self.options.max_height:
+            scale = min(scale, self.options.max_height / height)
+        if scale == 1.0:
+            return size
+        return max(1, round(width * scale)), max(1, round(height * scale))
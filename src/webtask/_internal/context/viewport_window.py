@@ -0,0 +1,130 @@
+"""ViewportWindow - limit LLM context to the part of the page near the viewport."""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from ..dom import BoundingBox
+
+ABOVE = "above"
+BELOW = "below"
+
+
+@dataclass(frozen=True, slots=True)
+class ViewportWindow:
+    """Vertical band of the page, in document coordinates, to include in context.
+
+    DOMSnapshot layout bounds are document coordinates, so a node is inside
+    the window when its box overlaps [top, bottom].
+    """
+
+    top: float
+    bottom: float
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        dom_snapshot: Dict[str, Any],
+        viewport_height: float,
+        margin: float = 0.5,
+    ) -> "ViewportWindow":
+        """Window around the viewport of a DOMSnapshot.captureSnapshot result.
+
+        Args:
+            dom_snapshot: Captured DOM snapshot (provides scrollOffsetY)
+            viewport_height: Viewport height in pixels
+            margin: Extra band above and below the viewport, as a fraction of
+                its height, so elements just out of view are still included
+        """
+        documents = dom_snapshot.get("documents") or [{}]
+        scroll_y = documents[0].get("scrollOffsetY") or 0
+        extra = viewport_height * margin
+        return cls(top=scroll_y - extra, bottom=scroll_y + viewport_height + extra)
+
+    def position(self, bounds: BoundingBox) -> Optional[str]:
+        """ABOVE or BELOW the window, or None if the box overlaps it."""
+        if bounds.y + bounds.height < self.top:
+            return ABOVE
+        if bounds.y > self.bottom:
+            return BELOW
+        return None
+
+
+@dataclass(slots=True)
+class WindowSplit:
+    """Nodes of a tree inside a window, and a summary of those left out.
+
+    Attributes:
+        kept: id() of every node to serialize (inside the window, or an
+            ancestor of one)
+        above: Label -> number of left-out nodes above the window
+        below: Label -> number of left-out nodes below the window
+    """
+
+    kept: Set[int] = field(default_factory=set)
+    above: Counter = field(default_factory=Counter)
+    below: Counter = field(default_factory=Counter)
+
+    def summary(self, position: str) -> Optional[str]:
+        """One-line summary of what lies above or below, or None if nothing."""
+        counts = self.above if position == ABOVE else self.below
+        total = sum(counts.values())
+        if not total:
+            return None
+        common = ", ".join(f"{label}: {n}" for label, n in counts.most_common(5))
+        more = ", ..." if len(counts) > 5 else ""
+        scroll = "up" if position == ABOVE else "down"
+        noun = "element" if total == 1 else "elements"
+        return (
+            f"[{position.upper()} VIEWPORT: {total} {noun} ({common}{more})"
+            f" - scroll {scroll} to see them]"
+        )
+
+
+def split_by_window(
+    root: Any,
+    window: ViewportWindow,
+    bounds_of: Callable[[Any], Optional[BoundingBox]],
+    label_of: Callable[[Any], Optional[str]],
+) -> WindowSplit:
+    """Split a tree into nodes inside a window and a summary of the rest.
+
+    A node without bounds (e.g. text) takes the position of the last node
+    with bounds before it in document order: filtering promotes children of
+    removed elements, so their parent is not necessarily where they are. A
+    node is kept if it is inside the window or has a kept descendant, so the
+    context keeps its structure; the root is always kept.
+
+    Args:
+        root: Tree root (nodes have .children)
+        window: Band of the page to keep
+        bounds_of: Layout box of a node, or None if it has none
+        label_of: Summary label of a left-out node (e.g. its tag), or None to
+            not count it
+    """
+    order: List[Any] = []
+    positions: Dict[int, Optional[str]] = {}
+    position: Optional[str] = None
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        bounds = bounds_of(node)
+        if bounds is not None:
+            position = window.position(bounds)
+        positions[id(node)] = position
+        order.append(node)
+        stack.extend(reversed(node.children))
+
+    # Reversed pre-order sees every child before its parent
+    split = WindowSplit()
+    kept = split.kept
+    for node in reversed(order):
+        position = positions[id(node)]
+        if position is None or any(id(child) in kept for child in node.children):
+            kept.add(id(node))
+            continue
+        label = label_of(node)
+        if label is not None:
+            (split.above if position == ABOVE else split.below)[label] += 1
+    kept.add(id(root))
+    return split
@@ -1,7 +1,7 @@
 """DOM module - Pure data structure classes for DOM representation."""
 
 from .domnode import DomNode, DomNodeData, Text, BoundingBox
-from .parsers import parse_html, parse_cdp
+from .parsers import parse_html, parse_cdp, CdpNodeTable, parse_cdp_columnar
 from .selector import XPath
 
 __all__ = [
@@ -11,5 +11,7 @@ __all__ = [
     "BoundingBox",
     "parse_html",
     "parse_cdp",
+    "CdpNodeTable",
+    "parse_cdp_columnar",
     "XPath",
 ]
@@ -7,7 +7,7 @@ if TYPE_CHECKING:
     from .selector import XPath
 
 
-@dataclass
+@dataclass(slots=True)
 class Text:
     """DOM text node."""
 
@@ -40,7 +40,7 @@ class Text:
         return self.content
 
 
-@dataclass
+@dataclass(slots=True)
 class BoundingBox:
     """Element bounding box from browser rendering."""
 
@@ -50,7 +50,7 @@ class BoundingBox:
     height: float
 
 
-@dataclass
+@dataclass(slots=True)
 class DomNodeData:
     """Data container for DOM node properties."""
 
@@ -72,13 +72,15 @@ class DomNodeData:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DomNode:
     """DOM element node with browser rendering data."""
 
     data: DomNodeData
     children: List[Union["DomNode", "Text"]] = field(default_factory=list)
     parent: Optional["DomNode"] = field(default=None, repr=False)
+    # Memoized XPath string (see get_x_path)
+    _x_path: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def __init__(
         self,
@@ -103,6 +105,7 @@ class DomNode:
             )
         self.children = []
         self.parent = None
+        self._x_path = None
 
     @property
     def tag(self) -> str:
@@ -135,6 +138,9 @@ class DomNode:
     def add_child(self, child: Union["DomNode", "Text"]):
         self.children.append(child)
         child.parent = self
+        # Child XPaths are only cached below a node whose own XPath is cached
+        if self._x_path is not None:
+            self._invalidate_child_x_paths()
 
     def copy(
         self, children: List[Union["DomNode", "Text"]], parent: Optional["DomNode"]
@@ -163,13 +169,17 @@ class DomNode:
         return self.bounds.width == 0 or self.bounds.height == 0
 
     def traverse(self):
-        """Traverse tree depth-first."""
+        """Traverse tree depth-first (pre-order) with an explicit stack."""
         yield self
-        for child in self.children:
-            if isinstance(child, DomNode):
-                yield from child.traverse()
+        stack = [iter(self.children)]
+        while stack:
+            for node in stack[-1]:
+                yield node
+                if isinstance(node, DomNode) and node.children:
+                    stack.append(iter(node.children))
+                    break
             else:
-                yield child
+                stack.pop()
 
     def get_text(self, separator: str = "") -> str:
         """Get all text content."""
@@ -177,32 +187,80 @@ class DomNode:
         return separator.join(parts)
 
     @classmethod
-    def from_cdp(cls, cdp_data: Dict[str, Any]) -> "DomNode":
+    def from_cdp(cls, cdp_data: Dict[str, Any], columnar: bool = False) -> "DomNode":
         """
         Create DomNode tree from CDP DOM snapshot data.
+
+        Args:
+            cdp_data: DOMSnapshot.captureSnapshot result
+            columnar: Build the tree through the array-backed CdpNodeTable
+                instead of the per-node parse_cdp() passes
         """
+        if columnar:
+            from .parsers.cdp_columnar import parse_cdp_columnar
+
+            return parse_cdp_columnar(cdp_data).build_tree()
+
         from .parsers.cdp import parse_cdp
 
         return parse_cdp(cdp_data)
 
     def get_x_path(self) -> "XPath":
-        """Get XPath to this element."""
-        from .selector import XPath
-
-        if self.parent is None:
-            return XPath(f"/{self.tag}")
+        """Get XPath to this element.
 
-        siblings = [
-            child
-            for child in self.parent.children
-            if isinstance(child, DomNode) and child.tag == self.tag
-        ]
+        XPaths are memoized. Computing one fills in the XPath of every element
+        sibling at each level on the way up, so subsequent calls for this node,
+        its siblings or their descendants only scan the levels not yet seen.
+        add_child() invalidates affected paths.
+        """
+        from .selector import XPath
 
-        if len(siblings) == 1:
-            position = ""
-        else:
-            index = siblings.index(self) + 1
-            position = f"[{index}]"
+        if self._x_path is None:
+            # Nearest-first chain of ancestors without a cached XPath
+            chain = []
+            node = self
+            while node is not None and node._x_path is None:
+                chain.append(node)
+                node = node.parent
+
+            for node in reversed(chain):
+                if node._x_path is not None:  # filled in as a sibling
+                    continue
+                if node.parent is None:
+                    node._x_path = f"/{node.tag}"
+                    continue
+                node.parent._cache_child_x_paths()
+                if node._x_path is None:
+                    raise ValueError(f"<{node.tag}> is not among its parent's children")
+
+        return XPath(self._x_path)
+
+    def _cache_child_x_paths(self) -> None:
+        """Compute XPaths of all element children (requires self._x_path)."""
+        tag_counts: Dict[str, int] = {}
+        for child in self.children:
+            if isinstance(child, DomNode):
+                tag_counts[child.tag] = tag_counts.get(child.tag, 0) + 1
 
-        parent_path = self.parent.get_x_path()
-        return XPath(f"{parent_path.path}/{self.tag}{position}")
+        positions: Dict[str, int] = {}
+        for child in self.children:
+            if not isinstance(child, DomNode):
+                continue
+            tag = child.tag
+            if tag_counts[tag] == 1:
+                child._x_path = f"{self._x_path}/{tag}"
+            else:
+                position = positions.get(tag, 0) + 1
+                positions[tag] = position
+                child._x_path = f"{self._x_path}/{tag}[{position}]"
+
+    def _invalidate_child_x_paths(self) -> None:
+        """Drop memoized XPaths below this node."""
+        stack = [child for child in self.children if isinstance(child, DomNode)]
+        while stack:
+            node = stack.pop()
+            if node._x_path is None:
+                # Descendants of a node without a cached XPath have none either
+                continue
+            node._x_path = None
+            stack.extend(child for child in node.children if isinstance(child, DomNode))
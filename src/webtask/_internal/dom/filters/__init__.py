@@ -6,8 +6,10 @@ They use knowledge functions from dom_processing.knowledge to make decisions.
 
 from .filter_non_rendered import filter_non_rendered
 from .filter_non_semantic import filter_non_semantic
+from .filter_pipeline import filter_dom_tree
 
 __all__ = [
     "filter_non_rendered",
     "filter_non_semantic",
+    "filter_dom_tree",
 ]
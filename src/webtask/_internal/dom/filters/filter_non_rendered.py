@@ -4,6 +4,12 @@ from typing import Optional, Union
 from ..domnode import DomNode, Text
 from ..knowledge import is_not_rendered, should_keep_when_not_rendered
 from ...utils.filter_tree_by_predicate import filter_tree_by_predicate
+from ...utils.filter_tree_by_stages import FilterStage
+
+
+def _should_remove(node: Union[DomNode, Text]) -> bool:
+    """Check if node should be removed (not rendered and not special)."""
+    return is_not_rendered(node) and not should_keep_when_not_rendered(node)
 
 
 def filter_non_rendered(node: DomNode) -> Optional[DomNode]:
@@ -12,9 +18,10 @@ def filter_non_rendered(node: DomNode) -> Optional[DomNode]:
     Non-rendered wrapper elements are flattened - children are promoted.
     Text nodes are always kept (they don't have rendering info).
     """
+    return filter_tree_by_predicate(node, _should_remove, on_remove="delete")
 
-    def should_remove(n: Union[DomNode, Text]) -> bool:
-        """Check if node should be removed (not rendered and not special)."""
-        return is_not_rendered(n) and not should_keep_when_not_rendered(n)
 
-    return filter_tree_by_predicate(node, should_remove, on_remove="delete")
+# filter_non_rendered as a stage for filter_tree_by_stages
+NON_RENDERED_STAGE = FilterStage(
+    should_remove=lambda node, _: _should_remove(node), on_remove="delete"
+)
@@ -1,9 +1,11 @@
 """Filter non-semantic elements and attributes."""
 
-from typing import Optional, Union
+from dataclasses import replace
+from typing import List, Optional, Union
 from ..domnode import DomNode, Text
 from ..knowledge import has_semantic_value, is_semantic_attribute
 from ...utils.filter_tree_by_predicate import filter_tree_by_predicate
+from ...utils.filter_tree_by_stages import FilterStage
 
 
 def filter_non_semantic(node: DomNode) -> Optional[DomNode]:
@@ -20,21 +22,47 @@ def filter_non_semantic(node: DomNode) -> Optional[DomNode]:
     return filter_tree_by_predicate(node, should_remove, on_remove="promote")
 
 
+def strip_non_semantic_attributes(
+    node: Union[DomNode, Text], children: List[Union[DomNode, Text]]
+) -> Union[DomNode, Text]:
+    """Copy a node with only its semantic attributes (copy_node for stages)."""
+    if isinstance(node, Text):
+        return Text(node.content)
+    # Only attrib changes; styles and metadata are shared with the input
+    # node (and memoized copies), so they are read-only from here on.
+    # Element IDs are kept in maps of their own (see LLMDomContext).
+    new_node = DomNode(
+        data=replace(
+            node.data,
+            attrib={k: v for k, v in node.attrib.items() if is_semantic_attribute(k)},
+        )
+    )
+    new_node.children = list(children)
+    return new_node
+
+
 def _remove_non_semantic_attributes(node: DomNode) -> DomNode:
     """Keep only semantic attributes."""
-    new_node = node.deepcopy()
-    new_node.attrib = {k: v for k, v in node.attrib.items() if is_semantic_attribute(k)}
+    new_root = strip_non_semantic_attributes(node, [])
+    # Explicit stack of (source, copy) pairs so deep trees don't recurse
+    stack = [(node, new_root)]
+    while stack:
+        source, new_node = stack.pop()
+        for child in source.children:
+            if not isinstance(child, (DomNode, Text)):
+                continue
+            new_child = strip_non_semantic_attributes(child, [])
+            if isinstance(child, DomNode):
+                stack.append((child, new_child))
+            new_child.parent = new_node
+            new_node.children.append(new_child)
 
-    filtered_children = []
-    for child in node.children:
-        if isinstance(child, Text):
-            filtered_children.append(Text(child.content))
-        elif isinstance(child, DomNode):
-            filtered_child = _remove_non_semantic_attributes(child)
-            filtered_children.append(filtered_child)
+    return new_root
 
-    new_node.children = filtered_children
-    for child in new_node.children:
-        child.parent = new_node
 
-    return new_node
+# Element removal of filter_non_semantic as a stage for filter_tree_by_stages.
+# has_semantic_value() only reads semantic attributes, so the predicate gives
+# the same answer before and after attribute stripping.
+NON_SEMANTIC_STAGE = FilterStage(
+    should_remove=lambda node, _: not has_semantic_value(node), on_remove="promote"
+)
@@ -0,0 +1,28 @@
+"""Fused DOM filter pipeline."""
+
+from typing import Optional, TYPE_CHECKING
+from ..domnode import DomNode
+from ...utils.filter_tree_by_stages import filter_tree_by_stages
+from .filter_non_rendered import NON_RENDERED_STAGE
+from .filter_non_semantic import NON_SEMANTIC_STAGE, strip_non_semantic_attributes
+
+if TYPE_CHECKING:
+    from ...utils.subtree_memo import SubtreeMemo
+
+DOM_FILTER_STAGES = (
+    NON_RENDERED_STAGE,
+    NON_SEMANTIC_STAGE,
+)
+
+
+def filter_dom_tree(root: DomNode, memo: Optional["SubtreeMemo"] = None) -> DomNode:
+    """
+    Filter DOM tree for LLM context in a single pass.
+
+    Same result as filter_non_rendered, then filter_non_semantic, without
+    allocating the intermediate trees. Pass a SubtreeMemo to reuse results
+    for subtrees unchanged since the previous snapshot.
+    """
+    return filter_tree_by_stages(
+        root, DOM_FILTER_STAGES, copy_node=strip_non_semantic_attributes, memo=memo
+    )
@@ -20,12 +20,14 @@ SEMANTIC_ATTRIBUTES = {
     "aria-hidden",
     "aria-disabled",
     "aria-haspopup",
+    "aria-autocomplete",
     # Form/input attributes
     "type",
     "name",
     "placeholder",
     "value",
     "accept",
+    "list",
     "alt",
     "title",
     "disabled",
@@ -2,5 +2,6 @@
 
 from .html import parse_html
 from .cdp import parse_cdp
+from .cdp_columnar import CdpNodeTable, parse_cdp_columnar
 
-__all__ = ["parse_html", "parse_cdp"]
+__all__ = ["parse_html", "parse_cdp", "CdpNodeTable", "parse_cdp_columnar"]
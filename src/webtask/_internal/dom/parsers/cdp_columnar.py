@@ -0,0 +1,330 @@
+"""Columnar CDP snapshot parser.
+
+DOMSnapshot.captureSnapshot already returns the document as a table of
+parallel arrays with every string interned in one shared list. CdpNodeTable
+keeps that table as-is and answers per-node questions by index; DomNode
+objects are only created when a tree is actually requested.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..domnode import DomNode, DomNodeData, Text, BoundingBox
+from .cdp import _get_string_resolver
+
+# Computed styles requested by DOMSnapshot.captureSnapshot, in order
+_STYLE_PROPERTIES = ("display", "visibility", "opacity")
+
+
+class CdpNodeTable:
+    """Array-backed view over the first document of a CDP DOM snapshot.
+
+    Produces the same tree as parse_cdp(), but without the intermediate
+    per-node dicts and BoundingBox objects for nodes that are never turned
+    into DomNodes (text nodes, non-element nodes, skipped layout rows).
+    Nodes with identical computed styles share one styles dict.
+    """
+
+    def __init__(self, snapshot_data: Dict[str, Any]):
+        documents = snapshot_data.get("documents", [])
+        document = documents[0] if documents else {}
+        nodes = document.get("nodes", {})
+        layout = document.get("layout", {})
+
+        self.is_empty = not documents
+        self.strings: List[str] = snapshot_data.get("strings", [])
+        self.node_types: List[int] = nodes.get("nodeType", [])
+        self.node_names: List[int] = nodes.get("nodeName", [])
+        self.node_values: List[int] = nodes.get("nodeValue", [])
+        self.parent_indices: List[int] = nodes.get("parentIndex", [])
+        self.attributes: List[List[int]] = nodes.get("attributes", [])
+        self.backend_node_ids: List[int] = nodes.get("backendNodeId", [])
+
+        # Form element values (live JS property values, not HTML attributes)
+        self._input_values = nodes.get("inputValue", {})
+        self._text_values = nodes.get("textValue", {})
+        self._input_checked = nodes.get("inputChecked", {})
+        self._option_selected = nodes.get("optionSelected", {})
+
+        self.layout_bounds: List[List[float]] = layout.get("bounds", [])
+        self.layout_styles: List[List[int]] = layout.get("styles", [])
+        # Node index -> layout row. Only rendered nodes have a row.
+        self._layout_rows: Dict[int, int] = {
+            node_idx: row for row, node_idx in enumerate(layout.get("nodeIndex", []))
+        }
+
+        self._get_string = _get_string_resolver(self.strings)
+        self._nodes: Optional[List[Optional[DomNode]]] = None
+        self._root: Optional[DomNode] = None
+        self._backend_index: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.node_types)
+
+    def string(self, index: Any) -> str:
+        """Resolve an index into the shared strings array."""
+        return self._get_string(index)
+
+    def is_element(self, index: int) -> bool:
+        return self.node_types[index] == 1
+
+    def is_rendered(self, index: int) -> bool:
+        """Whether CDP included this node in the render tree (has layout)."""
+        return index in self._layout_rows
+
+    def parent_index(self, index: int) -> Optional[int]:
+        if index < len(self.parent_indices):
+            return self.parent_indices[index]
+        return None
+
+    def backend_node_id(self, index: int) -> Optional[int]:
+        if index < len(self.backend_node_ids):
+            return self.backend_node_ids[index]
+        return None
+
+    def index_of(self, backend_node_id: int) -> Optional[int]:
+        """Find the node index for a backend node ID."""
+        if self._backend_index is None:
+            self._backend_index = {
+                backend_id: i for i, backend_id in enumerate(self.backend_node_ids)
+            }
+        return self._backend_index.get(backend_node_id)
+
+    def tag(self, index: int) -> str:
+        name_idx = self.node_names[index] if index < len(self.node_names) else None
+        return self._get_string(name_idx).lower() if name_idx is not None else "unknown"
+
+    def text(self, index: int) -> str:
+        value_idx = self.node_values[index] if index < len(self.node_values) else None
+        return self._get_string(value_idx) if value_idx is not None else ""
+
+    def attrib(self, index: int) -> Dict[str, str]:
+        """Attributes of an element, including live form values as data-*."""
+        get_string = self._get_string
+        attrib = {}
+        flat = self.attributes[index] if index < len(self.attributes) else []
+        for j in range(0, len(flat) - 1, 2):
+            name = get_string(flat[j])
+            value = get_string(flat[j + 1])
+            if name and value:
+                attrib[name] = value
+        self._add_form_values(index, attrib)
+        return attrib
+
+    def styles(self, index: int) -> Dict[str, str]:
+        row = self._layout_rows.get(index)
+        if row is None or row >= len(self.layout_styles):
+            return {}
+        styles = {}
+        for prop_name, value_idx in zip(_STYLE_PROPERTIES, self.layout_styles[row]):
+            value = self._get_string(value_idx)
+            if value:
+                styles[prop_name] = value
+        return styles
+
+    def bounds(self, index: int) -> Optional[BoundingBox]:
+        row = self._layout_rows.get(index)
+        if row is None or row >= len(self.layout_bounds):
+            return None
+        b = self.layout_bounds[row]
+        if len(b) < 4:
+            return None
+        return BoundingBox(x=b[0], y=b[1], width=b[2], height=b[3])
+
+    def materialize(self, index: int) -> DomNode:
+        """Create a standalone DomNode (no parent, no children) for an element."""
+        return DomNode(
+            tag=self.tag(index),
+            attrib=self.attrib(index),
+            styles=self.styles(index),
+            bounds=self.bounds(index),
+            backend_dom_node_id=self.backend_node_id(index),
+            metadata={"cdp_index": index},
+        )
+
+    def node(self, index: int) -> Optional[DomNode]:
+        """Get the DomNode for an element within the built tree."""
+        self.build_tree()
+        return self._nodes[index] if 0 <= index < len(self._nodes) else None
+
+    def build_tree(self) -> DomNode:
+        """Materialize the DomNode tree (once) and return its root."""
+        if self._root is not None:
+            return self._root
+
+        if self.is_empty:
+            self._nodes = []
+            self._root = DomNode(tag="html", metadata={"cdp_index": 0})
+            return self._root
+
+        nodes = self._create_element_nodes()
+        self._add_text_nodes(nodes)
+        root = self._link_elements(nodes)
+        self._nodes = nodes
+        self._root = root or DomNode(tag="html", metadata={"cdp_index": 0})
+        return self._root
+
+    def _add_form_values(self, index: int, attrib: Dict[str, str]) -> None:
+        if index in self._input_values:
+            value = self._get_string(self._input_values[index])
+            if value:
+                attrib["data-value"] = value
+        if index in self._text_values:
+            value = self._get_string(self._text_values[index])
+            if value:
+                attrib["data-value"] = value
+        if index in self._input_checked:
+            attrib["data-checked"] = str(self._input_checked[index]).lower()
+        if index in self._option_selected:
+            attrib["data-selected"] = str(self._option_selected[index]).lower()
+
+    def _create_element_nodes(self) -> List[Optional[DomNode]]:
+        """Create DomNodes for element nodes, indexed like the CDP arrays.
+
+        This is the hot loop, so string lookups are inlined. A malformed index
+        (None, float, ...) raises TypeError and falls back to materialize(),
+        which resolves strings exactly as parse_cdp() does.
+        """
+        strings = self.strings
+        num_strings = len(strings)
+        node_names = self.node_names
+        attributes = self.attributes
+        backend_node_ids = self.backend_node_ids
+        layout_rows = self._layout_rows
+        layout_bounds = self.layout_bounds
+        layout_styles = self.layout_styles
+        has_form_values = bool(
+            self._input_values
+            or self._text_values
+            or self._input_checked
+            or self._option_selected
+        )
+        num_names = len(node_names)
+        num_attributes = len(attributes)
+        num_backend_ids = len(backend_node_ids)
+        num_bounds = len(layout_bounds)
+        num_styles = len(layout_styles)
+        # Computed styles repeat across most nodes, so nodes with the same
+        # style row share one (read-only) styles dict
+        shared_styles: Dict[Tuple[Any, ...], Dict[str, str]] = {}
+
+        nodes: List[Optional[DomNode]] = [None] * len(self.node_types)
+        for i, node_type in enumerate(self.node_types):
+            if node_type != 1:
+                continue
+
+            try:
+                name_idx = node_names[i] if i < num_names else None
+                if name_idx is None:
+                    tag = "unknown"
+                elif 0 <= name_idx < num_strings:
+                    tag = strings[name_idx].lower()
+                else:
+                    tag = ""
+
+                attrib = {}
+                if i < num_attributes:
+                    flat = attributes[i]
+                    for j in range(0, len(flat) - 1, 2):
+                        name_idx = flat[j]
+                        value_idx = flat[j + 1]
+                        if 0 <= name_idx < num_strings and 0 <= value_idx < num_strings:
+                            name = strings[name_idx]
+                            value = strings[value_idx]
+                            if name and value:
+                                attrib[name] = value
+                if has_form_values:
+                    self._add_form_values(i, attrib)
+
+                bounds = None
+                styles = {}
+                row = layout_rows.get(i)
+                if row is not None:
+                    if row < num_bounds:
+                        b = layout_bounds[row]
+                        if len(b) >= 4:
+                            bounds = BoundingBox(b[0], b[1], b[2], b[3])
+                    if row < num_styles:
+                        style_key = tuple(layout_styles[row])
+                        styles = shared_styles.get(style_key)
+                        if styles is None:
+                            styles = {}
+                            for prop_name, value_idx in zip(
+                                _STYLE_PROPERTIES, style_key
+                            ):
+                                if 0 <= value_idx < num_strings:
+                                    value = strings[value_idx]
+                                    if value:
+                                        styles[prop_name] = value
+                            shared_styles[style_key] = styles
+            except TypeError:
+                nodes[i] = self.materialize(i)
+                continue
+
+            nodes[i] = DomNode(
+                data=DomNodeData(
+                    tag,
+                    attrib,
+                    styles,
+                    bounds,
+                    backend_node_ids[i] if i < num_backend_ids else None,
+                    {"cdp_index": i},
+                )
+            )
+        return nodes
+
+    def _add_text_nodes(self, nodes: List[Optional[DomNode]]) -> None:
+        """Attach non-empty text nodes to their parent elements.
+
+        Matches parse_cdp(): text children are attached before element
+        children are linked.
+        """
+        parent_indices = self.parent_indices
+        num_parents = len(parent_indices)
+        num_nodes = len(nodes)
+        for i, node_type in enumerate(self.node_types):
+            if node_type != 3:
+                continue
+            parent_idx = parent_indices[i] if i < num_parents else None
+            if parent_idx is None or not (0 <= parent_idx < num_nodes):
+                continue
+            parent = nodes[parent_idx]
+            if parent is None:
+                continue
+            content = self.text(i)
+            if content.strip():
+                text = Text(content)
+                text.parent = parent
+                parent.children.append(text)
+
+    def _link_elements(self, nodes: List[Optional[DomNode]]) -> Optional[DomNode]:
+        """Link element nodes to their parents and return the root."""
+        parent_indices = self.parent_indices
+        num_parents = len(parent_indices)
+        num_nodes = len(nodes)
+        root = None
+        first = None
+        for i, node in enumerate(nodes):
+            if node is None:
+                continue
+            if first is None:
+                first = node
+            parent_idx = parent_indices[i] if i < num_parents else None
+            if parent_idx is not None and parent_idx != -1:
+                if 0 <= parent_idx < num_nodes:
+                    parent = nodes[parent_idx]
+                    if parent is not None:
+                        node.parent = parent
+                        parent.children.append(node)
+            elif root is None:
+                root = node
+        return root or first
+
+
+def parse_cdp_columnar(snapshot_data: Dict[str, Any]) -> CdpNodeTable:
+    """
+    Parse CDP snapshot into a columnar node table.
+
+    Call build_tree() on the result to get the same DomNode tree parse_cdp()
+    would return.
+    """
+    return CdpNodeTable(snapshot_data)
@@ -13,8 +13,21 @@ def serialize_to_json(node: Union[DomNode, Text]) -> Dict[str, Any]:
     - styles (computed CSS properties from CDP)
     - bounds (bounding box: x, y, width, height)
     - metadata (extra data like element_id, original_node reference)
-    - children (recursively serialized)
+    - children (serialized with an explicit stack, so deep trees are fine)
     """
+    result = _serialize_node(node)
+    stack = [(node, result)]
+    while stack:
+        source, data = stack.pop()
+        for child in source.children:
+            child_data = _serialize_node(child)
+            data["children"].append(child_data)
+            stack.append((child, child_data))
+    return result
+
+
+def _serialize_node(node: Union[DomNode, Text]) -> Dict[str, Any]:
+    """Serialize a single node; children are filled in by serialize_to_json."""
     if isinstance(node, Text):
         return {"type": "text", "content": node.content}
 
@@ -32,11 +45,6 @@ def serialize_to_json(node: Union[DomNode, Text]) -> Dict[str, Any]:
     # Skip 'original_node' as it causes infinite recursion
     filtered_metadata = {k: v for k, v in node.metadata.items() if k != "original_node"}
 
-    # Recursively serialize children
-    children_list = []
-    for child in node.children:
-        children_list.append(serialize_to_json(child))
-
     return {
         "type": "element",
         "tag": node.tag,
@@ -44,7 +52,7 @@ def serialize_to_json(node: Union[DomNode, Text]) -> Dict[str, Any]:
         "styles": dict(node.styles),  # Computed styles from CDP
         "bounds": bounds_dict,  # Bounding box or None
         "metadata": filtered_metadata,  # Extra data (element_id, etc)
-        "children": children_list,
+        "children": [],
     }
 
 
@@ -0,0 +1,115 @@
+"""ConversionCache - reuse provider-format messages across calls of a run."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from webtask.llm.message import Content, Message, Role
+from ..utils.logger import get_logger
+
+T = TypeVar("T")
+
+# (role, id() of each content item)
+_Key = Tuple[Role, Tuple[int, ...]]
+
+
+class ConversionCache(Generic[T]):
+    """Converted form of each message, reused while its content is unchanged.
+
+    The history sent on each step of a run is the previous history plus one
+    new model/tool pair, so without a cache the whole history is converted
+    again on every call.
+
+    A message is looked up by its role and the identity of its content items
+    rather than by the message itself: lifespan purging and the token budget
+    rebuild messages with model_copy, but keep the items they don't drop.
+    Purging an item therefore changes the key, and only that message is
+    converted again. Content items are treated as immutable once they are in
+    the history.
+
+    A cache belongs to one run (see conversion_scope): only entries used by
+    the latest call are kept, so it holds at most that run's history. Runs
+    sharing an LLM instance (e.g. in an AgentPool) each get their own.
+    Entries are kept apart per converter, so LLMs of different providers (or
+    with different options) called in one run never get each other's output.
+    """
+
+    def __init__(self):
+        # converter -> key -> (content items, kept so ids aren't reused;
+        # converted message)
+        self._entries: Dict[Hashable, Dict[_Key, Tuple[Tuple[Content, ...], T]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._logger = get_logger(__name__)
+
+    def convert(
+        self,
+        messages: List[Message],
+        convert: Callable[[Message], T],
+        converter: Optional[Hashable] = None,
+    ) -> List[T]:
+        """Convert messages, reusing results from the previous call.
+
+        Args:
+            messages: Message history
+            convert: Converts one message
+            converter: Identifies what convert produces, including any
+                options bound into it (None: convert itself)
+        """
+        if converter is None:
+            converter = convert
+        previous = self._entries.get(converter, {})
+        entries: Dict[_Key, Tuple[Tuple[Content, ...], T]] = {}
+        converted = []
+        hits = self.hits
+        for msg in messages:
+            items = tuple(msg.content or ())
+            key = (msg.role, tuple(map(id, items)))
+            entry = previous.get(key) or entries.get(key)
+            if entry is None:
+                entry = (items, convert(msg))
+                self.misses += 1
+            else:
+                self.hits += 1
+            entries[key] = entry
+            converted.append(entry[1])
+        self._entries[converter] = entries
+        self._logger.debug(
+            f"Message conversion - reused {self.hits - hits} of {len(messages)} messages"
+        )
+        return converted
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries = {}
+
+
+_run_cache: ContextVar[Optional[ConversionCache[Any]]] = ContextVar(
+    "conversion_cache", default=None
+)
+
+
+@contextmanager
+def conversion_scope() -> Iterator[ConversionCache[Any]]:
+    """Give the LLM calls of the current task a fresh ConversionCache."""
+    token = _run_cache.set(ConversionCache())
+    try:
+        yield _run_cache.get()
+    finally:
+        _run_cache.reset(token)
+
+
+def current_conversion_cache() -> Optional[ConversionCache[Any]]:
+    """The cache of the enclosing conversion_scope, or None outside a run."""
+    return _run_cache.get()
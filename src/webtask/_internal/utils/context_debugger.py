@@ -79,12 +79,12 @@ def _message_to_dict(message: "Message") -> dict:
                     }
                 )
             elif isinstance(content, Image):
-                # Don't save full base64 image data, just metadata
+                # Don't save the image data, just metadata
                 result["content"].append(
                     {
                         "type": "image",
                         "mime_type": content.mime_type.value,
-                        "size": len(content.data),
+                        "size": content.size,
                     }
                 )
             elif isinstance(content, ToolCall):
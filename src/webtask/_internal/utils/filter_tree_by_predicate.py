@@ -1,9 +1,8 @@
 """Generic filter function for tree nodes (works with any tree structure)."""
 
-from typing import Callable, Optional, TypeVar, Any
+from typing import Any, Callable, List, Optional, TypeVar
 from .tree_protocol import TreeNode
 
-
 T = TypeVar("T", bound=TreeNode)
 
 
@@ -32,17 +31,8 @@ def filter_tree_by_predicate(
             f"on_remove must be 'promote', 'delete', or 'keep_wrapper', got: {on_remove}"
         )
 
-    def _filter_node(node: T) -> list[T]:
-        """Returns list of nodes (0, 1, or many)."""
-        # Check early if we should delete entire subtree
-        if on_remove == "delete" and should_remove(node):
-            # Delete node and all descendants - don't even process children
-            return []
-
-        # Bottom-up: recursively filter all children first
-        filtered_children_lists = [_filter_node(child) for child in node.children]
-        filtered_children = [c for sublist in filtered_children_lists for c in sublist]
-
+    def _resolve(node: T, filtered_children: List[T]) -> List[T]:
+        """Decide a node's output once its children are filtered (0, 1, or many)."""
         # Check if current node should be removed
         if should_remove(node):
             if on_remove == "promote":
@@ -58,7 +48,8 @@ def filter_tree_by_predicate(
                 else:
                     # It's a leaf (no children), not a wrapper - delete it
                     return []
-            # on_remove == "delete" already handled above
+            # on_remove == "delete" is handled before descending
+            return []
         else:
             # Node doesn't match predicate - keep it with filtered children
             new_node = node.copy(children=filtered_children, parent=None)
@@ -66,11 +57,26 @@ def filter_tree_by_predicate(
                 child.parent = new_node
             return [new_node]
 
-    # Filter root's children (root itself is always kept)
-    filtered_children_lists = [_filter_node(child) for child in root.children]
-    filtered_children = [c for sublist in filtered_children_lists for c in sublist]
+    # Bottom-up with an explicit stack (deep trees would exceed the recursion
+    # limit). Each frame: [node, iterator over its children, filtered children]
+    filtered_children: List[T] = []
+    stack = [[root, iter(root.children), filtered_children]]
+    while stack:
+        frame = stack[-1]
+        child = next(frame[1], None)
+        if child is not None:
+            # Check early if we should delete entire subtree
+            if on_remove == "delete" and should_remove(child):
+                # Delete node and all descendants - don't even process children
+                continue
+            stack.append([child, iter(child.children), []])
+            continue
+
+        stack.pop()
+        if stack:
+            stack[-1][2].extend(_resolve(frame[0], frame[2]))
 
-    # Return root with filtered children
+    # Return root (always kept) with filtered children
     new_root = root.copy(children=filtered_children, parent=None)
     for child in new_root.children:
         child.parent = new_root
@@ -0,0 +1,222 @@
+"""Fused multi-stage tree filter (one traversal, one output tree)."""
+
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+from .tree_protocol import TreeNode
+
+if TYPE_CHECKING:
+    from .subtree_memo import SubtreeMemo
+
+T = TypeVar("T", bound=TreeNode)
+
+_ON_REMOVE_MODES = ("promote", "delete", "keep_wrapper")
+
+
+@dataclass(frozen=True)
+class FilterStage:
+    """One filter stage: a predicate plus its on_remove behavior.
+
+    should_remove(node, context) is evaluated against the tree as it looks
+    after all earlier stages. Instead of walking node.parent, a stage that
+    needs ancestor information declares carry(node, context), which computes
+    the context handed to the node's children; the root's children receive
+    carry(root, initial). Without carry, every node sees initial.
+
+    on_remove has the same meaning as in filter_tree_by_predicate().
+    """
+
+    should_remove: Callable[[Any, Any], bool]
+    on_remove: str = "promote"
+    carry: Optional[Callable[[Any, Any], Any]] = None
+    initial: Any = None
+
+    def __post_init__(self):
+        if self.on_remove not in _ON_REMOVE_MODES:
+            raise ValueError(
+                f"on_remove must be 'promote', 'delete', or 'keep_wrapper', got: {self.on_remove}"
+            )
+
+
+# Per-stage state of a node while it is being filtered
+_KEPT = 0
+_PROMOTED = 1
+_DELETED = 2
+
+
+@dataclass(slots=True)
+class _Frame:
+    """Traversal state of one node (explicit stack instead of recursion)."""
+
+    node: Any
+    alive_until: int
+    contexts: List[Any]
+    matches: List[bool]
+    child_contexts: List[Any]
+    child_alive_until: int
+    children: Iterator[Any]
+    child_outputs: List[Any] = field(default_factory=list)
+    child_survives: List[bool] = field(default_factory=list)
+
+
+def filter_tree_by_stages(
+    root: T,
+    stages: Sequence[FilterStage],
+    copy_node: Optional[Callable[[T, List[T]], T]] = None,
+    memo: Optional["SubtreeMemo"] = None,
+) -> T:
+    """
+    Apply several filter stages in a single traversal.
+
+    The result is identical to chaining filter_tree_by_predicate() once per
+    stage, but only the final tree is allocated: earlier stages are tracked
+    as per-node state instead of materialized copies.
+
+    For every node the traversal records, per stage, whether anything derived
+    from its subtree survives that stage. keep_wrapper decisions need exactly
+    that, and later stages only ever see nodes that survived earlier ones.
+
+    Note: The root node is always kept, even if it matches a predicate.
+
+    Args:
+        root: Root node to filter (always kept)
+        stages: Stages in the order they would have been chained
+        copy_node: Builds a kept node from the input node and its filtered
+            children (default: node.copy(children=..., parent=None))
+        memo: Reuse results for subtrees unchanged since the previous snapshot
+            (memo.begin(root) must have been called). Reused output nodes are
+            re-parented into the new tree.
+    """
+    num_stages = len(stages)
+
+    def _copy(node: T, children: List[T]) -> T:
+        if copy_node is not None:
+            new_node = copy_node(node, children)
+        else:
+            new_node = node.copy(children=children, parent=None)
+        for child in new_node.children:
+            child.parent = new_node
+        return new_node
+
+    def _carry(node: T, contexts: List[Any], upto: int) -> List[Any]:
+        """Contexts for children of node, which is present in stages < upto."""
+        child_contexts = list(contexts)
+        for k in range(upto):
+            carry = stages[k].carry
+            if carry is not None:
+                child_contexts[k] = carry(node, contexts[k])
+        return child_contexts
+
+    def _enter(node: T, contexts: List[Any], alive_until: int) -> _Frame:
+        """
+        Top-down: evaluate predicates for a node alive in stages < alive_until.
+
+        keep_wrapper matches are provisional - they resolve in _exit().
+        """
+        matches = [False] * num_stages
+        removed_at = alive_until
+        for k in range(alive_until):
+            stage = stages[k]
+            if stage.should_remove(node, contexts[k]):
+                matches[k] = True
+                if stage.on_remove != "keep_wrapper":
+                    removed_at = k
+                    break
+
+        deleted = removed_at < alive_until and stages[removed_at].on_remove == "delete"
+        # The node is an ancestor of its children in every stage whose input
+        # contains it; after a promote its children move up a level.
+        present_until = removed_at + 1 if removed_at < alive_until else alive_until
+        child_alive_until = removed_at if deleted else alive_until
+        return _Frame(
+            node=node,
+            alive_until=alive_until,
+            contexts=contexts,
+            matches=matches,
+            child_contexts=_carry(node, contexts, present_until),
+            child_alive_until=child_alive_until,
+            # Children alive in no stage contribute nothing
+            children=iter(node.children) if child_alive_until else iter(()),
+            child_survives=[False] * num_stages,
+        )
+
+    def _exit(frame: _Frame) -> Tuple[List[T], List[bool]]:
+        """
+        Bottom-up: resolve the node's fate stage by stage.
+
+        Returns the nodes it contributes to the final tree, and for each stage
+        whether it contributes anything to that stage's output.
+        """
+        survives = [False] * num_stages
+        state = _KEPT
+        for k in range(frame.alive_until):
+            if state == _KEPT and frame.matches[k]:
+                on_remove = stages[k].on_remove
+                if on_remove == "promote":
+                    state = _PROMOTED
+                elif on_remove == "delete" or not frame.child_survives[k]:
+                    state = _DELETED
+                    break
+                # keep_wrapper with surviving children: still kept
+            if state == _PROMOTED:
+                survives[k] = frame.child_survives[k]
+            else:
+                survives[k] = True
+
+        if frame.alive_until < num_stages or state == _DELETED:
+            return [], survives
+        if state == _PROMOTED:
+            return frame.child_outputs, survives
+        return [_copy(frame.node, frame.child_outputs)], survives
+
+    contexts = _carry(root, [stage.initial for stage in stages], num_stages)
+    root_frame = _Frame(
+        node=root,
+        alive_until=num_stages,
+        contexts=[],
+        matches=[False] * num_stages,
+        child_contexts=contexts,
+        child_alive_until=num_stages,
+        children=iter(root.children),
+        child_survives=[False] * num_stages,
+    )
+    stack = [root_frame]
+    while stack:
+        frame = stack[-1]
+        child = next(frame.children, None)
+        if child is not None:
+            hit = None
+            if memo is not None:
+                hit = memo.lookup(child, frame.child_contexts, frame.child_alive_until)
+            if hit is None:
+                stack.append(
+                    _enter(child, frame.child_contexts, frame.child_alive_until)
+                )
+                continue
+            output, survives = hit
+        else:
+            stack.pop()
+            if not stack:
+                break
+            output, survives = _exit(frame)
+            if memo is not None:
+                memo.store(
+                    frame.node, frame.contexts, frame.alive_until, output, survives
+                )
+
+        parent = stack[-1]
+        parent.child_outputs.extend(output)
+        for k in range(parent.child_alive_until):
+            if survives[k]:
+                parent.child_survives[k] = True
+
+    return _copy(root, root_frame.child_outputs)
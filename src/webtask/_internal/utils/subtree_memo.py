@@ -0,0 +1,120 @@
+"""Reuse of per-subtree filter results across successive snapshots of a tree."""
+
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class SubtreeMemo:
+    """
+    Filter results of earlier snapshots, keyed by a stable node key.
+
+    Each snapshot parses a brand new tree, but most of it is usually identical
+    to the previous one. A subtree is considered unchanged when its node has
+    the same key (e.g. a backend node ID) and the same fingerprint: a hash of
+    content(node) for every node in the subtree, children included. Stateless
+    per-node filters give an unchanged subtree the same output, so it can be
+    reused instead of filtered again.
+
+    Usage: call begin(root) for every new snapshot, then pass the memo to
+    filter_tree_by_stages(), which calls lookup() and store().
+
+    Args:
+        key: Stable identity of a node across snapshots, or None if it has none
+        content: Hashable summary of everything filters may read from a node
+            (excluding its children)
+    """
+
+    def __init__(
+        self,
+        key: Callable[[Any], Optional[Hashable]],
+        content: Callable[[Any], Hashable],
+    ):
+        self._key = key
+        self._content = content
+        # id(node) -> (fingerprint, subtree size) for the current snapshot
+        self._fingerprints: Dict[int, Tuple[int, int]] = {}
+        # key -> (fingerprint, contexts, alive_until, output, survives)
+        self._entries: Dict[Hashable, Tuple[int, List[Any], int, List[Any], Any]] = {}
+        self.total = 0
+        self.reused = 0
+
+    @property
+    def rebuilt(self) -> int:
+        """Nodes of the current snapshot whose results were not reused."""
+        return self.total - self.reused
+
+    def begin(self, root: Any) -> None:
+        """Fingerprint a new snapshot and drop entries for nodes it lacks."""
+        order = [root]
+        stack = [iter(root.children)]
+        while stack:
+            for node in stack[-1]:
+                order.append(node)
+                if node.children:
+                    stack.append(iter(node.children))
+                    break
+            else:
+                stack.pop()
+
+        # Children come after their parent in pre-order, so reversed order
+        # sees every child before its parent
+        key = self._key
+        content = self._content
+        fingerprints: Dict[int, Tuple[int, int]] = {}
+        keys = set()
+        for node in reversed(order):
+            size = 1
+            child_hashes = []
+            for child in node.children:
+                child_hash, child_size = fingerprints[id(child)]
+                child_hashes.append(child_hash)
+                size += child_size
+            fingerprints[id(node)] = (hash((content(node), *child_hashes)), size)
+            node_key = key(node)
+            if node_key is not None:
+                keys.add(node_key)
+
+        self._fingerprints = fingerprints
+        self._entries = {k: v for k, v in self._entries.items() if k in keys}
+        self.total = len(order)
+        self.reused = 0
+
+    def lookup(
+        self, node: Any, contexts: List[Any], alive_until: int
+    ) -> Optional[Tuple[List[Any], Any]]:
+        """Earlier (output, survives) for an unchanged subtree, or None."""
+        node_key = self._key(node)
+        if node_key is None:
+            return None
+        entry = self._entries.get(node_key)
+        if entry is None:
+            return None
+        fingerprint, size = self._fingerprints[id(node)]
+        if (
+            entry[0] != fingerprint
+            or entry[2] != alive_until
+            or entry[1] != contexts[:alive_until]
+        ):
+            return None
+        self.reused += size
+        return entry[3], entry[4]
+
+    def store(
+        self,
+        node: Any,
+        contexts: List[Any],
+        alive_until: int,
+        output: List[Any],
+        survives: Any,
+    ) -> None:
+        """Record the (output, survives) just computed for a subtree."""
+        node_key = self._key(node)
+        if node_key is None:
+            return
+        fingerprint = self._fingerprints[id(node)][0]
+        self._entries[node_key] = (
+            fingerprint,
+            contexts[:alive_until],
+            alive_until,
+            output,
+            survives,
+        )
@@ -0,0 +1,38 @@
+"""Token counting for prompt budgeting."""
+
+from functools import lru_cache
+from typing import Callable
+
+from .logger import get_logger
+
+# tiktoken encoding used as a provider-neutral estimate
+ENCODING_NAME = "cl100k_base"
+
+# Characters per token when the encoding is unavailable
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _encoder() -> Callable[[str], int]:
+    """Token counter for ENCODING_NAME, or a character estimate without it.
+
+    tiktoken downloads the encoding on first use, which fails offline.
+    """
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding(ENCODING_NAME)
+    except Exception as e:
+        get_logger(__name__).warning(
+            f"tiktoken encoding {ENCODING_NAME} unavailable ({type(e).__name__}), "
+            f"estimating tokens as characters / {CHARS_PER_TOKEN}"
+        )
+        return lambda text: -(-len(text) // CHARS_PER_TOKEN)
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in text."""
+    if not text:
+        return 0
+    return _encoder()(text)
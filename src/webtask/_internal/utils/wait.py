@@ -1,8 +1,48 @@
 """Wait utilities for async operations."""
 
 import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+
+class WaitBatch:
+    """Waits deferred while a batch of actions runs, settled with one wait.
+
+    Inside defer_waits(batch), wait() records its duration instead of
+    sleeping. settle() then waits once, for the longest recorded duration,
+    so N actions that each wait after themselves pay one wait instead of N.
+    """
+
+    def __init__(self):
+        self.pending = 0.0
+        self.deferred = 0
+
+    async def settle(self) -> None:
+        """Wait for the longest deferred wait since the last settle, if any."""
+        seconds, self.pending, self.deferred = self.pending, 0.0, 0
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+
+_batch: ContextVar[Optional[WaitBatch]] = ContextVar("wait_batch", default=None)
+
+
+@contextmanager
+def defer_waits(batch: WaitBatch) -> Iterator[WaitBatch]:
+    """Record wait() calls of the current task in batch instead of sleeping."""
+    token = _batch.set(batch)
+    try:
+        yield batch
+    finally:
+        _batch.reset(token)
 
 
 async def wait(seconds: float) -> None:
-    """Wait for a specified number of seconds."""
+    """Wait for a specified number of seconds (deferred inside defer_waits)."""
+    batch = _batch.get()
+    if batch is not None:
+        batch.pending = max(batch.pending, seconds)
+        batch.deferred += 1
+        return
     await asyncio.sleep(seconds)
@@ -2,6 +2,17 @@
 
 from .agent import Agent
 from .result import Result, Verdict
+from .pool import AgentPool, PoolTask, PoolResult
 from ..llm.tool import Tool
+from .._internal.context.screenshot import ScreenshotOptions
 
-__all__ = ["Agent", "Result", "Verdict", "Tool"]
+__all__ = [
+    "Agent",
+    "Result",
+    "Verdict",
+    "Tool",
+    "ScreenshotOptions",
+    "AgentPool",
+    "PoolTask",
+    "PoolResult",
+]
@@ -32,6 +32,7 @@ from webtask.exceptions import TaskAbortedError
 from webtask.constants import DEFAULT_WAIT_AFTER_ACTION, DEFAULT_TYPING_DELAY
 from .result import Result, Verdict
 from webtask._internal.agent.agent_browser import AgentBrowser
+from webtask._internal.context.screenshot import ScreenshotOptions
 from webtask._internal.prompts.worker_prompt import build_worker_prompt
 
 
@@ -56,6 +57,10 @@ class Agent:
         mode: str = "dom",
         wait_after_action: float = DEFAULT_WAIT_AFTER_ACTION,
         typing_delay: float = DEFAULT_TYPING_DELAY,
+        viewport_window: bool = False,
+        max_context_tokens: Optional[int] = None,
+        screenshot_options: Optional[ScreenshotOptions] = None,
+        parse_in: str = "inline",
     ):
         """
         Initialize agent.
@@ -66,6 +71,21 @@ class Agent:
             mode: Agent mode - "dom" (element IDs) or "pixel" (screen coordinates)
             wait_after_action: Wait time in seconds after each action (default: 1.0)
             typing_delay: Delay between keystrokes in milliseconds (default: 80)
+            viewport_window: Only show elements inside or near the viewport in
+                the DOM context, summarizing the rest (default: False)
+            max_context_tokens: Token budget for every LLM prompt. Older page
+                context is dropped first, then page text, then page elements
+                (default: None, no limit)
+            screenshot_options: Downscaling, encoding and dedup of the
+                screenshots sent to the LLM (default: None, full-size PNG)
+            parse_in: Where page snapshots are parsed and serialized -
+                "inline" (on the event loop), "thread" or "process" (in a
+                pool shared by all agents, keeping the event loop responsive
+                when many agents run at once) (default: "inline"). The pools
+                are shut down when the last open Webtask closes (or by
+                shutdown_parse_executors()). "process" starts workers with
+                spawn, which imports the main module again, so the script
+                must create agents under `if __name__ == "__main__":`.
         """
         if mode not in self.VALID_MODES:
             raise ValueError(
@@ -77,13 +97,21 @@ class Agent:
         self.mode = mode
         self.wait_after_action = wait_after_action
         self.typing_delay = typing_delay
+        self.viewport_window = viewport_window
+        self.max_context_tokens = max_context_tokens
         self.logger = logging.getLogger(__name__)
 
         # Get coordinate_scale from LLM if available (e.g., GeminiComputerUse)
         coordinate_scale = getattr(llm, "coordinate_scale", None)
 
         # Create AgentBrowser once - shared across all do() calls
-        self.browser = AgentBrowser(context=context, coordinate_scale=coordinate_scale)
+        self.browser = AgentBrowser(
+            context=context,
+            coordinate_scale=coordinate_scale,
+            viewport_window=viewport_window,
+            screenshot_options=screenshot_options,
+            parse_in=parse_in,
+        )
 
         # Accumulates runs from all do() calls for multi-turn conversations
         self._previous_runs: List[Run] = []
@@ -130,6 +158,9 @@ class Agent:
             TypeTool(self.browser, wait_after_action, typing_delay),
             SelectTool(self.browser, wait_after_action),
         ]
+        # With a windowed context, the agent scrolls to see the rest of the page
+        if self.viewport_window:
+            dom_tools.append(ScrollDocumentTool(self.browser, wait_after_action))
 
         # Pixel mode: coordinate-based tools
         pixel_tools: List[Tool] = [
@@ -233,6 +264,7 @@ class Agent:
             tools=tools,
             get_context=get_context,
             system_prompt=build_worker_prompt(),
+            max_context_tokens=self.max_context_tokens,
         )
 
         run = await task_runner.run(
@@ -416,7 +448,7 @@ class Agent:
         """
         from webtask._internal.agent.selector import Selector
 
-        selector = Selector(self.llm, self.browser)
+        selector = Selector(self.llm, self.browser, self.max_context_tokens)
         return await selector.select(description, max_steps)
 
     async def goto(self, url: str) -> None:
@@ -0,0 +1,312 @@
+"""AgentPool - run many tasks in parallel over one browser with bounded concurrency."""
+
+import asyncio
+import logging
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from webtask.constants import DEFAULT_TYPING_DELAY, DEFAULT_WAIT_AFTER_ACTION
+from webtask.exceptions import WebtaskError
+from webtask.llm import LLM
+from webtask.llm.message import Content, Message
+from .agent import Agent
+from .result import Result
+
+if TYPE_CHECKING:
+    from webtask.llm.tool import Tool
+    from webtask.webtask import Webtask
+
+
+@dataclass
+class PoolTask:
+    """A task for AgentPool.
+
+    Attributes:
+        task: Task description in natural language
+        url: Page to open before the task (None: stay on the current page)
+        max_steps: Maximum number of steps
+        output_schema: Optional Pydantic model for structured output
+        files: Optional list of file paths for upload
+    """
+
+    task: str
+    url: Optional[str] = None
+    max_steps: int = 20
+    output_schema: Optional[Type[BaseModel]] = None
+    files: Optional[List[str]] = None
+
+
+@dataclass
+class PoolResult:
+    """Outcome of one pool task.
+
+    Attributes:
+        index: Position of the task in the input
+        task: The task
+        result: Result of agent.do(), or None if it raised
+        error: Exception raised by the task, if any
+        wait_seconds: Time from the start of the pool run until an agent
+            picked the task up
+        duration_seconds: Time the task ran (including opening url)
+    """
+
+    index: int
+    task: PoolTask
+    result: Optional[Result] = None
+    error: Optional[BaseException] = None
+    wait_seconds: float = 0.0
+    duration_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the task completed without raising."""
+        return self.error is None
+
+
+class _BoundedLLM(LLM):
+    """LLM wrapper that lets at most a semaphore's worth of calls run at once."""
+
+    def __init__(self, llm: LLM, semaphore: asyncio.Semaphore):
+        super().__init__()
+        self._llm = llm
+        self._semaphore = semaphore
+        # Agent reads coordinate_scale from its LLM (e.g. GeminiComputerUse)
+        self.coordinate_scale = getattr(llm, "coordinate_scale", None)
+
+    async def call_tools(self, messages: List[Message], tools: List["Tool"]) -> Message:
+        async with self._semaphore:
+            return await self._llm.call_tools(messages, tools)
+
+    async def stream_tools(
+        self, messages: List[Message], tools: List["Tool"]
+    ) -> AsyncIterator[Content]:
+        """Yield items as they arrive, holding a slot only while the provider streams.
+
+        The consumer runs tool calls (browser actions and their waits) while
+        it iterates, so the response is read by a separate task: tool calls
+        still start before the response ends, and the slot is freed when the
+        response ends rather than when the consumer is done with it.
+        """
+        items: asyncio.Queue = asyncio.Queue()
+        end = object()
+
+        async def read() -> None:
+            async with self._semaphore:
+                async with aclosing(self._llm.stream_tools(messages, tools)) as stream:
+                    async for item in stream:
+                        items.put_nowait(item)
+
+        reader = asyncio.create_task(read())
+        reader.add_done_callback(lambda _: items.put_nowait(end))
+        try:
+            while (item := await items.get()) is not end:
+                yield item
+            # Raise what ended the stream, if it failed
+            reader.result()
+        finally:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+
+
+class AgentPool:
+    """Runs tasks in parallel on agents with their own contexts of one browser.
+
+    At most max_contexts agents (each with its own browser context) run at
+    once. An agent that finishes a task takes the next queued one, keeping
+    its warm context (cookies, cache, open page) but not its conversation
+    history. Agents are created on demand, so fewer tasks than max_contexts
+    create fewer contexts. LLM calls of all agents share a limit of
+    max_llm_calls in flight.
+
+    An agent whose task raised something other than a WebtaskError (e.g. a
+    crashed page) is closed and replaced by a new one.
+
+    Example:
+        >>> async with AgentPool(wt, llm, max_contexts=4, max_llm_calls=2) as pool:
+        ...     async for done in pool.run(["Find the cheapest laptop", ...]):
+        ...         print(done.index, done.ok, f"{done.duration_seconds:.1f}s")
+    """
+
+    def __init__(
+        self,
+        webtask: "Webtask",
+        llm: LLM,
+        max_contexts: int = 4,
+        max_llm_calls: Optional[int] = None,
+        mode: str = "dom",
+        wait_after_action: float = DEFAULT_WAIT_AFTER_ACTION,
+        typing_delay: float = DEFAULT_TYPING_DELAY,
+        headless: bool = True,
+        browser_type: str = "chromium",
+    ):
+        """Initialize AgentPool.
+
+        Args:
+            webtask: Webtask whose browser the contexts are created in
+            llm: LLM shared by all agents
+            max_contexts: Maximum number of contexts (and tasks) at once
+            max_llm_calls: Maximum number of LLM calls in flight at once
+                (None: up to max_contexts)
+            mode: Agent mode - "dom" or "pixel"
+            wait_after_action: Wait time in seconds after each action
+            typing_delay: Delay between keystrokes in milliseconds
+            headless: Run the browser without GUI, if the pool launches it
+                (default: True)
+            browser_type: Browser type, if the pool launches it
+        """
+        if max_contexts < 1:
+            raise ValueError("max_contexts must be at least 1")
+        if max_llm_calls is not None and max_llm_calls < 1:
+            raise ValueError("max_llm_calls must be at least 1")
+
+        self.webtask = webtask
+        self.max_contexts = max_contexts
+        self.max_llm_calls = max_llm_calls
+        self._llm = (
+            _BoundedLLM(llm, asyncio.Semaphore(max_llm_calls))
+            if max_llm_calls is not None
+            else llm
+        )
+        self._agent_options = {
+            "mode": mode,
+            "wait_after_action": wait_after_action,
+            "typing_delay": typing_delay,
+            "headless": headless,
+            "browser_type": browser_type,
+        }
+        self._idle: List[Agent] = []
+        self._agents: List[Agent] = []
+        self._workers: List[asyncio.Task] = []
+        # The browser is launched by the first create_agent, so create one at a time
+        self._create_lock = asyncio.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    async def run(
+        self, tasks: Iterable[Union[str, PoolTask]]
+    ) -> AsyncIterator[PoolResult]:
+        """Run tasks, yielding each result as it completes.
+
+        Tasks are started in input order. A failed task is reported in its
+        result (error) and doesn't stop the others. Closing the iterator
+        early (e.g. with contextlib.aclosing) or closing the pool cancels
+        the running tasks.
+
+        Args:
+            tasks: Task descriptions or PoolTasks
+
+        Yields:
+            PoolResult per task, in completion order
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for index, task in enumerate(tasks):
+            queue.put_nowait(
+                (index, task if isinstance(task, PoolTask) else PoolTask(task))
+            )
+        total = queue.qsize()
+        if not total:
+            return
+
+        results: asyncio.Queue = asyncio.Queue()
+        started = time.perf_counter()
+        workers = [
+            asyncio.create_task(self._worker(queue, results, started))
+            for _ in range(min(self.max_contexts, total))
+        ]
+        self._workers.extend(workers)
+        self.logger.info(f"Agent pool - {total} tasks on {len(workers)} contexts")
+        try:
+            for _ in range(total):
+                yield await results.get()
+        finally:
+            await self._cancel(workers)
+
+    async def close(self) -> None:
+        """Cancel running tasks and close the contexts of all pool agents."""
+        await self._cancel(self._workers)
+        agents, self._agents, self._idle = self._agents, [], []
+        for agent in agents:
+            await agent.context.close()
+
+    async def __aenter__(self) -> "AgentPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    ### Helper methods ###
+
+    async def _worker(
+        self, queue: asyncio.Queue, results: asyncio.Queue, started: float
+    ) -> None:
+        """Take tasks off the queue and run them on one agent at a time."""
+        while not queue.empty():
+            index, task = queue.get_nowait()
+            picked_up = time.perf_counter()
+            outcome = PoolResult(
+                index=index, task=task, wait_seconds=picked_up - started
+            )
+            agent = None
+            try:
+                # A failed create (e.g. the browser doesn't launch) fails this
+                # task only; the next task tries again
+                agent = await self._acquire()
+                if task.url:
+                    await agent.goto(task.url)
+                outcome.result = await agent.do(
+                    task.task,
+                    max_steps=task.max_steps,
+                    output_schema=task.output_schema,
+                    files=task.files,
+                )
+            except Exception as e:
+                outcome.error = e
+            outcome.duration_seconds = time.perf_counter() - picked_up
+            self.logger.info(
+                f"Agent pool - task {index} "
+                f"{'done' if outcome.ok else 'failed'} "
+                f"in {outcome.duration_seconds:.2f}s"
+            )
+            if agent is not None:
+                await self._release(agent, outcome.error)
+            results.put_nowait(outcome)
+
+    async def _cancel(self, workers: List[asyncio.Task]) -> None:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._workers = [w for w in self._workers if w not in workers]
+
+    async def _acquire(self) -> Agent:
+        """A warm idle agent, or a new one with its own context."""
+        if self._idle:
+            return self._idle.pop()
+        async with self._create_lock:
+            agent = await self.webtask.create_agent(
+                llm=self._llm, **self._agent_options
+            )
+        self._agents.append(agent)
+        return agent
+
+    async def _release(self, agent: Agent, error: Optional[BaseException]) -> None:
+        """Keep the agent for the next task, or close it if it may be broken."""
+        if error is not None and not isinstance(error, WebtaskError):
+            self._agents.remove(agent)
+            try:
+                await agent.context.close()
+            except Exception as e:
+                self.logger.warning(f"Agent pool - could not close agent context: {e}")
+            return
+        agent.clear_history()
+        self._idle.append(agent)
@@ -95,6 +95,27 @@ class Page(ABC):
         """
         pass
 
+    async def select_by_backend_node_id(
+        self, backend_node_id: int, keep: bool = False
+    ) -> Optional[Element]:
+        """
+        Select the element with a CDP backend node ID.
+
+        Backend node IDs come from DOM snapshots (DomNode.backend_dom_node_id)
+        and identify a node directly, without re-evaluating a selector.
+        Implementations without CDP access return None.
+
+        Args:
+            backend_node_id: CDP backendNodeId of the element
+            keep: Whether the element stays usable after the next DOM
+                snapshot (e.g. one handed to the user); otherwise it may be
+                freed then
+
+        Returns:
+            Element, or None if the node no longer exists (or lookup is unsupported)
+        """
+        return None
+
     @abstractmethod
     async def close(self):
         """Close the page."""
@@ -2,12 +2,14 @@
 
 from .playwright_browser import PlaywrightBrowser
 from .playwright_context import PlaywrightContext
+from .playwright_context_pool import PlaywrightContextPool
 from .playwright_page import PlaywrightPage
 from .playwright_element import PlaywrightElement
 
 __all__ = [
     "PlaywrightBrowser",
     "PlaywrightContext",
+    "PlaywrightContextPool",
     "PlaywrightPage",
     "PlaywrightElement",
 ]
@@ -1,8 +1,12 @@
 """Playwright browser implementation."""
 
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
 from playwright.async_api import async_playwright, Browser as PlaywrightBrowserType
 from ....browser import Browser
 
+if TYPE_CHECKING:
+    from .playwright_context_pool import PlaywrightContextPool
+
 
 class PlaywrightBrowser(Browser):
     """
@@ -118,12 +122,14 @@ class PlaywrightBrowser(Browser):
             return PlaywrightContext(contexts[0])
         return None
 
-    async def create_context(self, cookies=None):
+    async def create_context(self, cookies=None, **options):
         """
         Create a new context in this browser.
 
         Args:
             cookies: Optional list of cookies for the context
+            **options: Options for Playwright's new_context (e.g.
+                storage_state, viewport, user_agent)
 
         Returns:
             PlaywrightContext instance
@@ -135,7 +141,7 @@ class PlaywrightBrowser(Browser):
         """
         from .playwright_context import PlaywrightContext
 
-        browser_context = await self._browser.new_context()
+        browser_context = await self._browser.new_context(**options)
 
         # Set cookies if provided
         if cookies:
@@ -146,6 +152,53 @@ class PlaywrightBrowser(Browser):
 
         return PlaywrightContext(browser_context)
 
+    async def create_context_pool(
+        self,
+        size: int = 4,
+        max_uses: int = 50,
+        preopen_pages: int = 1,
+        warm_url: Optional[str] = None,
+        storage_state: Optional[Union[str, Dict[str, Any]]] = None,
+        health_check_timeout: float = 5.0,
+        **context_options,
+    ) -> "PlaywrightContextPool":
+        """
+        Create a pool of warm contexts in this browser and fill it.
+
+        Args:
+            size: Number of warm contexts to keep ready
+            max_uses: Close a context after this many uses instead of recycling it
+            preopen_pages: Pages to keep open in each context
+            warm_url: URL the pre-opened pages load (default: about:blank)
+            storage_state: Storage state (path or dict) every context starts with
+            health_check_timeout: Seconds a context may take to respond
+                before it counts as unhealthy
+            **context_options: Other options for Playwright's new_context
+
+        Returns:
+            Started PlaywrightContextPool
+
+        Example:
+            >>> pool = await browser.create_context_pool(size=4, warm_url="https://shop.example.com")
+            >>> async with pool.context() as context:
+            ...     agent = wt.create_agent_with_page(llm=llm, page=context.pages[0])
+            ...     await agent.do("Add a laptop to the cart")
+        """
+        from .playwright_context_pool import PlaywrightContextPool
+
+        pool = PlaywrightContextPool(
+            self,
+            size=size,
+            max_uses=max_uses,
+            preopen_pages=preopen_pages,
+            warm_url=warm_url,
+            storage_state=storage_state,
+            health_check_timeout=health_check_timeout,
+            **context_options,
+        )
+        await pool.start()
+        return pool
+
     async def close(self):
         """Close the Playwright browser instance."""
         if self._browser:
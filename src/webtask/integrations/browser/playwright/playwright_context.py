@@ -40,6 +40,11 @@ class PlaywrightContext(Context):
         """
         return self._context.pages
 
+    @property
+    def browser_context(self) -> BrowserContext:
+        """The wrapped Playwright BrowserContext."""
+        return self._context
+
     async def create_page(self) -> "PlaywrightPage":
         """
         Create a new page/tab in this context.
@@ -0,0 +1,345 @@
+"""Playwright context pool - warm, recycled browser contexts."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+
+from ...._internal.utils.logger import get_logger
+from .playwright_context import PlaywrightContext
+from .playwright_page import detach_cdp_sessions
+
+if TYPE_CHECKING:
+    from .playwright_browser import PlaywrightBrowser
+
+# Served instead of an origin's page while its storage is cleared, so none of
+# its scripts run
+_BLANK_PAGE = "<!DOCTYPE html><title></title>"
+
+# Clears the page origin's storage and puts back what the storage state preloads
+_RESET_STORAGE_JS = """(preloaded) => {
+    try {
+        localStorage.clear();
+        sessionStorage.clear();
+        for (const item of preloaded[location.origin] || []) {
+            localStorage.setItem(item.name, item.value);
+        }
+    } catch (e) {}
+}"""
+
+
+@dataclass
+class _PooledContext:
+    context: PlaywrightContext
+    uses: int = 0
+    # Created because all pool contexts were in use, closed on release
+    extra: bool = False
+    # Origins any frame of the context navigated to since the last reset
+    origins: Set[str] = field(default_factory=set)
+
+
+class PlaywrightContextPool:
+    """
+    Pool of warm browser contexts that are recycled instead of closed.
+
+    Owns `size` contexts, each with `preopen_pages` pages open (on
+    `warm_url`, if given) and the given storage state loaded. `acquire()`
+    hands out a ready one after a health check; if all are in use, an extra
+    context is created on the spot and closed on release. `release()` resets
+    a pool context and makes it ready again:
+
+    - pages beyond the pre-opened ones are closed, and the CDP sessions
+      opened on the pre-opened ones detached
+    - cookies and permissions are cleared, then the preloaded cookies and
+      the permissions given in the context options granted again
+    - local and session storage of every origin the context visited are
+      cleared (on a blank stand-in page of the origin, so none of its scripts
+      run), then the preloaded items of that origin restored
+    - pages load `warm_url` (or about:blank) again, without the previous
+      task's cookies or storage
+
+    The HTTP cache survives the reset, which is what keeps the first load of
+    the next task warm. Other state of visited origins (e.g. IndexedDB,
+    service workers) survives too, so a recycled context doesn't isolate
+    tasks as fully as a new one; `max_uses` bounds how long that state can
+    build up, after which the context is closed and replaced by a fresh one.
+
+    Example:
+        >>> pool = await browser.create_context_pool(size=4, warm_url="https://shop.example.com")
+        >>> context = await pool.acquire()
+        >>> agent = wt.create_agent_with_page(llm=llm, page=context.pages[0])
+        >>> await agent.do("Add a laptop to the cart")
+        >>> await pool.release(context)
+    """
+
+    def __init__(
+        self,
+        browser: "PlaywrightBrowser",
+        size: int = 4,
+        max_uses: int = 50,
+        preopen_pages: int = 1,
+        warm_url: Optional[str] = None,
+        storage_state: Optional[Union[str, Dict[str, Any]]] = None,
+        health_check_timeout: float = 5.0,
+        **context_options,
+    ):
+        """
+        Initialize PlaywrightContextPool (use browser.create_context_pool instead).
+
+        Args:
+            browser: Browser the contexts are created in
+            size: Number of warm contexts to keep ready
+            max_uses: Close a context after this many uses instead of recycling it
+            preopen_pages: Pages to keep open in each context
+            warm_url: URL the pre-opened pages load (default: about:blank)
+            storage_state: Storage state (path to a JSON file or dict, as saved
+                by Playwright's storage_state()) every context starts with
+            health_check_timeout: Seconds a context may take to respond
+                before it counts as unhealthy
+            **context_options: Other options for Playwright's new_context
+        """
+        if size < 0:
+            raise ValueError("size must not be negative")
+        if max_uses < 1:
+            raise ValueError("max_uses must be at least 1")
+
+        if isinstance(storage_state, str):
+            with open(storage_state) as f:
+                storage_state = json.load(f)
+
+        self.browser = browser
+        self.size = size
+        self.max_uses = max_uses
+        self.preopen_pages = preopen_pages
+        self.warm_url = warm_url
+        self.storage_state = storage_state
+        self.health_check_timeout = health_check_timeout
+        self._context_options = dict(context_options)
+        if storage_state is not None:
+            self._context_options["storage_state"] = storage_state
+        self._preloaded_storage = {
+            origin["origin"]: origin.get("localStorage", [])
+            for origin in (storage_state or {}).get("origins", [])
+        }
+
+        self._idle: List[_PooledContext] = []
+        self._in_use: Dict[int, _PooledContext] = {}
+        self._refills: Set[asyncio.Task] = set()
+        self._closed = False
+        self._stats = {
+            "created": 0,
+            "warm": 0,
+            "cold": 0,
+            "recycled": 0,
+            "retired": 0,
+            "unhealthy": 0,
+        }
+        self._logger = get_logger(__name__)
+
+    async def start(self) -> None:
+        """Create contexts until `size` are ready."""
+        missing = self.size - len(self._idle)
+        if missing > 0:
+            entries = await asyncio.gather(*(self._create() for _ in range(missing)))
+            self._idle.extend(entries)
+
+    async def acquire(self) -> PlaywrightContext:
+        """Take a ready context, or create one if none is ready (or healthy)."""
+        if self._closed:
+            raise RuntimeError("Context pool is closed")
+        while self._idle:
+            entry = self._idle.pop()
+            if await self._is_healthy(entry):
+                self._stats["warm"] += 1
+                break
+            self._stats["unhealthy"] += 1
+            self._logger.debug("Context pool - discarded unhealthy context")
+            await self._discard(entry)
+            self._refill()
+        else:
+            extra = self._owned() >= self.size
+            entry = await self._create()
+            entry.extra = extra
+            self._stats["cold"] += 1
+        entry.uses += 1
+        self._in_use[id(entry.context)] = entry
+        return entry.context
+
+    async def release(self, context: PlaywrightContext) -> None:
+        """Reset a context from acquire() and make it ready again.
+
+        The context is closed instead if it is an extra one beyond `size`,
+        reached max_uses or fails to reset; the latter two are replaced by
+        fresh contexts in the background.
+        """
+        entry = self._in_use.pop(id(context), None)
+        if entry is None:
+            raise ValueError("Context was not acquired from this pool")
+        if self._closed or entry.extra:
+            await self._discard(entry)
+            return
+        if entry.uses >= self.max_uses:
+            self._stats["retired"] += 1
+            self._logger.debug(
+                f"Context pool - retired context after {entry.uses} uses"
+            )
+            await self._discard(entry)
+            self._refill()
+            return
+        try:
+            await self._reset(entry)
+        except Exception as e:
+            self._stats["unhealthy"] += 1
+            self._logger.debug(f"Context pool - reset failed, discarding: {e}")
+            await self._discard(entry)
+            self._refill()
+            return
+        self._stats["recycled"] += 1
+        self._idle.append(entry)
+
+    @asynccontextmanager
+    async def context(self) -> AsyncIterator[PlaywrightContext]:
+        """Acquire a context for the duration of an async with block."""
+        context = await self.acquire()
+        try:
+            yield context
+        finally:
+            await self.release(context)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Contexts created, acquisitions served warm or cold, recycled, retired
+        and found unhealthy so far, plus how many are ready and in use."""
+        return {**self._stats, "idle": len(self._idle), "in_use": len(self._in_use)}
+
+    async def close(self) -> None:
+        """Close all contexts of the pool, including ones still in use."""
+        self._closed = True
+        for task in list(self._refills):
+            task.cancel()
+        await asyncio.gather(*self._refills, return_exceptions=True)
+        entries = self._idle + list(self._in_use.values())
+        self._idle, self._in_use = [], {}
+        await asyncio.gather(
+            *(self._discard(entry) for entry in entries), return_exceptions=True
+        )
+
+    ### Helper methods ###
+
+    async def _create(self) -> _PooledContext:
+        context = await self.browser.create_context(**self._context_options)
+        self._stats["created"] += 1
+        entry = _PooledContext(context)
+        context.browser_context.on("page", lambda page: self._track(entry, page))
+        await self._open_pages(entry)
+        return entry
+
+    @staticmethod
+    def _track(entry: _PooledContext, page) -> None:
+        """Record the origins the page's frames navigate to."""
+
+        def on_navigated(frame) -> None:
+            url = urlsplit(frame.url)
+            if url.scheme in ("http", "https"):
+                entry.origins.add(f"{url.scheme}://{url.netloc}")
+
+        page.on("framenavigated", on_navigated)
+
+    async def _open_pages(self, entry: _PooledContext) -> None:
+        """Open missing pre-opened pages and load warm_url in new ones."""
+        while len(entry.context.pages) < self.preopen_pages:
+            page = await entry.context.create_page()
+            if self.warm_url:
+                await page.goto(self.warm_url)
+
+    async def _reset(self, entry: _PooledContext) -> None:
+        raw = entry.context.browser_context
+        pages = list(raw.pages)
+        for page in pages[self.preopen_pages :]:
+            await page.close()
+        kept = [page for page in pages[: self.preopen_pages] if not page.is_closed()]
+        # Every task wraps the kept pages anew, each wrapper with its own session
+        await asyncio.gather(*(detach_cdp_sessions(page) for page in kept))
+        # Cookies first, so nothing below loads with the previous task's session
+        await raw.clear_cookies()
+        await raw.clear_permissions()
+        permissions = self._context_options.get("permissions")
+        if permissions:
+            await raw.grant_permissions(permissions)
+        cookies = (self.storage_state or {}).get("cookies")
+        if cookies:
+            await raw.add_cookies(cookies)
+        # Session storage is per tab, so every kept page visits every origin
+        for page in kept:
+            for origin in sorted(entry.origins):
+                await self._clear_storage(page, origin)
+        entry.origins.clear()
+        for page in kept:
+            await page.goto(self.warm_url or "about:blank")
+        await self._open_pages(entry)
+
+    async def _clear_storage(self, page, origin: str) -> None:
+        """Clear an origin's storage on a blank stand-in page of the origin."""
+        url = f"{origin}/"
+
+        async def serve_blank(route) -> None:
+            await route.fulfill(content_type="text/html", body=_BLANK_PAGE)
+
+        await page.route(url, serve_blank)
+        try:
+            await page.goto(url)
+            await page.evaluate(_RESET_STORAGE_JS, self._preloaded_storage)
+        finally:
+            await page.unroute(url, serve_blank)
+
+    async def _is_healthy(self, entry: _PooledContext) -> bool:
+        """Whether the context's pages are open and the browser answers."""
+        raw = entry.context.browser_context
+        try:
+            pages = raw.pages
+            if any(page.is_closed() for page in pages):
+                return False
+            probe = pages[0].evaluate("1") if pages else raw.cookies()
+            await asyncio.wait_for(probe, self.health_check_timeout)
+            return True
+        except Exception:
+            return False
+
+    async def _discard(self, entry: _PooledContext) -> None:
+        try:
+            await entry.context.close()
+        except Exception as e:
+            self._logger.debug(f"Context pool - could not close context: {e}")
+
+    def _owned(self) -> int:
+        """Contexts ready, in use or being created."""
+        return len(self._idle) + len(self._in_use) + len(self._refills)
+
+    def _refill(self) -> None:
+        """Create contexts in the background until the pool owns `size` again."""
+        missing = self.size - self._owned()
+        for _ in range(max(0, missing)):
+            task = asyncio.create_task(self._refill_one())
+            self._refills.add(task)
+            task.add_done_callback(self._refills.discard)
+
+    async def _refill_one(self) -> None:
+        try:
+            entry = await self._create()
+        except Exception as e:
+            self._logger.debug(f"Context pool - could not create context: {e}")
+            return
+        if self._closed:
+            await self._discard(entry)
+            return
+        self._idle.append(entry)
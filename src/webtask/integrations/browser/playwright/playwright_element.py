@@ -1,7 +1,7 @@
 """Playwright element implementation."""
 
 from typing import List, Optional, Union
-from playwright.async_api import Locator
+from playwright.async_api import ElementHandle, Locator
 from ....browser import Element
 
 # Timeout for element actions (ms) - fail fast but allow for navigation
@@ -15,7 +15,7 @@ class PlaywrightElement(Element):
     Wraps Playwright's Locator/ElementHandle for element interaction.
     """
 
-    def __init__(self, locator: Locator):
+    def __init__(self, locator: Union[Locator, ElementHandle]):
         """
         Initialize PlaywrightElement.
 
@@ -88,6 +88,10 @@ class PlaywrightElement(Element):
         Returns:
             Parent PlaywrightElement or None if no parent (e.g., root element)
         """
+        if isinstance(self._locator, ElementHandle):
+            parent = await self._locator.query_selector("xpath=..")
+            return PlaywrightElement(parent) if parent is not None else None
+
         # Get parent using XPath
         parent_locator = self._locator.locator("xpath=..")
         count = await parent_locator.count()
@@ -102,6 +106,10 @@ class PlaywrightElement(Element):
         Returns:
             List of child PlaywrightElements (may be empty)
         """
+        if isinstance(self._locator, ElementHandle):
+            children = await self._locator.query_selector_all("xpath=./*")
+            return [PlaywrightElement(child) for child in children]
+
         # Get all direct child elements using XPath
         children_locator = self._locator.locator("xpath=./*")
         count = await children_locator.count()
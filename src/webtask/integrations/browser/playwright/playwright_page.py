@@ -1,8 +1,16 @@
 """Playwright page implementation."""
 
+import asyncio
+import secrets
+from weakref import WeakKeyDictionary, WeakValueDictionary
 from typing import TYPE_CHECKING, Dict, Any, List, Union, Optional
 from pathlib import Path
-from playwright.async_api import Page as PlaywrightPageType
+from playwright.async_api import (
+    CDPSession,
+    ElementHandle,
+    Error as PlaywrightError,
+    Page as PlaywrightPageType,
+)
 from ....browser import Page
 from ...._internal.utils.url import normalize_url
 from ...._internal.dom import XPath
@@ -10,6 +18,54 @@ from ...._internal.dom import XPath
 if TYPE_CHECKING:
     from .playwright_element import PlaywrightElement
 
+# Parts of CDP error messages meaning the session itself is gone (closed,
+# crashed or detached target), as opposed to a failed command
+_STALE_SESSION_ERRORS = ("closed", "crash", "detached", "no session", "no target")
+
+# Called on a DOM.resolveNode object: put it on window under a symbol that
+# isn't enumerable and is only there until taken, unless it has been
+# detached from the document since the snapshot
+_PARK_ELEMENT_JS = """function (key) {
+    if (!(this instanceof Element) || !this.isConnected) return false;
+    Object.defineProperty(window, Symbol.for(key), {
+        value: this,
+        configurable: true,
+    });
+    return true;
+}"""
+
+# Take a parked element back off window
+_TAKE_ELEMENT_JS = """(key) => {
+    const symbol = Symbol.for(key);
+    const element = window[symbol];
+    delete window[symbol];
+    return element;
+}"""
+
+
+# Live wrappers of each Playwright page by id() (wrappers of one page compare
+# equal), whose CDP sessions outlive any one of them (e.g. on a pooled page
+# that agent after agent wraps)
+_wrappers: (
+    "WeakKeyDictionary[PlaywrightPageType, WeakValueDictionary[int, PlaywrightPage]]"
+) = WeakKeyDictionary()
+
+
+def _on_crash(page: PlaywrightPageType) -> None:
+    """Drop the CDP sessions of every wrapper of a crashed page.
+
+    Registered once per page, and holding no wrapper, so pages that agent
+    after agent wraps don't pile up listeners or keep old wrappers alive.
+    """
+    for wrapper in list(_wrappers.get(page, {}).values()):
+        wrapper._cdp_session = None
+
+
+async def detach_cdp_sessions(page: PlaywrightPageType) -> None:
+    """Detach the CDP sessions of every PlaywrightPage wrapping a page."""
+    wrappers = list(_wrappers.get(page, {}).values())
+    await asyncio.gather(*(wrapper._detach_cdp_session() for wrapper in wrappers))
+
 
 class PlaywrightPage(Page):
     """
@@ -26,6 +82,26 @@ class PlaywrightPage(Page):
             page: Playwright Page instance
         """
         self._page = page
+        # Pooled CDP session, created lazily and reused across snapshots
+        self._cdp_session: Optional[CDPSession] = None
+        self._cdp_sessions_created = 0
+        # Concurrent first commands (e.g. capture_page's gather) share one session
+        self._cdp_session_lock = asyncio.Lock()
+        # Keys for handing resolved nodes from CDP to Playwright, unguessable
+        # by page scripts
+        self._resolve_prefix = f"webtask:{secrets.token_hex(8)}:"
+        self._resolve_counter = 0
+        # Handles from select_by_backend_node_id not kept by the caller,
+        # disposed at the next snapshot
+        self._resolved_handles: List[ElementHandle] = []
+        # CDP objects behind resolved elements, released together at the next
+        # snapshot (the handles don't need them)
+        self._object_group = f"{self._resolve_prefix}objects"
+        self._objects_resolved = False
+        if page not in _wrappers:
+            _wrappers[page] = WeakValueDictionary()
+            page.on("crash", _on_crash)
+        _wrappers[page][id(self)] = self
 
     def __eq__(self, other: object) -> bool:
         """Check if this is the same page as another."""
@@ -63,6 +139,81 @@ class PlaywrightPage(Page):
         url = normalize_url(url)
         await self._page.goto(url)
 
+    @property
+    def cdp_sessions_created(self) -> int:
+        """Number of CDP sessions this page has opened (1 while the pool is healthy)."""
+        return self._cdp_sessions_created
+
+    async def _get_cdp_session(self) -> CDPSession:
+        """
+        Get the pooled CDP session, creating it on first use.
+
+        The session is dropped when Chromium closes it (crash, cross-process
+        navigation, target swap) so the next call transparently opens a new one.
+        """
+        async with self._cdp_session_lock:
+            if self._cdp_session is None:
+                session = await self._page.context.new_cdp_session(self._page)
+                # A crash drops it too (see _on_crash)
+                session.on("close", lambda _: self._invalidate_cdp_session(session))
+                self._cdp_session = session
+                self._cdp_sessions_created += 1
+            return self._cdp_session
+
+    def _invalidate_cdp_session(self, session: CDPSession) -> None:
+        """Forget the pooled session if it is still the current one."""
+        if self._cdp_session is session:
+            self._cdp_session = None
+
+    async def _drop_cdp_session(self, session: CDPSession) -> None:
+        """Forget a stale session and detach it (best effort, it may be gone)."""
+        self._invalidate_cdp_session(session)
+        try:
+            await session.detach()
+        except PlaywrightError:
+            pass
+
+    @staticmethod
+    def _is_stale_session_error(error: PlaywrightError) -> bool:
+        message = str(error).lower()
+        return any(part in message for part in _STALE_SESSION_ERRORS)
+
+    async def send_cdp(
+        self, method: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a CDP command over the pooled session.
+
+        If the session has gone stale (page crashed or navigated to a new
+        renderer), it is detached, rebuilt once and the command is retried.
+        Other errors (e.g. a node that no longer exists) are raised as is.
+
+        Args:
+            method: CDP method name (e.g., "DOMSnapshot.captureSnapshot")
+            params: Optional CDP method parameters
+
+        Returns:
+            Raw CDP response dictionary
+        """
+        try:
+            return await self._send_cdp_once(method, params)
+        except PlaywrightError as e:
+            if self._page.is_closed() or not self._is_stale_session_error(e):
+                raise
+            return await self._send_cdp_once(method, params)
+
+    async def _send_cdp_once(
+        self, method: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Send a CDP command without retrying; a stale session is dropped."""
+        session = await self._get_cdp_session()
+        try:
+            return await session.send(method, params)
+        except PlaywrightError as e:
+            if self._is_stale_session_error(e):
+                await self._drop_cdp_session(session)
+            raise
+
     async def get_cdp_dom_snapshot(self) -> Dict[str, Any]:
         """
         Get a CDP (Chrome DevTools Protocol) DOM snapshot of the current page.
@@ -70,19 +221,18 @@ class PlaywrightPage(Page):
         Returns:
             CDP DOM snapshot data (raw dictionary from DOMSnapshot.captureSnapshot)
         """
-        # Get CDP session
-        cdp = await self._page.context.new_cdp_session(self._page)
-
-        # Capture snapshot
-        snapshot = await cdp.send(
-            "DOMSnapshot.captureSnapshot",
-            {
-                "computedStyles": ["display", "visibility", "opacity"],
-                "includePaintOrder": True,
-                "includeDOMRects": True,
-            },
+        # Elements resolved from the previous snapshot's IDs are done with
+        snapshot, _ = await asyncio.gather(
+            self.send_cdp(
+                "DOMSnapshot.captureSnapshot",
+                {
+                    "computedStyles": ["display", "visibility", "opacity"],
+                    "includePaintOrder": True,
+                    "includeDOMRects": True,
+                },
+            ),
+            self._dispose_resolved_handles(),
         )
-
         return snapshot
 
     async def get_cdp_accessibility_tree(self) -> Dict[str, Any]:
@@ -92,13 +242,7 @@ class PlaywrightPage(Page):
         Returns:
             CDP accessibility tree data (raw dictionary from Accessibility.getFullAXTree)
         """
-        # Get CDP session
-        cdp = await self._page.context.new_cdp_session(self._page)
-
-        # Get full accessibility tree
-        ax_tree = await cdp.send("Accessibility.getFullAXTree")
-
-        return ax_tree
+        return await self.send_cdp("Accessibility.getFullAXTree")
 
     async def select(self, selector: Union[str, XPath]) -> List["PlaywrightElement"]:
         """
@@ -144,6 +288,85 @@ class PlaywrightPage(Page):
 
         return elements[0]
 
+    async def select_by_backend_node_id(
+        self, backend_node_id: int, keep: bool = False
+    ) -> Optional["PlaywrightElement"]:
+        """
+        Select the element with a CDP backend node ID.
+
+        DOM.resolveNode turns the ID into a JS object over the pooled CDP
+        session; the object is parked on window under a one-off symbol and
+        picked up (and removed) as an ElementHandle. No selector is
+        evaluated. Commands are sent once: a failure means the node (or the
+        session its object belonged to) is gone. The CDP objects are
+        released as one group at the next DOM snapshot, and so is the handle
+        unless kept.
+
+        Args:
+            backend_node_id: CDP backendNodeId of the element
+            keep: Leave the handle to the caller instead of disposing it at
+                the next snapshot (it then lives as long as the element)
+
+        Returns:
+            PlaywrightElement, or None if the node is gone or detached
+        """
+        from .playwright_element import PlaywrightElement
+
+        try:
+            resolved = await self._send_cdp_once(
+                "DOM.resolveNode",
+                {"backendNodeId": backend_node_id, "objectGroup": self._object_group},
+            )
+            object_id = resolved["object"]["objectId"]
+        except (PlaywrightError, KeyError):
+            return None
+        self._objects_resolved = True
+
+        try:
+            self._resolve_counter += 1
+            key = f"{self._resolve_prefix}{self._resolve_counter}"
+            parked = await self._send_cdp_once(
+                "Runtime.callFunctionOn",
+                {
+                    "objectId": object_id,
+                    "functionDeclaration": _PARK_ELEMENT_JS,
+                    "arguments": [{"value": key}],
+                    "returnByValue": True,
+                },
+            )
+            if not parked.get("result", {}).get("value"):
+                return None
+            handle = await self._page.evaluate_handle(_TAKE_ELEMENT_JS, key)
+        except PlaywrightError:
+            return None
+
+        element = handle.as_element()
+        if element is None:
+            await handle.dispose()
+            return None
+        if not keep:
+            self._resolved_handles.append(element)
+        return PlaywrightElement(element)
+
+    async def _release_objects(self) -> None:
+        """Release the resolved CDP objects (best effort, they die with the page)."""
+        try:
+            await self._send_cdp_once(
+                "Runtime.releaseObjectGroup", {"objectGroup": self._object_group}
+            )
+        except PlaywrightError:
+            pass
+
+    async def _dispose_resolved_handles(self) -> None:
+        handles, self._resolved_handles = self._resolved_handles, []
+        release = self._objects_resolved
+        self._objects_resolved = False
+        await asyncio.gather(
+            *(handle.dispose() for handle in handles),
+            *([self._release_objects()] if release else []),
+            return_exceptions=True,
+        )
+
     async def wait_for_load(self, timeout: int = 10000):
         """
         Wait for page to fully load.
@@ -172,9 +395,21 @@ class PlaywrightPage(Page):
         await self._page.wait_for_load_state("networkidle", timeout=timeout)
 
     async def close(self):
-        """Close the page."""
+        """Close the page, detaching the pooled CDP session first."""
+        await self._detach_cdp_session()
         await self._page.close()
 
+    async def _detach_cdp_session(self) -> None:
+        """Detach the pooled session; the next command opens a new one."""
+        session, self._cdp_session = self._cdp_session, None
+        # Remote objects die with the session they were resolved in
+        self._objects_resolved = False
+        if session is not None:
+            try:
+                await session.detach()
+            except PlaywrightError:
+                pass  # Session already gone with its target
+
     async def screenshot(
         self, path: Optional[Union[str, Path]] = None, full_page: bool = False
     ) -> bytes:
@@ -1,18 +1,24 @@
 """AWS Bedrock LLM implementation using Converse API."""
 
-from typing import Optional, List, TYPE_CHECKING
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Dict, Optional, List, TYPE_CHECKING
 
 from webtask.llm import LLM
-from webtask.llm.message import Message
+from webtask.llm.message import Content, Message, Role
+from webtask._internal.llm.conversion_cache import current_conversion_cache
 from webtask._internal.utils.context_debugger import LLMContextDebugger
 from .bedrock_mapper import (
     messages_to_bedrock_format,
     build_tool_config,
     bedrock_response_to_message,
+    BedrockStreamAssembler,
 )
 
 try:
     import boto3
+    from botocore.config import Config as BotoConfig
 except ImportError:
     raise ImportError(
         "boto3 is required for Bedrock integration. "
@@ -22,11 +28,20 @@ except ImportError:
 if TYPE_CHECKING:
     from webtask.llm.tool import Tool
 
+# Cache TTLs (seconds) supported by Bedrock cache points
+_CACHE_TTLS = {300: "5m", 3600: "1h"}
+
 
 class Bedrock(LLM):
     """AWS Bedrock implementation using Converse API.
 
     Supports Claude models via AWS Bedrock.
+
+    boto3 is synchronous, so converse requests run on a thread pool owned by
+    the instance, and the event loop keeps serving other agents, browser
+    events and sessions while a request is in flight. At most
+    max_concurrency requests run at once; more wait for a free thread.
+    close() stops the threads once the instance is no longer needed.
     """
 
     def __init__(
@@ -38,6 +53,8 @@ class Bedrock(LLM):
         aws_session_token: Optional[str] = None,
         temperature: float = 0.5,
         max_tokens: int = 4096,
+        prompt_cache_ttl: Optional[int] = None,
+        max_concurrency: int = 8,
     ):
         """Initialize Bedrock.
 
@@ -49,9 +66,21 @@ class Bedrock(LLM):
             aws_session_token: Optional AWS session token
             temperature: Sampling temperature (0.0 to 1.0)
             max_tokens: Maximum tokens to generate
+            prompt_cache_ttl: Cache the system prompt and the stable start of
+                the conversation (up to its CachePoint) for this many seconds,
+                300 or 3600 (None: no prompt caching). Requires a model with
+                prompt caching; prefixes below its minimum size aren't cached.
+            max_concurrency: Maximum number of requests in flight at once
+                (threads and HTTP connections of this instance)
         """
         super().__init__()
 
+        if prompt_cache_ttl is not None and prompt_cache_ttl not in _CACHE_TTLS:
+            raise ValueError(
+                f"Unsupported prompt_cache_ttl: {prompt_cache_ttl}. "
+                f"Must be one of: {list(_CACHE_TTLS)}"
+            )
+
         # Initialize boto3 client
         session_kwargs = {"region_name": region_name}
         if aws_access_key_id:
@@ -61,11 +90,20 @@ class Bedrock(LLM):
         if aws_session_token:
             session_kwargs["aws_session_token"] = aws_session_token
 
-        self.client = boto3.client("bedrock-runtime", **session_kwargs)
+        self.client = boto3.client(
+            "bedrock-runtime",
+            config=BotoConfig(max_pool_connections=max_concurrency),
+            **session_kwargs,
+        )
+        # Threads are started on demand, up to max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="bedrock"
+        )
         self.model_id = model
         self.temperature = temperature
         self.max_tokens = max_tokens
         self._debugger = LLMContextDebugger()
+        self._cache_point = self._build_cache_point(prompt_cache_ttl)
 
     async def call_tools(
         self,
@@ -73,7 +111,73 @@ class Bedrock(LLM):
         tools: List["Tool"],
     ) -> Message:
         """Generate response with tool calling."""
-        bedrock_messages, system_prompt = messages_to_bedrock_format(messages)
+        request_params = self._build_request(messages, tools)
+
+        # Call Bedrock Converse API off the event loop
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            self._executor, partial(self.client.converse, **request_params)
+        )
+        self._log_usage(response.get("usage"))
+
+        model_msg = bedrock_response_to_message(response)
+        self._debugger.save_call(messages, model_msg)
+        return model_msg
+
+    async def stream_tools(
+        self,
+        messages: List[Message],
+        tools: List["Tool"],
+    ) -> AsyncIterator[Content]:
+        """Generate response with tool calling, yielding each item once complete."""
+        request_params = self._build_request(messages, tools)
+
+        # The event stream is read with blocking calls, so read it off the loop too
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            self._executor, partial(self.client.converse_stream, **request_params)
+        )
+        stream = response["stream"]
+        events = iter(stream)
+        assembler = BedrockStreamAssembler()
+        content: List[Content] = []
+        pending: Optional[asyncio.Future] = None
+        try:
+            while True:
+                pending = loop.run_in_executor(self._executor, next, events, None)
+                # Shielded, so a caller that stops reading can wait for it below
+                event = await asyncio.shield(pending)
+                if event is None:
+                    break
+                for item in assembler.feed(event):
+                    content.append(item)
+                    yield item
+        finally:
+            # Release the connection if the caller stops reading early. The
+            # stream isn't thread-safe: close it on a worker thread, once no
+            # next() is blocked in it on another one.
+            if pending is not None and not pending.done():
+                await asyncio.gather(pending, return_exceptions=True)
+            await loop.run_in_executor(self._executor, stream.close)
+        self._log_usage(assembler.usage)
+
+        model_msg = Message(role=Role.MODEL, content=content or None)
+        self._debugger.save_call(messages, model_msg)
+
+    async def close(self) -> None:
+        """Stop the request threads and close the client's connections."""
+        await asyncio.get_running_loop().run_in_executor(
+            None, partial(self._executor.shutdown, wait=True)
+        )
+        self.client.close()
+
+    def _build_request(
+        self, messages: List[Message], tools: List["Tool"]
+    ) -> Dict[str, Any]:
+        """Parameters of a converse / converse_stream request."""
+        bedrock_messages, system_prompt = messages_to_bedrock_format(
+            messages, current_conversion_cache(), self._cache_point
+        )
         tool_config = build_tool_config(tools)
 
         # Build inference configuration
@@ -91,22 +195,33 @@ class Bedrock(LLM):
 
         if system_prompt:
             request_params["system"] = [{"text": system_prompt}]
+            if self._cache_point:
+                # Caches tools + system prompt, shared by runs with other tasks
+                request_params["system"].append({"cachePoint": self._cache_point})
 
         if tool_config:
             request_params["toolConfig"] = tool_config
 
-        # Call Bedrock Converse API
-        response = self.client.converse(**request_params)
+        return request_params
 
-        # Log token usage
-        if "usage" in response:
-            usage = response["usage"]
+    def _log_usage(self, usage: Optional[Dict[str, Any]]) -> None:
+        """Log token usage of a response, if reported."""
+        if usage:
             self.logger.info(
                 f"Token usage - Input: {usage.get('inputTokens', 0)}, "
                 f"Output: {usage.get('outputTokens', 0)}, "
-                f"Total: {usage.get('totalTokens', 0)}"
+                f"Total: {usage.get('totalTokens', 0)}, "
+                f"Cache read: {usage.get('cacheReadInputTokens', 0)}, "
+                f"Cache write: {usage.get('cacheWriteInputTokens', 0)}"
             )
 
-        model_msg = bedrock_response_to_message(response)
-        self._debugger.save_call(messages, model_msg)
-        return model_msg
+    @staticmethod
+    def _build_cache_point(ttl: Optional[int]) -> Optional[Dict[str, Any]]:
+        """cachePoint block for a TTL, or None without prompt caching."""
+        if ttl is None:
+            return None
+        cache_point = {"type": "default"}
+        if ttl != 300:
+            # 5 minutes is the default, and the only TTL older models accept
+            cache_point["ttl"] = _CACHE_TTLS[ttl]
+        return cache_point
@@ -1,33 +1,62 @@
 """Mappers for transforming between webtask and AWS Bedrock formats."""
 
-import base64
-from typing import Any, Dict, List, TYPE_CHECKING
+import json
+from functools import lru_cache, partial
+from typing import Any, Dict, List, Optional, Type, TYPE_CHECKING
+from pydantic import BaseModel
 from webtask.llm import (
     Role,
     Message,
+    Content,
     Text,
     Image,
+    CachePoint,
     ToolCall,
     ToolResult,
 )
+from webtask._internal.llm.conversion_cache import ConversionCache
 from webtask._internal.llm.json_schema_utils import resolve_json_schema_refs
 
 if TYPE_CHECKING:
     from webtask.llm.tool import Tool
 
 
+def _image_format(image: Image) -> str:
+    """Bedrock image format (png, jpeg, gif or webp) from the MIME type."""
+    return image.mime_type.value.split("/", 1)[1]
+
+
 def messages_to_bedrock_format(
     messages: List[Message],
+    cache: Optional[ConversionCache] = None,
+    cache_point: Optional[Dict[str, Any]] = None,
 ) -> tuple[List[Dict[str, Any]], str | None]:
     """
     Convert Message history to Bedrock Converse API format.
 
+    Args:
+        messages: Message history
+        cache: Reuses the conversion of messages unchanged since the
+            previous call (None: convert every message)
+        cache_point: Bedrock cachePoint block to put where a CachePoint is
+            (None: ignore CachePoint content)
+
     Returns:
         Tuple of (messages list, system_prompt string or None)
     """
-    bedrock_messages = []
-    system_prompt = None
+    convert = partial(_message_to_bedrock, cache_point=cache_point)
+    converted = (
+        cache.convert(
+            messages,
+            convert,
+            (_message_to_bedrock, json.dumps(cache_point, sort_keys=True)),
+        )
+        if cache is not None
+        else [convert(msg) for msg in messages]
+    )
+    bedrock_messages = [c for c in converted if c is not None]
 
+    system_prompt = None
     for msg in messages:
         if msg.role == Role.SYSTEM:
             # Extract system prompt (Bedrock uses separate system parameter)
@@ -35,129 +64,144 @@ def messages_to_bedrock_format(
                 texts = [c.text for c in msg.content if isinstance(c, Text)]
                 system_prompt = "\n\n".join(texts)
 
-        elif msg.role == Role.USER:
-            # Build content list (text and images)
-            content = []
+    return bedrock_messages, system_prompt
 
-            if msg.content:
-                for content_part in msg.content:
-                    if isinstance(content_part, Text):
-                        content.append({"text": content_part.text})
-                    elif isinstance(content_part, Image):
-                        # Bedrock expects base64 encoded images
-                        content.append(
-                            {
-                                "image": {
-                                    "format": "png",  # Assume PNG, could be made configurable
-                                    "source": {
-                                        "bytes": base64.b64decode(content_part.data)
-                                    },
-                                }
+
+def _message_to_bedrock(
+    msg: Message, cache_point: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """Convert one non-system message to a Bedrock message, or None if it has no parts."""
+    if msg.role == Role.USER:
+        # Build content list (text and images)
+        content = []
+
+        if msg.content:
+            for content_part in msg.content:
+                if isinstance(content_part, Text):
+                    content.append({"text": content_part.text})
+                elif isinstance(content_part, Image):
+                    # Bedrock takes raw bytes, passed through without copying
+                    content.append(
+                        {
+                            "image": {
+                                "format": _image_format(content_part),
+                                "source": {"bytes": content_part.raw},
                             }
-                        )
+                        }
+                    )
+                elif isinstance(content_part, CachePoint) and cache_point:
+                    content.append({"cachePoint": cache_point})
 
-            if content:
-                bedrock_messages.append({"role": "user", "content": content})
+        if content:
+            return {"role": "user", "content": content}
 
-        elif msg.role == Role.MODEL:
-            # Model message with optional tool calls
-            content = []
+    elif msg.role == Role.MODEL:
+        # Model message with optional tool calls
+        content = []
 
-            if msg.content:
-                for content_part in msg.content:
-                    if isinstance(content_part, Text):
-                        content.append({"text": content_part.text})
-                    elif isinstance(content_part, ToolCall):
-                        content.append(
-                            {
-                                "toolUse": {
-                                    "toolUseId": content_part.id
-                                    or f"call-{content_part.name}",
-                                    "name": content_part.name,
-                                    "input": content_part.arguments,
-                                }
+        if msg.content:
+            for content_part in msg.content:
+                if isinstance(content_part, Text):
+                    content.append({"text": content_part.text})
+                elif isinstance(content_part, ToolCall):
+                    content.append(
+                        {
+                            "toolUse": {
+                                "toolUseId": content_part.id
+                                or f"call-{content_part.name}",
+                                "name": content_part.name,
+                                "input": content_part.arguments,
                             }
-                        )
+                        }
+                    )
 
-            if content:
-                bedrock_messages.append({"role": "assistant", "content": content})
+        if content:
+            return {"role": "assistant", "content": content}
 
-        elif msg.role == Role.TOOL:
-            # Tool results message - convert to Bedrock tool result format
-            content = []
+    elif msg.role == Role.TOOL:
+        # Tool results message - convert to Bedrock tool result format
+        content = []
 
-            if msg.content:
-                for content_part in msg.content:
-                    if isinstance(content_part, ToolResult):
-                        # Create tool result
-                        tool_result_content = {
-                            "toolUseId": content_part.tool_call_id,
-                            "content": [],
-                        }
+        if msg.content:
+            for content_part in msg.content:
+                if isinstance(content_part, ToolResult):
+                    # Create tool result
+                    tool_result_content = {
+                        "toolUseId": content_part.tool_call_id,
+                        "content": [],
+                    }
 
-                        if content_part.error:
-                            tool_result_content["status"] = "error"
-                            tool_result_content["content"].append(
-                                {"text": f"Error: {content_part.error}"}
-                            )
-                        else:
-                            # Bedrock doesn't have an explicit success status, omit status for success
-                            tool_result_content["content"].append(
-                                {"text": f"Status: {content_part.status.value}"}
-                            )
-
-                        content.append({"toolResult": tool_result_content})
-                    elif isinstance(content_part, Text):
-                        content.append({"text": content_part.text})
-                    elif isinstance(content_part, Image):
-                        content.append(
-                            {
-                                "image": {
-                                    "format": "png",
-                                    "source": {
-                                        "bytes": base64.b64decode(content_part.data)
-                                    },
-                                }
-                            }
+                    if content_part.error:
+                        tool_result_content["status"] = "error"
+                        tool_result_content["content"].append(
+                            {"text": f"Error: {content_part.error}"}
+                        )
+                    else:
+                        # Bedrock doesn't have an explicit success status, omit status for success
+                        tool_result_content["content"].append(
+                            {"text": f"Status: {content_part.status.value}"}
                         )
 
-            if content:
-                bedrock_messages.append({"role": "user", "content": content})
+                    content.append({"toolResult": tool_result_content})
+                elif isinstance(content_part, Text):
+                    content.append({"text": content_part.text})
+                elif isinstance(content_part, Image):
+                    content.append(
+                        {
+                            "image": {
+                                "format": _image_format(content_part),
+                                "source": {"bytes": content_part.raw},
+                            }
+                        }
+                    )
 
-    return bedrock_messages, system_prompt
+        if content:
+            return {"role": "user", "content": content}
 
+    return None
 
-def build_tool_config(tools: List["Tool"]) -> Dict[str, Any]:
-    """Build Bedrock tool configuration from tools."""
-    tool_specs = []
-
-    for tool in tools:
-        # Convert Pydantic model to JSON schema
-        params_schema = tool.Params.model_json_schema()
-
-        # Resolve $ref references (Bedrock doesn't support $ref)
-        params_schema = resolve_json_schema_refs(params_schema)
-
-        # Build input schema (Bedrock format)
-        input_schema = {
-            "json": {
-                "type": "object",
-                "properties": params_schema.get("properties", {}),
-                "required": params_schema.get("required", []),
-            }
+
+def tool_spec(tool: "Tool") -> Dict[str, Any]:
+    """Bedrock tool spec of a tool (compiled once, see below)."""
+    return _compile_tool_spec(tool.name, tool.description, tool.Params)
+
+
+@lru_cache(maxsize=256)
+def _compile_tool_spec(
+    name: str, description: str, params: Type[BaseModel]
+) -> Dict[str, Any]:
+    """Build a tool spec from a tool's Params schema.
+
+    The result only depends on these arguments, so it is cached; the returned
+    dict is shared and must not be modified.
+    """
+    # Convert Pydantic model to JSON schema
+    params_schema = params.model_json_schema()
+
+    # Resolve $ref references (Bedrock doesn't support $ref)
+    params_schema = resolve_json_schema_refs(params_schema)
+
+    # Build input schema (Bedrock format)
+    input_schema = {
+        "json": {
+            "type": "object",
+            "properties": params_schema.get("properties", {}),
+            "required": params_schema.get("required", []),
         }
+    }
+
+    return {
+        "toolSpec": {
+            "name": name,
+            "description": description,
+            "inputSchema": input_schema,
+        }
+    }
 
-        tool_specs.append(
-            {
-                "toolSpec": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "inputSchema": input_schema,
-                }
-            }
-        )
 
-    return {"tools": tool_specs}
+def build_tool_config(tools: List["Tool"]) -> Dict[str, Any]:
+    """Build Bedrock tool configuration from tools."""
+    return {"tools": [tool_spec(tool) for tool in tools]}
 
 
 def bedrock_response_to_message(response: Dict[str, Any]) -> Message:
@@ -185,3 +229,60 @@ def bedrock_response_to_message(response: Dict[str, Any]) -> Message:
         role=Role.MODEL,
         content=content if content else None,
     )
+
+
+class BedrockStreamAssembler:
+    """Turns converse_stream events into complete content items.
+
+    Text and tool input arrive as deltas per content block; an item is
+    complete at its contentBlockStop. Usage comes with the metadata event.
+    """
+
+    def __init__(self):
+        self.usage: Optional[Dict[str, Any]] = None
+        # contentBlockIndex -> {"text": [...]} or {"toolUse": {...}, "input": [...]}
+        self._blocks: Dict[int, Dict[str, Any]] = {}
+
+    def feed(self, event: Dict[str, Any]) -> List[Content]:
+        """Content items completed by an event."""
+        if "contentBlockStart" in event:
+            start = event["contentBlockStart"]
+            tool_use = start.get("start", {}).get("toolUse")
+            if tool_use:
+                self._blocks[start["contentBlockIndex"]] = {
+                    "toolUse": tool_use,
+                    "input": [],
+                }
+        elif "contentBlockDelta" in event:
+            delta_event = event["contentBlockDelta"]
+            delta = delta_event["delta"]
+            index = delta_event["contentBlockIndex"]
+            if "text" in delta:
+                # Text blocks have no start event
+                self._blocks.setdefault(index, {"text": []})["text"].append(
+                    delta["text"]
+                )
+            elif "toolUse" in delta and index in self._blocks:
+                self._blocks[index]["input"].append(delta["toolUse"].get("input", ""))
+        elif "contentBlockStop" in event:
+            block = self._blocks.pop(
+                event["contentBlockStop"]["contentBlockIndex"], None
+            )
+            if block is not None:
+                return [_stream_block_to_content(block)]
+        elif "metadata" in event:
+            self.usage = event["metadata"].get("usage")
+        return []
+
+
+def _stream_block_to_content(block: Dict[str, Any]) -> Content:
+    """Text or ToolCall for a completed stream content block."""
+    if "text" in block:
+        return Text(text="".join(block["text"]))
+    tool_use = block["toolUse"]
+    arguments = "".join(block["input"])
+    return ToolCall(
+        id=tool_use["toolUseId"],
+        name=tool_use["name"],
+        arguments=json.loads(arguments) if arguments else {},
+    )
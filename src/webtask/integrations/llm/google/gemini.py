@@ -1,18 +1,23 @@
 """Google Gemini LLM implementation with conversation-based interface."""
 
-from typing import Optional, List, TYPE_CHECKING
+from contextlib import aclosing
+from typing import AsyncIterator, Optional, List, Tuple, TYPE_CHECKING
 
 from google import genai
 from google.genai import types
 
 from webtask.llm import LLM
-from webtask.llm.message import Message
+from webtask.llm.message import Content, Message, Role
+from webtask._internal.llm.conversion_cache import current_conversion_cache
 from webtask._internal.utils.context_debugger import LLMContextDebugger
 from .gemini_mapper import (
     messages_to_gemini_content,
     build_tool_config,
     gemini_response_to_message,
+    split_at_cache_point,
+    GeminiStreamAssembler,
 )
+from .gemini_prompt_cache import GeminiPromptCache
 
 if TYPE_CHECKING:
     from webtask.llm.tool import Tool
@@ -26,6 +31,8 @@ class Gemini(LLM):
         model: str = "gemini-2.5-flash",
         api_key: Optional[str] = None,
         temperature: float = 0.5,
+        prompt_cache_ttl: Optional[int] = None,
+        prompt_cache_min_tokens: Optional[int] = None,
     ):
         """Initialize Gemini.
 
@@ -33,6 +40,13 @@ class Gemini(LLM):
             model: Gemini model name (e.g., "gemini-2.5-flash", "gemini-2.5-pro")
             api_key: Optional API key (if not set via environment variable)
             temperature: Sampling temperature (0.0 to 1.0)
+            prompt_cache_ttl: Cache the system instruction, tools and the
+                stable start of the conversation (up to its CachePoint) as
+                Gemini cached content for this many seconds (None: no
+                explicit caching). Prefixes below the model's minimum size
+                aren't cached.
+            prompt_cache_min_tokens: Smallest prefix to cache, in tokens
+                (None: the model's known minimum)
         """
         super().__init__()
 
@@ -42,6 +56,13 @@ class Gemini(LLM):
         self.model_name = model
         self.temperature = temperature
         self._debugger = LLMContextDebugger()
+        self._prompt_cache = (
+            GeminiPromptCache(
+                self._client, model, prompt_cache_ttl, prompt_cache_min_tokens
+            )
+            if prompt_cache_ttl
+            else None
+        )
 
     async def call_tools(
         self,
@@ -49,34 +70,99 @@ class Gemini(LLM):
         tools: List["Tool"],
     ) -> Message:
         """Generate response with tool calling."""
-        gemini_content, system_instruction = messages_to_gemini_content(messages)
-        tool_config = build_tool_config(tools)
-
-        config = types.GenerateContentConfig(
-            temperature=self.temperature,
-            system_instruction=system_instruction,
-            tools=[tool_config],
-            automatic_function_calling=types.AutomaticFunctionCallingConfig(
-                disable=True  # We handle function calling ourselves
-            ),
-        )
+        contents, config = await self._build_request(messages, tools)
 
         # Use async client
         response = await self._client.aio.models.generate_content(
             model=self.model_name,
-            contents=gemini_content,
+            contents=contents,
             config=config,
         )
+        self._log_usage(response.usage_metadata)
+
+        model_msg = gemini_response_to_message(response)
+        self._debugger.save_call(messages, model_msg)
+        return model_msg
+
+    async def stream_tools(
+        self,
+        messages: List[Message],
+        tools: List["Tool"],
+    ) -> AsyncIterator[Content]:
+        """Generate response with tool calling, yielding each item once complete."""
+        contents, config = await self._build_request(messages, tools)
 
-        # Log token usage
-        if hasattr(response, "usage_metadata") and response.usage_metadata:
-            usage = response.usage_metadata
+        stream = await self._client.aio.models.generate_content_stream(
+            model=self.model_name,
+            contents=contents,
+            config=config,
+        )
+        assembler = GeminiStreamAssembler()
+        usage = None
+        content: List[Content] = []
+        # Close the response if the caller stops reading early
+        async with aclosing(stream):
+            async for chunk in stream:
+                # Usage is reported on the last chunk
+                usage = chunk.usage_metadata or usage
+                for item in assembler.feed(chunk):
+                    content.append(item)
+                    yield item
+        for item in assembler.finish():
+            content.append(item)
+            yield item
+        self._log_usage(usage)
+
+        model_msg = Message(role=Role.MODEL, content=content or None)
+        self._debugger.save_call(messages, model_msg)
+
+    async def _build_request(
+        self, messages: List[Message], tools: List["Tool"]
+    ) -> Tuple[List[types.Content], types.GenerateContentConfig]:
+        """Contents and config of a request, using the prompt cache if enabled."""
+        tool_config = build_tool_config(tools)
+
+        # Send only what follows the cached prefix, if there is one
+        cached_content = None
+        to_send = messages
+        if self._prompt_cache is not None:
+            split = split_at_cache_point(messages)
+            if split is not None:
+                prefix, rest = split
+                cached_content = await self._prompt_cache.get(prefix, tool_config)
+                if cached_content is not None:
+                    to_send = rest
+
+        gemini_content, system_instruction = messages_to_gemini_content(
+            to_send, current_conversion_cache()
+        )
+
+        if cached_content is not None:
+            # System instruction and tools are part of the cached content
+            config = types.GenerateContentConfig(
+                temperature=self.temperature,
+                cached_content=cached_content,
+                automatic_function_calling=types.AutomaticFunctionCallingConfig(
+                    disable=True
+                ),
+            )
+        else:
+            config = types.GenerateContentConfig(
+                temperature=self.temperature,
+                system_instruction=system_instruction,
+                tools=[tool_config],
+                automatic_function_calling=types.AutomaticFunctionCallingConfig(
+                    disable=True  # We handle function calling ourselves
+                ),
+            )
+        return gemini_content, config
+
+    def _log_usage(self, usage: Optional[types.GenerateContentResponseUsageMetadata]):
+        """Log token usage of a response, if reported."""
+        if usage:
             self.logger.info(
                 f"Token usage - Prompt: {usage.prompt_token_count}, "
                 f"Response: {usage.candidates_token_count}, "
-                f"Total: {usage.total_token_count}"
+                f"Total: {usage.total_token_count}, "
+                f"Cached: {usage.cached_content_token_count or 0}"
             )
-
-        model_msg = gemini_response_to_message(response)
-        self._debugger.save_call(messages, model_msg)
-        return model_msg
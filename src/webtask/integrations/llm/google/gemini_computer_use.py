@@ -7,8 +7,9 @@ from google.genai import types
 
 from webtask.llm import LLM
 from webtask.llm.message import Message, Role, Text, ToolCall
+from webtask._internal.llm.conversion_cache import current_conversion_cache
 from webtask._internal.utils.context_debugger import LLMContextDebugger
-from .gemini_mapper import messages_to_gemini_content, clean_schema_for_gemini
+from .gemini_mapper import messages_to_gemini_content, function_declaration
 
 if TYPE_CHECKING:
     from webtask.llm.tool import Tool
@@ -69,19 +70,8 @@ class GeminiComputerUse(LLM):
 
     def _build_tool_config(self, tools: List["Tool"]) -> List[types.Tool]:
         """Build Gemini tool configuration with Computer Use and custom functions."""
-        # Build function declarations for our custom tools
-        function_declarations = []
-        for tool in tools:
-            params_schema = tool.Params.model_json_schema()
-            params_schema = clean_schema_for_gemini(params_schema)
-
-            function_declarations.append(
-                types.FunctionDeclaration(
-                    name=tool.name,
-                    description=tool.description,
-                    parameters=params_schema,
-                )
-            )
+        # Function declarations for our custom tools (compiled once per tool)
+        function_declarations = [function_declaration(tool) for tool in tools]
 
         return [
             # Computer Use tool with all predefined functions excluded
@@ -105,7 +95,9 @@ class GeminiComputerUse(LLM):
         Note: Coordinates in returned tool calls are normalized (0-999).
         AgentBrowser handles scaling to actual screen pixels using coordinate_scale.
         """
-        gemini_content, system_instruction = messages_to_gemini_content(messages)
+        gemini_content, system_instruction = messages_to_gemini_content(
+            messages, current_conversion_cache()
+        )
         tool_configs = self._build_tool_config(tools)
 
         config = types.GenerateContentConfig(
@@ -133,7 +125,8 @@ class GeminiComputerUse(LLM):
             self.logger.info(
                 f"Token usage - Prompt: {usage.prompt_token_count}, "
                 f"Response: {usage.candidates_token_count}, "
-                f"Total: {usage.total_token_count}"
+                f"Total: {usage.total_token_count}, "
+                f"Cached: {usage.cached_content_token_count or 0}"
             )
 
         # Parse response
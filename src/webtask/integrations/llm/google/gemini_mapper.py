@@ -1,18 +1,22 @@
 """Mappers for transforming between webtask and Gemini formats (google-genai SDK)."""
 
-import base64
-from typing import Any, Dict, List, TYPE_CHECKING
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type, TYPE_CHECKING
 
 from google.genai import types
+from pydantic import BaseModel
 
 from webtask.llm import (
     Role,
     Message,
+    Content,
     Text,
     Image,
+    CachePoint,
     ToolCall,
     ToolResult,
 )
+from webtask._internal.llm.conversion_cache import ConversionCache
 from webtask._internal.llm.json_schema_utils import resolve_json_schema_refs
 
 if TYPE_CHECKING:
@@ -21,6 +25,7 @@ if TYPE_CHECKING:
 
 def messages_to_gemini_content(
     messages: List[Message],
+    cache: Optional[ConversionCache] = None,
 ) -> tuple[List[types.Content], str | None]:
     """
     Convert Message history to Gemini's content format.
@@ -28,12 +33,22 @@ def messages_to_gemini_content(
     Gemini uses alternating user/model roles. System messages are
     extracted separately for use with GenerateContentConfig.system_instruction.
 
+    Args:
+        messages: Message history
+        cache: Reuses the conversion of messages unchanged since the
+            previous call (None: convert every message)
+
     Returns:
         Tuple of (gemini_contents, system_instruction)
     """
-    gemini_messages = []
-    system_instruction = None
+    converted = (
+        cache.convert(messages, _message_to_gemini_content)
+        if cache is not None
+        else [_message_to_gemini_content(msg) for msg in messages]
+    )
+    gemini_messages = [c for c in converted if c is not None]
 
+    system_instruction = None
     for msg in messages:
         if msg.role == Role.SYSTEM:
             # Extract system instruction (to be passed to config separately)
@@ -41,86 +56,116 @@ def messages_to_gemini_content(
                 texts = [c.text for c in msg.content if isinstance(c, Text)]
                 system_instruction = "\n\n".join(texts)
 
-        elif msg.role == Role.USER:
-            # Build parts list (text and images)
-            parts = []
+    return gemini_messages, system_instruction
 
-            if msg.content:
-                for content_part in msg.content:
-                    if isinstance(content_part, Text):
-                        parts.append(types.Part.from_text(text=content_part.text))
-                    elif isinstance(content_part, Image):
-                        # Convert base64 to inline data
-                        parts.append(
-                            types.Part.from_bytes(
-                                data=base64.b64decode(content_part.data),
-                                mime_type=content_part.mime_type.value,
-                            )
-                        )
 
-            # Only add message if parts is not empty (Gemini requires at least one part)
-            if parts:
-                gemini_messages.append(types.Content(role="user", parts=parts))
+def split_at_cache_point(
+    messages: List[Message],
+) -> Optional[Tuple[List[Message], List[Message]]]:
+    """Split messages at their last CachePoint into (prefix, rest).
 
-        elif msg.role == Role.MODEL:
-            # Model message with optional tool calls
-            parts = []
+    A message containing the cache point is split in two, with the content
+    before the cache point in the prefix. Returns None if there is none.
+    """
+    for index in range(len(messages) - 1, -1, -1):
+        content = messages[index].content or []
+        points = [i for i, c in enumerate(content) if isinstance(c, CachePoint)]
+        if not points:
+            continue
+        msg = messages[index]
+        head, tail = content[: points[-1]], content[points[-1] + 1 :]
+        prefix = messages[:index]
+        rest = messages[index + 1 :]
+        if head:
+            prefix = prefix + [msg.model_copy(update={"content": head})]
+        if tail:
+            rest = [msg.model_copy(update={"content": tail})] + rest
+        return prefix, rest
+    return None
+
+
+def _message_to_gemini_content(msg: Message) -> Optional[types.Content]:
+    """Convert one non-system message to a Gemini content, or None if it has no parts."""
+    if msg.role == Role.USER:
+        # Build parts list (text and images)
+        parts = []
+
+        if msg.content:
+            for content_part in msg.content:
+                if isinstance(content_part, Text):
+                    parts.append(types.Part.from_text(text=content_part.text))
+                elif isinstance(content_part, Image):
+                    # Raw bytes are passed through without copying
+                    parts.append(
+                        types.Part.from_bytes(
+                            data=content_part.raw,
+                            mime_type=content_part.mime_type.value,
+                        )
+                    )
 
-            if msg.content:
-                for content_part in msg.content:
-                    if isinstance(content_part, Text):
-                        parts.append(types.Part.from_text(text=content_part.text))
-                    elif isinstance(content_part, Image):
-                        parts.append(
-                            types.Part.from_bytes(
-                                data=base64.b64decode(content_part.data),
-                                mime_type=content_part.mime_type.value,
-                            )
+        # Skip the message if parts is empty (Gemini requires at least one part)
+        if parts:
+            return types.Content(role="user", parts=parts)
+
+    elif msg.role == Role.MODEL:
+        # Model message with optional tool calls
+        parts = []
+
+        if msg.content:
+            for content_part in msg.content:
+                if isinstance(content_part, Text):
+                    parts.append(types.Part.from_text(text=content_part.text))
+                elif isinstance(content_part, Image):
+                    parts.append(
+                        types.Part.from_bytes(
+                            data=content_part.raw,
+                            mime_type=content_part.mime_type.value,
                         )
-                    elif isinstance(content_part, ToolCall):
-                        parts.append(
-                            types.Part.from_function_call(
-                                name=content_part.name,
-                                args=content_part.arguments,
-                            )
+                    )
+                elif isinstance(content_part, ToolCall):
+                    parts.append(
+                        types.Part.from_function_call(
+                            name=content_part.name,
+                            args=content_part.arguments,
                         )
+                    )
 
-            # Only add message if parts is not empty (Gemini requires at least one part)
-            if parts:
-                gemini_messages.append(types.Content(role="model", parts=parts))
-
-        elif msg.role == Role.TOOL:
-            # Tool results message - convert to Gemini function response
-            parts = []
-
-            if msg.content:
-                for content_part in msg.content:
-                    if isinstance(content_part, ToolResult):
-                        # Create function response for each tool result
-                        response_data = {"status": content_part.status.value}
-                        if content_part.error:
-                            response_data["error"] = content_part.error
-
-                        parts.append(
-                            types.Part.from_function_response(
-                                name=content_part.name,
-                                response=response_data,
-                            )
+        # Skip the message if parts is empty (Gemini requires at least one part)
+        if parts:
+            return types.Content(role="model", parts=parts)
+
+    elif msg.role == Role.TOOL:
+        # Tool results message - convert to Gemini function response
+        parts = []
+
+        if msg.content:
+            for content_part in msg.content:
+                if isinstance(content_part, ToolResult):
+                    # Create function response for each tool result
+                    response_data = {"status": content_part.status.value}
+                    if content_part.error:
+                        response_data["error"] = content_part.error
+
+                    parts.append(
+                        types.Part.from_function_response(
+                            name=content_part.name,
+                            response=response_data,
                         )
-                    elif isinstance(content_part, Text):
-                        parts.append(types.Part.from_text(text=content_part.text))
-                    elif isinstance(content_part, Image):
-                        parts.append(
-                            types.Part.from_bytes(
-                                data=base64.b64decode(content_part.data),
-                                mime_type=content_part.mime_type.value,
-                            )
+                    )
+                elif isinstance(content_part, Text):
+                    parts.append(types.Part.from_text(text=content_part.text))
+                elif isinstance(content_part, Image):
+                    parts.append(
+                        types.Part.from_bytes(
+                            data=content_part.raw,
+                            mime_type=content_part.mime_type.value,
                         )
+                    )
 
-            if parts:
-                gemini_messages.append(types.Content(role="user", parts=parts))
+        if parts:
+            return types.Content(role="user", parts=parts)
 
-    return gemini_messages, system_instruction
+    return None
 
 
 def clean_schema_for_gemini(schema: Dict[str, Any]) -> Dict[str, Any]:
@@ -184,54 +229,105 @@ def clean_schema_for_gemini(schema: Dict[str, Any]) -> Dict[str, Any]:
     return cleaned
 
 
-def build_tool_config(tools: List["Tool"]) -> types.Tool:
-    """Build Gemini Tool with function declarations from tools."""
-    function_declarations = []
+def function_declaration(tool: "Tool") -> types.FunctionDeclaration:
+    """Gemini function declaration of a tool (compiled once, see below)."""
+    return _compile_function_declaration(tool.name, tool.description, tool.Params)
+
+
+@lru_cache(maxsize=256)
+def _compile_function_declaration(
+    name: str, description: str, params: Type[BaseModel]
+) -> types.FunctionDeclaration:
+    """Build a function declaration from a tool's Params schema.
+
+    Generating, resolving and cleaning the JSON schema is the expensive part
+    of a call's tool config, and its result only depends on these arguments,
+    so it is cached. The returned declaration is shared and must not be
+    modified.
+    """
+    # Convert Pydantic model to JSON schema
+    params_schema = params.model_json_schema()
 
-    for tool in tools:
-        # Convert Pydantic model to JSON schema
-        params_schema = tool.Params.model_json_schema()
+    # Clean schema to be Gemini-compatible
+    params_schema = clean_schema_for_gemini(params_schema)
 
-        # Clean schema to be Gemini-compatible
-        params_schema = clean_schema_for_gemini(params_schema)
+    return types.FunctionDeclaration(
+        name=name,
+        description=description,
+        parameters=params_schema,
+    )
 
-        function_declarations.append(
-            types.FunctionDeclaration(
-                name=tool.name,
-                description=tool.description,
-                parameters=params_schema,
-            )
-        )
 
-    return types.Tool(function_declarations=function_declarations)
+def build_tool_config(tools: List["Tool"]) -> types.Tool:
+    """Build Gemini Tool with function declarations from tools."""
+    return types.Tool(
+        function_declarations=[function_declaration(tool) for tool in tools]
+    )
 
 
 def gemini_response_to_message(response) -> Message:
     """Convert Gemini response to Message with Role.MODEL."""
     content = []
 
+    for part in _response_parts(response):
+        # Check for text content
+        if hasattr(part, "text") and part.text:
+            content.append(Text(text=part.text))
+        # Check for function call
+        elif hasattr(part, "function_call") and part.function_call:
+            content.append(_function_call_to_tool_call(part.function_call))
+
+    return Message(
+        role=Role.MODEL,
+        content=content if content else None,
+    )
+
+
+class GeminiStreamAssembler:
+    """Turns generate_content_stream chunks into complete content items.
+
+    Text arrives in fragments and is joined until the next function call or
+    the end of the stream; function calls arrive whole.
+    """
+
+    def __init__(self):
+        self._text: List[str] = []
+
+    def feed(self, chunk) -> List[Content]:
+        """Content items completed by a chunk."""
+        completed: List[Content] = []
+        for part in _response_parts(chunk):
+            if hasattr(part, "text") and part.text:
+                self._text.append(part.text)
+            elif hasattr(part, "function_call") and part.function_call:
+                completed.extend(self.finish())
+                completed.append(_function_call_to_tool_call(part.function_call))
+        return completed
+
+    def finish(self) -> List[Content]:
+        """Content still pending at the end of the stream."""
+        if not self._text:
+            return []
+        text, self._text = "".join(self._text), []
+        return [Text(text=text)]
+
+
+def _response_parts(response) -> List[types.Part]:
+    """Parts of the first candidate of a response or stream chunk."""
     if (
         response.candidates
         and response.candidates[0].content
         and response.candidates[0].content.parts
     ):
-        for part in response.candidates[0].content.parts:
-            # Check for text content
-            if hasattr(part, "text") and part.text:
-                content.append(Text(text=part.text))
-            # Check for function call
-            elif hasattr(part, "function_call") and part.function_call:
-                fc = part.function_call
-                # Convert args to dict - in new SDK args is already a dict-like object
-                args = dict(fc.args) if fc.args else {}
-                content.append(
-                    ToolCall(
-                        name=fc.name,
-                        arguments=args,
-                    )
-                )
+        return response.candidates[0].content.parts
+    return []
 
-    return Message(
-        role=Role.MODEL,
-        content=content if content else None,
+
+def _function_call_to_tool_call(fc: types.FunctionCall) -> ToolCall:
+    """ToolCall for a Gemini function call (Gemini gives no call id)."""
+    # Convert args to dict - in new SDK args is already a dict-like object
+    args = dict(fc.args) if fc.args else {}
+    return ToolCall(
+        name=fc.name,
+        arguments=args,
     )
@@ -0,0 +1,200 @@
+"""Explicit Gemini context caching for the stable prefix of a run's prompts."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from google import genai
+from google.genai import types
+
+from webtask.llm.message import Image, Message, Text
+from webtask._internal.utils.logger import get_logger
+from webtask._internal.utils.token_count import count_tokens
+from .gemini_mapper import messages_to_gemini_content
+
+# Recreate a cache this long before it expires, so no call uses an expired one
+_EXPIRY_MARGIN = 0.1
+
+# Caches kept per LLM, one per prefix (e.g. per agent sharing the LLM)
+_MAX_ENTRIES = 8
+
+# Smallest prefix Gemini caches, in tokens, by model name prefix (the
+# longest matching one applies)
+_MIN_TOKENS_BY_MODEL = {
+    "gemini-2.5-flash": 1024,
+    "gemini-2.5-pro": 4096,
+}
+# For models not in the table (a prefix that is still too small only costs a
+# failed create, after which it isn't tried again)
+_MIN_TOKENS = 1024
+
+# Tokens Gemini counts per image
+_IMAGE_TOKENS = 258
+
+
+@dataclass
+class _Entry:
+    # Objects whose ids make up the key, kept so the ids aren't reused
+    pinned: Tuple[object, ...]
+    name: str
+    expires_at: float
+
+
+class GeminiPromptCache:
+    """Keeps cached contents for the prompt prefixes up to a CachePoint.
+
+    A prefix (system instruction, tools and the messages before the cache
+    point) is uploaded with caches.create and reused by name while it is
+    unexpired. Each prefix has its own cache, so agents sharing one LLM
+    (with different tasks) don't replace each other's. Up to _MAX_ENTRIES
+    are kept, least recently used first out; caches aren't deleted, they
+    expire after their TTL, so a cache another call is still using stays valid.
+
+    Prefixes below the model's minimum cacheable size aren't uploaded. If a
+    cache can't be created anyway, calls for that prefix send the full
+    prompt instead. Concurrent calls for a prefix that is being uploaded
+    wait for that upload rather than paying for one each.
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        model: str,
+        ttl: int,
+        min_tokens: Optional[int] = None,
+    ):
+        """Initialize GeminiPromptCache.
+
+        Args:
+            client: Client to create caches with
+            model: Model the caches are for
+            ttl: Lifetime of a cache in seconds
+            min_tokens: Smallest prefix to cache, in tokens (None: the
+                model's minimum, see _MIN_TOKENS_BY_MODEL)
+        """
+        self._client = client
+        self._model = model
+        self._ttl = ttl
+        self._min_tokens = (
+            min_tokens if min_tokens is not None else _model_min_tokens(model)
+        )
+        self._entries: "OrderedDict[Tuple[int, ...], _Entry]" = OrderedDict()
+        # Uploads in flight, shared by every call for their prefix
+        self._creating: Dict[Tuple[int, ...], "asyncio.Task[Optional[str]]"] = {}
+        # Prefixes not to try again: too small or failed to create
+        self._uncached: "OrderedDict[Tuple[int, ...], Tuple[object, ...]]" = (
+            OrderedDict()
+        )
+        self._logger = get_logger(__name__)
+
+    async def get(
+        self, prefix: List[Message], tool_config: types.Tool
+    ) -> Optional[str]:
+        """Name of the cached content for prefix and tools, or None if uncached."""
+        pinned = (
+            *(c for msg in prefix for c in msg.content or ()),
+            *(tool_config.function_declarations or ()),
+        )
+        key = tuple(map(id, pinned))
+        entry = self._entries.get(key)
+        if entry is not None:
+            if time.monotonic() < entry.expires_at:
+                self._entries.move_to_end(key)
+                return entry.name
+            del self._entries[key]
+        if key in self._uncached:
+            return None
+
+        task = self._creating.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._create(key, pinned, prefix, tool_config))
+            self._creating[key] = task
+            task.add_done_callback(lambda _: self._creating.pop(key, None))
+        # Shielded, so one caller giving up doesn't cancel it for the others
+        return await asyncio.shield(task)
+
+    async def _create(
+        self,
+        key: Tuple[int, ...],
+        pinned: Tuple[object, ...],
+        prefix: List[Message],
+        tool_config: types.Tool,
+    ) -> Optional[str]:
+        """Upload a prefix and remember its cache, or remember it as uncached."""
+        tokens = self._estimate_tokens(prefix, tool_config)
+        if tokens < self._min_tokens:
+            self._logger.debug(
+                f"Prompt cache - prefix of ~{tokens} tokens is below the "
+                f"minimum of {self._min_tokens}, sending the full prompt"
+            )
+            self._remember(self._uncached, key, pinned)
+            return None
+
+        contents, system_instruction = messages_to_gemini_content(prefix)
+        try:
+            cached = await self._client.aio.caches.create(
+                model=self._model,
+                config=types.CreateCachedContentConfig(
+                    contents=contents,
+                    system_instruction=system_instruction,
+                    tools=[tool_config],
+                    ttl=f"{self._ttl}s",
+                    display_name="webtask",
+                ),
+            )
+        except Exception as e:
+            self._logger.warning(
+                f"Prompt cache - not created ({type(e).__name__}: {e}), "
+                f"sending the full prompt"
+            )
+            self._remember(self._uncached, key, pinned)
+            return None
+
+        self._remember(
+            self._entries,
+            key,
+            _Entry(
+                pinned=pinned,
+                name=cached.name,
+                expires_at=time.monotonic() + self._ttl * (1 - _EXPIRY_MARGIN),
+            ),
+        )
+        self._logger.info(
+            f"Prompt cache - created {cached.name} for {len(prefix)} messages "
+            f"and {len(tool_config.function_declarations or ())} tools "
+            f"(ttl {self._ttl}s)"
+        )
+        return cached.name
+
+    @staticmethod
+    def _remember(entries: OrderedDict, key: Tuple[int, ...], value) -> None:
+        """Add to a bounded LRU map, dropping the least recently used."""
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > _MAX_ENTRIES:
+            entries.popitem(last=False)
+
+    @staticmethod
+    def _estimate_tokens(prefix: List[Message], tool_config: types.Tool) -> int:
+        """Rough size of the prefix in tokens, to skip ones too small to cache."""
+        tokens = 0
+        for msg in prefix:
+            for content in msg.content or ():
+                if isinstance(content, Image):
+                    tokens += _IMAGE_TOKENS
+                elif isinstance(content, Text):
+                    tokens += count_tokens(content.text)
+        for declaration in tool_config.function_declarations or ():
+            tokens += count_tokens(declaration.model_dump_json(exclude_none=True))
+        return tokens
+
+
+def _model_min_tokens(model: str) -> int:
+    """Minimum cacheable prefix of a model (e.g. "models/gemini-2.5-pro-001")."""
+    name = model.removeprefix("models/")
+    matches = [prefix for prefix in _MIN_TOKENS_BY_MODEL if name.startswith(prefix)]
+    if not matches:
+        return _MIN_TOKENS
+    return _MIN_TOKENS_BY_MODEL[max(matches, key=len)]
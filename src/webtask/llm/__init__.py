@@ -1,6 +1,7 @@
 """LLM module - LLM base class and message types."""
 
 from .llm import LLM
+from .caching import CachingLLM, LLMCacheMissError
 from .tool import Tool, ToolParams
 from .message import (
     Role,
@@ -8,6 +9,7 @@ from .message import (
     Content,
     Text,
     Image,
+    CachePoint,
     ImageMimeType,
     ToolCall,
     ToolResult,
@@ -16,6 +18,8 @@ from .message import (
 
 __all__ = [
     "LLM",
+    "CachingLLM",
+    "LLMCacheMissError",
     "Tool",
     "ToolParams",
     "Role",
@@ -23,6 +27,7 @@ __all__ = [
     "Content",
     "Text",
     "Image",
+    "CachePoint",
     "ImageMimeType",
     "ToolCall",
     "ToolResult",
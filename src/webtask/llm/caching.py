@@ -0,0 +1,331 @@
+"""CachingLLM - record and replay LLM responses for deterministic, free reruns."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from contextlib import aclosing
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, TYPE_CHECKING, Union
+
+from pydantic import BaseModel
+
+from webtask.exceptions import WebtaskError
+from .llm import LLM
+from .message import (
+    CachePoint,
+    Content,
+    Image,
+    ImageMimeType,
+    Message,
+    Role,
+    Text,
+    ToolCall,
+    ToolResult,
+)
+
+if TYPE_CHECKING:
+    from webtask.llm.tool import Tool
+
+# Bumped when the key or the stored format changes, so old entries miss
+_FORMAT_VERSION = 1
+
+
+class LLMCacheMissError(WebtaskError):
+    """Raised in replay mode when a request has no recorded response."""
+
+    def __init__(self, key: str):
+        super().__init__(
+            f"No recorded LLM response for request {key[:12]} (replay mode). "
+            f"Record it first with mode='record'."
+        )
+        self.key = key
+
+
+class CachingLLM(LLM):
+    """Wraps an LLM and stores its responses on disk, keyed by request.
+
+    The key is a hash of the normalized request: message roles and content,
+    and each tool's name, description and parameter schema. Timestamps and
+    tool call ids are left out, since they differ between otherwise identical
+    runs; images are hashed by content.
+
+    Modes:
+    - "record": return the stored response if there is one, otherwise call
+      the wrapped LLM and store its response
+    - "replay": only return stored responses, raising LLMCacheMissError for
+      unknown requests (no wrapped LLM needed)
+    - "passthrough": always call the wrapped LLM, without reading or writing
+      the store
+
+    The store is one JSON file per response. When it grows past
+    max_size_bytes, the least recently used responses are evicted.
+
+    Example:
+        >>> llm = CachingLLM(Gemini(), ".webtask/llm_cache", mode="record")
+        >>> agent = await wt.create_agent(llm=llm)
+        >>> await agent.do("Add the first product to the cart")  # recorded
+        >>> print(llm.get_stats())
+    """
+
+    MODES = ("record", "replay", "passthrough")
+
+    def __init__(
+        self,
+        llm: Optional[LLM],
+        cache_dir: Union[str, Path],
+        mode: str = "record",
+        max_size_bytes: int = 256 * 1024 * 1024,
+        namespace: str = "",
+    ):
+        """Initialize CachingLLM.
+
+        Args:
+            llm: LLM to call on cache misses (may be None in replay mode)
+            cache_dir: Directory of the response store (created if missing)
+            mode: "record", "replay" or "passthrough" (default: "record")
+            max_size_bytes: Evict least recently used responses beyond this
+                total size (default: 256 MB)
+            namespace: Part of every key, e.g. a model name, to keep the
+                responses of different models apart in one store
+        """
+        super().__init__()
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid mode '{mode}'. Must be one of: {self.MODES}")
+        if llm is None and mode != "replay":
+            raise ValueError(f"An LLM is required in '{mode}' mode")
+
+        self.llm = llm
+        self.mode = mode
+        self.max_size_bytes = max_size_bytes
+        self.namespace = namespace
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Agent reads coordinate_scale from its LLM (e.g. GeminiComputerUse)
+        self.coordinate_scale = getattr(llm, "coordinate_scale", None)
+        self.logger = logging.getLogger(__name__)
+
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._size = sum(path.stat().st_size for path in self._entry_paths())
+
+    async def call_tools(
+        self,
+        messages: List[Message],
+        tools: List["Tool"],
+    ) -> Message:
+        """Return the stored response for this request, or get and store one."""
+        key = self._lookup_key(messages, tools)
+        if key is not None:
+            cached = self._load(key)
+            if cached is not None:
+                return cached
+
+        response = await self.llm.call_tools(messages, tools)
+        if key is not None:
+            self._store(key, response)
+        return response
+
+    async def stream_tools(
+        self,
+        messages: List[Message],
+        tools: List["Tool"],
+    ) -> AsyncIterator[Content]:
+        """Stream the stored response, or stream the wrapped LLM's and store it."""
+        key = self._lookup_key(messages, tools)
+        if key is not None:
+            cached = self._load(key)
+            if cached is not None:
+                for content in cached.content or []:
+                    yield content
+                return
+
+        content: List[Content] = []
+        async with aclosing(self.llm.stream_tools(messages, tools)) as stream:
+            async for item in stream:
+                content.append(item)
+                yield item
+        if key is not None:
+            self._store(key, Message(role=Role.MODEL, content=content or None))
+
+    async def close(self) -> None:
+        """Close the wrapped LLM (the store needs no closing)."""
+        if self.llm is not None:
+            await self.llm.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hits, misses, writes and evictions so far, and the store size in bytes."""
+        return {**self._stats, "size_bytes": self._size}
+
+    def clear(self) -> None:
+        """Delete every stored response."""
+        for path in self._entry_paths():
+            path.unlink(missing_ok=True)
+        self._size = 0
+
+    def request_key(self, messages: List[Message], tools: List["Tool"]) -> str:
+        """Hash of the normalized request (see the class docstring)."""
+        request = {
+            "version": _FORMAT_VERSION,
+            "namespace": self.namespace,
+            "messages": [_normalize_message(msg) for msg in messages],
+            "tools": [
+                [tool.name, tool.description, _params_schema(tool.Params)]
+                for tool in tools
+            ],
+        }
+        encoded = json.dumps(request, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    ### Helper methods ###
+
+    def _lookup_key(
+        self, messages: List[Message], tools: List["Tool"]
+    ) -> Optional[str]:
+        """Key of the request, or None in passthrough mode (no store access)."""
+        if self.mode == "passthrough":
+            return None
+        return self.request_key(messages, tools)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _entry_paths(self) -> List[Path]:
+        return list(self.cache_dir.glob("*.json"))
+
+    def _load(self, key: str) -> Optional[Message]:
+        """Stored response for key (counting a hit or miss); raises on replay misses."""
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            self._stats["misses"] += 1
+            self.logger.debug(f"LLM cache - miss {key[:12]}")
+            if self.mode == "replay":
+                raise LLMCacheMissError(key)
+            return None
+
+        self._stats["hits"] += 1
+        self.logger.debug(f"LLM cache - hit {key[:12]}")
+        # Mark as recently used for eviction
+        os.utime(path)
+        return Message(
+            role=Role.MODEL,
+            content=[_content_from_dict(c) for c in data["content"]] or None,
+        )
+
+    def _store(self, key: str, response: Message) -> None:
+        """Write a response and evict old ones beyond max_size_bytes."""
+        data = {
+            "version": _FORMAT_VERSION,
+            "content": [_content_to_dict(c) for c in response.content or []],
+        }
+        path = self._path(key)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        # Own temp file per write: agents and processes share the store
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps(data))
+            # Atomic, so concurrent agents never read a partial entry
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._stats["writes"] += 1
+        self._size += path.stat().st_size - replaced
+        if self._size > self.max_size_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the store fits its size."""
+        entries = []
+        for path in self._entry_paths():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(key=lambda entry: entry[0])
+
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+            self._stats["evictions"] += 1
+        self.logger.debug(
+            f"LLM cache - evicted to {self._size}/{self.max_size_bytes} bytes"
+        )
+
+
+@lru_cache(maxsize=256)
+def _params_schema(params: type[BaseModel]) -> Dict[str, Any]:
+    return params.model_json_schema()
+
+
+def _normalize_message(msg: Message) -> Dict[str, Any]:
+    """Request-relevant parts of a message (no timestamp)."""
+    return {
+        "role": msg.role.value,
+        "content": [_normalize_content(c) for c in msg.content or []],
+    }
+
+
+def _normalize_content(content: Content) -> Any:
+    if isinstance(content, Text):
+        return ["text", content.text]
+    if isinstance(content, Image):
+        return [
+            "image",
+            content.mime_type.value,
+            hashlib.sha256(content.raw).hexdigest(),
+        ]
+    if isinstance(content, ToolCall):
+        # Ids are generated by the provider and differ between runs
+        return ["tool_call", content.name, content.arguments]
+    if isinstance(content, ToolResult):
+        return [
+            "tool_result",
+            content.name,
+            content.status.value,
+            content.error,
+            content.description,
+            content.terminal,
+        ]
+    if isinstance(content, CachePoint):
+        return ["cache_point"]
+    return [type(content).__name__]
+
+
+def _content_to_dict(content: Content) -> Dict[str, Any]:
+    """Serialize response content (text, images and tool calls)."""
+    if isinstance(content, Text):
+        return {"type": "text", "text": content.text}
+    if isinstance(content, Image):
+        return {
+            "type": "image",
+            "mime_type": content.mime_type.value,
+            "data": content.base64,
+        }
+    if isinstance(content, ToolCall):
+        return {
+            "type": "tool_call",
+            "id": content.id,
+            "name": content.name,
+            "arguments": content.arguments,
+        }
+    raise ValueError(f"Unsupported response content: {type(content).__name__}")
+
+
+def _content_from_dict(data: Dict[str, Any]) -> Content:
+    if data["type"] == "text":
+        return Text(text=data["text"])
+    if data["type"] == "image":
+        return Image(data=data["data"], mime_type=ImageMimeType(data["mime_type"]))
+    return ToolCall(id=data["id"], name=data["name"], arguments=data["arguments"])
@@ -2,8 +2,8 @@
 
 import logging
 from abc import ABC, abstractmethod
-from typing import List, TYPE_CHECKING
-from .message import Message
+from typing import AsyncIterator, List, TYPE_CHECKING
+from .message import Content, Message
 
 if TYPE_CHECKING:
     from webtask.llm.tool import Tool
@@ -47,3 +47,35 @@ class LLM(ABC):
             - Each LLM implementation handles its own API format conversion
         """
         pass
+
+    async def stream_tools(
+        self,
+        messages: List[Message],
+        tools: List["Tool"],
+    ) -> AsyncIterator[Content]:
+        """Generate a response, yielding each content item once it is complete.
+
+        Lets callers act on the first ToolCall while the rest of the response
+        is still being generated. Items are yielded in response order, and
+        together they are the content of the Message call_tools would return.
+
+        The default implementation waits for call_tools and yields its
+        content; LLMs with a streaming API override it.
+
+        Args:
+            messages: Conversation history (as for call_tools)
+            tools: Tools available for the LLM to call
+
+        Yields:
+            Complete Text and ToolCall items
+        """
+        response = await self.call_tools(messages, tools)
+        for content in response.content or []:
+            yield content
+
+    async def close(self) -> None:
+        """Release resources the LLM holds (e.g. threads, connections).
+
+        The LLM can't be used afterwards. The default implementation holds
+        nothing to release.
+        """
@@ -1,9 +1,10 @@
 """Message types for conversational LLM history with tool calling support."""
 
-from typing import List, Optional, Dict, Any
+import base64
+from typing import List, Optional, Dict, Any, Union
 from enum import Enum
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_serializer
 
 
 class ImageMimeType(str, Enum):
@@ -49,13 +50,73 @@ class Text(Content):
 
 
 class Image(Content):
-    """Image content (base64-encoded)."""
+    """Image content.
 
-    data: str  # base64-encoded
+    data holds the encoded image (e.g. PNG bytes). Raw bytes or a memoryview
+    are kept as is and passed to providers without copying; a str is taken to
+    be base64 and decoded once, on first use. The base64 form is likewise
+    only built when something asks for it.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    data: Union[str, bytes, memoryview]  # base64 str, or raw bytes
     mime_type: ImageMimeType = ImageMimeType.PNG
 
+    _raw: Optional[bytes] = PrivateAttr(default=None)
+    _base64: Optional[str] = PrivateAttr(default=None)
+
+    @property
+    def raw(self) -> bytes:
+        """Image bytes (decoded from base64 at most once)."""
+        if self._raw is None:
+            data = self.data
+            if isinstance(data, bytes):
+                self._raw = data
+            elif isinstance(data, str):
+                self._raw = base64.b64decode(data)
+            elif isinstance(data.obj, bytes) and data.nbytes == len(data.obj):
+                # View of a whole bytes object, no copy needed
+                self._raw = data.obj
+            else:
+                self._raw = data.tobytes()
+        return self._raw
+
+    @property
+    def base64(self) -> str:
+        """Image as a base64 str (encoded at most once)."""
+        if self._base64 is None:
+            if isinstance(self.data, str):
+                self._base64 = self.data
+            else:
+                self._base64 = base64.b64encode(self.data).decode("ascii")
+        return self._base64
+
+    @property
+    def size(self) -> int:
+        """Size of the image in bytes, without decoding base64 data."""
+        data = self.data
+        if isinstance(data, str):
+            return len(data) * 3 // 4 - data[-2:].count("=")
+        return data.nbytes if isinstance(data, memoryview) else len(data)
+
+    @field_serializer("data", when_used="json")
+    def _serialize_data(self, data: Union[str, bytes, memoryview]) -> str:
+        return self.base64
+
+    def __str__(self) -> str:
+        return f"Image(mime_type={self.mime_type.value}, size={self.size} bytes)"
+
+
+class CachePoint(Content):
+    """Marks the end of a prompt prefix that stays the same across calls.
+
+    LLMs with prompt caching enabled cache everything up to the last cache
+    point, so later calls only pay for what follows it. Others ignore it.
+    """
+
     def __str__(self) -> str:
-        return f"Image(mime_type={self.mime_type.value}, size={len(self.data)} bytes)"
+        return "CachePoint()"
 
 
 class ToolCall(Content):
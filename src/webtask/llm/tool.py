@@ -21,6 +21,11 @@ class Tool(ABC):
     - Params: BaseModel - Nested Pydantic model for parameters
     - async execute(params: Params) -> ToolResult
 
+    Tools may override settles_in_batch(params) to return True for calls
+    whose action doesn't change what the next tool call acts on (e.g. typing
+    into a plain text field). The waits after consecutive such calls in one
+    step are merged into a single wait at the end of the run of calls.
+
     Example:
         class ClickTool(Tool):
             name = "click"
@@ -43,6 +48,18 @@ class Tool(ABC):
     description: str
     Params: type[BaseModel]
 
+    def settles_in_batch(self, params: BaseModel) -> bool:
+        """Whether the wait after this call may be merged with the next calls'.
+
+        Args:
+            params: Validated Params instance
+
+        Returns:
+            False unless the tool knows the call leaves the page as the next
+            call expects it
+        """
+        return False
+
     @abstractmethod
     async def execute(self, params: BaseModel) -> ToolResult:
         """Execute the tool with validated parameters.
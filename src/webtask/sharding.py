@@ -0,0 +1,434 @@
+"""ShardedRunner - spread agent tasks across processes, one browser each."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Set,
+    Type,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from .agent import Agent
+from .constants import DEFAULT_TYPING_DELAY, DEFAULT_WAIT_AFTER_ACTION
+from .exceptions import WebtaskError
+from .llm import LLM
+from .webtask import Webtask
+
+# How often the parent checks for dead workers while waiting for results
+_POLL_SECONDS = 0.5
+
+
+@dataclass
+class ShardTask:
+    """A job for ShardedRunner. Must be pickleable (output_schema importable).
+
+    Attributes:
+        task: Task, condition or what to extract, in natural language
+        kind: Agent method to run - "do", "verify" or "extract"
+        url: Page to open before the job (None: stay on the current page)
+        max_steps: Maximum number of steps (None: the method's default)
+        output_schema: Optional Pydantic model for "do" and "extract"
+    """
+
+    KINDS = ("do", "verify", "extract")
+
+    task: str
+    kind: str = "do"
+    url: Optional[str] = None
+    max_steps: Optional[int] = None
+    output_schema: Optional[Type[BaseModel]] = None
+
+    def __post_init__(self):
+        if self.kind not in self.KINDS:
+            raise ValueError(
+                f"Invalid kind '{self.kind}'. Must be one of: {self.KINDS}"
+            )
+
+
+@dataclass
+class ShardResult:
+    """Outcome of one job.
+
+    Attributes:
+        index: Position of the job in the input
+        task: The job
+        output: Result (do), Verdict (verify) or extracted value (extract),
+            None if the job raised
+        error: Exception raised by the job, if any (a WebtaskError with its
+            description if the original or the output couldn't be pickled)
+        worker: Index of the worker process that ran the job (-1: none did)
+        duration_seconds: Time the job ran in the worker
+    """
+
+    index: int
+    task: ShardTask
+    output: Any = None
+    error: Optional[BaseException] = None
+    worker: int = -1
+    duration_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the job completed without raising."""
+        return self.error is None
+
+
+@dataclass
+class _JobStarted:
+    """Sent by a worker when it takes a job, so its death fails the job."""
+
+    worker: int
+    index: int
+
+
+@dataclass
+class ShardMetrics:
+    """Throughput of a ShardedRunner run.
+
+    Attributes:
+        tasks: Jobs completed (including failed ones)
+        succeeded: Jobs that completed without raising
+        failed: Jobs that raised
+        wall_seconds: Time since the run started
+        busy_seconds: Sum of job durations over all workers
+        per_worker: Jobs completed per worker index
+    """
+
+    tasks: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    wall_seconds: float = 0.0
+    busy_seconds: float = 0.0
+    per_worker: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def tasks_per_second(self) -> float:
+        """Completed jobs per second of wall time."""
+        return self.tasks / self.wall_seconds if self.wall_seconds else 0.0
+
+
+class ShardedRunner:
+    """Runs jobs in worker processes, each with its own browser and event loop.
+
+    DOM parsing, filtering and serialization are CPU-bound Python, so agents
+    in one process share one core however many contexts they use. Each
+    worker process launches its own PlaywrightBrowser and runs
+    contexts_per_process agents, which take jobs off a shared queue, so
+    throughput scales with cores.
+
+    LLM clients generally can't be pickled, so each worker builds its own
+    LLM with llm_factory, which must be pickleable (e.g. a module-level
+    function). Jobs and results are pickled between processes.
+
+    Example:
+        >>> def make_llm():
+        ...     return Gemini(model="gemini-2.5-flash")
+        >>> runner = ShardedRunner(make_llm, processes=8, contexts_per_process=2)
+        >>> async for done in runner.run(tasks):
+        ...     print(done.index, done.worker, done.output or done.error)
+        >>> print(runner.metrics.tasks_per_second)
+    """
+
+    def __init__(
+        self,
+        llm_factory: Callable[[], LLM],
+        processes: Optional[int] = None,
+        contexts_per_process: int = 1,
+        mode: str = "dom",
+        wait_after_action: float = DEFAULT_WAIT_AFTER_ACTION,
+        typing_delay: float = DEFAULT_TYPING_DELAY,
+        headless: bool = True,
+        browser_type: str = "chromium",
+        start_method: str = "spawn",
+    ):
+        """Initialize ShardedRunner.
+
+        Args:
+            llm_factory: Pickleable callable creating the LLM of a worker
+            processes: Number of worker processes (None: number of CPUs)
+            contexts_per_process: Agents (contexts) per worker process
+            mode: Agent mode - "dom" or "pixel"
+            wait_after_action: Wait time in seconds after each action
+            typing_delay: Delay between keystrokes in milliseconds
+            headless: Run the browsers without GUI (default: True)
+            browser_type: Browser type - "chromium", "firefox" or "webkit"
+            start_method: multiprocessing start method (default: "spawn")
+        """
+        processes = processes or os.cpu_count() or 1
+        if processes < 1:
+            raise ValueError("processes must be at least 1")
+        if contexts_per_process < 1:
+            raise ValueError("contexts_per_process must be at least 1")
+
+        self.llm_factory = llm_factory
+        self.processes = processes
+        self.contexts_per_process = contexts_per_process
+        self.start_method = start_method
+        self._agent_options = {
+            "mode": mode,
+            "wait_after_action": wait_after_action,
+            "typing_delay": typing_delay,
+            "headless": headless,
+            "browser_type": browser_type,
+        }
+        self.metrics = ShardMetrics()
+        self.logger = logging.getLogger(__name__)
+
+    async def run(
+        self, tasks: Iterable[Union[str, ShardTask]]
+    ) -> AsyncIterator[ShardResult]:
+        """Run jobs across the worker processes, yielding results as they complete.
+
+        Workers are started for the run and stopped after it. A failed job is
+        reported in its result (error) and doesn't stop the others; the jobs
+        a worker process was running when it died are reported as failed
+        right away, the rest run on the other workers. self.metrics is
+        updated with each result.
+
+        Args:
+            tasks: Task descriptions ("do" jobs) or ShardTasks
+
+        Yields:
+            ShardResult per job, in completion order
+        """
+        specs = [t if isinstance(t, ShardTask) else ShardTask(t) for t in tasks]
+        self.metrics = ShardMetrics()
+        if not specs:
+            return
+
+        mp = multiprocessing.get_context(self.start_method)
+        jobs = mp.Queue()
+        results = mp.Queue()
+        for index, spec in enumerate(specs):
+            jobs.put((index, spec))
+        count = min(self.processes, len(specs))
+        # One stop marker per agent lane
+        for _ in range(count * self.contexts_per_process):
+            jobs.put(None)
+
+        workers = [
+            mp.Process(
+                target=_worker_main,
+                args=(
+                    worker,
+                    self.llm_factory,
+                    self._agent_options,
+                    self.contexts_per_process,
+                    jobs,
+                    results,
+                ),
+                daemon=True,
+            )
+            for worker in range(count)
+        ]
+        started = time.perf_counter()
+        for process in workers:
+            process.start()
+        self.logger.info(
+            f"Sharded run - {len(specs)} jobs on {count} processes "
+            f"x {self.contexts_per_process} contexts"
+        )
+
+        loop = asyncio.get_running_loop()
+        pending = set(range(len(specs)))
+        # Jobs each worker has taken and not reported yet
+        in_flight: Dict[int, Set[int]] = {worker: set() for worker in range(count)}
+        try:
+            while pending:
+                # Sampled before waiting: whatever a worker dead by then sent
+                # was flushed before it exited, so the wait reads it
+                alive = [process.is_alive() for process in workers]
+                message = await loop.run_in_executor(None, _next_message, results)
+                if isinstance(message, _JobStarted):
+                    in_flight[message.worker].add(message.index)
+                    continue
+                if isinstance(message, ShardResult):
+                    in_flight[message.worker].discard(message.index)
+                    pending.discard(message.index)
+                    self._record(message, started)
+                    yield message
+                    continue
+
+                # Nothing arrived in a while: fail the jobs of dead workers
+                for worker in range(count):
+                    if alive[worker] or not in_flight[worker]:
+                        continue
+                    for index in sorted(in_flight[worker]):
+                        outcome = ShardResult(
+                            index=index,
+                            task=specs[index],
+                            error=WebtaskError(
+                                f"Worker process {worker} exited while running the job"
+                            ),
+                            worker=worker,
+                        )
+                        pending.discard(index)
+                        self._record(outcome, started)
+                        yield outcome
+                    in_flight[worker].clear()
+                if pending and not any(alive):
+                    # Every worker exited without taking these jobs
+                    for index in sorted(pending):
+                        outcome = ShardResult(
+                            index=index,
+                            task=specs[index],
+                            error=WebtaskError("Worker process exited"),
+                        )
+                        self._record(outcome, started)
+                        yield outcome
+                    pending.clear()
+        finally:
+            for process in workers:
+                if pending and process.is_alive():
+                    process.terminate()
+            for process in workers:
+                await loop.run_in_executor(None, process.join)
+            self.logger.info(
+                f"Sharded run - {self.metrics.tasks} jobs in "
+                f"{self.metrics.wall_seconds:.2f}s "
+                f"({self.metrics.tasks_per_second:.2f} jobs/s)"
+            )
+
+    ### Helper methods ###
+
+    def _record(self, outcome: ShardResult, started: float) -> None:
+        metrics = self.metrics
+        metrics.tasks += 1
+        if outcome.ok:
+            metrics.succeeded += 1
+        else:
+            metrics.failed += 1
+        metrics.busy_seconds += outcome.duration_seconds
+        metrics.wall_seconds = time.perf_counter() - started
+        metrics.per_worker[outcome.worker] = (
+            metrics.per_worker.get(outcome.worker, 0) + 1
+        )
+
+
+def _next_message(results) -> Union[ShardResult, _JobStarted, None]:
+    """Next message from the workers, or None if none came for a while."""
+    try:
+        return results.get(timeout=_POLL_SECONDS)
+    except queue.Empty:
+        return None
+
+
+def _worker_main(worker, llm_factory, agent_options, contexts, jobs, results):
+    """Entry point of a worker process."""
+    asyncio.run(
+        _run_worker(worker, llm_factory, agent_options, contexts, jobs, results)
+    )
+
+
+async def _run_worker(
+    worker: int,
+    llm_factory: Callable[[], LLM],
+    agent_options: Dict[str, Any],
+    contexts: int,
+    jobs,
+    results,
+) -> None:
+    """Run agent lanes that take jobs off the queue until their stop marker."""
+    loop = asyncio.get_running_loop()
+    # One thread per lane blocking on the job queue
+    executor = ThreadPoolExecutor(max_workers=contexts)
+    wt = Webtask()
+    create_lock = asyncio.Lock()
+    try:
+        llm = llm_factory()
+        startup_error = None
+    except Exception as e:
+        llm, startup_error = None, e
+
+    async def lane() -> None:
+        agent: Optional[Agent] = None
+        while True:
+            job = await loop.run_in_executor(executor, jobs.get)
+            if job is None:
+                return
+            index, spec = job
+            results.put(_JobStarted(worker=worker, index=index))
+            outcome = ShardResult(index=index, task=spec, worker=worker)
+            started = time.perf_counter()
+            try:
+                if startup_error is not None:
+                    raise startup_error
+                if agent is None:
+                    # The browser is launched by the first create_agent
+                    async with create_lock:
+                        agent = await wt.create_agent(llm=llm, **agent_options)
+                else:
+                    agent.clear_history()
+                if spec.url:
+                    await agent.goto(spec.url)
+                outcome.output = await _run_job(agent, spec)
+            except Exception as e:
+                outcome.error = _portable_error(e)
+                if agent is not None and not isinstance(e, WebtaskError):
+                    # May be broken (e.g. a crashed page), start a fresh context
+                    try:
+                        await agent.context.close()
+                    except Exception:
+                        pass
+                    agent = None
+            outcome.duration_seconds = time.perf_counter() - started
+            results.put(_portable_outcome(outcome))
+
+    try:
+        await asyncio.gather(*(lane() for _ in range(contexts)))
+    finally:
+        executor.shutdown(wait=False)
+        await wt.close()
+
+
+async def _run_job(agent: Agent, spec: ShardTask) -> Any:
+    steps = {} if spec.max_steps is None else {"max_steps": spec.max_steps}
+    if spec.kind == "verify":
+        return await agent.verify(spec.task, **steps)
+    if spec.kind == "extract":
+        return await agent.extract(spec.task, output_schema=spec.output_schema, **steps)
+    return await agent.do(spec.task, output_schema=spec.output_schema, **steps)
+
+
+def _portable_outcome(outcome: ShardResult) -> ShardResult:
+    """The outcome if it survives pickling, else its job failed with why.
+
+    mp.Queue pickles in a feeder thread, where a failure would lose the
+    result without a word.
+    """
+    try:
+        pickle.loads(pickle.dumps(outcome))
+        return outcome
+    except Exception as e:
+        return replace(
+            outcome,
+            output=None,
+            error=WebtaskError(
+                f"Result can't be sent to the parent process - "
+                f"{type(e).__name__}: {e}"
+            ),
+        )
+
+
+def _portable_error(error: BaseException) -> BaseException:
+    """The error if it survives pickling, else a WebtaskError describing it."""
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return WebtaskError(f"{type(error).__name__}: {error}")
@@ -1,10 +1,15 @@
 """Webtask - main manager class for web automation."""
 
+import asyncio
 from typing import Optional, Union, TYPE_CHECKING
 from .browser import Browser, Context, Page
 from .llm import LLM
-from .agent import Agent
+from .agent import Agent, AgentPool
 from .constants import DEFAULT_WAIT_AFTER_ACTION, DEFAULT_TYPING_DELAY
+from ._internal.context.offload import (
+    release_parse_executors,
+    retain_parse_executors,
+)
 
 if TYPE_CHECKING:
     from playwright.async_api import (
@@ -25,6 +30,9 @@ class Webtask:
     def __init__(self):
         """Initialize Webtask. Browser launches lazily on first agent creation."""
         self.browser: Optional[Browser] = None
+        # Parse pools are shared by all Webtasks; the last to close stops them
+        retain_parse_executors()
+        self._owns_parse_pools = True
 
     async def _ensure_browser(
         self, headless: bool = False, browser_type: str = "chromium"
@@ -285,7 +293,61 @@ class Webtask:
 
         return agent
 
+    def create_agent_pool(
+        self,
+        llm: LLM,
+        max_contexts: int = 4,
+        max_llm_calls: Optional[int] = None,
+        mode: str = "dom",
+        wait_after_action: float = DEFAULT_WAIT_AFTER_ACTION,
+        typing_delay: float = DEFAULT_TYPING_DELAY,
+        headless: bool = True,
+        browser_type: str = "chromium",
+    ) -> AgentPool:
+        """Create pool of agents that run tasks in parallel, one context each.
+
+        Args:
+            llm: LLM instance shared by all agents
+            max_contexts: Maximum number of contexts (and tasks) at once (default: 4)
+            max_llm_calls: Maximum number of LLM calls in flight at once (default: no limit beyond max_contexts)
+            mode: Agent mode - "dom" (element IDs) or "pixel" (screen coordinates)
+            wait_after_action: Wait time in seconds after each action (default: 1.0)
+            typing_delay: Delay between keystrokes in milliseconds (default: 80)
+            headless: Run browser in headless mode if the pool launches it (default: True)
+            browser_type: Browser type - "chromium", "firefox", or "webkit" (default: "chromium")
+
+        Returns:
+            AgentPool creating its agents' contexts in this Webtask's browser
+
+        Example:
+            >>> async with wt.create_agent_pool(llm=llm, max_contexts=4) as pool:
+            ...     async for done in pool.run(tasks):
+            ...         print(done.index, done.result, done.duration_seconds)
+        """
+        return AgentPool(
+            self,
+            llm,
+            max_contexts=max_contexts,
+            max_llm_calls=max_llm_calls,
+            mode=mode,
+            wait_after_action=wait_after_action,
+            typing_delay=typing_delay,
+            headless=headless,
+            browser_type=browser_type,
+        )
+
     async def close(self) -> None:
-        """Close and cleanup all resources."""
+        """Close and cleanup all resources.
+
+        This includes the pools that agents with parse_in "thread" or
+        "process" build page context in, once no other Webtask of the
+        process is open. They are started again on next use.
+        """
         if self.browser is not None:
             await self.browser.close()
+        if self._owns_parse_pools:
+            self._owns_parse_pools = False
+            # Waits for builds in flight, so off the event loop
+            await asyncio.get_running_loop().run_in_executor(
+                None, release_parse_executors
+            )
@@ -0,0 +1,87 @@
+"""Tests for the fused accessibility filter pipeline."""
+
+import random
+
+import pytest
+
+from webtask._internal.accessibility.filters import (
+    filter_accessibility_tree,
+    filter_duplicate_text,
+    filter_ignored_nodes,
+    filter_non_semantic_role,
+)
+from webtask._internal.accessibility.parsers.cdp import parse_cdp_accessibility
+
+ROLES = ["generic", "none", "StaticText", "InlineTextBox", "button", "link"]
+NAMES = ["", "Buy", "Buy now", "now", "Add to cart", "cart"]
+
+
+def random_cdp_tree(rng, size):
+    nodes = [{"nodeId": "0", "role": {"type": "role", "value": "RootWebArea"}}]
+    for i in range(1, size + 1):
+        parent = rng.choice(nodes)
+        node = {
+            "nodeId": str(i),
+            "parentId": parent["nodeId"],
+            "ignored": rng.random() < 0.25,
+            "role": {"type": "role", "value": rng.choice(ROLES)},
+            "name": {"type": "computedString", "value": rng.choice(NAMES)},
+        }
+        parent.setdefault("childIds", []).append(node["nodeId"])
+        nodes.append(node)
+    return {"nodes": nodes}
+
+
+def shape(node):
+    return (node.node_id, [shape(child) for child in node.children])
+
+
+@pytest.mark.unit
+class TestFilterAccessibilityTree:
+    """Fused pipeline must produce the same tree as the chained filters."""
+
+    def test_matches_chained_filters(self):
+        rng = random.Random(0)
+        for _ in range(300):
+            root = parse_cdp_accessibility(random_cdp_tree(rng, rng.randint(0, 40)))
+
+            expected = filter_non_semantic_role(
+                filter_duplicate_text(filter_ignored_nodes(root))
+            )
+            result = filter_accessibility_tree(root)
+
+            assert shape(result) == shape(expected)
+
+    def test_duplicate_text_under_ignored_ancestor(self):
+        # The ignored "Buy now" link is gone before duplicate-text runs, so
+        # the StaticText is compared against the root's name instead.
+        root = parse_cdp_accessibility(
+            {
+                "nodes": [
+                    {
+                        "nodeId": "1",
+                        "role": {"type": "role", "value": "RootWebArea"},
+                        "name": {"type": "computedString", "value": "Shop"},
+                        "childIds": ["2"],
+                    },
+                    {
+                        "nodeId": "2",
+                        "parentId": "1",
+                        "ignored": True,
+                        "role": {"type": "role", "value": "link"},
+                        "name": {"type": "computedString", "value": "Buy now"},
+                        "childIds": ["3"],
+                    },
+                    {
+                        "nodeId": "3",
+                        "parentId": "2",
+                        "role": {"type": "role", "value": "StaticText"},
+                        "name": {"type": "computedString", "value": "Buy"},
+                    },
+                ]
+            }
+        )
+
+        result = filter_accessibility_tree(root)
+
+        assert shape(result) == ("1", [("3", [])])
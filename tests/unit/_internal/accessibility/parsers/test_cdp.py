@@ -0,0 +1,84 @@
+"""Tests for CDP accessibility tree parser."""
+
+import pytest
+
+from webtask._internal.accessibility.axnode import AXNode, AXProperty, AXValue
+from webtask._internal.accessibility.parsers.cdp import parse_cdp_accessibility
+
+
+@pytest.fixture
+def ax_tree():
+    return {
+        "nodes": [
+            {
+                "nodeId": "1",
+                "role": {"type": "role", "value": "RootWebArea"},
+                "childIds": ["2", "3"],
+            },
+            {
+                "nodeId": "2",
+                "parentId": "1",
+                "role": {"type": "role", "value": "button"},
+                "name": {
+                    "type": "computedString",
+                    "value": "OK",
+                    "sources": [{"type": "contents"}],
+                },
+                "backendDOMNodeId": 10,
+            },
+            {
+                "nodeId": "3",
+                "parentId": "1",
+                "role": {"type": "role", "value": "button"},
+                "name": {"type": "computedString", "value": "Cancel"},
+                "backendDOMNodeId": 11,
+            },
+        ]
+    }
+
+
+@pytest.mark.unit
+class TestParseCdpAccessibility:
+    """Tests for parse_cdp_accessibility."""
+
+    def test_builds_tree(self, ax_tree):
+        root = parse_cdp_accessibility(ax_tree)
+
+        assert root.role.value == "RootWebArea"
+        assert [c.name.value for c in root.children] == ["OK", "Cancel"]
+        assert all(c.parent is root for c in root.children)
+        assert root.children[0].name.sources == [{"type": "contents"}]
+
+    def test_roles_are_shared(self, ax_tree):
+        root = parse_cdp_accessibility(ax_tree)
+        ok, cancel = root.children
+
+        assert ok.role is cancel.role
+        assert ok.name is not cancel.name
+
+    def test_missing_role_defaults_to_unknown(self):
+        root = parse_cdp_accessibility({"nodes": [{"nodeId": "1"}]})
+        assert root.role.value == "unknown"
+
+
+@pytest.mark.unit
+class TestSlots:
+    """AX node types are slotted: no per-instance __dict__."""
+
+    @pytest.mark.parametrize(
+        "obj",
+        [
+            AXNode(node_id="1"),
+            AXValue(type="role", value="button"),
+            AXProperty(name="focusable", value=AXValue(type="boolean", value=True)),
+        ],
+    )
+    def test_no_instance_dict(self, obj):
+        assert not hasattr(obj, "__dict__")
+
+    def test_copy_shares_metadata(self):
+        node = AXNode(node_id="1", role=AXValue(type="role", value="button"))
+        copy = node.copy(children=[], parent=None)
+        copy.metadata["role_id"] = "button-0"
+
+        assert node.metadata["role_id"] == "button-0"
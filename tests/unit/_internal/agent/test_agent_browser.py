@@ -252,3 +252,312 @@ async def test_sync_pages_removes_closed_tab(browser, mock_context):
     assert len(browser._pages) == 1
     assert page2 not in browser._pages
     assert page1 in browser._pages
+
+
+class ResolvingPage(MockPage):
+    """MockPage that resolves backend node IDs it knows about."""
+
+    def __init__(self, elements):
+        super().__init__()
+        self.elements = elements
+        self.selectors = []
+        self.kept = []
+
+    async def select_by_backend_node_id(self, backend_node_id, keep=False):
+        self.kept.append(keep)
+        return self.elements.get(backend_node_id)
+
+    async def select_one(self, selector):
+        self.selectors.append(str(selector))
+        return "xpath-element"
+
+
+def _browser_with_button(page):
+    from webtask._internal.dom import DomNode
+
+    root = DomNode(tag="html")
+    button = DomNode(tag="button", backend_dom_node_id=7)
+    root.add_child(button)
+
+    browser = AgentBrowser()
+    browser._pages = [page]
+    browser._current_page_index = 0
+    browser._dom_context = MagicMock()
+    browser._dom_context.get_dom_node.return_value = button
+    return browser
+
+
+@pytest.mark.asyncio
+async def test_select_resolves_backend_node_id():
+    """select() resolves the snapshot node directly, without XPath."""
+    page = ResolvingPage({7: "resolved-element"})
+    browser = _browser_with_button(page)
+
+    assert await browser.select("button-0") == "resolved-element"
+    assert page.selectors == []
+    assert page.kept == [False]
+
+
+@pytest.mark.asyncio
+async def test_select_can_keep_the_element():
+    """Elements for the user are kept past the next snapshot."""
+    page = ResolvingPage({7: "resolved-element"})
+    browser = _browser_with_button(page)
+
+    assert await browser.select("button-0", keep=True) == "resolved-element"
+    assert page.kept == [True]
+
+
+@pytest.mark.asyncio
+async def test_select_falls_back_to_xpath():
+    """When the node is gone, select() re-queries by XPath."""
+    page = ResolvingPage({})
+    browser = _browser_with_button(page)
+
+    assert await browser.select("button-0") == "xpath-element"
+    assert page.selectors == ["/html/button"]
+
+
+@pytest.mark.parametrize(
+    "tag, attrib, plain",
+    [
+        ("input", {}, True),
+        ("input", {"type": "email"}, True),
+        ("textarea", {}, True),
+        ("input", {"type": "search"}, False),
+        ("input", {"type": "checkbox"}, False),
+        ("input", {"role": "combobox"}, False),
+        ("input", {"aria-autocomplete": "list"}, False),
+        ("input", {"list": "cities"}, False),
+        ("select", {}, False),
+    ],
+)
+def test_is_plain_text_field(tag, attrib, plain):
+    """Only text fields that pop nothing up while typed into are plain."""
+    from webtask._internal.dom import DomNode
+
+    browser = AgentBrowser()
+    browser._dom_context = MagicMock()
+    browser._dom_context.get_dom_node.side_effect = lambda id: (
+        DomNode(tag=tag, attrib=attrib) if id == "field-0" else None
+    )
+
+    assert browser.is_plain_text_field("field-0") is plain
+    # Not in the snapshot the call was made for
+    assert browser.is_plain_text_field("field-9") is False
+
+
+@pytest.mark.asyncio
+async def test_incremental_context_reports_reuse():
+    """Incremental mode reuses the previous snapshot of the same page."""
+    from webtask._internal.context import PageCapture
+
+    dom = {
+        "documents": [
+            {
+                "nodes": {
+                    "nodeType": [9, 1, 1],
+                    "nodeName": [-1, 0, 1],
+                    "parentIndex": [-1, 0, 1],
+                    "attributes": [[], [], []],
+                    "backendNodeId": [1, 2, 3],
+                },
+                "layout": {"nodeIndex": [1, 2], "bounds": [[0, 0, 1, 1]] * 2},
+            }
+        ],
+        "strings": ["HTML", "BUTTON"],
+    }
+    browser = AgentBrowser(mode="dom", incremental=True)
+    browser._pages = [MockPage()]
+    browser._current_page_index = 0
+
+    browser._get_dom_snapshot(PageCapture(dom_snapshot=dom, ax_tree={"nodes": []}))
+    assert browser.get_reuse_stats() == {"reused": 0, "rebuilt": 2}
+
+    browser._get_dom_snapshot(PageCapture(dom_snapshot=dom, ax_tree={"nodes": []}))
+    assert browser.get_reuse_stats() == {"reused": 1, "rebuilt": 1}
+
+    browser.set_incremental(False)
+    browser._get_dom_snapshot(PageCapture(dom_snapshot=dom, ax_tree={"nodes": []}))
+    assert browser.get_reuse_stats() is None
+
+
+class RecordingPage(MockPage):
+    """MockPage that records which CDP data is fetched."""
+
+    def __init__(self):
+        super().__init__()
+        self.fetched = []
+
+    async def get_cdp_dom_snapshot(self):
+        self.fetched.append("dom_snapshot")
+        return {}
+
+    async def get_cdp_accessibility_tree(self):
+        self.fetched.append("ax_tree")
+        return {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "mode, fetched",
+    [("dom", ["dom_snapshot"]), ("accessibility", ["ax_tree", "dom_snapshot"])],
+)
+async def test_capture_fetches_what_the_mode_needs(mode, fetched):
+    """DOM mode skips the accessibility tree round-trip."""
+    page = RecordingPage()
+    browser = AgentBrowser(mode=mode)
+    browser._pages = [page]
+    browser._current_page_index = 0
+
+    capture = await browser._capture(include_dom=True, include_screenshot=False)
+
+    assert sorted(page.fetched) == fetched
+    assert (capture.ax_tree is None) == (mode == "dom")
+
+
+def test_viewport_window_uses_page_viewport():
+    """With viewport windowing on, the context is limited to the viewport."""
+    from webtask._internal.context import PageCapture
+
+    dom = {
+        "documents": [
+            {
+                "nodes": {
+                    "nodeType": [9, 1, 1, 1],
+                    "nodeName": [-1, 0, 1, 1],
+                    "parentIndex": [-1, 0, 1, 1],
+                    "attributes": [[], [], [], []],
+                    "backendNodeId": [1, 2, 3, 4],
+                },
+                "layout": {
+                    "nodeIndex": [1, 2, 3],
+                    "bounds": [[0, 0, 1280, 5000], [0, 0, 100, 40], [0, 4000, 100, 40]],
+                },
+                "scrollOffsetY": 0,
+            }
+        ],
+        "strings": ["HTML", "BUTTON"],
+    }
+    browser = AgentBrowser(mode="dom", viewport_window=True)
+    browser._pages = [MockPage()]
+    browser._current_page_index = 0
+
+    context = browser._get_dom_snapshot(PageCapture(dom_snapshot=dom))
+    assert "[button-0]" in context
+    assert "[button-1]" not in context
+    assert "[BELOW VIEWPORT: 1 element (button: 1)" in context
+
+    browser.set_viewport_window(False)
+    assert "[button-1]" in browser._get_dom_snapshot(PageCapture(dom_snapshot=dom))
+
+
+@pytest.mark.asyncio
+async def test_screenshot_pipeline_scales_coordinates_back():
+    """Clicks on a downscaled screenshot map back to viewport pixels."""
+    import io
+
+    from PIL import Image as PILImage
+
+    from webtask._internal.agent.message import AgentImage, AgentText
+    from webtask._internal.context import PageCapture
+    from webtask._internal.context.screenshot import ScreenshotOptions
+
+    out = io.BytesIO()
+    PILImage.new("RGB", (1280, 720), "white").save(out, format="PNG")
+    capture = PageCapture(screenshot=out.getvalue())
+
+    browser = AgentBrowser(
+        screenshot_options=ScreenshotOptions(max_width=640, dedup=True)
+    )
+    browser._pages = [MockPage()]
+    browser._current_page_index = 0
+
+    image = browser._get_screenshot(capture)
+    assert isinstance(image, AgentImage)
+    assert browser.scale_coordinates(320, 180) == (640, 360)
+    stats = browser.get_screenshot_stats()
+    assert 0 < stats["sent_bytes"] < stats["source_bytes"]
+
+    # Same screenshot again: a note instead of the image
+    note = browser._get_screenshot(capture)
+    assert isinstance(note, AgentText) and "unchanged" in note.text
+    assert browser.get_screenshot_stats()["sent_bytes"] == 0
+
+    browser.set_screenshot_options(None)
+    assert isinstance(browser._get_screenshot(capture), AgentImage)
+    assert browser.scale_coordinates(320, 180) == (320, 180)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("parse_in", ["thread", "process"])
+async def test_offloaded_context_matches_inline(parse_in):
+    """Context built in a pool is the same, and its elements still resolve."""
+    from webtask._internal.context import PageCapture
+    from webtask._internal.context.offload import shutdown_parse_executors
+
+    dom = {
+        "documents": [
+            {
+                "nodes": {
+                    "nodeType": [9, 1, 1],
+                    "nodeName": [-1, 0, 1],
+                    "parentIndex": [-1, 0, 1],
+                    "attributes": [[], [], []],
+                    "backendNodeId": [1, 2, 3],
+                },
+                "layout": {"nodeIndex": [1, 2], "bounds": [[0, 0, 1, 1]] * 2},
+            }
+        ],
+        "strings": ["HTML", "BUTTON"],
+    }
+    page = ResolvingPage({3: "resolved-element"})
+    inline = AgentBrowser(mode="dom")
+    offloaded = AgentBrowser(mode="dom", parse_in=parse_in)
+    for browser in (inline, offloaded):
+        browser._pages = [page]
+        browser._current_page_index = 0
+
+    try:
+        expected = inline._get_dom_snapshot(PageCapture(dom_snapshot=dom))
+        context = await offloaded._build_dom_snapshot(PageCapture(dom_snapshot=dom))
+    finally:
+        shutdown_parse_executors()
+
+    assert context == expected
+    assert await offloaded.select("button-0") == "resolved-element"
+
+
+@pytest.mark.asyncio
+async def test_thread_parse_keeps_incremental_reuse():
+    """Builds in a thread share the page's incremental state."""
+    from webtask._internal.context import PageCapture
+
+    dom = {
+        "documents": [
+            {
+                "nodes": {
+                    "nodeType": [9, 1, 1],
+                    "nodeName": [-1, 0, 1],
+                    "parentIndex": [-1, 0, 1],
+                    "attributes": [[], [], []],
+                    "backendNodeId": [1, 2, 3],
+                },
+                "layout": {"nodeIndex": [1, 2], "bounds": [[0, 0, 1, 1]] * 2},
+            }
+        ],
+        "strings": ["HTML", "BUTTON"],
+    }
+    browser = AgentBrowser(mode="dom", incremental=True, parse_in="thread")
+    browser._pages = [MockPage()]
+    browser._current_page_index = 0
+
+    await browser._build_dom_snapshot(PageCapture(dom_snapshot=dom))
+    await browser._build_dom_snapshot(PageCapture(dom_snapshot=dom))
+
+    assert browser.get_reuse_stats() == {"reused": 1, "rebuilt": 1}
+
+
+def test_rejects_unknown_parse_in():
+    with pytest.raises(ValueError):
+        AgentBrowser(parse_in="gpu")
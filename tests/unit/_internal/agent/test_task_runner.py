@@ -0,0 +1,192 @@
+"""Tests for TaskRunner dispatching streamed tool calls."""
+
+import asyncio
+from typing import List
+
+import pytest
+from pydantic import Field
+
+from webtask._internal.agent.task_runner import TaskRunner
+from webtask.llm import LLM, CachingLLM, Text, ToolCall, ToolResultStatus
+from webtask.llm.message import ToolResult
+from webtask.llm.tool import Tool, ToolParams
+
+pytestmark = pytest.mark.unit
+
+
+class RecordingTool(Tool):
+    """Records each call; fails for value "fail"."""
+
+    name = "record"
+    description = "Record a value"
+
+    class Params(ToolParams):
+        value: str = Field(description="Value to record")
+
+    def __init__(self, events: List[str]):
+        self.events = events
+
+    async def execute(self, params: Params) -> ToolResult:
+        self.events.append(f"run {params.value}")
+        if params.value == "fail":
+            return ToolResult(
+                name=self.name, status=ToolResultStatus.ERROR, error="failed"
+            )
+        return ToolResult(name=self.name, status=ToolResultStatus.SUCCESS)
+
+
+class StreamingLLM(LLM):
+    """Streams a response, noting when each item is emitted."""
+
+    def __init__(self, events: List[str], items):
+        super().__init__()
+        self.events = events
+        self.items = items
+
+    async def call_tools(self, messages, tools):
+        raise AssertionError("TaskRunner should stream")
+
+    async def stream_tools(self, messages, tools):
+        try:
+            for item in self.items:
+                await asyncio.sleep(0)
+                if isinstance(item, Exception):
+                    raise item
+                self.events.append(f"emit {item}")
+                yield item
+            self.events.append("stream end")
+        finally:
+            self.events.append("stream closed")
+
+
+def call(value: str) -> ToolCall:
+    return ToolCall(name="record", arguments={"value": value})
+
+
+def runner(mocker, events, items) -> TaskRunner:
+    return TaskRunner(
+        llm=StreamingLLM(events, items),
+        tools=[RecordingTool(events)],
+        get_context=mocker.AsyncMock(return_value=[]),
+        system_prompt="system",
+    )
+
+
+async def test_tool_calls_run_while_the_response_streams(mocker):
+    events = []
+    items = [Text(text="thinking"), call("a"), call("b")]
+    task_runner = runner(mocker, events, items)
+
+    model_msg, results = await task_runner._call_and_execute(
+        [], task_runner._setup_tools(mocker.Mock(status=None), None)
+    )
+
+    assert events == [
+        "emit Text(thinking)",
+        "emit ToolCall(record, value=a)",
+        "run a",
+        "emit ToolCall(record, value=b)",
+        "run b",
+        "stream end",
+        "stream closed",
+    ]
+    assert model_msg.content == items
+    assert [r.status for r in results] == [ToolResultStatus.SUCCESS] * 2
+
+
+async def test_calls_after_a_failure_are_skipped(mocker):
+    events = []
+    items = [call("a"), call("fail"), call("c"), ToolCall(name="missing", arguments={})]
+    task_runner = runner(mocker, events, items)
+
+    model_msg, results = await task_runner._call_and_execute(
+        [], task_runner._setup_tools(mocker.Mock(status=None), None)
+    )
+
+    assert "run c" not in events
+    assert model_msg.tool_calls == items
+    assert [r.description for r in results[2:]] == [
+        "record (SKIPPED)",
+        "missing (SKIPPED)",
+    ]
+    assert results[1].error == "failed"
+
+
+async def test_stream_failure_after_a_tool_call_keeps_the_partial_response(mocker):
+    """Actions that already ran are recorded, so a retry doesn't repeat them."""
+    events = []
+    items = [Text(text="thinking"), call("a"), ConnectionError("reset")]
+    task_runner = runner(mocker, events, items)
+
+    model_msg, results = await task_runner._call_and_execute(
+        [], task_runner._setup_tools(mocker.Mock(status=None), None)
+    )
+
+    assert model_msg.content == items[:2]
+    assert [r.status for r in results] == [ToolResultStatus.SUCCESS]
+    assert events.count("run a") == 1
+
+
+async def test_stream_failure_before_any_tool_call_raises(mocker):
+    events = []
+    items = [Text(text="thinking"), ConnectionError("reset")]
+    task_runner = runner(mocker, events, items)
+
+    with pytest.raises(ConnectionError):
+        await task_runner._call_and_execute(
+            [], task_runner._setup_tools(mocker.Mock(status=None), None)
+        )
+
+
+async def test_stream_is_closed_when_the_step_is_cancelled(mocker):
+    events = []
+    started = asyncio.Event()
+
+    class BlockingTool(RecordingTool):
+        async def execute(self, params):
+            started.set()
+            await asyncio.Event().wait()
+
+    task_runner = runner(mocker, events, [call("a"), call("b")])
+    task_runner._tools = [BlockingTool(events)]
+    step = asyncio.create_task(
+        task_runner._call_and_execute(
+            [], task_runner._setup_tools(mocker.Mock(status=None), None)
+        )
+    )
+    await started.wait()
+
+    step.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await step
+
+    assert events[-1] == "stream closed"
+    assert "stream end" not in events
+
+
+async def test_run_streams_until_complete_work(mocker):
+    events = []
+    items = [call("a"), ToolCall(name="complete_work", arguments={"feedback": "ok"})]
+    task_runner = runner(mocker, events, items)
+
+    run = await task_runner.run("task", max_steps=3)
+
+    assert run.result.status.value == "completed"
+    assert run.steps_used == 1
+    assert run.messages[1].tool_results[1].terminal
+
+
+async def test_replayed_run_needs_no_llm(mocker, tmp_path):
+    events = []
+    items = [call("a"), ToolCall(name="complete_work", arguments={"feedback": "ok"})]
+    recorder = CachingLLM(StreamingLLM(events, items), tmp_path)
+    task_runner = runner(mocker, events, items)
+    task_runner._llm = recorder
+    recorded = await task_runner.run("task", max_steps=3)
+
+    task_runner._llm = CachingLLM(None, tmp_path, mode="replay")
+    replayed = await task_runner.run("task", max_steps=3)
+
+    assert replayed.result.feedback == recorded.result.feedback == "ok"
+    assert task_runner._llm.get_stats()["hits"] == 1
+    assert events.count("stream end") == 1
@@ -0,0 +1,151 @@
+"""Tests for TokenBudget prompt trimming."""
+
+import pytest
+
+from webtask._internal.agent import token_budget
+from webtask._internal.agent.message import AgentImage, AgentText
+from webtask._internal.agent.task_runner import TaskRunner
+from webtask._internal.agent.token_budget import IMAGE_TOKENS, TokenBudget
+from webtask.llm import Message, Role, Text
+
+pytestmark = pytest.mark.unit
+
+PAGE = "\n".join(
+    [
+        "Current Tab:",
+        "- [html-0]",
+        "  - [button-0]",
+        '    - "Sign in"',
+        "  - [a-0] href=/help",
+        '    - "Help"',
+        "[END OF PAGE]",
+    ]
+)
+
+
+@pytest.fixture(autouse=True)
+def one_token_per_char(monkeypatch):
+    monkeypatch.setattr(token_budget, "count_tokens", len)
+
+
+def conversation(steps: int):
+    """System + task messages, then one (model, tool) pair per step."""
+    messages = [
+        Message(role=Role.SYSTEM, content=[Text(text="system")]),
+        Message(role=Role.USER, content=[AgentText(text="task")]),
+    ]
+    for step in range(steps):
+        messages.append(Message(role=Role.MODEL, content=[Text(text=f"step {step}")]))
+        messages.append(
+            Message(
+                role=Role.TOOL,
+                content=[
+                    AgentText(text=PAGE, lifespan=1),
+                    AgentImage(data="png", lifespan=2),
+                ],
+            )
+        )
+    return messages
+
+
+def page_items(messages):
+    return [
+        c for msg in messages for c in msg.content or [] if getattr(c, "lifespan", None)
+    ]
+
+
+def test_under_budget_is_untouched():
+    messages = conversation(2)
+    budget = TokenBudget(10_000)
+
+    assert budget.fit(messages) is messages
+
+
+def test_counts_are_kept_only_for_the_current_prompt():
+    budget = TokenBudget(10_000)
+    messages = conversation(2)
+    budget.fit(messages)
+    old_image = messages[3].content[1]
+    assert id(old_image) in budget._counts
+
+    # The first step left the history
+    remaining = messages[:2] + messages[4:]
+    budget.fit(remaining)
+
+    assert id(old_image) not in budget._counts
+    assert len(budget._counts) == sum(len(m.content) for m in remaining)
+
+
+def test_older_page_context_goes_first():
+    messages = conversation(3)
+    budget = TokenBudget(0)
+    full = budget.count_messages(messages)
+    budget.max_tokens = full - IMAGE_TOKENS - len(PAGE)
+
+    fitted = budget.fit(messages)
+
+    # Oldest page text and screenshot are dropped, the latest step is intact
+    assert budget.count_messages(fitted) <= budget.max_tokens
+    assert fitted[3].content is None
+    assert fitted[-1] is messages[-1]
+    assert len(page_items(messages)) == 6  # input not modified
+
+
+def test_latest_page_drops_text_before_elements():
+    messages = conversation(1)
+    budget = TokenBudget(0)
+    budget.max_tokens = budget.count_messages(messages) - len('    - "Help"')
+
+    fitted = budget.fit(messages)
+
+    page = fitted[-1].content[0].text
+    assert '"Help"' not in page
+    assert '"Sign in"' in page
+    assert "[a-0] href=/help" in page
+    assert "[TRUNCATED: 0 elements and 1 text lines omitted" in page
+    assert fitted[-1].content[0].lifespan == 1
+
+
+def test_elements_dropped_from_the_bottom():
+    messages = conversation(1)
+    budget = TokenBudget(0)
+    budget.max_tokens = budget.count_messages(messages) - len(PAGE) // 2
+
+    page = budget.fit(messages)[-1].content[0].text
+
+    assert page.startswith("Current Tab:\n- [html-0]")
+    assert "[a-0]" not in page
+    assert page.endswith("[END OF PAGE]")
+
+
+def test_untrimmable_content_is_reported(mocker):
+    messages = conversation(1)
+    budget = TokenBudget(1)
+    budget._logger = mocker.Mock()
+
+    fitted = budget.fit(messages)
+
+    assert "[html-0]" not in fitted[-1].content[0].text
+    message = budget._logger.warning.call_args[0][0]
+    assert "never trimmed" in message
+    assert "trimmed latest page context" in message
+
+
+def test_task_runner_applies_budget(mocker):
+    messages = conversation(3)
+    runner = TaskRunner(
+        llm=mocker.Mock(),
+        tools=[],
+        get_context=mocker.AsyncMock(return_value=[]),
+        system_prompt="system",
+        max_context_tokens=IMAGE_TOKENS + len(PAGE) + 50,
+    )
+    pairs = list(zip(messages[2::2], messages[3::2]))
+
+    prepared = runner._prepare_messages(messages[:2], pairs)
+
+    assert (
+        runner._token_budget.count_messages(prepared) <= runner._token_budget.max_tokens
+    )
+    # Lifespans leave 3 page items; the budget drops the older screenshot
+    assert len(page_items(prepared)) == 2
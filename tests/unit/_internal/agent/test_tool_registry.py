@@ -6,6 +6,7 @@ from webtask.llm.tool import Tool, ToolParams
 from webtask.llm import ToolCall, ToolResultStatus
 from webtask.llm.message import ToolResult
 from webtask._internal.agent.tool_registry import ToolRegistry
+from webtask._internal.utils.wait import wait
 
 pytestmark = pytest.mark.unit
 
@@ -241,3 +242,129 @@ async def test_tool_params_rejects_extra_fields():
     assert results[0].name == "strict"
     assert results[0].error is not None
     assert "extra" in results[0].error.lower() or "element_id" in results[0].error
+
+
+class WaitingTool(Tool):
+    """Tool that waits after its action, like the browser tools."""
+
+    name = "fill"
+    description = "A tool that waits after acting"
+    Params = DummyParams
+
+    def __init__(self, name: str, batched: bool, events: list):
+        self.name = name
+        self.batched = batched
+        self.events = events
+
+    def settles_in_batch(self, params: DummyParams) -> bool:
+        """Batch the calls of batched tools, except for value 'popup'."""
+        return self.batched and params.value != "popup"
+
+    async def execute(self, params: DummyParams) -> ToolResult:
+        """Record the action, then wait like a browser tool."""
+        self.events.append(f"{self.name}:{params.value}")
+        await wait(params.count / 10)
+        return ToolResult(
+            name=self.name,
+            status=ToolResultStatus.SUCCESS,
+            description=f"{self.name} {params.value}",
+        )
+
+
+@pytest.fixture
+def waiting_registry(mocker):
+    """Registry with a batched fill tool and an unbatched click tool, recording
+    actions and the sleeps that actually happen."""
+    events = []
+
+    async def sleep(seconds):
+        events.append(f"sleep:{seconds}")
+
+    mocker.patch("webtask._internal.utils.wait.asyncio.sleep", side_effect=sleep)
+    reg = ToolRegistry()
+    reg.register(WaitingTool("fill", True, events))
+    reg.register(WaitingTool("click", False, events))
+    return reg, events
+
+
+def _call(name: str, value: str, count: int = 1) -> ToolCall:
+    return ToolCall(
+        id=f"{name}-{value}", name=name, arguments={"value": value, "count": count}
+    )
+
+
+@pytest.mark.unit
+async def test_waits_of_consecutive_fills_are_merged(waiting_registry):
+    """Consecutive settle_in_batch tools wait once, for the longest wait,
+    before the next tool that isn't batched."""
+    registry, events = waiting_registry
+
+    results = await registry.execute_tool_calls(
+        [
+            _call("fill", "a"),
+            _call("fill", "b", 3),
+            _call("fill", "c"),
+            _call("click", "go"),
+        ]
+    )
+
+    assert [r.status for r in results] == [ToolResultStatus.SUCCESS] * 4
+    assert events == [
+        "fill:a",
+        "fill:b",
+        "fill:c",
+        "sleep:0.3",
+        "click:go",
+        "sleep:0.1",
+    ]
+
+
+@pytest.mark.unit
+async def test_trailing_fills_settle_when_the_batch_finishes(waiting_registry):
+    """Waits still deferred at the end are waited out before results return."""
+    registry, events = waiting_registry
+
+    await registry.execute_tool_calls(
+        [_call("click", "go"), _call("fill", "a"), _call("fill", "b")]
+    )
+
+    assert events == ["click:go", "sleep:0.1", "fill:a", "fill:b", "sleep:0.1"]
+
+
+@pytest.mark.unit
+async def test_batched_fills_still_stop_on_error(waiting_registry):
+    """A failed call in a run of fills skips the rest; earlier waits still settle."""
+    registry, events = waiting_registry
+
+    results = await registry.execute_tool_calls(
+        [
+            _call("fill", "a"),
+            ToolCall(id="bad", name="fill", arguments={"count": 1}),
+            _call("fill", "c"),
+        ]
+    )
+
+    assert results[0].status == ToolResultStatus.SUCCESS
+    assert results[1].status == ToolResultStatus.ERROR
+    assert "SKIPPED" in results[2].description
+    assert events == ["fill:a", "sleep:0.1"]
+
+
+@pytest.mark.unit
+async def test_fill_the_tool_wont_batch_settles_like_any_other_call(waiting_registry):
+    """A call its tool doesn't batch (e.g. an autocomplete input) waits
+    for earlier fills first and its own wait isn't merged."""
+    registry, events = waiting_registry
+
+    await registry.execute_tool_calls(
+        [_call("fill", "a"), _call("fill", "popup"), _call("fill", "c")]
+    )
+
+    assert events == [
+        "fill:a",
+        "sleep:0.1",
+        "fill:popup",
+        "sleep:0.1",
+        "fill:c",
+        "sleep:0.1",
+    ]
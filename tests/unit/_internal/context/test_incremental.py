@@ -0,0 +1,203 @@
+"""Tests for incremental context building across snapshots."""
+
+import random
+
+import pytest
+
+from webtask._internal.context import IncrementalContext, LLMDomContext, PageCapture
+from webtask._internal.dom import DomNode
+
+MODES = ("dom", "accessibility")
+
+
+def list_capture(items) -> PageCapture:
+    """Page with a <ul> of (item_id, label, hidden) items, plus its AX tree.
+
+    Backend node IDs derive from item_id, so an item keeps its IDs when
+    other items are inserted or removed around it.
+    """
+    strings = ["HTML", "BODY", "UL", "LI", "BUTTON", "block", "visible", "1"]
+    node_type, node_name, node_value, parent_index = [9], [-1], [-1], [-1]
+    attributes, backend_ids, layout_index = [[]], [1], []
+
+    def add(kind, name, value, parent, attrs, backend_id, rendered=True):
+        index = len(node_type)
+        node_type.append(kind)
+        node_name.append(name)
+        node_value.append(value)
+        parent_index.append(parent)
+        flat = []
+        for key, val in attrs.items():
+            for s in (key, val):
+                strings.append(s)
+                flat.append(len(strings) - 1)
+        attributes.append(flat)
+        backend_ids.append(backend_id)
+        if rendered:
+            layout_index.append(index)
+        return index
+
+    html = add(1, 0, -1, 0, {}, 2)
+    body = add(1, 1, -1, html, {}, 3)
+    ul = add(1, 2, -1, body, {"class": "results"}, 4)
+    ax_nodes = [
+        _ax("2", None, "RootWebArea", "", 2),
+        _ax("4", "2", "list", "", 4),
+    ]
+    for item_id, label, hidden in items:
+        base = 1000 * (item_id + 1)
+        li = add(1, 3, -1, ul, {"data-id": str(item_id)}, base, not hidden)
+        button = add(1, 4, -1, li, {"aria-label": label}, base + 1, not hidden)
+        strings.append(label)
+        add(3, -1, len(strings) - 1, button, {}, base + 2, not hidden)
+        if not hidden:
+            ax_nodes += [
+                _ax(str(base), "4", "listitem", "", base),
+                _ax(str(base + 1), str(base), "button", label, base + 1),
+                _ax(str(base + 2), str(base + 1), "StaticText", label, base + 2),
+            ]
+    for node in ax_nodes:
+        node["childIds"] = [
+            n["nodeId"] for n in ax_nodes if n["parentId"] == node["nodeId"]
+        ]
+
+    dom = {
+        "documents": [
+            {
+                "nodes": {
+                    "nodeType": node_type,
+                    "nodeName": node_name,
+                    "nodeValue": node_value,
+                    "parentIndex": parent_index,
+                    "attributes": attributes,
+                    "backendNodeId": backend_ids,
+                },
+                "layout": {
+                    "nodeIndex": layout_index,
+                    "bounds": [[0, 0, 100, 20]] * len(layout_index),
+                    "styles": [[5, 6, 7]] * len(layout_index),
+                },
+            }
+        ],
+        "strings": strings,
+    }
+    return PageCapture(dom_snapshot=dom, ax_tree={"nodes": ax_nodes})
+
+
+def _ax(node_id, parent_id, role, name, backend_id):
+    return {
+        "nodeId": node_id,
+        "parentId": parent_id,
+        "ignored": False,
+        "role": {"type": "role", "value": role},
+        "name": {"type": "computedString", "value": name},
+        "backendDOMNodeId": backend_id,
+    }
+
+
+def build(items, mode, incremental=None):
+    context = LLMDomContext.from_capture(list_capture(items), incremental=incremental)
+    context.get_context(mode)
+    return context
+
+
+def assert_same_context(expected: LLMDomContext, actual: LLMDomContext, mode):
+    assert actual.get_context(mode) == expected.get_context(mode)
+    actual_map = actual._get_element_map(mode)
+    expected_map = expected._get_element_map(mode)
+    assert actual_map.keys() == expected_map.keys()
+    current = {id(node) for node in actual.dom_root.traverse()}
+    for element_id, node in actual_map.items():
+        # Element IDs must resolve into the current snapshot's tree
+        assert id(node) in current
+        expected_node = expected_map[element_id]
+        assert node.backend_dom_node_id == expected_node.backend_dom_node_id
+        assert node.get_x_path().path == expected_node.get_x_path().path
+
+
+ITEMS = [(i, f"Add item {i}", False) for i in range(20)]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("mode", MODES)
+class TestIncrementalContext:
+    """Incremental builds match fresh builds and reuse unchanged subtrees."""
+
+    def test_unchanged_page_is_reused(self, mode):
+        state = IncrementalContext()
+        first = build(ITEMS, mode, state)
+        assert first.get_reuse_stats()["reused"] == 0
+
+        second = build(ITEMS, mode, state)
+        assert_same_context(build(ITEMS, mode), second, mode)
+        stats = second.get_reuse_stats()
+        assert stats["reused"] > 0
+        assert stats["rebuilt"] <= 5  # only the root spine
+
+    def test_changed_item_is_rebuilt(self, mode):
+        state = IncrementalContext()
+        build(ITEMS, mode, state)
+
+        changed = list(ITEMS)
+        changed[7] = (7, "Added!", False)
+        context = build(changed, mode, state)
+
+        assert_same_context(build(changed, mode), context, mode)
+        assert "Added!" in context.get_context(mode)
+        stats = context.get_reuse_stats()
+        assert stats["rebuilt"] < stats["reused"] // 5
+
+    def test_inserted_sibling_shifts_xpaths(self, mode):
+        state = IncrementalContext()
+        build(ITEMS, mode, state)
+
+        inserted = [(99, "New", False)] + ITEMS
+        context = build(inserted, mode, state)
+
+        assert_same_context(build(inserted, mode), context, mode)
+        node = next(
+            n
+            for n in context._get_element_map(mode).values()
+            if n.attrib.get("aria-label") == "Add item 0"
+        )
+        assert node.get_x_path().path == "/html/body/ul/li[2]/button"
+
+    def test_random_mutations_match_fresh_builds(self, mode):
+        rng = random.Random(0)
+        state = IncrementalContext()
+        items = list(ITEMS)
+        next_id = len(items)
+        for _ in range(30):
+            action = rng.choice(("relabel", "toggle", "insert", "remove"))
+            pos = rng.randrange(len(items))
+            item_id, label, hidden = items[pos]
+            if action == "relabel":
+                items[pos] = (item_id, f"{label}!", hidden)
+            elif action == "toggle":
+                items[pos] = (item_id, label, not hidden)
+            elif action == "insert":
+                items.insert(pos, (next_id, f"Item {next_id}", False))
+                next_id += 1
+            elif len(items) > 1:
+                items.pop(pos)
+
+            assert_same_context(build(items, mode), build(items, mode, state), mode)
+
+    def test_not_incremental_has_no_stats(self, mode):
+        assert build(ITEMS, mode).get_reuse_stats() is None
+
+
+@pytest.mark.unit
+def test_line_cache_holds_only_current_nodes():
+    """Serialized lines of nodes that left the page are dropped."""
+    state = IncrementalContext()
+    build(ITEMS, "dom", state)
+    context = build(ITEMS[:5], "dom", state)
+
+    element_lines = [
+        line
+        for line in context.get_context("dom").splitlines()
+        if line.lstrip().startswith("- [")
+    ]
+    assert len(state.line_cache) == len(element_lines)
+    assert all(isinstance(node, DomNode) for node, _ in state.line_cache.values())
@@ -0,0 +1,190 @@
+"""Tests for LLMDomContext."""
+
+import sys
+from dataclasses import replace
+
+import pytest
+
+from webtask._internal.context import LLMDomContext, PageCapture
+from webtask._internal.dom.serializers import serialize_to_json
+
+DEPTH = sys.getrecursionlimit() * 3
+
+
+def deep_capture(depth: int) -> PageCapture:
+    """Page with depth nested divs around a button, plus a matching AX tree."""
+    node_type = [9, 1, 1]
+    node_name = [-1, 0, 1]
+    parent_index = [-1, 0, 1]
+    for _ in range(depth):
+        parent_index.append(len(node_type) - 1)
+        node_type.append(1)
+        node_name.append(2)
+    parent_index += [len(node_type) - 1, len(node_type)]
+    node_type += [1, 3]
+    node_name += [3, -1]
+    count = len(node_type)
+    dom = {
+        "documents": [
+            {
+                "nodes": {
+                    "nodeType": node_type,
+                    "nodeName": node_name,
+                    "nodeValue": [-1] * (count - 1) + [4],
+                    "parentIndex": parent_index,
+                    "attributes": [[] for _ in range(count)],
+                    "backendNodeId": list(range(1, count + 1)),
+                },
+                "layout": {
+                    "nodeIndex": list(range(1, count)),
+                    "bounds": [[0, 0, 100, 20]] * (count - 1),
+                    "styles": [[5, 6, 7]] * (count - 1),
+                },
+            }
+        ],
+        "strings": ["HTML", "BODY", "DIV", "BUTTON", "Go", "block", "visible", "1"],
+    }
+
+    ax_nodes = []
+    for i in range(1, count):
+        role = {1: "RootWebArea", count - 2: "button", count - 1: "StaticText"}
+        ax_nodes.append(
+            {
+                "nodeId": str(i),
+                "parentId": str(i - 1) if i > 1 else None,
+                "childIds": [str(i + 1)] if i < count - 1 else [],
+                "role": {"type": "role", "value": role.get(i, "generic")},
+                "name": {
+                    "type": "computedString",
+                    "value": "Go" if i >= count - 2 else "",
+                },
+                "backendDOMNodeId": i + 1,
+            }
+        )
+    return PageCapture(dom_snapshot=dom, ax_tree={"nodes": ax_nodes})
+
+
+@pytest.mark.unit
+class TestDeepTrees:
+    """Context building must not depend on the recursion limit."""
+
+    def test_dom_mode(self):
+        context = LLMDomContext.from_capture(deep_capture(DEPTH))
+
+        text = context.get_context("dom")
+
+        assert "[button-0]" in text
+        assert context.get_dom_node("button-0").tag == "button"
+
+    def test_accessibility_mode(self):
+        context = LLMDomContext.from_capture(deep_capture(DEPTH))
+
+        text = context.get_context("accessibility")
+
+        assert text.splitlines()[:2] == ["- [RootWebArea-0]", '  - [button-0] "Go"']
+        assert context.get_dom_node("button-0").tag == "button"
+
+    def test_traverse_and_json(self):
+        context = LLMDomContext.from_capture(deep_capture(DEPTH))
+        nodes = list(context.dom_root.traverse())
+
+        assert len(nodes) == DEPTH + 4
+        assert [n.tag for n in nodes[:3]] == ["html", "body", "div"]
+        assert nodes[-1].content == "Go"
+        assert serialize_to_json(context.dom_root)["tag"] == "html"
+
+
+class CapturePage:
+    """Page stub serving a fixed capture and recording which CDP data is fetched."""
+
+    def __init__(self, capture: PageCapture):
+        self.capture = capture
+        self.fetched = []
+
+    async def get_cdp_dom_snapshot(self):
+        self.fetched.append("dom_snapshot")
+        return self.capture.dom_snapshot
+
+    async def get_cdp_accessibility_tree(self):
+        self.fetched.append("ax_tree")
+        return self.capture.ax_tree
+
+
+@pytest.mark.unit
+class TestLazyModes:
+    """Only what a mode needs is fetched, parsed and built."""
+
+    def test_dom_mode_needs_no_accessibility_tree(self):
+        capture = replace(deep_capture(3), ax_tree=None)
+        context = LLMDomContext.from_capture(capture)
+
+        assert "[button-0]" in context.get_context("dom")
+        assert context.get_dom_node("button-0").tag == "button"
+        assert context._ax_root is None
+        with pytest.raises(ValueError, match="accessibility tree"):
+            context.get_context("accessibility")
+
+    def test_trees_are_parsed_on_first_use(self):
+        context = LLMDomContext.from_capture(deep_capture(3))
+
+        assert context._dom_root is None and context._ax_root is None
+        context.get_context("accessibility")
+        assert context._dom_root is None  # role IDs not resolved yet
+        context.get_dom_node("button-0")
+        assert context._dom_root is not None
+
+    def test_each_mode_is_cached_separately(self):
+        context = LLMDomContext.from_capture(deep_capture(3))
+
+        ax_text = context.get_context("accessibility")
+        dom_text = context.get_context("dom")
+
+        assert ax_text != dom_text
+        assert context.get_context("accessibility") is ax_text
+        assert context.get_context("dom") is dom_text
+
+    def test_ids_resolve_in_the_mode_last_requested(self):
+        context = LLMDomContext.from_capture(deep_capture(3))
+
+        context.get_context("dom")
+        assert context.get_dom_node("html-0").tag == "html"
+        context.get_context("accessibility")
+        assert context.get_dom_node("html-0") is None
+        assert context.get_dom_node("html-0", mode="dom").tag == "html"
+
+    def test_ids_stay_out_of_the_parsed_trees(self):
+        """Element IDs live in the context's maps, not in node metadata that
+        filtered and memoized trees share with the parsed ones."""
+        context = LLMDomContext.from_capture(deep_capture(3))
+
+        context.get_context("dom")
+        context.get_context("accessibility")
+
+        for root in (context.dom_root, context.ax_root):
+            for node in root.traverse():
+                metadata = getattr(node, "metadata", {})
+                assert "tag_id" not in metadata and "role_id" not in metadata
+
+    def test_invalid_mode(self):
+        context = LLMDomContext.from_capture(deep_capture(3))
+        context.get_context("dom")
+
+        with pytest.raises(ValueError, match="Invalid mode"):
+            context.get_context("html")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "mode, fetched",
+        [
+            ("dom", ["dom_snapshot"]),
+            ("accessibility", ["ax_tree", "dom_snapshot"]),
+            (None, ["ax_tree", "dom_snapshot"]),
+        ],
+    )
+    async def test_from_page_fetches_what_the_mode_needs(self, mode, fetched):
+        page = CapturePage(deep_capture(3))
+
+        context = await LLMDomContext.from_page(page, mode=mode)
+
+        assert sorted(page.fetched) == fetched
+        assert "[button-0]" in context.get_context(mode or "accessibility")
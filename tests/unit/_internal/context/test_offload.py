@@ -0,0 +1,95 @@
+"""Tests for building page context in a thread or process pool."""
+
+import pytest
+
+from webtask._internal.context import PageCapture, RemoteDomContext
+from webtask import Webtask
+from webtask._internal.context import offload
+from webtask._internal.context.offload import (
+    build_dom_context,
+    build_dom_context_in,
+    get_parse_executor,
+    shutdown_parse_executors,
+)
+
+pytestmark = pytest.mark.unit
+
+DOM = {
+    "documents": [
+        {
+            "nodes": {
+                "nodeType": [9, 1, 1, 1],
+                "nodeName": [-1, 0, 1, 1],
+                "parentIndex": [-1, 0, 1, 1],
+                "attributes": [[], [], [2, 3], []],
+                "backendNodeId": [1, 2, 3, 4],
+            },
+            "layout": {"nodeIndex": [1, 2, 3], "bounds": [[0, 0, 1, 1]] * 3},
+        }
+    ],
+    "strings": ["HTML", "BUTTON", "name", "buy"],
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def parse_pools():
+    yield
+    shutdown_parse_executors()
+
+
+@pytest.mark.parametrize("parse_in", ["inline", "thread", "process"])
+async def test_builds_the_same_context_anywhere(parse_in):
+    expected = build_dom_context(PageCapture(dom_snapshot=DOM), "dom")
+
+    context = await build_dom_context_in(parse_in, PageCapture(dom_snapshot=DOM), "dom")
+
+    assert context.get_context(mode="dom") == expected.get_context(mode="dom")
+    for id in ("button-0", "button-1"):
+        node, original = context.get_dom_node(id), expected.get_dom_node(id)
+        assert node.backend_dom_node_id == original.backend_dom_node_id
+        assert str(node.get_x_path()) == str(original.get_x_path())
+    assert context.get_dom_node("button-9") is None
+
+
+async def test_process_build_returns_only_what_the_parent_needs():
+    context = await build_dom_context_in(
+        "process", PageCapture(dom_snapshot=DOM, screenshot=b"png"), "dom"
+    )
+
+    assert isinstance(context, RemoteDomContext)
+    assert context.get_reuse_stats() is None
+    with pytest.raises(ValueError):
+        context.get_context(mode="accessibility")
+
+
+async def test_rejects_unknown_parse_in():
+    with pytest.raises(ValueError):
+        await build_dom_context_in("gpu", PageCapture(dom_snapshot=DOM), "dom")
+
+
+async def test_webtask_close_shuts_down_parse_pools():
+    executor = get_parse_executor("process")
+    await build_dom_context_in("process", PageCapture(dom_snapshot=DOM), "dom")
+
+    await Webtask().close()
+
+    assert offload._executors == {}
+    with pytest.raises(RuntimeError):
+        executor.submit(int)
+
+
+async def test_parse_pools_outlive_all_but_the_last_webtask():
+    first, second = Webtask(), Webtask()
+    executor = get_parse_executor("thread")
+
+    await first.close()
+    await first.close()
+
+    assert executor.submit(int).result() == 0
+    assert offload._executors == {"thread": executor}
+
+    await second.close()
+
+    assert offload._executors == {}
+    with pytest.raises(RuntimeError):
+        executor.submit(int)
@@ -0,0 +1,52 @@
+"""Tests for the concurrent page capture stage."""
+
+import asyncio
+import time
+
+import pytest
+
+from webtask._internal.context import capture_page
+
+pytestmark = pytest.mark.unit
+
+CAPTURE_DELAY = 0.1
+
+
+class SlowPage:
+    """Page stub whose captures each take CAPTURE_DELAY seconds."""
+
+    async def get_cdp_dom_snapshot(self):
+        await asyncio.sleep(CAPTURE_DELAY)
+        return {"documents": [], "strings": []}
+
+    async def get_cdp_accessibility_tree(self):
+        await asyncio.sleep(CAPTURE_DELAY)
+        return {"nodes": []}
+
+    async def screenshot(self, path=None, full_page=False):
+        await asyncio.sleep(CAPTURE_DELAY)
+        return b"png"
+
+
+@pytest.mark.asyncio
+async def test_captures_run_concurrently():
+    """All three captures overlap instead of running back to back."""
+    start = time.perf_counter()
+    capture = await capture_page(SlowPage(), screenshot=True)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < CAPTURE_DELAY * 2
+    assert capture.dom_snapshot == {"documents": [], "strings": []}
+    assert capture.ax_tree == {"nodes": []}
+    assert capture.screenshot == b"png"
+
+
+@pytest.mark.asyncio
+async def test_reports_per_capture_timings():
+    """Each requested capture gets its own timing plus the stage total."""
+    capture = await capture_page(SlowPage(), accessibility_tree=False)
+
+    assert set(capture.timings) == {"dom_snapshot", "total"}
+    assert capture.timings["dom_snapshot"] >= CAPTURE_DELAY * 0.9
+    assert capture.ax_tree is None
+    assert capture.screenshot is None
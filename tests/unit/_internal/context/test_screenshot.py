@@ -0,0 +1,82 @@
+"""Tests for the screenshot pipeline."""
+
+import io
+import random
+
+import pytest
+from PIL import Image as PILImage
+
+from webtask._internal.context.screenshot import ScreenshotOptions, ScreenshotPipeline
+from webtask.llm import ImageMimeType
+
+pytestmark = pytest.mark.unit
+
+
+def page_png(seed: int = 0, size=(640, 360)) -> bytes:
+    """A PNG with random blocks over a noisy background (like photos on a page)."""
+    rng = random.Random(seed)
+    tile = (size[0] // 4, size[1] // 4)
+    noise = PILImage.frombytes("L", tile, rng.randbytes(tile[0] * tile[1]))
+    image = noise.resize(size).convert("RGB")
+    for _ in range(40):
+        x, y = rng.randrange(size[0]), rng.randrange(size[1])
+        color = tuple(rng.randrange(256) for _ in range(3))
+        image.paste(color, (x, y, x + 120, y + 40))
+    out = io.BytesIO()
+    image.save(out, format="PNG")
+    return out.getvalue()
+
+
+def decoded(data: bytes) -> PILImage.Image:
+    return PILImage.open(io.BytesIO(data))
+
+
+def test_defaults_send_capture_as_is():
+    png = page_png()
+    shot = ScreenshotPipeline(ScreenshotOptions()).process(png)
+
+    assert shot.data is png
+    assert shot.size == shot.source_size == (640, 360)
+
+
+def test_downscale_keeps_aspect_ratio():
+    options = ScreenshotOptions(max_width=320, format=ImageMimeType.JPEG, quality=60)
+    shot = ScreenshotPipeline(options).process(page_png())
+
+    assert shot.size == (320, 180)
+    assert decoded(shot.data).size == (320, 180)
+    assert decoded(shot.data).format == "JPEG"
+    assert shot.mime_type == ImageMimeType.JPEG
+    assert len(shot.data) < shot.source_bytes
+
+
+def test_max_height_limits_too():
+    options = ScreenshotOptions(max_width=500, max_height=90)
+    shot = ScreenshotPipeline(options).process(page_png())
+
+    assert shot.size == (160, 90)
+
+
+def test_webp_encoding():
+    options = ScreenshotOptions(format=ImageMimeType.WEBP)
+    shot = ScreenshotPipeline(options).process(page_png())
+
+    assert decoded(shot.data).format == "WEBP"
+
+
+def test_dedup_skips_unchanged_screenshot():
+    pipeline = ScreenshotPipeline(ScreenshotOptions(dedup=True))
+
+    assert not pipeline.process(page_png(0)).duplicate
+    repeat = pipeline.process(page_png(0))
+    assert repeat.duplicate
+    assert repeat.data == b""
+    assert not pipeline.process(page_png(1)).duplicate
+
+    pipeline.reset()
+    assert not pipeline.process(page_png(1)).duplicate
+
+
+def test_unsupported_format():
+    with pytest.raises(ValueError, match="Unsupported screenshot format"):
+        ScreenshotOptions(format=ImageMimeType.GIF)
@@ -0,0 +1,129 @@
+"""Tests for viewport-windowed context."""
+
+import pytest
+
+from webtask._internal.context import LLMDomContext, PageCapture, ViewportWindow
+
+ITEM_HEIGHT = 100
+VIEWPORT_HEIGHT = 400
+
+
+def feed_capture(num_items: int, scroll_y: float) -> PageCapture:
+    """Page with a feed of num_items buttons stacked ITEM_HEIGHT px apart."""
+    height = num_items * ITEM_HEIGHT
+    strings = ["HTML", "BODY", "BUTTON", "block", "visible", "1"]
+    node_type, node_name, node_value = [9, 1, 1], [-1, 0, 1], [-1, -1, -1]
+    parent_index = [-1, 0, 1]
+    bounds = [[0, 0, 1280, height], [0, 0, 1280, height]]
+    ax_nodes = [_ax(2, None, "RootWebArea", ""), _ax(3, 2, "generic", "")]
+    for i in range(num_items):
+        strings.append(f"Item {i}")
+        button = len(node_type)
+        node_type += [1, 3]
+        node_name += [2, -1]
+        node_value += [-1, len(strings) - 1]
+        parent_index += [2, button]
+        bounds.append([0, i * ITEM_HEIGHT, 200, 40])
+        ax_nodes.append(_ax(button + 1, 3, "button", f"Item {i}"))
+    count = len(node_type)
+    dom = {
+        "documents": [
+            {
+                "nodes": {
+                    "nodeType": node_type,
+                    "nodeName": node_name,
+                    "nodeValue": node_value,
+                    "parentIndex": parent_index,
+                    "attributes": [[] for _ in range(count)],
+                    "backendNodeId": list(range(1, count + 1)),
+                },
+                "layout": {
+                    "nodeIndex": [1, 2] + list(range(3, count, 2)),
+                    "bounds": bounds,
+                    "styles": [[3, 4, 5]] * len(bounds),
+                },
+                "scrollOffsetY": scroll_y,
+            }
+        ],
+        "strings": strings,
+    }
+    for node in ax_nodes:
+        node["childIds"] = [
+            n["nodeId"] for n in ax_nodes if n["parentId"] == node["nodeId"]
+        ]
+    return PageCapture(dom_snapshot=dom, ax_tree={"nodes": ax_nodes})
+
+
+def _ax(backend_id, parent_id, role, name):
+    return {
+        "nodeId": str(backend_id),
+        "parentId": str(parent_id) if parent_id else None,
+        "role": {"type": "role", "value": role},
+        "name": {"type": "computedString", "value": name},
+        "backendDOMNodeId": backend_id,
+    }
+
+
+def windowed(capture: PageCapture, mode: str) -> str:
+    context = LLMDomContext.from_capture(capture, viewport_height=VIEWPORT_HEIGHT)
+    return context.get_context(mode)
+
+
+def items_in(text: str):
+    return [
+        int(line.split("Item ")[1].rstrip('"'))
+        for line in text.splitlines()
+        if "Item " in line
+    ]
+
+
+@pytest.mark.unit
+def test_window_from_snapshot():
+    """The window spans the viewport plus a margin on both sides."""
+    window = ViewportWindow.from_snapshot(
+        feed_capture(1, 1000).dom_snapshot, viewport_height=400, margin=0.5
+    )
+
+    assert (window.top, window.bottom) == (800, 1600)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("mode", ["dom", "accessibility"])
+class TestViewportWindow:
+    """Only elements near the viewport are serialized; the rest is summarized."""
+
+    def test_middle_of_feed(self, mode):
+        text = windowed(feed_capture(100, scroll_y=5000), mode)
+        lines = text.splitlines()
+
+        # Viewport 5000-5400 plus 200px margins: items 48-56
+        assert items_in(text) == list(range(48, 57))
+        assert lines[0].startswith("[ABOVE VIEWPORT: 48 elements (")
+        assert "scroll up" in lines[0]
+        assert lines[-1].startswith("[BELOW VIEWPORT: 43 elements (")
+        assert LLMDomContext.END_OF_PAGE_MARKER not in text
+
+    def test_top_and_bottom_of_feed(self, mode):
+        top = windowed(feed_capture(100, scroll_y=0), mode)
+        bottom = windowed(feed_capture(100, scroll_y=9600), mode)
+
+        assert "ABOVE VIEWPORT" not in top
+        assert top.splitlines()[-1].startswith("[BELOW VIEWPORT")
+        assert "BELOW VIEWPORT" not in bottom
+        assert bottom.splitlines()[-1] == LLMDomContext.END_OF_PAGE_MARKER
+
+    def test_ids_match_full_context(self, mode):
+        """IDs are assigned over the whole page, so they survive scrolling."""
+        capture = feed_capture(100, scroll_y=5000)
+        full = LLMDomContext.from_capture(capture).get_context(mode)
+        windowed_lines = windowed(capture, mode).splitlines()[1:-1]
+
+        assert set(windowed_lines) <= set(full.splitlines())
+        assert "[button-50]" in "\n".join(windowed_lines)
+
+    def test_short_page_is_unchanged(self, mode):
+        capture = feed_capture(3, scroll_y=0)
+
+        assert windowed(capture, mode) == LLMDomContext.from_capture(
+            capture
+        ).get_context(mode)
@@ -0,0 +1,70 @@
+"""Tests for the fused DOM filter pipeline."""
+
+import random
+
+import pytest
+
+from webtask._internal.dom import BoundingBox, DomNode, Text
+from webtask._internal.dom.filters import (
+    filter_dom_tree,
+    filter_non_rendered,
+    filter_non_semantic,
+)
+
+TAGS = ["div", "span", "button", "a", "li", "input", "script"]
+ATTRIBUTES = [
+    {},
+    {"class": "card"},
+    {"role": "button", "class": "btn"},
+    {"role": "none"},
+    {"onclick": "go()", "style": "x"},
+    {"type": "hidden"},
+    {"type": "file", "aria-label": "Upload"},
+]
+
+
+def random_tree(rng, size):
+    root = DomNode(tag="html", attrib={"lang": "en"})
+    nodes = [root]
+    for _ in range(size):
+        parent = rng.choice(nodes)
+        if rng.random() < 0.2:
+            parent.add_child(Text(rng.choice(["", "  ", "Buy"])))
+            continue
+        rendered = rng.random() < 0.7
+        node = DomNode(
+            tag=rng.choice(TAGS),
+            attrib=dict(rng.choice(ATTRIBUTES)),
+            styles={"display": "block"} if rendered else {},
+            bounds=BoundingBox(0, 0, 10, 10) if rendered else None,
+        )
+        parent.add_child(node)
+        nodes.append(node)
+    return root
+
+
+def shape(node):
+    if isinstance(node, Text):
+        return node.content
+    return (node.data, [shape(child) for child in node.children])
+
+
+@pytest.mark.unit
+class TestFilterDomTree:
+    """Fused pipeline must produce the same tree as the chained filters."""
+
+    def test_matches_chained_filters(self):
+        rng = random.Random(0)
+        for _ in range(300):
+            root = random_tree(rng, rng.randint(0, 40))
+
+            expected = filter_non_semantic(filter_non_rendered(root))
+            result = filter_dom_tree(root)
+
+            assert shape(result) == shape(expected)
+
+    def test_parent_links(self):
+        root = random_tree(random.Random(1), 200)
+        for node in filter_dom_tree(root).traverse():
+            for child in node.children:
+                assert child.parent is node
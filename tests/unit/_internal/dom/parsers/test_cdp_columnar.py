@@ -0,0 +1,184 @@
+"""Tests for the columnar CDP snapshot parser."""
+
+import pytest
+from webtask._internal.dom.parsers.cdp import parse_cdp
+from webtask._internal.dom.parsers.cdp_columnar import (
+    CdpNodeTable,
+    parse_cdp_columnar,
+)
+from webtask._internal.dom.domnode import DomNode, Text, BoundingBox
+
+
+def assert_same_tree(expected, actual):
+    """Assert two parsed trees are structurally identical."""
+    assert type(actual) is type(expected)
+    if isinstance(expected, Text):
+        assert actual.content == expected.content
+        return
+    assert actual.data == expected.data
+    assert len(actual.children) == len(expected.children)
+    for expected_child, actual_child in zip(expected.children, actual.children):
+        assert actual_child.parent is actual
+        assert_same_tree(expected_child, actual_child)
+
+
+@pytest.fixture
+def form_snapshot():
+    """Snapshot with form values, hidden nodes, mixed text and a bad index.
+
+    <html>
+      <form>text <input/> tail <select><option/></select></form>
+      <div style="display:none">hidden</div>
+    </html>
+    """
+    return {
+        "documents": [
+            {
+                "nodes": {
+                    "nodeType": [9, 1, 1, 3, 1, 3, 1, 1, 1, 3, 1],
+                    "nodeName": [-1, 0, 1, -1, 2, -1, 3, 4, 5, -1, 7],
+                    "nodeValue": [-1, -1, -1, 6, -1, 11, -1, -1, -1, 8, -1],
+                    "parentIndex": [-1, 0, 1, 2, 2, 2, 2, 6, 1, 8, 1],
+                    "attributes": [
+                        [],
+                        [],
+                        [9, 10],
+                        [],
+                        [12, 13, 14],  # odd length: dangling name ignored
+                        [],
+                        [],
+                        [],
+                        [15, 16],
+                        [],
+                        [None, 10],  # malformed name index
+                    ],
+                    "backendNodeId": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+                    "inputValue": {4: 17},
+                    "inputChecked": {4: True},
+                    "optionSelected": {7: False},
+                },
+                "layout": {
+                    "nodeIndex": [1, 2, 4, 4, 6, 7, 10],
+                    "bounds": [
+                        [0, 0, 100, 100],
+                        [0, 0, 50, 50],
+                        [0, 0, 1, 1],
+                        [5, 5, 20, 10],  # later row for the same node wins
+                        [0, 20, 30, 10],
+                        [0, 20, 30],  # too short: no bounds
+                    ],
+                    "styles": [
+                        [18, 19, 20],
+                        [18, 19, 20],
+                        [18, 19, 20],
+                        [21, 19, 20],
+                        [18, 19, 20],
+                        [18, 19, -1],
+                    ],
+                },
+            }
+        ],
+        "strings": [
+            "HTML",  # 0
+            "FORM",  # 1
+            "INPUT",  # 2
+            "SELECT",  # 3
+            "OPTION",  # 4
+            "DIV",  # 5
+            "text ",  # 6
+            "SPAN",  # 7
+            "hidden",  # 8
+            "action",  # 9
+            "/submit",  # 10
+            " tail",  # 11
+            "type",  # 12
+            "checkbox",  # 13
+            "name",  # 14
+            "style",  # 15
+            "display:none",  # 16
+            "typed",  # 17
+            "block",  # 18
+            "visible",  # 19
+            "1",  # 20
+            "inline",  # 21
+        ],
+    }
+
+
+@pytest.mark.unit
+class TestColumnarParity:
+    """build_tree() must produce exactly what parse_cdp() produces."""
+
+    def test_sample_snapshot(self, sample_cdp_snapshot):
+        expected = parse_cdp(sample_cdp_snapshot)
+        actual = parse_cdp_columnar(sample_cdp_snapshot).build_tree()
+        assert_same_tree(expected, actual)
+
+    def test_form_snapshot(self, form_snapshot):
+        expected = parse_cdp(form_snapshot)
+        actual = parse_cdp_columnar(form_snapshot).build_tree()
+        assert_same_tree(expected, actual)
+
+    def test_empty_snapshot(self):
+        expected = parse_cdp({"documents": [], "strings": []})
+        actual = parse_cdp_columnar({"documents": [], "strings": []}).build_tree()
+        assert_same_tree(expected, actual)
+
+    def test_missing_arrays(self):
+        snapshot = {
+            "documents": [{"nodes": {"nodeType": [1, 1, 3]}}],
+            "strings": [],
+        }
+        assert_same_tree(parse_cdp(snapshot), parse_cdp_columnar(snapshot).build_tree())
+
+    def test_from_cdp_columnar(self, sample_cdp_snapshot):
+        assert_same_tree(
+            DomNode.from_cdp(sample_cdp_snapshot),
+            DomNode.from_cdp(sample_cdp_snapshot, columnar=True),
+        )
+
+
+@pytest.mark.unit
+class TestCdpNodeTable:
+    """Tests for per-index access without building a tree."""
+
+    def test_builds_no_nodes_until_requested(self, sample_cdp_snapshot):
+        table = CdpNodeTable(sample_cdp_snapshot)
+        assert table._nodes is None
+        assert len(table) == 6
+
+    def test_per_index_accessors(self, form_snapshot):
+        table = CdpNodeTable(form_snapshot)
+
+        assert table.is_element(4)
+        assert not table.is_element(3)
+        assert table.tag(4) == "input"
+        assert table.attrib(4) == {
+            "type": "checkbox",
+            "data-value": "typed",
+            "data-checked": "true",
+        }
+        assert table.styles(4)["display"] == "inline"
+        assert table.bounds(4) == BoundingBox(x=5, y=5, width=20, height=10)
+        assert table.bounds(10) is None
+        assert table.is_rendered(2)
+        assert not table.is_rendered(8)
+        assert table.text(3) == "text "
+
+    def test_index_of_backend_node_id(self, form_snapshot):
+        table = CdpNodeTable(form_snapshot)
+        assert table.index_of(5) == 4
+        assert table.index_of(999) is None
+
+    def test_node_returns_tree_member(self, sample_cdp_snapshot):
+        table = CdpNodeTable(sample_cdp_snapshot)
+        button = table.node(4)
+
+        assert button.tag == "button"
+        assert button.parent is table.build_tree()
+        assert button.get_x_path().path == "/html/button"
+        assert table.node(0) is None
+
+    def test_build_tree_is_cached(self, sample_cdp_snapshot):
+        table = CdpNodeTable(sample_cdp_snapshot)
+        assert table.build_tree() is table.build_tree()
@@ -0,0 +1,133 @@
+"""Tests for DomNode memory layout, copy semantics and XPaths."""
+
+import pytest
+
+from webtask._internal.dom.domnode import BoundingBox, DomNode, DomNodeData, Text
+from webtask._internal.dom.filters import filter_non_semantic
+from webtask._internal.dom.parsers.cdp_columnar import parse_cdp_columnar
+
+
+@pytest.mark.unit
+class TestSlots:
+    """Node types are slotted: no per-instance __dict__."""
+
+    @pytest.mark.parametrize(
+        "obj",
+        [
+            DomNode(tag="div"),
+            DomNodeData(tag="div"),
+            Text("hello"),
+            BoundingBox(x=0, y=0, width=1, height=1),
+        ],
+    )
+    def test_no_instance_dict(self, obj):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.unexpected = 1
+
+    def test_public_api_unchanged(self):
+        node = DomNode(tag="a", attrib={"href": "/x"}, metadata={"k": 1})
+        node.attrib = {"href": "/y"}
+        node.metadata["tag_id"] = "a-0"
+        node.add_child(Text("link"))
+
+        assert node.attrib == {"href": "/y"}
+        assert node.metadata == {"k": 1, "tag_id": "a-0"}
+        assert node.get_text() == "link"
+        assert node.children[0].parent is node
+
+
+@pytest.mark.unit
+class TestSharing:
+    """Read-only data is shared rather than copied."""
+
+    def test_identical_styles_share_one_dict(self, sample_cdp_snapshot):
+        root = parse_cdp_columnar(sample_cdp_snapshot).build_tree()
+        div, button = [c for c in root.children if isinstance(c, DomNode)]
+        assert div.styles == {
+            "display": "block",
+            "visibility": "visible",
+            "opacity": "1",
+        }
+        assert div.styles is button.styles
+
+    def test_filter_non_semantic_leaves_input_attrib(self):
+        root = DomNode(tag="html")
+        button = DomNode(
+            tag="button",
+            attrib={"aria-label": "Go", "class": "btn"},
+            styles={"display": "block"},
+        )
+        root.add_child(button)
+
+        filtered = filter_non_semantic(root)
+        filtered_button = filtered.children[0]
+
+        assert button.attrib == {"aria-label": "Go", "class": "btn"}
+        assert "class" not in filtered_button.attrib
+        assert filtered_button.styles is button.styles
+
+
+def _element(tag, *children):
+    node = DomNode(tag=tag)
+    for child in children:
+        node.add_child(child)
+    return node
+
+
+@pytest.mark.unit
+class TestXPath:
+    """XPaths are memoized and computed once per sibling list."""
+
+    def test_positions_only_for_repeated_tags(self):
+        items = [_element("li") for _ in range(3)]
+        heading = _element("h2")
+        root = _element(
+            "html", _element("body", heading, Text("x"), _element("ul", *items))
+        )
+
+        assert heading.get_x_path().path == "/html/body/h2"
+        assert [li.get_x_path().path for li in items] == [
+            "/html/body/ul/li[1]",
+            "/html/body/ul/li[2]",
+            "/html/body/ul/li[3]",
+        ]
+        assert root.get_x_path().path == "/html"
+
+    def test_equal_siblings_get_distinct_positions(self):
+        # Structurally equal siblings compare == but are different elements
+        first, second = _element("li"), _element("li")
+        _element("ul", first, second)
+        assert first == second
+        assert first.get_x_path().path == "/ul/li[1]"
+        assert second.get_x_path().path == "/ul/li[2]"
+
+    def test_long_list_scans_siblings_once(self):
+        items = [_element("li", _element("a")) for _ in range(500)]
+        _element("html", _element("ul", *items))
+
+        items[0].get_x_path()
+        assert all(li._x_path is not None for li in items)
+        assert items[499].children[0].get_x_path().path == "/html/ul/li[500]/a"
+
+    def test_add_child_invalidates_sibling_positions(self):
+        link = _element("a")
+        first = _element("li", link)
+        ul = _element("ul", first)
+        assert link.get_x_path().path == "/ul/li/a"
+
+        ul.add_child(_element("li"))
+        assert first.get_x_path().path == "/ul/li[1]"
+        assert link.get_x_path().path == "/ul/li[1]/a"
+
+    def test_deep_tree_does_not_recurse(self):
+        import sys
+
+        leaf = DomNode(tag="div")
+        depth = sys.getrecursionlimit() * 3
+        for _ in range(depth):
+            child = DomNode(tag="div")
+            leaf.add_child(child)
+            leaf = child
+
+        assert leaf.get_x_path().path == "/div" * (depth + 1)
@@ -0,0 +1,168 @@
+"""Tests for ConversionCache message conversion reuse."""
+
+import asyncio
+
+import pytest
+
+from webtask._internal.agent.message import AgentImage, AgentText
+from webtask._internal.agent.task_runner import TaskRunner
+from webtask._internal.llm.conversion_cache import (
+    ConversionCache,
+    conversion_scope,
+    current_conversion_cache,
+)
+from webtask.integrations.llm.bedrock.bedrock_mapper import messages_to_bedrock_format
+from webtask.llm import CachePoint, Message, Role, Text
+
+pytestmark = pytest.mark.unit
+
+
+def step_pair(step: int):
+    """One (model, tool) pair with page context that expires."""
+    return (
+        Message(role=Role.MODEL, content=[Text(text=f"step {step}")]),
+        Message(
+            role=Role.TOOL,
+            content=[
+                Text(text=f"result {step}"),
+                AgentText(text=f"page {step}", lifespan=1),
+                AgentImage(data=b"png", lifespan=2),
+            ],
+        ),
+    )
+
+
+def start():
+    return [
+        Message(role=Role.SYSTEM, content=[Text(text="system")]),
+        Message(role=Role.USER, content=[AgentText(text="task")]),
+    ]
+
+
+def test_unchanged_messages_are_not_converted_again():
+    messages = start() + list(step_pair(0))
+    cache = ConversionCache()
+    converted = []
+
+    def convert(msg):
+        converted.append(msg)
+        return object()
+
+    first = cache.convert(messages, convert)
+    second = cache.convert(messages + list(step_pair(1)), convert)
+
+    assert second[:4] == first
+    assert len(converted) == 6
+    assert (cache.hits, cache.misses) == (4, 6)
+
+
+def new_object(msg):
+    return object()
+
+
+def content_count(msg):
+    return len(msg.content)
+
+
+def test_copies_with_the_same_content_hit():
+    """Messages rebuilt by model_copy keep their conversion."""
+    messages = start()
+    cache = ConversionCache()
+    first = cache.convert(messages, new_object)
+
+    copies = [msg.model_copy() for msg in messages]
+
+    assert cache.convert(copies, new_object) == first
+
+
+def test_purged_content_is_converted_again():
+    messages = start() + list(step_pair(0))
+    cache = ConversionCache()
+    cache.convert(messages, content_count)
+    tool = messages[-1]
+    purged = tool.model_copy(update={"content": tool.content[:1]})
+
+    counts = cache.convert(messages[:-1] + [purged], content_count)
+
+    assert counts == [1, 1, 1, 1]
+    assert (cache.hits, cache.misses) == (3, 5)
+
+
+def test_entries_not_used_by_the_latest_call_are_dropped():
+    cache = ConversionCache()
+    cache.convert(start(), new_object)
+    cache.convert([], new_object)
+
+    assert cache._entries == {new_object: {}}
+
+
+def test_converters_do_not_share_entries():
+    """Two providers called in one run each get their own conversion."""
+    messages = start()
+    cache = ConversionCache()
+    first = cache.convert(messages, new_object)
+    other = cache.convert(messages, content_count)
+
+    assert other == [1, 1]
+    assert cache.convert(messages, new_object) == first
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_bedrock_cache_point_is_part_of_the_key():
+    messages = start() + [Message(role=Role.USER, content=[CachePoint()])]
+    cache = ConversionCache()
+
+    plain, _ = messages_to_bedrock_format(messages, cache)
+    cached, _ = messages_to_bedrock_format(
+        messages, cache, cache_point={"type": "default"}
+    )
+
+    assert plain != cached
+    assert (
+        cached
+        == messages_to_bedrock_format(messages, cache_point={"type": "default"})[0]
+    )
+
+
+def test_run_conversion_grows_linearly(mocker):
+    """Over a run, each step converts only its new and purged messages."""
+    runner = TaskRunner(
+        llm=mocker.Mock(),
+        tools=[],
+        get_context=mocker.AsyncMock(return_value=[]),
+        system_prompt="system",
+    )
+    session = start()
+    pairs = []
+    cache = ConversionCache()
+    steps = 20
+
+    for step in range(steps):
+        pairs.append(step_pair(step))
+        prepared = runner._prepare_messages(session, pairs)
+        cached, system = messages_to_bedrock_format(prepared, cache)
+        assert (cached, system) == messages_to_bedrock_format(prepared)
+
+    # New pair plus the tool messages whose page text and screenshot expired
+    assert cache.misses <= len(session) + 4 * steps
+    assert cache.hits > cache.misses
+
+
+async def test_each_run_gets_its_own_cache():
+    """Runs sharing an LLM don't evict each other's entries."""
+    assert current_conversion_cache() is None
+    caches = []
+
+    async def run(step):
+        with conversion_scope() as cache:
+            messages = start() + list(step_pair(step))
+            for _ in range(3):
+                current_conversion_cache().convert(messages, new_object)
+                await asyncio.sleep(0)
+            caches.append(cache)
+
+    await asyncio.gather(run(0), run(1))
+
+    assert caches[0] is not caches[1]
+    assert [(c.hits, c.misses) for c in caches] == [(8, 4), (8, 4)]
+    assert current_conversion_cache() is None
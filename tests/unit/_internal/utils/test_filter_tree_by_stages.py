@@ -0,0 +1,135 @@
+"""Tests for the fused multi-stage tree filter."""
+
+import random
+
+import pytest
+
+from webtask._internal.accessibility.axnode import AXNode, AXValue
+from webtask._internal.utils.filter_tree_by_predicate import filter_tree_by_predicate
+from webtask._internal.utils.filter_tree_by_stages import (
+    FilterStage,
+    filter_tree_by_stages,
+)
+
+ROLES = ["generic", "none", "StaticText", "button", "link"]
+NAMES = ["", "Buy", "Buy now", "now", "Add to cart", "cart"]
+
+
+def make_node(node_id, role, name="", ignored=False):
+    return AXNode(
+        node_id=node_id,
+        role=AXValue(type="role", value=role),
+        name=AXValue(type="computedString", value=name) if name else None,
+        ignored=ignored,
+    )
+
+
+def random_tree(rng, size):
+    root = make_node("root", "RootWebArea", rng.choice(NAMES))
+    nodes = [root]
+    for i in range(size):
+        parent = rng.choice(nodes)
+        child = make_node(
+            str(i), rng.choice(ROLES), rng.choice(NAMES), ignored=rng.random() < 0.25
+        )
+        child.parent = parent
+        parent.children.append(child)
+        nodes.append(child)
+    return root
+
+
+def shape(node):
+    return (node.node_id, [shape(child) for child in node.children])
+
+
+def assert_parent_links(node):
+    for child in node.children:
+        assert child.parent is node
+        assert_parent_links(child)
+
+
+def nearest_named_ancestor(node):
+    current = node.parent
+    while current is not None:
+        if current.name:
+            return current.name.value
+        current = current.parent
+    return None
+
+
+# (predicate on a materialized tree, equivalent stage predicate, carry)
+PREDICATES = {
+    "ignored": (lambda n: n.ignored, lambda n, _: n.ignored, None),
+    "generic": (
+        lambda n: n.role.value in ("generic", "none"),
+        lambda n, _: n.role.value in ("generic", "none"),
+        None,
+    ),
+    "text": (
+        lambda n: n.role.value == "StaticText",
+        lambda n, _: n.role.value == "StaticText",
+        None,
+    ),
+    "in_ancestor_name": (
+        lambda n: bool(n.name)
+        and (nearest_named_ancestor(n) or "").find(n.name.value) >= 0,
+        lambda n, ctx: bool(n.name) and (ctx or "").find(n.name.value) >= 0,
+        lambda n, ctx: n.name.value if n.name else ctx,
+    ),
+}
+
+
+@pytest.mark.unit
+class TestFilterTreeByStages:
+    """filter_tree_by_stages must match chained filter_tree_by_predicate calls."""
+
+    def test_rejects_unknown_mode(self):
+        with pytest.raises(ValueError):
+            FilterStage(should_remove=lambda n, _: False, on_remove="drop")
+
+    def test_root_always_kept(self):
+        root = make_node("root", "generic", ignored=True)
+        stage = FilterStage(should_remove=lambda n, _: True, on_remove="delete")
+
+        result = filter_tree_by_stages(root, [stage])
+
+        assert result.node_id == "root"
+        assert result is not root
+
+    def test_keep_wrapper_sees_earlier_stage_output(self):
+        # wrapper(text) -> child(generic, leaf): the child is still present
+        # when keep_wrapper runs, so the wrapper survives; the later promote
+        # stage then removes the child.
+        root = make_node("root", "RootWebArea")
+        wrapper = make_node("wrapper", "StaticText")
+        leaf = make_node("leaf", "generic")
+        root.children.append(wrapper)
+        wrapper.parent = root
+        wrapper.children.append(leaf)
+        leaf.parent = wrapper
+        stages = [
+            FilterStage(PREDICATES["text"][1], on_remove="keep_wrapper"),
+            FilterStage(PREDICATES["generic"][1], on_remove="promote"),
+        ]
+
+        result = filter_tree_by_stages(root, stages)
+
+        assert shape(result) == ("root", [("wrapper", [])])
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_chained_filters(self, seed):
+        rng = random.Random(seed)
+        for _ in range(200):
+            root = random_tree(rng, rng.randint(0, 30))
+            expected = root
+            stages = []
+            for _ in range(rng.randint(1, 4)):
+                on_remove = rng.choice(["promote", "delete", "keep_wrapper"])
+                tree_pred, stage_pred, carry = PREDICATES[rng.choice(list(PREDICATES))]
+                expected = filter_tree_by_predicate(expected, tree_pred, on_remove)
+                stages.append(FilterStage(stage_pred, on_remove, carry=carry))
+
+            result = filter_tree_by_stages(root, stages)
+
+            assert shape(result) == shape(expected)
+            assert_parent_links(result)
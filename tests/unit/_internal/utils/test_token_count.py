@@ -0,0 +1,40 @@
+"""Tests for token counting."""
+
+import pytest
+
+from webtask._internal.utils import token_count
+
+
+@pytest.fixture
+def fresh_encoder():
+    token_count._encoder.cache_clear()
+    yield
+    token_count._encoder.cache_clear()
+
+
+@pytest.mark.unit
+def test_estimates_without_encoding(monkeypatch, fresh_encoder):
+    """Offline, tokens are estimated from the character count."""
+    import tiktoken
+
+    def unavailable(name):
+        raise ConnectionError(name)
+
+    monkeypatch.setattr(tiktoken, "get_encoding", unavailable)
+
+    assert token_count.count_tokens("") == 0
+    assert token_count.count_tokens("abcd") == 1
+    assert token_count.count_tokens("abcde") == 2
+
+
+@pytest.mark.unit
+def test_uses_tiktoken_encoding(monkeypatch, fresh_encoder):
+    import tiktoken
+
+    class Encoding:
+        def encode(self, text, disallowed_special=()):
+            return text.split()
+
+    monkeypatch.setattr(tiktoken, "get_encoding", lambda name: Encoding())
+
+    assert token_count.count_tokens("three short words") == 3
@@ -0,0 +1,323 @@
+"""Tests for AgentPool - bounded parallel runs over agents with warm contexts."""
+
+import asyncio
+from contextlib import aclosing
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from webtask.agent import AgentPool, PoolTask, Result
+from webtask.exceptions import TaskAbortedError
+from webtask.llm import LLM
+from webtask.llm.message import Message, Role, Text
+
+pytestmark = pytest.mark.unit
+
+
+class FakeWebtask:
+    """Creates mock agents whose do() tracks how many run at once."""
+
+    def __init__(self, durations=None, errors=None):
+        self.durations = durations or {}
+        self.errors = errors or {}
+        self.agents = []
+        self.running = 0
+        self.max_running = 0
+
+    async def create_agent(self, llm, **options):
+        agent = Mock()
+        agent.llm = llm
+        agent.options = options
+        agent.goto = AsyncMock()
+        agent.context.close = AsyncMock()
+        agent.do = AsyncMock(side_effect=self._do)
+        self.agents.append(agent)
+        return agent
+
+    async def _do(self, task, **kwargs):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.durations.get(task, 0.01))
+            if task in self.errors:
+                raise self.errors[task]
+            return Result(output=task.upper())
+        finally:
+            self.running -= 1
+
+
+class SlowLLM(LLM):
+    """Counts concurrent calls."""
+
+    def __init__(self):
+        super().__init__()
+        self.running = 0
+        self.max_running = 0
+
+    async def call_tools(self, messages, tools):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return Message(role=Role.MODEL, content=[Text(text="ok")])
+
+
+async def collect(pool, tasks):
+    return [done async for done in pool.run(tasks)]
+
+
+async def test_runs_all_tasks_with_bounded_contexts():
+    wt = FakeWebtask()
+    pool = AgentPool(wt, Mock(), max_contexts=3)
+
+    results = await collect(pool, [f"task {i}" for i in range(10)])
+
+    assert sorted(done.index for done in results) == list(range(10))
+    assert all(done.ok for done in results)
+    assert results[0].result.output == results[0].task.task.upper()
+    assert wt.max_running == 3
+    # Warm agents are reused instead of creating a context per task
+    assert len(wt.agents) == 3
+
+
+async def test_creates_no_more_agents_than_tasks():
+    wt = FakeWebtask()
+    pool = AgentPool(wt, Mock(), max_contexts=8)
+
+    await collect(pool, ["a", "b"])
+
+    assert len(wt.agents) == 2
+
+
+async def test_yields_results_in_completion_order():
+    wt = FakeWebtask(durations={"slow": 0.1, "fast": 0.01})
+    pool = AgentPool(wt, Mock(), max_contexts=2)
+
+    results = await collect(pool, ["slow", "fast"])
+
+    assert [done.task.task for done in results] == ["fast", "slow"]
+    slow = results[1]
+    assert slow.duration_seconds >= 0.1
+    assert slow.wait_seconds < 0.1
+
+
+async def test_wait_time_covers_time_queued_for_an_agent():
+    wt = FakeWebtask(durations={"first": 0.05})
+    pool = AgentPool(wt, Mock(), max_contexts=1)
+
+    results = await collect(pool, ["first", "second"])
+
+    assert results[1].wait_seconds >= results[0].duration_seconds
+
+
+async def test_reused_agents_start_with_clean_history():
+    wt = FakeWebtask()
+    pool = AgentPool(wt, Mock(), max_contexts=1)
+
+    await collect(pool, ["a", "b"])
+
+    assert wt.agents[0].clear_history.call_count == 2
+
+
+async def test_pool_task_options_are_passed_to_agent():
+    wt = FakeWebtask()
+    pool = AgentPool(wt, Mock(), max_contexts=1)
+    task = PoolTask("buy", url="https://example.com", max_steps=5, files=["a.txt"])
+
+    await collect(pool, [task])
+
+    agent = wt.agents[0]
+    agent.goto.assert_awaited_once_with("https://example.com")
+    agent.do.assert_awaited_once_with(
+        "buy", max_steps=5, output_schema=None, files=["a.txt"]
+    )
+
+
+async def test_failed_task_is_reported_and_others_continue():
+    wt = FakeWebtask(errors={"bad": TaskAbortedError("stuck")})
+    pool = AgentPool(wt, Mock(), max_contexts=1)
+
+    results = await collect(pool, ["bad", "good"])
+
+    assert isinstance(results[0].error, TaskAbortedError)
+    assert results[0].result is None
+    assert not results[0].ok
+    assert results[1].ok
+    # A task failure doesn't mean the context is broken
+    assert len(wt.agents) == 1
+
+
+async def test_agent_with_unexpected_error_is_replaced():
+    wt = FakeWebtask(errors={"crash": RuntimeError("page crashed")})
+    pool = AgentPool(wt, Mock(), max_contexts=1)
+
+    results = await collect(pool, ["crash", "next"])
+
+    assert isinstance(results[0].error, RuntimeError)
+    assert results[1].ok
+    assert len(wt.agents) == 2
+    wt.agents[0].context.close.assert_awaited_once()
+
+
+async def test_failure_to_close_a_replaced_agent_is_logged(caplog):
+    wt = FakeWebtask(errors={"crash": RuntimeError("page crashed")})
+    pool = AgentPool(wt, Mock(), max_contexts=1)
+    create_agent = wt.create_agent
+
+    async def create_unclosable(llm, **options):
+        agent = await create_agent(llm, **options)
+        agent.context.close.side_effect = RuntimeError("browser gone")
+        return agent
+
+    wt.create_agent = create_unclosable
+    results = await collect(pool, ["crash", "next"])
+
+    assert results[1].ok
+    assert "browser gone" in caplog.text
+
+
+async def test_failed_agent_creation_fails_only_its_task():
+    wt = FakeWebtask()
+    create_agent = wt.create_agent
+    calls = 0
+
+    async def flaky_create_agent(llm, **options):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("browser did not launch")
+        return await create_agent(llm, **options)
+
+    wt.create_agent = flaky_create_agent
+    pool = AgentPool(wt, Mock(), max_contexts=1)
+
+    results = await asyncio.wait_for(collect(pool, ["a", "b"]), timeout=1)
+
+    assert isinstance(results[0].error, RuntimeError)
+    assert results[0].index == 0
+    assert results[1].ok
+    assert len(wt.agents) == 1
+
+
+async def test_llm_calls_are_bounded_across_agents():
+    wt = FakeWebtask()
+    llm = SlowLLM()
+    pool = AgentPool(wt, llm, max_contexts=4, max_llm_calls=2)
+
+    async def do(task, **kwargs):
+        agent_llm = wt.agents[0].llm
+        await asyncio.gather(*(agent_llm.call_tools([], []) for _ in range(3)))
+        return Result()
+
+    wt._do = do
+    await collect(pool, ["a", "b", "c", "d"])
+
+    assert llm.max_running == 2
+
+
+async def test_bounded_llm_streams_and_keeps_coordinate_scale():
+    llm = SlowLLM()
+    llm.coordinate_scale = 1000
+    pool = AgentPool(FakeWebtask(), llm, max_llm_calls=1)
+
+    content = [c async for c in pool._llm.stream_tools([], [])]
+
+    assert content[0].text == "ok"
+    assert pool._llm.coordinate_scale == 1000
+
+
+async def test_bounded_llm_yields_items_before_the_response_ends():
+    """Tool calls can start while the provider is still streaming."""
+    received = asyncio.Event()
+
+    class StreamingLLM(SlowLLM):
+        async def stream_tools(self, messages, tools):
+            yield Text(text="a")
+            await received.wait()
+            yield Text(text="b")
+
+    pool = AgentPool(FakeWebtask(), StreamingLLM(), max_llm_calls=1)
+    texts = []
+
+    async with aclosing(pool._llm.stream_tools([], [])) as stream:
+        async for item in stream:
+            texts.append(item.text)
+            received.set()
+
+    assert texts == ["a", "b"]
+
+
+async def test_bounded_llm_frees_its_slot_when_the_response_ends():
+    class StreamingLLM(SlowLLM):
+        async def stream_tools(self, messages, tools):
+            for text in ("a", "b"):
+                yield Text(text=text)
+
+    pool = AgentPool(FakeWebtask(), StreamingLLM(), max_llm_calls=1)
+    semaphore_free = []
+
+    async for _ in pool._llm.stream_tools([], []):
+        # The consumer runs tool calls here; they must not hold the slot
+        await asyncio.sleep(0.01)
+        semaphore_free.append(not pool._llm._semaphore.locked())
+
+    assert semaphore_free == [True, True]
+
+
+async def test_bounded_llm_raises_stream_errors():
+    class FailingLLM(SlowLLM):
+        async def stream_tools(self, messages, tools):
+            yield Text(text="a")
+            raise RuntimeError("stream broke")
+
+    pool = AgentPool(FakeWebtask(), FailingLLM(), max_llm_calls=1)
+    texts = []
+
+    with pytest.raises(RuntimeError, match="stream broke"):
+        async for item in pool._llm.stream_tools([], []):
+            texts.append(item.text)
+
+    assert texts == ["a"]
+    assert not pool._llm._semaphore.locked()
+
+
+async def test_close_closes_all_contexts():
+    wt = FakeWebtask()
+    pool = AgentPool(wt, Mock(), max_contexts=2)
+    await collect(pool, ["a", "b"])
+
+    await pool.close()
+
+    for agent in wt.agents:
+        agent.context.close.assert_awaited_once()
+
+
+async def test_leaving_the_loop_cancels_running_tasks():
+    wt = FakeWebtask(durations={"fast": 0.01, "slow": 10})
+    pool = AgentPool(wt, Mock(), max_contexts=2)
+
+    async with aclosing(pool.run(["fast", "slow"])) as results:
+        async for done in results:
+            assert done.task.task == "fast"
+            break
+
+    assert wt.running == 0
+
+
+async def test_close_cancels_running_tasks():
+    wt = FakeWebtask(durations={"fast": 0.01, "slow": 10})
+    pool = AgentPool(wt, Mock(), max_contexts=2)
+
+    async for done in pool.run(["fast", "slow"]):
+        break
+    await pool.close()
+
+    assert wt.running == 0
+    assert len(wt.agents) == 2
+
+
+def test_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        AgentPool(FakeWebtask(), Mock(), max_contexts=0)
+    with pytest.raises(ValueError):
+        AgentPool(FakeWebtask(), Mock(), max_llm_calls=0)
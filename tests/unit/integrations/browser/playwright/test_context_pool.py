@@ -0,0 +1,346 @@
+"""Tests for PlaywrightContextPool warm context recycling."""
+
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from webtask.integrations.browser.playwright import (
+    PlaywrightBrowser,
+    PlaywrightContextPool,
+    PlaywrightPage,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class FakePage:
+    """Stand-in for a Playwright page, logging calls to its context's log."""
+
+    def __init__(self, context):
+        self.context = context
+        self.urls = []
+        self.closed = False
+        self.routes = {}
+        self.handlers = []
+        self.evaluate = AsyncMock(side_effect=self._evaluate)
+
+    async def _evaluate(self, script, *args):
+        self.context.log.append(f"evaluate:{self.urls[-1] if self.urls else ''}")
+        return 1
+
+    def is_closed(self):
+        return self.closed
+
+    def on(self, event, handler):
+        # PlaywrightPage wrappers listen for crashes
+        assert event in ("framenavigated", "crash")
+        if event == "framenavigated":
+            self.handlers.append(handler)
+
+    async def route(self, url, handler):
+        self.routes[url] = handler
+
+    async def unroute(self, url, handler):
+        assert self.routes.pop(url) is handler
+
+    async def goto(self, url, **kwargs):
+        route = MagicMock(fulfill=AsyncMock())
+        if url in self.routes:
+            await self.routes[url](route)
+        self.context.log.append(
+            f"goto:{url}" + (" (blank)" if route.fulfill.await_count else "")
+        )
+        self.urls.append(url)
+        for handler in self.handlers:
+            handler(MagicMock(url=url))
+
+    async def close(self):
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class FakeBrowserContext:
+    """Stand-in for a Playwright BrowserContext."""
+
+    def __init__(self, **options):
+        self.options = options
+        self.pages = []
+        self.closed = False
+        self.log = []
+        self.page_handlers = []
+        self.clear_cookies = AsyncMock(
+            side_effect=lambda: self.log.append("clear_cookies")
+        )
+        self.clear_permissions = AsyncMock()
+        # Records whether permissions were cleared before each grant
+        self.grant_permissions = AsyncMock(
+            side_effect=lambda permissions: self.log.append(
+                f"grant_permissions:{self.clear_permissions.await_count}"
+            )
+        )
+        self.add_cookies = AsyncMock(
+            side_effect=lambda cookies: self.log.append("add_cookies")
+        )
+        self.cookies = AsyncMock(return_value=[])
+
+    def on(self, event, handler):
+        assert event == "page"
+        self.page_handlers.append(handler)
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        for handler in self.page_handlers:
+            handler(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def browser():
+    raw = MagicMock()
+    raw.contexts_created = []
+
+    async def new_context(**options):
+        context = FakeBrowserContext(**options)
+        raw.contexts_created.append(context)
+        return context
+
+    raw.new_context = new_context
+    return PlaywrightBrowser(None, raw, headless=True)
+
+
+def raw(context):
+    return context.browser_context
+
+
+async def test_start_creates_warm_contexts_with_pages(browser):
+    pool = await browser.create_context_pool(
+        size=2, preopen_pages=1, warm_url="https://shop.example.com"
+    )
+
+    contexts = browser._browser.contexts_created
+    assert len(contexts) == 2
+    for context in contexts:
+        assert len(context.pages) == 1
+        assert context.pages[0].urls == ["https://shop.example.com"]
+    assert pool.get_stats()["idle"] == 2
+
+
+async def test_acquire_serves_warm_context(browser):
+    pool = await browser.create_context_pool(size=1)
+
+    context = await pool.acquire()
+
+    assert raw(context) is browser._browser.contexts_created[0]
+    stats = pool.get_stats()
+    assert stats["warm"] == 1
+    assert stats["in_use"] == 1
+    assert stats["idle"] == 0
+    assert stats["created"] == 1
+
+
+async def test_acquire_creates_cold_context_when_none_ready(browser):
+    pool = PlaywrightContextPool(browser, size=0)
+
+    context = await pool.acquire()
+
+    assert context is not None
+    assert pool.get_stats()["cold"] == 1
+
+
+async def test_release_resets_and_recycles(browser):
+    state = {
+        "cookies": [{"name": "session", "value": "1", "domain": "x", "path": "/"}],
+        "origins": [
+            {
+                "origin": "https://shop.example.com",
+                "localStorage": [{"name": "consent", "value": "yes"}],
+            }
+        ],
+    }
+    pool = await browser.create_context_pool(
+        size=1, warm_url="https://shop.example.com", storage_state=state
+    )
+    context = await pool.acquire()
+    bc = raw(context)
+    assert bc.options["storage_state"] == state
+    # The task browses another site in a tab it opens and closes
+    tab = await context.create_page()
+    await tab.goto("https://login.example.org/account")
+    bc.log.clear()
+
+    await pool.release(context)
+
+    assert len(bc.pages) == 1
+    page = bc.pages[0]
+    # Cookies go first, then storage of every visited origin is cleared on
+    # blank stand-in pages, then the warm page loads with the clean state
+    assert bc.log == [
+        "clear_cookies",
+        "add_cookies",
+        "goto:https://login.example.org/ (blank)",
+        "evaluate:https://login.example.org/",
+        "goto:https://shop.example.com/ (blank)",
+        "evaluate:https://shop.example.com/",
+        "goto:https://shop.example.com",
+    ]
+    assert page.routes == {}
+    # The preloaded items are restored after clearing
+    assert page.evaluate.await_args.args[1] == {
+        "https://shop.example.com": [{"name": "consent", "value": "yes"}]
+    }
+    bc.clear_cookies.assert_awaited_once()
+    bc.clear_permissions.assert_awaited_once()
+    bc.add_cookies.assert_awaited_once_with(state["cookies"])
+    assert not bc.closed
+    assert pool.get_stats()["recycled"] == 1
+
+    assert raw(await pool.acquire()) is bc
+    # Only the warm page's own load is left to clear next time
+    assert pool._idle == [] and len(pool._in_use) == 1
+    assert next(iter(pool._in_use.values())).origins == {"https://shop.example.com"}
+
+
+async def test_release_grants_context_option_permissions_again(browser):
+    pool = await browser.create_context_pool(size=1, permissions=["geolocation"])
+    context = await pool.acquire()
+
+    await pool.release(context)
+
+    assert "grant_permissions:1" in raw(context).log
+    raw(context).grant_permissions.assert_awaited_once_with(["geolocation"])
+
+
+async def test_release_grants_no_permissions_unless_given(browser):
+    pool = await browser.create_context_pool(size=1)
+    context = await pool.acquire()
+
+    await pool.release(context)
+
+    raw(context).grant_permissions.assert_not_awaited()
+
+
+async def test_factory_passes_health_check_timeout(browser):
+    pool = await browser.create_context_pool(size=0, health_check_timeout=0.5)
+
+    assert pool.health_check_timeout == 0.5
+    assert "health_check_timeout" not in pool._context_options
+
+
+async def test_release_detaches_cdp_sessions_of_kept_pages(browser):
+    """Each task wraps the pooled page anew; its session doesn't outlive it."""
+    pool = await browser.create_context_pool(size=1)
+    sessions = []
+    for _ in range(2):
+        context = await pool.acquire()
+        page = PlaywrightPage(context.pages[0])
+        page._cdp_session = MagicMock(detach=AsyncMock())
+        sessions.append(page._cdp_session)
+        await pool.release(context)
+
+    for session in sessions:
+        session.detach.assert_awaited_once()
+
+
+async def test_storage_state_from_file(browser, tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"cookies": [], "origins": []}))
+
+    pool = PlaywrightContextPool(browser, size=1, storage_state=str(path))
+
+    assert pool.storage_state == {"cookies": [], "origins": []}
+
+
+async def test_context_is_retired_after_max_uses(browser):
+    pool = await browser.create_context_pool(size=1, max_uses=2)
+
+    first = await pool.acquire()
+    await pool.release(first)
+    second = await pool.acquire()
+    assert second is first
+    await pool.release(second)
+
+    assert raw(first).closed
+    assert pool.get_stats()["retired"] == 1
+    for task in list(pool._refills):
+        await task
+    assert raw(await pool.acquire()) is not raw(first)
+
+
+async def test_unhealthy_context_is_replaced_on_acquire(browser):
+    pool = await browser.create_context_pool(size=1)
+    bc = browser._browser.contexts_created[0]
+    bc.pages[0].evaluate.side_effect = Exception("Target crashed")
+
+    context = await pool.acquire()
+
+    assert raw(context) is not bc
+    assert bc.closed
+    stats = pool.get_stats()
+    assert stats["unhealthy"] == 1
+    assert stats["cold"] == 1
+
+
+async def test_failed_reset_discards_and_replaces_context(browser):
+    pool = await browser.create_context_pool(size=1)
+    context = await pool.acquire()
+    raw(context).clear_cookies.side_effect = Exception("Browser closed")
+
+    await pool.release(context)
+    for task in list(pool._refills):
+        await task
+
+    assert raw(context).closed
+    stats = pool.get_stats()
+    assert stats["unhealthy"] == 1
+    assert stats["idle"] == 1
+    assert stats["created"] == 2
+
+
+async def test_extra_context_is_closed_on_release(browser):
+    pool = await browser.create_context_pool(size=1)
+    warm = await pool.acquire()
+    extra = await pool.acquire()
+
+    await pool.release(warm)
+    await pool.release(extra)
+
+    assert raw(extra).closed
+    assert not raw(warm).closed
+    stats = pool.get_stats()
+    assert stats["cold"] == 1
+    assert stats["idle"] == 1
+
+
+async def test_context_manager_releases(browser):
+    pool = await browser.create_context_pool(size=1)
+
+    async with pool.context() as context:
+        assert pool.get_stats()["in_use"] == 1
+
+    assert pool.get_stats()["in_use"] == 0
+    assert pool.get_stats()["idle"] == 1
+    assert not raw(context).closed
+
+
+async def test_release_rejects_foreign_context(browser):
+    pool = PlaywrightContextPool(browser, size=0)
+    other = await browser.create_context()
+
+    with pytest.raises(ValueError):
+        await pool.release(other)
+
+
+async def test_close_closes_all_contexts(browser):
+    pool = await browser.create_context_pool(size=2)
+    await pool.acquire()
+
+    await pool.close()
+
+    assert all(c.closed for c in browser._browser.contexts_created)
+    with pytest.raises(RuntimeError):
+        await pool.acquire()
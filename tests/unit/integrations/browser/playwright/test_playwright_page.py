@@ -0,0 +1,283 @@
+"""Tests for PlaywrightPage CDP session pooling."""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from playwright.async_api import Error as PlaywrightError
+
+from webtask.integrations.browser.playwright import PlaywrightPage
+
+pytestmark = pytest.mark.unit
+
+
+class FakeCDPSession:
+    """Minimal stand-in for Playwright's CDPSession."""
+
+    def __init__(self):
+        self.send = AsyncMock(return_value={"ok": True})
+        self.detach = AsyncMock()
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+
+@pytest.fixture
+def raw_page():
+    """Mock Playwright page whose context hands out fresh fake sessions."""
+    page = MagicMock()
+    page.is_closed.return_value = False
+    page.close = AsyncMock()
+    page.context.new_cdp_session = AsyncMock(side_effect=lambda _: FakeCDPSession())
+    return page
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused_across_snapshots(raw_page):
+    """DOM snapshot and AX tree share one lazily created session."""
+    page = PlaywrightPage(raw_page)
+    assert page.cdp_sessions_created == 0
+
+    await page.get_cdp_dom_snapshot()
+    await page.get_cdp_accessibility_tree()
+    await page.get_cdp_dom_snapshot()
+
+    assert page.cdp_sessions_created == 1
+    assert raw_page.context.new_cdp_session.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_session_rebuilt_after_close_event(raw_page):
+    """A session closed by Chromium (crash, navigation) is replaced on next use."""
+    page = PlaywrightPage(raw_page)
+    await page.get_cdp_dom_snapshot()
+    first = page._cdp_session
+
+    first.handlers["close"](first)
+    await page.get_cdp_dom_snapshot()
+
+    assert page._cdp_session is not first
+    assert page.cdp_sessions_created == 2
+
+
+@pytest.mark.asyncio
+async def test_one_crash_listener_per_page(raw_page):
+    """Session rebuilds and new wrappers of a page add no crash listeners."""
+    page = PlaywrightPage(raw_page)
+    other = PlaywrightPage(raw_page)
+    for wrapper in (page, other):
+        for _ in range(3):
+            await wrapper.get_cdp_dom_snapshot()
+            wrapper._cdp_session.handlers["close"](wrapper._cdp_session)
+
+    crash_listeners = [
+        call for call in raw_page.on.call_args_list if call.args[0] == "crash"
+    ]
+    assert len(crash_listeners) == 1
+    raw_page.once.assert_not_called()
+
+    await page.get_cdp_dom_snapshot()
+    await other.get_cdp_dom_snapshot()
+    crash_listeners[0].args[1](raw_page)
+
+    assert page._cdp_session is None
+    assert other._cdp_session is None
+
+
+@pytest.mark.asyncio
+async def test_stale_session_retried_once(raw_page):
+    """A send failure on a stale session rebuilds it and retries the command."""
+    page = PlaywrightPage(raw_page)
+    await page.get_cdp_dom_snapshot()
+    page._cdp_session.send.side_effect = PlaywrightError("Target closed")
+
+    result = await page.send_cdp("Accessibility.getFullAXTree")
+
+    assert result == {"ok": True}
+    assert page.cdp_sessions_created == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_commands_share_one_session(raw_page):
+    """capture_page's gathered commands don't each open a session."""
+    created = []
+
+    async def new_cdp_session(_):
+        await asyncio.sleep(0)
+        created.append(FakeCDPSession())
+        return created[-1]
+
+    raw_page.context.new_cdp_session = AsyncMock(side_effect=new_cdp_session)
+    page = PlaywrightPage(raw_page)
+
+    await asyncio.gather(page.get_cdp_dom_snapshot(), page.get_cdp_accessibility_tree())
+
+    assert page.cdp_sessions_created == 1
+    assert len(created) == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_session_is_detached_when_replaced(raw_page):
+    page = PlaywrightPage(raw_page)
+    await page.get_cdp_dom_snapshot()
+    stale = page._cdp_session
+    stale.send.side_effect = PlaywrightError(
+        "Target page, context or browser has been closed"
+    )
+
+    await page.send_cdp("Accessibility.getFullAXTree")
+
+    stale.detach.assert_awaited_once()
+    assert page._cdp_session is not stale
+
+
+@pytest.mark.asyncio
+async def test_command_errors_keep_the_session(raw_page):
+    """A failed command (not a lost session) is raised without a rebuild."""
+    page = PlaywrightPage(raw_page)
+    await page.get_cdp_dom_snapshot()
+    session = page._cdp_session
+    session.send.side_effect = PlaywrightError("No node with given id found")
+
+    with pytest.raises(PlaywrightError):
+        await page.send_cdp("DOM.resolveNode", {"backendNodeId": 1})
+
+    assert page._cdp_session is session
+    assert page.cdp_sessions_created == 1
+    assert session.send.await_count == 2
+    session.detach.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_close_detaches_session(raw_page):
+    """Closing the page detaches the pooled session."""
+    page = PlaywrightPage(raw_page)
+    await page.get_cdp_accessibility_tree()
+    session = page._cdp_session
+
+    await page.close()
+
+    session.detach.assert_awaited_once()
+    raw_page.close.assert_awaited_once()
+    assert page._cdp_session is None
+
+
+def _resolving_session(parked=True):
+    """Fake session answering DOM.resolveNode and Runtime.callFunctionOn."""
+    responses = {
+        "DOM.resolveNode": {"object": {"objectId": "obj-1"}},
+        "Runtime.callFunctionOn": {"result": {"value": parked}},
+        "Runtime.releaseObjectGroup": {},
+        "DOMSnapshot.captureSnapshot": {"documents": []},
+    }
+    session = FakeCDPSession()
+    session.send = AsyncMock(side_effect=lambda method, params: responses[method])
+    return session
+
+
+@pytest.mark.asyncio
+async def test_select_by_backend_node_id(raw_page):
+    """A backend node ID resolves to an element handle without any selector."""
+    handle = MagicMock()
+    raw_page.evaluate_handle = AsyncMock(return_value=handle)
+    raw_page.context.new_cdp_session = AsyncMock(return_value=_resolving_session())
+    page = PlaywrightPage(raw_page)
+
+    element = await page.select_by_backend_node_id(42)
+
+    assert element._locator is handle.as_element.return_value
+    session = page._cdp_session
+    method, params = session.send.await_args_list[0].args
+    assert method == "DOM.resolveNode"
+    assert params["backendNodeId"] == 42
+    raw_page.locator.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_select_by_backend_node_id_leaves_nothing_behind(raw_page):
+    """The CDP objects (as one group) and the handles are released at the next
+    snapshot; the element is handed over under a one-off key, not a window
+    global."""
+    handle = MagicMock()
+    handle.as_element.return_value.dispose = AsyncMock()
+    raw_page.evaluate_handle = AsyncMock(return_value=handle)
+    raw_page.context.new_cdp_session = AsyncMock(return_value=_resolving_session())
+    page = PlaywrightPage(raw_page)
+
+    await page.select_by_backend_node_id(42)
+    await page.select_by_backend_node_id(43)
+
+    calls = [call.args for call in page._cdp_session.send.await_args_list]
+    park = [params for method, params in calls if method == "Runtime.callFunctionOn"]
+    keys = [params["arguments"][0]["value"] for params in park]
+    assert len(set(keys)) == 2
+    assert "window.__" not in park[0]["functionDeclaration"]
+    assert [c.args[1] for c in raw_page.evaluate_handle.await_args_list] == keys
+    assert [m for m, _ in calls] == [
+        "DOM.resolveNode",
+        "Runtime.callFunctionOn",
+    ] * 2
+
+    def released():
+        calls = page._cdp_session.send.await_args_list
+        return [c.args for c in calls if c.args[0] == "Runtime.releaseObjectGroup"]
+
+    element = handle.as_element.return_value
+    element.dispose.assert_not_awaited()
+    await page.get_cdp_dom_snapshot()
+    assert element.dispose.await_count == 2
+    assert len(released()) == 1
+    assert {p["objectGroup"] for m, p in calls if m == "DOM.resolveNode"} == {
+        released()[0][1]["objectGroup"]
+    }
+    await page.get_cdp_dom_snapshot()
+    assert element.dispose.await_count == 2
+    assert len(released()) == 1
+
+
+@pytest.mark.asyncio
+async def test_kept_element_works_after_the_next_snapshot(raw_page):
+    """Elements handed to the user (Agent.select) aren't disposed by snapshots."""
+    handle = MagicMock()
+    element_handle = handle.as_element.return_value
+    element_handle.dispose = AsyncMock()
+    element_handle.click = AsyncMock()
+    raw_page.evaluate_handle = AsyncMock(return_value=handle)
+    raw_page.context.new_cdp_session = AsyncMock(return_value=_resolving_session())
+    page = PlaywrightPage(raw_page)
+
+    element = await page.select_by_backend_node_id(42, keep=True)
+    await page.get_cdp_dom_snapshot()
+    await element.click()
+
+    element_handle.dispose.assert_not_awaited()
+    element_handle.click.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_select_by_backend_node_id_gone(raw_page):
+    """Removed nodes resolve to None so callers can fall back to XPath."""
+    session = FakeCDPSession()
+    session.send.side_effect = PlaywrightError("No node with given id found")
+    raw_page.context.new_cdp_session = AsyncMock(return_value=session)
+    page = PlaywrightPage(raw_page)
+
+    assert await page.select_by_backend_node_id(42) is None
+    assert session.send.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_select_by_backend_node_id_detached(raw_page):
+    """Nodes detached from the document are not handed out."""
+    raw_page.evaluate_handle = AsyncMock()
+    raw_page.context.new_cdp_session = AsyncMock(
+        return_value=_resolving_session(parked=False)
+    )
+    page = PlaywrightPage(raw_page)
+
+    assert await page.select_by_backend_node_id(42) is None
+    raw_page.evaluate_handle.assert_not_called()
+    await page.get_cdp_dom_snapshot()
+    method, params = page._cdp_session.send.await_args_list[-1].args
+    assert method == "Runtime.releaseObjectGroup"
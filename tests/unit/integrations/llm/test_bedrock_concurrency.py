@@ -0,0 +1,127 @@
+"""Unit tests for non-blocking Bedrock calls."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from webtask.integrations.llm.bedrock.bedrock import Bedrock
+from webtask.llm import Message, Role, Text
+
+pytestmark = pytest.mark.unit
+
+LATENCY = 0.2
+
+
+class SlowConverse:
+    """Blocking converse stand-in that records how many calls overlap."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __call__(self, **request):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(LATENCY)
+        with self._lock:
+            self.in_flight -= 1
+        return {"output": {"message": {"content": [{"text": "ok"}]}}}
+
+
+def bedrock(mocker, max_concurrency=8):
+    llm = Bedrock(max_concurrency=max_concurrency)
+    llm.client = mocker.Mock()
+    llm.client.converse = SlowConverse()
+    return llm
+
+
+def task(n: int):
+    return [Message(role=Role.USER, content=[Text(text=f"task {n}")])]
+
+
+async def test_concurrent_agents_overlap_llm_calls(mocker):
+    llm = bedrock(mocker)
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    beating = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(llm.call_tools(task(n), []) for n in range(4)))
+    elapsed = time.perf_counter() - start
+    beating.cancel()
+
+    assert [r.text for r in responses] == ["ok"] * 4
+    assert llm.client.converse.max_in_flight == 4
+    assert elapsed < 2 * LATENCY
+    # The event loop kept running while the requests were in flight
+    assert ticks >= 5
+
+
+async def test_concurrency_is_bounded(mocker):
+    llm = bedrock(mocker, max_concurrency=2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(llm.call_tools(task(n), []) for n in range(4)))
+
+    assert llm.client.converse.max_in_flight == 2
+    assert time.perf_counter() - start >= 2 * LATENCY
+
+
+async def test_close_stops_the_request_threads(mocker):
+    llm = bedrock(mocker)
+    await llm.call_tools(task(0), [])
+
+    await llm.close()
+
+    assert llm._executor._shutdown
+    llm.client.close.assert_called_once()
+    with pytest.raises(RuntimeError):
+        await llm.call_tools(task(1), [])
+
+
+async def test_stream_is_closed_after_a_blocked_read_returns(mocker):
+    """A cancelled reader never closes the stream under a running next()."""
+    llm = bedrock(mocker)
+    release = threading.Event()
+    reading = threading.Event()
+    log = []
+
+    def events():
+        yield {"messageStart": {"role": "assistant"}}
+        reading.set()
+        release.wait()
+        log.append("read")
+        yield {"messageStop": {"stopReason": "end_turn"}}
+
+    stream = mocker.MagicMock()
+    stream.__iter__.return_value = events()
+    stream.close.side_effect = lambda: log.append(
+        ("close", threading.current_thread().name.startswith("bedrock"))
+    )
+    llm.client.converse_stream.return_value = {"stream": stream}
+
+    async def consume():
+        return [item async for item in llm.stream_tools(task(0), [])]
+
+    consumer = asyncio.create_task(consume())
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, reading.wait)
+        await asyncio.sleep(0.05)
+        consumer.cancel()
+        await asyncio.sleep(0.05)
+        assert log == []
+    finally:
+        release.set()
+    with pytest.raises(asyncio.CancelledError):
+        await consumer
+
+    assert log == ["read", ("close", True)]
@@ -0,0 +1,32 @@
+"""Unit tests for passing images to provider formats."""
+
+import pytest
+from webtask.llm import Image, ImageMimeType, Message, Role
+from webtask.integrations.llm.bedrock.bedrock_mapper import messages_to_bedrock_format
+from webtask.integrations.llm.google.gemini_mapper import messages_to_gemini_content
+
+pytestmark = pytest.mark.unit
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256))
+
+
+def test_gemini_passes_image_bytes_through():
+    """Gemini inline data is the image's own bytes object."""
+    image = Image(data=PNG)
+
+    contents, _ = messages_to_gemini_content([Message(role=Role.USER, content=[image])])
+
+    blob = contents[0].parts[0].inline_data
+    assert blob.data is PNG
+    assert blob.mime_type == "image/png"
+
+
+def test_bedrock_passes_image_bytes_through():
+    """Bedrock image source is the image's own bytes object."""
+    image = Image(data=PNG, mime_type=ImageMimeType.WEBP)
+
+    messages, _ = messages_to_bedrock_format([Message(role=Role.USER, content=[image])])
+
+    block = messages[0]["content"][0]["image"]
+    assert block["source"]["bytes"] is PNG
+    assert block["format"] == "webp"
@@ -0,0 +1,249 @@
+"""Unit tests for provider prompt caching of the stable prompt prefix."""
+
+import asyncio
+
+import pytest
+from google.genai import types
+
+from webtask._internal.agent.message import AgentText
+from webtask.integrations.llm.bedrock import bedrock_mapper
+from webtask.integrations.llm.bedrock.bedrock import Bedrock
+from webtask.integrations.llm.google import gemini as gemini_module
+from webtask.integrations.llm.google import gemini_prompt_cache
+from webtask.integrations.llm.google.gemini import Gemini
+from webtask.integrations.llm.google.gemini_mapper import split_at_cache_point
+from webtask.llm import CachePoint, Message, Role, Text
+
+pytestmark = pytest.mark.unit
+
+
+def session(page: str = "page 0"):
+    """Session start messages as TaskRunner builds them, plus one step."""
+    return [
+        Message(role=Role.SYSTEM, content=[Text(text="system")]),
+        Message(
+            role=Role.USER,
+            content=[
+                AgentText(text="## Current task:\nbuy shoes"),
+                CachePoint(),
+                AgentText(text=page, lifespan=1),
+            ],
+        ),
+        Message(role=Role.MODEL, content=[Text(text="step")]),
+    ]
+
+
+def test_split_at_cache_point():
+    messages = session()
+
+    prefix, rest = split_at_cache_point(messages)
+
+    assert prefix[0] is messages[0]
+    assert [c.text for c in prefix[1].content] == ["## Current task:\nbuy shoes"]
+    assert [c.text for c in rest[0].content] == ["page 0"]
+    assert rest[0].role == Role.USER
+    assert rest[1] is messages[2]
+    assert split_at_cache_point(messages[:1]) is None
+
+
+def test_bedrock_mapper_places_cache_point_only_when_enabled():
+    messages = session()
+
+    plain, _ = bedrock_mapper.messages_to_bedrock_format(messages)
+    cached, _ = bedrock_mapper.messages_to_bedrock_format(
+        messages, cache_point={"type": "default"}
+    )
+
+    assert len(plain[0]["content"]) == 2
+    assert cached[0]["content"][1] == {"cachePoint": {"type": "default"}}
+
+
+@pytest.mark.parametrize(
+    "ttl, cache_point",
+    [(300, {"type": "default"}), (3600, {"type": "default", "ttl": "1h"})],
+)
+async def test_bedrock_marks_system_and_session_prefix(mocker, ttl, cache_point):
+    llm = Bedrock(prompt_cache_ttl=ttl)
+    llm.client = mocker.Mock()
+    llm.client.converse.return_value = {
+        "output": {"message": {"content": [{"text": "ok"}]}},
+        "usage": {"inputTokens": 10, "cacheReadInputTokens": 2000},
+    }
+    llm.logger = mocker.Mock()
+
+    await llm.call_tools(session(), tools=[])
+
+    request = llm.client.converse.call_args.kwargs
+    assert request["system"] == [{"text": "system"}, {"cachePoint": cache_point}]
+    assert request["messages"][0]["content"][1] == {"cachePoint": cache_point}
+    assert "Cache read: 2000" in llm.logger.info.call_args[0][0]
+
+
+def test_bedrock_rejects_unsupported_ttl():
+    with pytest.raises(ValueError, match="prompt_cache_ttl"):
+        Bedrock(prompt_cache_ttl=60)
+
+
+@pytest.fixture
+def gemini_client(mocker):
+    client = mocker.Mock()
+    mocker.patch.object(gemini_module.genai, "Client", return_value=client)
+    client.aio.caches.create = mocker.AsyncMock(
+        return_value=types.CachedContent(name="cachedContents/1")
+    )
+    client.aio.caches.delete = mocker.AsyncMock()
+    client.aio.models.generate_content = mocker.AsyncMock(
+        return_value=types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(
+                        role="model", parts=[types.Part.from_text(text="ok")]
+                    )
+                )
+            ]
+        )
+    )
+    return client
+
+
+def cached_gemini(ttl: int = 600) -> Gemini:
+    """Gemini with prompt caching, caching even the tiny test prefixes."""
+    return Gemini(prompt_cache_ttl=ttl, prompt_cache_min_tokens=0)
+
+
+async def test_gemini_sends_only_what_follows_the_cached_prefix(gemini_client):
+    llm = cached_gemini()
+    messages = session()
+
+    await llm.call_tools(messages, tools=[])
+    await llm.call_tools(messages + [Message(role=Role.TOOL, content=[])], tools=[])
+
+    # Created once, then reused
+    gemini_client.aio.caches.create.assert_awaited_once()
+    cache_config = gemini_client.aio.caches.create.call_args.kwargs["config"]
+    assert cache_config.system_instruction == "system"
+    assert cache_config.ttl == "600s"
+    request = gemini_client.aio.models.generate_content.call_args.kwargs
+    assert request["config"].cached_content == "cachedContents/1"
+    assert request["config"].system_instruction is None
+    assert [p.text for c in request["contents"] for p in c.parts] == ["page 0", "step"]
+
+
+async def test_gemini_keeps_a_cache_per_prefix(gemini_client):
+    """Agents sharing the LLM alternate prefixes without recreating caches."""
+    gemini_client.aio.caches.create.side_effect = [
+        types.CachedContent(name="cachedContents/1"),
+        types.CachedContent(name="cachedContents/2"),
+    ]
+    llm = cached_gemini()
+    first, second = session(), session()
+
+    for messages in (first, second, first, second):
+        await llm.call_tools(messages, tools=[])
+
+    assert gemini_client.aio.caches.create.await_count == 2
+    gemini_client.aio.caches.delete.assert_not_awaited()
+    request = gemini_client.aio.models.generate_content.call_args.kwargs
+    assert request["config"].cached_content == "cachedContents/2"
+
+
+async def test_gemini_cache_entries_are_bounded(gemini_client, mocker):
+    mocker.patch.object(gemini_prompt_cache, "_MAX_ENTRIES", 2)
+    llm = cached_gemini()
+    sessions = [session() for _ in range(3)]
+
+    for messages in sessions + sessions[:1]:
+        await llm.call_tools(messages, tools=[])
+
+    # The first prefix was dropped for the third, so it is created again
+    assert gemini_client.aio.caches.create.await_count == 4
+    assert len(llm._prompt_cache._entries) == 2
+    gemini_client.aio.caches.delete.assert_not_awaited()
+
+
+async def test_gemini_concurrent_calls_create_one_cache(gemini_client):
+    """Agents calling with the same prefix at once share one upload."""
+    created = asyncio.Event()
+
+    async def create(**kwargs):
+        await created.wait()
+        return types.CachedContent(name="cachedContents/1")
+
+    gemini_client.aio.caches.create.side_effect = create
+    llm = cached_gemini()
+    messages = session()
+
+    calls = [asyncio.create_task(llm.call_tools(messages, tools=[])) for _ in range(3)]
+    await asyncio.sleep(0)
+    created.set()
+    await asyncio.gather(*calls)
+
+    gemini_client.aio.caches.create.assert_awaited_once()
+    for call in gemini_client.aio.models.generate_content.call_args_list:
+        assert call.kwargs["config"].cached_content == "cachedContents/1"
+    assert llm._prompt_cache._creating == {}
+
+
+@pytest.mark.parametrize(
+    "model, min_tokens",
+    [
+        ("gemini-2.5-flash", 1024),
+        ("gemini-2.5-flash-lite", 1024),
+        ("models/gemini-2.5-pro-preview-06-05", 4096),
+        ("gemini-next-pro-experimental", 1024),
+    ],
+)
+def test_gemini_minimum_prefix_size_by_model(gemini_client, model, min_tokens):
+    llm = Gemini(model=model, prompt_cache_ttl=600)
+
+    assert llm._prompt_cache._min_tokens == min_tokens
+
+
+def test_gemini_minimum_prefix_size_can_be_set(gemini_client):
+    llm = Gemini(
+        model="gemini-2.5-pro", prompt_cache_ttl=600, prompt_cache_min_tokens=2048
+    )
+
+    assert llm._prompt_cache._min_tokens == 2048
+
+
+async def test_gemini_skips_prefixes_below_the_minimum_size(gemini_client):
+    llm = Gemini(prompt_cache_ttl=600)
+
+    await llm.call_tools(session(), tools=[])
+
+    gemini_client.aio.caches.create.assert_not_awaited()
+    request = gemini_client.aio.models.generate_content.call_args.kwargs
+    assert request["config"].cached_content is None
+    assert request["config"].system_instruction == "system"
+
+
+async def test_gemini_without_caching_ignores_cache_points(gemini_client):
+    llm = Gemini()
+
+    await llm.call_tools(session(), tools=[])
+
+    gemini_client.aio.caches.create.assert_not_awaited()
+    request = gemini_client.aio.models.generate_content.call_args.kwargs
+    assert [p.text for c in request["contents"] for p in c.parts] == [
+        "## Current task:\nbuy shoes",
+        "page 0",
+        "step",
+    ]
+
+
+async def test_gemini_falls_back_when_cache_creation_fails(gemini_client):
+    gemini_client.aio.caches.create.side_effect = RuntimeError("too small")
+    llm = cached_gemini()
+    llm._prompt_cache._logger = gemini_client.logger
+    messages = session()
+
+    await llm.call_tools(messages, tools=[])
+    await llm.call_tools(messages, tools=[])
+
+    # Not retried for the same prefix; the full prompt is sent
+    gemini_client.aio.caches.create.assert_awaited_once()
+    request = gemini_client.aio.models.generate_content.call_args.kwargs
+    assert request["config"].cached_content is None
+    assert request["config"].system_instruction == "system"
+    assert "not created" in gemini_client.logger.warning.call_args[0][0]
@@ -0,0 +1,159 @@
+"""Unit tests for streamed LLM responses."""
+
+import pytest
+from google.genai import types
+
+from webtask.integrations.llm.bedrock.bedrock import Bedrock
+from webtask.integrations.llm.bedrock.bedrock_mapper import BedrockStreamAssembler
+from webtask.integrations.llm.google import gemini as gemini_module
+from webtask.integrations.llm.google.gemini import Gemini
+from webtask.integrations.llm.google.gemini_mapper import GeminiStreamAssembler
+from webtask.llm import LLM, Message, Role, Text, ToolCall
+
+pytestmark = pytest.mark.unit
+
+MESSAGES = [Message(role=Role.USER, content=[Text(text="task")])]
+
+BEDROCK_EVENTS = [
+    {"messageStart": {"role": "assistant"}},
+    {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"text": "Clicking "}}},
+    {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"text": "login"}}},
+    {"contentBlockStop": {"contentBlockIndex": 0}},
+    {
+        "contentBlockStart": {
+            "contentBlockIndex": 1,
+            "start": {"toolUse": {"toolUseId": "t1", "name": "click"}},
+        }
+    },
+    {
+        "contentBlockDelta": {
+            "contentBlockIndex": 1,
+            "delta": {"toolUse": {"input": '{"element_id": '}},
+        }
+    },
+    {
+        "contentBlockDelta": {
+            "contentBlockIndex": 1,
+            "delta": {"toolUse": {"input": '"button-0"}'}},
+        }
+    },
+    {"contentBlockStop": {"contentBlockIndex": 1}},
+    {
+        "contentBlockStart": {
+            "contentBlockIndex": 2,
+            "start": {"toolUse": {"toolUseId": "t2", "name": "abort_work"}},
+        }
+    },
+    {"contentBlockStop": {"contentBlockIndex": 2}},
+    {"messageStop": {"stopReason": "tool_use"}},
+    {"metadata": {"usage": {"inputTokens": 10, "outputTokens": 5}}},
+]
+
+
+def gemini_chunk(*parts):
+    return types.GenerateContentResponse(
+        candidates=[types.Candidate(content=types.Content(role="model", parts=parts))]
+    )
+
+
+GEMINI_CHUNKS = [
+    gemini_chunk(types.Part.from_text(text="Clicking ")),
+    gemini_chunk(
+        types.Part.from_text(text="login"),
+        types.Part.from_function_call(name="click", args={"element_id": "button-0"}),
+    ),
+    gemini_chunk(types.Part.from_function_call(name="abort_work", args={})),
+]
+
+
+def completed_by_event(assembler, events):
+    """For each event, the content items it completed."""
+    return [[str(c) for c in assembler.feed(event)] for event in events]
+
+
+def test_bedrock_assembler_completes_items_at_block_stop():
+    assembler = BedrockStreamAssembler()
+
+    completed = completed_by_event(assembler, BEDROCK_EVENTS)
+
+    assert [i for i, items in enumerate(completed) if items] == [3, 7, 9]
+    assert completed[3] == ["Text(Clicking login)"]
+    assert completed[7] == ["ToolCall(click, element_id=button-0)"]
+    assert completed[9] == ["ToolCall(abort_work, )"]
+    assert assembler.usage == {"inputTokens": 10, "outputTokens": 5}
+
+
+def test_gemini_assembler_joins_text_until_function_call():
+    assembler = GeminiStreamAssembler()
+
+    completed = completed_by_event(assembler, GEMINI_CHUNKS)
+
+    assert completed == [
+        [],
+        ["Text(Clicking login)", "ToolCall(click, element_id=button-0)"],
+        ["ToolCall(abort_work, )"],
+    ]
+    assert assembler.finish() == []
+
+
+async def test_bedrock_stream_tools(mocker):
+    llm = Bedrock()
+    llm.client = mocker.Mock()
+    stream = mocker.MagicMock()
+    stream.__iter__.return_value = iter(BEDROCK_EVENTS)
+    llm.client.converse_stream.return_value = {"stream": stream}
+
+    items = [item async for item in llm.stream_tools(MESSAGES, tools=[])]
+
+    assert [type(item) for item in items] == [Text, ToolCall, ToolCall]
+    assert items[1].id == "t1"
+    assert items[1].arguments == {"element_id": "button-0"}
+    assert "messages" in llm.client.converse_stream.call_args.kwargs
+    stream.close.assert_called_once()
+
+
+async def test_bedrock_stream_is_closed_when_reading_stops_early(mocker):
+    llm = Bedrock()
+    llm.client = mocker.Mock()
+    stream = mocker.MagicMock()
+    stream.__iter__.return_value = iter(BEDROCK_EVENTS)
+    llm.client.converse_stream.return_value = {"stream": stream}
+
+    items = llm.stream_tools(MESSAGES, tools=[])
+    await items.__anext__()
+    await items.aclose()
+
+    stream.close.assert_called_once()
+
+
+async def test_gemini_stream_tools(mocker):
+    client = mocker.Mock()
+    mocker.patch.object(gemini_module.genai, "Client", return_value=client)
+
+    async def stream():
+        for chunk in GEMINI_CHUNKS:
+            yield chunk
+
+    client.aio.models.generate_content_stream = mocker.AsyncMock(return_value=stream())
+    llm = Gemini()
+
+    items = [item async for item in llm.stream_tools(MESSAGES, tools=[])]
+
+    assert [str(item) for item in items] == [
+        "Text(Clicking login)",
+        "ToolCall(click, element_id=button-0)",
+        "ToolCall(abort_work, )",
+    ]
+
+
+async def test_default_stream_tools_yields_call_tools_content():
+    class OneShot(LLM):
+        async def call_tools(self, messages, tools):
+            return Message(
+                role=Role.MODEL,
+                content=[Text(text="hi"), ToolCall(name="wait", arguments={})],
+            )
+
+    items = [item async for item in OneShot().stream_tools(MESSAGES, tools=[])]
+
+    assert [str(item) for item in items] == ["Text(hi)", "ToolCall(wait, )"]
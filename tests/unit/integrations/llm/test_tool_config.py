@@ -0,0 +1,74 @@
+"""Unit tests for compiled provider tool declarations."""
+
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+from webtask._internal.agent.run import TaskResult
+from webtask._internal.agent.tools import AbortWorkTool, ClickTool, CompleteWorkTool
+from webtask.integrations.llm.bedrock import bedrock_mapper
+from webtask.integrations.llm.google import gemini_mapper
+
+pytestmark = pytest.mark.unit
+
+
+class Product(BaseModel):
+    name: str
+    price: float
+
+
+class Listing(BaseModel):
+    products: List[Product]
+
+
+def tools(output_schema=None):
+    result = TaskResult()
+    return [
+        ClickTool(browser=None, wait_after_action=0),
+        CompleteWorkTool(result, output_schema),
+        AbortWorkTool(result),
+    ]
+
+
+def test_complete_work_params_shared_per_output_schema():
+    assert tools(Listing)[1].Params is tools(Listing)[1].Params
+    assert tools(Listing)[1].Params is not tools(Product)[1].Params
+    assert tools()[1].Params is CompleteWorkTool.Params
+
+
+@pytest.mark.parametrize(
+    "compile_all, compiled",
+    [
+        (
+            lambda ts: gemini_mapper.build_tool_config(ts).function_declarations,
+            gemini_mapper._compile_function_declaration,
+        ),
+        (
+            lambda ts: bedrock_mapper.build_tool_config(ts)["tools"],
+            bedrock_mapper._compile_tool_spec,
+        ),
+    ],
+    ids=["gemini", "bedrock"],
+)
+def test_declarations_compiled_once_per_tool(compile_all, compiled):
+    compiled.cache_clear()
+    first = compile_all(tools(Listing))
+
+    second = compile_all(tools(Listing))
+
+    assert all(a is b for a, b in zip(first, second))
+    assert compiled.cache_info().misses == 3
+    # Another output schema only compiles complete_work again
+    other = compile_all(tools(Product))
+    assert other[1] is not first[1]
+    assert other[0] is first[0]
+    assert compiled.cache_info().misses == 4
+
+
+def test_gemini_declaration_keeps_nested_output_schema():
+    declaration = gemini_mapper.function_declaration(tools(Listing)[1])
+
+    output = declaration.parameters.properties["output"]
+    assert output.nullable
+    assert set(output.properties["products"].items.properties) == {"name", "price"}
@@ -0,0 +1,199 @@
+"""Unit tests for CachingLLM record/replay."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import Field
+
+from webtask.llm import (
+    LLM,
+    CachingLLM,
+    Image,
+    LLMCacheMissError,
+    Message,
+    Role,
+    Text,
+    ToolCall,
+)
+from webtask.llm.tool import Tool, ToolParams
+
+pytestmark = pytest.mark.unit
+
+
+class ClickTool(Tool):
+    name = "click"
+    description = "Click an element"
+
+    class Params(ToolParams):
+        element_id: str = Field(description="Element to click")
+
+    async def execute(self, params):
+        raise NotImplementedError
+
+
+class CountingLLM(LLM):
+    """Answers every request with a click, with a fresh call id each time."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def call_tools(self, messages, tools):
+        self.calls += 1
+        return Message(
+            role=Role.MODEL,
+            content=[
+                Text(text=f"answer {self.calls}"),
+                ToolCall(
+                    id=f"call-{self.calls}",
+                    name="click",
+                    arguments={"element_id": "button-0"},
+                ),
+            ],
+        )
+
+
+TOOLS = [ClickTool()]
+
+
+def request(text="Click login", call_id="call-1"):
+    """A two-step conversation, as a new Message list each time."""
+    return [
+        Message(role=Role.USER, content=[Text(text=text), Image(data=b"png")]),
+        Message(
+            role=Role.MODEL,
+            content=[ToolCall(id=call_id, name="click", arguments={"element_id": "a"})],
+        ),
+    ]
+
+
+async def test_record_stores_and_reuses_responses(tmp_path):
+    inner = CountingLLM()
+    llm = CachingLLM(inner, tmp_path)
+
+    first = await llm.call_tools(request(), TOOLS)
+    second = await llm.call_tools(request(call_id="call-7"), TOOLS)
+
+    assert inner.calls == 1
+    assert second.content == first.content
+    assert llm.get_stats() == {
+        "hits": 1,
+        "misses": 1,
+        "writes": 1,
+        "evictions": 0,
+        "size_bytes": llm.get_stats()["size_bytes"],
+    }
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+async def test_key_covers_content_and_tools(tmp_path):
+    llm = CachingLLM(CountingLLM(), tmp_path)
+    key = llm.request_key(request(), TOOLS)
+
+    assert key == llm.request_key(request(), TOOLS)
+    assert key != llm.request_key(request(text="Click logout"), TOOLS)
+    assert key != llm.request_key(request(), [])
+    other_image = request()
+    other_image[0].content[1] = Image(data=b"gif")
+    assert key != llm.request_key(other_image, TOOLS)
+    assert key != CachingLLM(None, tmp_path, mode="replay", namespace="m").request_key(
+        request(), TOOLS
+    )
+
+
+async def test_replay_serves_recordings_without_an_llm(tmp_path):
+    await CachingLLM(CountingLLM(), tmp_path).call_tools(request(), TOOLS)
+    llm = CachingLLM(None, tmp_path, mode="replay")
+
+    response = await llm.call_tools(request(), TOOLS)
+
+    assert response.text == "answer 1"
+    assert response.tool_calls[0].id == "call-1"
+    with pytest.raises(LLMCacheMissError):
+        await llm.call_tools(request(text="new task"), TOOLS)
+
+
+async def test_passthrough_neither_reads_nor_writes(tmp_path):
+    inner = CountingLLM()
+    llm = CachingLLM(inner, tmp_path, mode="passthrough")
+
+    await llm.call_tools(request(), TOOLS)
+    await llm.call_tools(request(), TOOLS)
+
+    assert inner.calls == 2
+    assert list(tmp_path.iterdir()) == []
+    assert llm.get_stats()["hits"] == llm.get_stats()["misses"] == 0
+
+
+async def test_stream_tools_records_and_replays(tmp_path):
+    inner = CountingLLM()
+    llm = CachingLLM(inner, tmp_path)
+
+    streamed = [item async for item in llm.stream_tools(request(), TOOLS)]
+    replayed = [item async for item in llm.stream_tools(request(), TOOLS)]
+
+    assert inner.calls == 1
+    assert replayed == streamed
+
+
+async def test_least_recently_used_entries_are_evicted(tmp_path):
+    llm = CachingLLM(CountingLLM(), tmp_path)
+    for n in range(3):
+        await llm.call_tools(request(text=f"task {n}"), TOOLS)
+    entry_size = llm.get_stats()["size_bytes"] // 3
+    for n in range(3):
+        path = tmp_path / f"{llm.request_key(request(text=f'task {n}'), TOOLS)}.json"
+        os.utime(path, (1000 + n, 1000 + n))
+    # Using task 0 again leaves task 1 as the least recently used
+    await llm.call_tools(request(text="task 0"), TOOLS)
+
+    llm.max_size_bytes = 3 * entry_size + entry_size // 2
+    await llm.call_tools(request(text="task 3"), TOOLS)
+
+    assert llm.get_stats()["evictions"] == 1
+    assert llm.get_stats()["size_bytes"] <= llm.max_size_bytes
+    replay = CachingLLM(None, tmp_path, mode="replay")
+    await replay.call_tools(request(text="task 0"), TOOLS)
+    with pytest.raises(LLMCacheMissError):
+        await replay.call_tools(request(text="task 1"), TOOLS)
+
+
+def test_writers_of_one_key_do_not_collide(tmp_path):
+    """Agents and processes sharing the store may record the same request."""
+    llms = [CachingLLM(CountingLLM(), tmp_path) for _ in range(8)]
+    response = Message(role=Role.MODEL, content=[Text(text="done")])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in range(20):
+            list(executor.map(lambda llm: llm._store("k", response), llms))
+
+    assert [path.name for path in tmp_path.iterdir()] == ["k.json"]
+
+
+def test_overwriting_an_entry_keeps_the_size(tmp_path):
+    llm = CachingLLM(CountingLLM(), tmp_path)
+    response = Message(role=Role.MODEL, content=[Text(text="done")])
+
+    for _ in range(3):
+        llm._store("k", response)
+
+    assert llm.get_stats()["size_bytes"] == (tmp_path / "k.json").stat().st_size
+
+
+def test_modes_are_validated(tmp_path):
+    with pytest.raises(ValueError, match="Invalid mode"):
+        CachingLLM(CountingLLM(), tmp_path, mode="offline")
+    with pytest.raises(ValueError, match="required"):
+        CachingLLM(None, tmp_path)
+
+
+async def test_close_closes_the_wrapped_llm(tmp_path):
+    inner = CountingLLM()
+    inner.close = AsyncMock()
+
+    await CachingLLM(inner, tmp_path).close()
+    await CachingLLM(None, tmp_path, mode="replay").close()
+
+    inner.close.assert_awaited_once()
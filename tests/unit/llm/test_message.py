@@ -0,0 +1,63 @@
+"""Unit tests for message content types."""
+
+import base64
+
+import pytest
+from webtask.llm import Image, ImageMimeType
+
+pytestmark = pytest.mark.unit
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256))
+
+
+def test_image_keeps_raw_bytes():
+    """Raw bytes are stored and returned without copying."""
+    image = Image(data=PNG)
+
+    assert image.data is PNG
+    assert image.raw is PNG
+    assert image.size == len(PNG)
+
+
+def test_image_memoryview_of_whole_bytes_is_not_copied():
+    """A view over a whole bytes object resolves to that object."""
+    image = Image(data=memoryview(PNG))
+
+    assert image.raw is PNG
+    assert image.size == len(PNG)
+
+
+def test_image_memoryview_slice_is_materialized_once():
+    """A partial view is copied on first use, then reused."""
+    image = Image(data=memoryview(PNG)[8:])
+
+    assert image.raw == PNG[8:]
+    assert image.raw is image.raw
+
+
+def test_image_decodes_base64_str_once():
+    """Base64 str data (the old form) is decoded lazily and cached."""
+    encoded = base64.b64encode(PNG).decode("ascii")
+    image = Image(data=encoded, mime_type=ImageMimeType.JPEG)
+
+    assert image.base64 is encoded
+    assert image.size == len(PNG)
+    assert image.raw == PNG
+    assert image.raw is image.raw
+
+
+def test_image_base64_is_built_lazily_and_cached():
+    """Raw data is only base64-encoded when asked for."""
+    image = Image(data=PNG)
+    assert image._base64 is None
+
+    assert base64.b64decode(image.base64) == PNG
+    assert image.base64 is image.base64
+
+
+def test_image_json_dump_is_base64():
+    """JSON serialization emits base64, which validates back to the same image."""
+    dumped = Image(data=PNG).model_dump_json()
+
+    assert Image.model_validate_json(dumped).raw == PNG
+    assert str(Image(data=PNG)) == f"Image(mime_type=image/png, size={len(PNG)} bytes)"
@@ -0,0 +1,232 @@
+"""Tests for ShardedRunner - jobs spread across worker processes."""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+from webtask import sharding
+from webtask.agent import Result, Verdict
+from webtask.exceptions import TaskAbortedError, WebtaskError
+from webtask.sharding import ShardedRunner, ShardResult, ShardTask
+
+pytestmark = pytest.mark.unit
+
+
+class Unpicklable(Exception):
+    def __init__(self):
+        super().__init__("not pickleable")
+        self.lock = threading.Lock()
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeAgent:
+    def __init__(self, llm):
+        self.llm = llm
+        self.context = FakeContext()
+        self.urls = []
+        self.cleared = 0
+
+    def clear_history(self):
+        self.cleared += 1
+
+    async def goto(self, url):
+        self.urls.append(url)
+
+    async def do(self, task, output_schema=None, max_steps=20):
+        if task == "abort":
+            raise TaskAbortedError("stuck")
+        if task == "unpicklable":
+            raise Unpicklable()
+        if task == "exit":
+            # Let the queue's feeder thread send the earlier results first
+            time.sleep(0.2)
+            os._exit(1)
+        if task == "slow":
+            await asyncio.sleep(3)
+        if task == "lock":
+            return Result(output=threading.Lock())
+        return Result(output=f"{task}:{os.getpid()}:{max_steps}")
+
+    async def verify(self, condition, max_steps=10):
+        return Verdict(passed=True, feedback=condition)
+
+    async def extract(self, what, output_schema=None, max_steps=10):
+        return f"{what}@{self.urls[-1] if self.urls else None}"
+
+
+class FakeWebtask:
+    instances = []
+
+    def __init__(self):
+        self.agents = []
+        self.closed = False
+        FakeWebtask.instances.append(self)
+
+    async def create_agent(self, llm, **options):
+        agent = FakeAgent(llm)
+        self.agents.append(agent)
+        return agent
+
+    async def close(self):
+        self.closed = True
+
+
+def make_llm():
+    return "llm"
+
+
+def failing_llm():
+    raise RuntimeError("no credentials")
+
+
+@pytest.fixture(autouse=True)
+def fake_webtask(monkeypatch):
+    FakeWebtask.instances = []
+    monkeypatch.setattr(sharding, "Webtask", FakeWebtask)
+
+
+async def run_worker(specs, contexts=2, llm_factory=make_llm):
+    """Run one worker in this process and collect its results."""
+    jobs, results = queue.Queue(), queue.Queue()
+    for index, spec in enumerate(specs):
+        jobs.put((index, spec))
+    for _ in range(contexts):
+        jobs.put(None)
+    await sharding._run_worker(0, llm_factory, {}, contexts, jobs, results)
+    collected = []
+    while not results.empty():
+        message = results.get()
+        if isinstance(message, ShardResult):
+            collected.append(message)
+    return sorted(collected, key=lambda outcome: outcome.index)
+
+
+async def collect(runner, tasks):
+    return [done async for done in runner.run(tasks)]
+
+
+def test_shard_task_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        ShardTask("x", kind="click")
+
+
+async def test_worker_runs_each_kind():
+    specs = [
+        ShardTask("buy", max_steps=5),
+        ShardTask("cart is empty", kind="verify"),
+        ShardTask("price", kind="extract", url="https://example.com"),
+    ]
+
+    results = await run_worker(specs)
+
+    assert results[0].output.output.startswith("buy:")
+    assert results[0].output.output.endswith(":5")
+    assert isinstance(results[1].output, Verdict)
+    assert results[1].output.feedback == "cart is empty"
+    assert results[2].output == "price@https://example.com"
+    assert all(done.ok and done.worker == 0 for done in results)
+    assert FakeWebtask.instances[0].closed
+
+
+async def test_worker_reuses_agents_per_lane():
+    results = await run_worker([ShardTask(f"t{i}") for i in range(6)], contexts=2)
+
+    assert len(results) == 6
+    agents = FakeWebtask.instances[0].agents
+    assert len(agents) == 2
+    assert sum(agent.cleared for agent in agents) == 4
+
+
+async def test_worker_reports_errors_and_replaces_broken_agents():
+    results = await run_worker(
+        [ShardTask("abort"), ShardTask("unpicklable"), ShardTask("next")],
+        contexts=1,
+    )
+
+    assert isinstance(results[0].error, TaskAbortedError)
+    # Replaced by a description that survives the trip to the parent
+    assert type(results[1].error) is WebtaskError
+    assert "Unpicklable: not pickleable" in str(results[1].error)
+    assert results[2].ok
+    agents = FakeWebtask.instances[0].agents
+    assert len(agents) == 2
+    assert agents[0].context.closed
+
+
+async def test_worker_reports_unpicklable_output_as_error():
+    results = await run_worker([ShardTask("lock"), ShardTask("next")], contexts=1)
+
+    assert results[0].output is None
+    assert type(results[0].error) is WebtaskError
+    assert "can't be sent" in str(results[0].error)
+    assert results[1].ok
+
+
+async def test_worker_reports_llm_factory_failure_for_each_job():
+    results = await run_worker(
+        [ShardTask("a"), ShardTask("b")], llm_factory=failing_llm
+    )
+
+    assert [str(done.error) for done in results] == ["no credentials"] * 2
+
+
+async def test_runner_spreads_jobs_across_processes():
+    runner = ShardedRunner(make_llm, processes=2, start_method="fork")
+
+    results = await collect(runner, [f"task {i}" for i in range(6)])
+
+    assert sorted(done.index for done in results) == list(range(6))
+    assert all(done.ok for done in results)
+    pids = {done.output.output.split(":")[1] for done in results}
+    assert str(os.getpid()) not in pids
+    metrics = runner.metrics
+    assert metrics.tasks == metrics.succeeded == 6
+    assert sum(metrics.per_worker.values()) == 6
+    assert set(metrics.per_worker) <= {0, 1}
+    assert metrics.tasks_per_second > 0
+
+
+async def test_runner_reports_jobs_of_dead_workers():
+    runner = ShardedRunner(make_llm, processes=1, start_method="fork")
+
+    results = await collect(runner, ["first", "exit", "never"])
+
+    by_index = {done.index: done for done in results}
+    assert by_index[0].ok
+    assert "exited" in str(by_index[1].error)
+    assert "exited" in str(by_index[2].error)
+    assert runner.metrics.failed == 2
+
+
+async def test_runner_fails_jobs_of_a_dead_worker_right_away():
+    """Not only once the other workers are done too."""
+    runner = ShardedRunner(make_llm, processes=2, start_method="fork")
+
+    results = await collect(runner, ["exit", "slow"])
+
+    assert [done.task.task for done in results] == ["exit", "slow"]
+    assert "exited while running" in str(results[0].error)
+    assert results[1].ok
+
+
+async def test_runner_with_no_tasks():
+    runner = ShardedRunner(make_llm, processes=2, start_method="fork")
+
+    assert await collect(runner, []) == []
+    assert runner.metrics.tasks == 0
+
+
+def test_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        ShardedRunner(make_llm, contexts_per_process=0)